@@ -200,6 +200,30 @@ if SERVER_MODE and not IS_WIN:
 else:
     LOG_FILE = os.path.join(DATA_DIR, 'pgadmin4.log')
 
+# Fraction (0.0 - 1.0) of the queries logged, when the log level is SQL.
+# Sampling keeps the log of a busy server readable, every query still gets a
+# unique query id.
+QUERY_LOG_SAMPLE_RATE = 1.0
+
+# Queries taking longer than the threshold (in milliseconds) are captured in
+# the slow query log as JSON records (server, database, connection, rows,
+# bytes, and timings of the query). Set it to 0 to disable the slow query log.
+SLOW_QUERY_THRESHOLD = 0
+
+# Slow query log file name, and its rotation settings.
+if SERVER_MODE and not IS_WIN:
+    SLOW_QUERY_LOG_FILE = '/var/log/pgadmin/pgadmin4-slow-queries.log'
+else:
+    SLOW_QUERY_LOG_FILE = os.path.join(DATA_DIR, 'pgadmin4-slow-queries.log')
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUP_COUNT = 5
+
+# Collect the metrics of the requests (latency per endpoint and node type,
+# database round trips, and time per request), the database queries and the
+# caches. The metrics are exposed in the Prometheus text format at /metrics/
+# to the administrators.
+METRICS_ENABLED = True
+
 
 ##########################################################################
 # Server Connection Driver Settings
@@ -212,6 +236,55 @@ PG_DEFAULT_DRIVER = 'psycopg2'
 # for the particular session. (in minutes)
 MAX_SESSION_IDLE_TIME = 60
 
+# Number of worker threads used to fetch the recovery/WAL replay pause state
+# of the connected servers concurrently, while listing a server group.
+SERVER_RECOVERY_STATE_WORKERS = 8
+
+# Maximum time (in seconds) to wait for the recovery state of a server, while
+# listing a server group. Servers, which do not respond in time, are reported
+# with the 'unknown' state.
+SERVER_RECOVERY_STATE_TIMEOUT = 2
+
+# Time (in seconds) for which the recovery state of a server is cached.
+SERVER_RECOVERY_STATE_CACHE_TTL = 10
+
+# Apply the session settings (DateStyle, client_encoding etc.), and the role
+# with the libpq 'options' at the connection startup, saving a round trip on
+# every connection. Set it to False for the connection poolers (e.g.
+# pgbouncer), which reject the startup options.
+CONNECTION_STARTUP_OPTIONS = True
+
+# Time (in seconds) for which the server information (version, server type,
+# database, and role information) fetched on a connection is reused by the
+# new connections to the same server, as long as the server reports the same
+# version, and user at the startup.
+SERVER_INFO_CACHE_TTL = 300
+
+# Maximum time (in seconds) to wait for a query cancel request to be sent to
+# the server, before falling back to pg_cancel_backend. The connection opened
+# by the fallback uses it (rounded up) as the libpq connect_timeout, which
+# libpq treats as at least 2 seconds.
+CANCEL_QUERY_TIMEOUT = 5
+
+# Maximum number, and total size (in bytes) of the messages (notices) from
+# the database server buffered per connection between the polls of a running
+# query. The oldest messages are discarded (and counted), when the buffer is
+# full. Set to 0 for no limit.
+NOTICES_BUFFER_MAX_COUNT = 10000
+NOTICES_BUFFER_MAX_BYTES = 1024 * 1024
+
+# JSON encoder used for the responses: 'auto' (orjson, if installed,
+# simplejson otherwise), 'orjson', 'simplejson', or the name of an encoder
+# registered using pgadmin.utils.ajax.register_json_encoder.
+JSON_ENCODER = 'auto'
+
+# The responses having an array (e.g. the rows of a query result, or the
+# nodes of a collection) with at least JSON_STREAM_THRESHOLD items are
+# streamed, encoding JSON_STREAM_BATCH_SIZE items at a time, instead of being
+# encoded as a whole in the memory. Set to 0 to disable streaming.
+JSON_STREAM_THRESHOLD = 5000
+JSON_STREAM_BATCH_SIZE = 1000
+
 ##########################################################################
 # User account and settings storage
 ##########################################################################
@@ -331,6 +404,83 @@ DEFAULT_BINARY_PATHS = {
     "gpdb": ""
 }
 
+##########################################################################
+# Background process scheduler
+#
+# The background processes (backup, restore, import/export, maintenance
+# etc.) are queued, and started only when the limits below allow.
+# Set a limit to 0 to disable it.
+##########################################################################
+
+# Maximum number of background processes running at a time (for all users)
+BG_PROCESS_MAX_RUNNING = 8
+
+# Maximum number of background processes running against a single server at a
+# time
+BG_PROCESS_MAX_RUNNING_PER_SERVER = 2
+
+# Interval (in seconds) at which the queue is checked for the background
+# processes, which can be started
+BG_PROCESS_SCHEDULER_INTERVAL = 5
+
+# Maximum length (in bytes) of a line logged from the output of a background
+# process, the rest of the line is truncated
+BG_PROCESS_LOG_MAX_LINE_LENGTH = 64 * 1024
+
+# Maximum size (in bytes) of a log file of a background process, before it is
+# rotated (only the new lines are shown in the process watcher after that)
+BG_PROCESS_LOG_MAX_SIZE = 64 * 1024 * 1024
+
+# Compress the rotated log files of the background processes
+BG_PROCESS_LOG_COMPRESS = True
+
+# The finished background processes, and their logs are removed, keeping only
+# a summary (exit code, duration, log size) for the reporting, when:
+# - finished more than BG_PROCESS_RETENTION_MAX_AGE days ago,
+# - a user has more than BG_PROCESS_RETENTION_MAX_COUNT processes (the oldest
+#   are removed first),
+# - the logs of all the processes exceed BG_PROCESS_RETENTION_MAX_LOG_SIZE
+#   bytes (the oldest are removed first).
+BG_PROCESS_RETENTION_MAX_AGE = 30
+BG_PROCESS_RETENTION_MAX_COUNT = 100
+BG_PROCESS_RETENTION_MAX_LOG_SIZE = 1024 * 1024 * 1024
+
+# The logs of the processes finished more than BG_PROCESS_LOG_COMPRESS_AGE
+# days ago are compressed
+BG_PROCESS_LOG_COMPRESS_AGE = 1
+
+# Interval (in seconds) between the sweeps applying the retention limits
+BG_PROCESS_RETENTION_INTERVAL = 3600
+
+##########################################################################
+# Import/Export
+##########################################################################
+
+# Engine used for copying the table data by default:
+# 'psql' - run the \copy command using the psql utility
+# 'copy' - run the COPY command in-process (in a background python worker),
+#          which does not require the client utilities, and supports the
+#          gzip/zstd (requires the 'zstandard' package) compressed files.
+IMPORT_EXPORT_ENGINE = 'psql'
+
+# Size (in bytes) of the buffer used by the 'copy' engine for each read/write
+IMPORT_EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Maximum number of the connections used by the 'copy' engine for importing a
+# text/CSV file in parallel
+IMPORT_MAX_PARALLEL_JOBS = 8
+
+# Size (in bytes) of the chunks of a file imported in parallel
+IMPORT_PARALLEL_CHUNK_SIZE = 64 * 1024 * 1024
+
+##########################################################################
+# Maintenance
+##########################################################################
+
+# Maximum number of the connections used for running a maintenance operation
+# on many tables (selected by the criteria) concurrently
+MAINTENANCE_MAX_PARALLEL_JOBS = 8
+
 ##########################################################################
 # Test settings - used primarily by the regression suite, not for users
 ##########################################################################
@@ -356,6 +506,49 @@ SQLALCHEMY_TRACK_MODIFICATIONS = False
 ##########################################################################
 ON_DEMAND_RECORD_COUNT = 1000
 
+##########################################################################
+# The results of the queries executed asynchronously (i.e. in the query tool,
+# and the view data tool) having more than RESULT_SPILL_THRESHOLD rows are
+# written into a temporary file (in RESULT_SPILL_DIR, or the system temporary
+# directory if None), and the rows are read from it on demand, instead of
+# keeping the whole result in the memory. Set to 0 to disable it.
+##########################################################################
+RESULT_SPILL_THRESHOLD = 10000
+RESULT_SPILL_DIR = None
+
+##########################################################################
+# When the statements of a script are executed separately in the query tool,
+# the result sets of at most QUERY_TOOL_RESULT_SETS_MAX statements (the most
+# recent ones), and at most QUERY_TOOL_RESULT_ROWS_MAX rows of each are
+# retained. A poll request executes the statements completing within
+# QUERY_TOOL_SCRIPT_POLL_TIME seconds, before reporting the progress.
+##########################################################################
+QUERY_TOOL_RESULT_SETS_MAX = 20
+QUERY_TOOL_RESULT_ROWS_MAX = 1000
+QUERY_TOOL_SCRIPT_POLL_TIME = 1
+
+##########################################################################
+# The queries executed in the query tool are recorded in the query history
+# of the user (in the configuration database). At most
+# QUERY_HISTORY_MAX_ENTRIES queries per user are kept, for at most
+# QUERY_HISTORY_MAX_AGE days (0 for no limit), and the text of a query is
+# truncated to QUERY_HISTORY_MAX_QUERY_LENGTH characters.
+#
+# The queries are stored as plain text. The statements which may carry the
+# credentials (e.g. ALTER ROLE ... PASSWORD, CREATE USER MAPPING, CREATE
+# SUBSCRIPTION, dblink) are stored without their literals, and their error
+# messages. Set QUERY_HISTORY_ENABLED to False to keep the history only in
+# the browser.
+##########################################################################
+QUERY_HISTORY_ENABLED = True
+QUERY_HISTORY_MAX_ENTRIES = 10000
+QUERY_HISTORY_MAX_AGE = 90
+QUERY_HISTORY_MAX_QUERY_LENGTH = 10000
+
+# Interval (in seconds) between the sweeps applying the retention limits on
+# the query history (0 to disable)
+QUERY_HISTORY_RETENTION_INTERVAL = 3600
+
 ##########################################################################
 # Local config settings
 ##########################################################################
@@ -0,0 +1,48 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+"""
+Adding new columns to the process table for the background process scheduler
+
+Revision ID: 50aad68f99c2
+Revises: 02b9dccdcfcb
+Create Date: 2026-10-19 10:12:41.516274
+
+"""
+from pgadmin.model import db
+
+# revision identifiers, used by Alembic.
+revision = '50aad68f99c2'
+down_revision = '02b9dccdcfcb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    db.engine.execute(
+        'ALTER TABLE process ADD COLUMN server_id INTEGER'
+    )
+    db.engine.execute(
+        'ALTER TABLE process ADD COLUMN priority INTEGER DEFAULT 0'
+    )
+    db.engine.execute(
+        'ALTER TABLE process ADD COLUMN queued_time TEXT'
+    )
+    db.engine.execute(
+        'ALTER TABLE process ADD COLUMN not_before TEXT'
+    )
+    db.engine.execute(
+        'ALTER TABLE process ADD COLUMN launch_time TEXT'
+    )
+    db.engine.execute(
+        'ALTER TABLE process ADD COLUMN env TEXT'
+    )
+
+
+def downgrade():
+    pass
@@ -0,0 +1,48 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+"""
+Adding the process_summary table for the retention of the background
+processes
+
+Revision ID: b5c5e1a5a1f3
+Revises: 50aad68f99c2
+Create Date: 2026-10-19 10:52:18.204117
+
+"""
+from pgadmin.model import db
+
+# revision identifiers, used by Alembic.
+revision = 'b5c5e1a5a1f3'
+down_revision = '50aad68f99c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    db.engine.execute("""
+        CREATE TABLE process_summary (
+            pid TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            server_id INTEGER,
+            command TEXT NOT NULL,
+            desc TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            exit_code INTEGER,
+            execution_time FLOAT,
+            log_size INTEGER,
+            removed_time TEXT NOT NULL,
+            PRIMARY KEY (pid),
+            FOREIGN KEY (user_id) REFERENCES user (id)
+        )
+    """)
+
+
+def downgrade():
+    pass
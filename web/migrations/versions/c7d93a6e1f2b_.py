@@ -0,0 +1,83 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+"""
+Adding the query_history table (and its full text search index) for the
+history of the queries executed in the Query Tool
+
+Revision ID: c7d93a6e1f2b
+Revises: b5c5e1a5a1f3
+Create Date: 2026-10-19 13:05:41.318022
+
+"""
+from pgadmin.model import db
+
+# revision identifiers, used by Alembic.
+revision = 'c7d93a6e1f2b'
+down_revision = 'b5c5e1a5a1f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    db.engine.execute("""
+        CREATE TABLE query_history (
+            id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            server_id INTEGER,
+            db_name TEXT,
+            query TEXT NOT NULL,
+            query_hash TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            duration FLOAT,
+            rows INTEGER,
+            status TEXT NOT NULL,
+            message TEXT,
+            PRIMARY KEY (id),
+            FOREIGN KEY (user_id) REFERENCES user (id)
+        )
+    """)
+    db.engine.execute("""
+        CREATE INDEX query_history_user_server
+            ON query_history (user_id, server_id, id)
+    """)
+    db.engine.execute("""
+        CREATE INDEX query_history_user_fingerprint
+            ON query_history (user_id, fingerprint, duration)
+    """)
+
+    # The full text search index of the queries is optional (SQLite may be
+    # built without FTS4), the queries are searched using LIKE without it.
+    try:
+        db.engine.execute("""
+            CREATE VIRTUAL TABLE query_history_fts
+                USING fts4(content="query_history", query)
+        """)
+    except Exception:
+        return
+
+    db.engine.execute("""
+        CREATE TRIGGER query_history_fts_insert
+            AFTER INSERT ON query_history
+        BEGIN
+            INSERT INTO query_history_fts (docid, query)
+                VALUES (new.id, new.query);
+        END
+    """)
+    db.engine.execute("""
+        CREATE TRIGGER query_history_fts_delete
+            BEFORE DELETE ON query_history
+        BEGIN
+            DELETE FROM query_history_fts WHERE docid = old.id;
+        END
+    """)
+
+
+def downgrade():
+    pass
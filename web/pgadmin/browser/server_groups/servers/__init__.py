@@ -9,15 +9,20 @@
 
 import simplejson as json
 import re
+import time
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
 import pgadmin.browser.server_groups as sg
 from flask import render_template, request, make_response, jsonify, \
-    current_app, url_for
+    current_app, url_for, copy_current_request_context
 from flask_babel import gettext
 from flask_security import current_user, login_required
 from pgadmin.browser.server_groups.servers.types import ServerType
 from pgadmin.browser.utils import PGChildNodeView
 from pgadmin.utils.ajax import make_json_response, bad_request, forbidden, \
     make_response as ajax_response, internal_server_error, unauthorized, gone
+from pgadmin.utils import metrics
 from pgadmin.utils.crypto import encrypt, decrypt, pqencryptpassword
 from pgadmin.utils.menu import MenuItem
 
@@ -42,18 +47,175 @@ def has_any(data, keys):
 
     return False
 
-def recovery_state(connection, postgres_version):
-    recovery_check_sql = render_template("connect/sql/#{0}#/check_recovery.sql".format(postgres_version))
+# Recovery state reported for the servers, which could not be probed in time.
+RECOVERY_STATE_UNKNOWN = 'unknown'
+
+# Thread pool used to probe the recovery state of the connected servers, the
+# probes, which are still running (server manager -> async result), and the
+# connections used by them (server manager -> connection).
+_recovery_state_pool = None
+_recovery_state_probes = dict()
+_recovery_state_conns = dict()
+_recovery_state_lock = Lock()
+
+# Id of the connection used to probe the recovery state of a server, so that
+# a slow probe does not hold (and can be cancelled without affecting) the
+# maintenance database connection shared by the other requests. It is
+# released after each probe.
+RECOVERY_STATE_CONN_ID = 'recovery-state'
+
 
+def _check_recovery(connection, recovery_check_sql):
     status, result = connection.execute_dict(recovery_check_sql)
     if status and 'rows' in result and len(result['rows']) > 0:
         in_recovery = result['rows'][0]['inrecovery']
         wal_paused = result['rows'][0]['isreplaypaused']
     else:
+        status = False
         in_recovery = None
         wal_paused = None
+    return status, in_recovery, wal_paused
+
+
+def recovery_state(connection, postgres_version):
+    recovery_check_sql = render_template("connect/sql/#{0}#/check_recovery.sql".format(postgres_version))
+
+    status, in_recovery, wal_paused = _check_recovery(
+        connection, recovery_check_sql
+    )
+    # Only the state fetched successfully is cached
+    if status:
+        connection.manager.recovery_state = (
+            time.time(), in_recovery, wal_paused
+        )
+
     return in_recovery, wal_paused
 
+
+def _get_recovery_state_pool():
+    global _recovery_state_pool
+
+    with _recovery_state_lock:
+        if _recovery_state_pool is None:
+            _recovery_state_pool = ThreadPool(
+                max(config.SERVER_RECOVERY_STATE_WORKERS or 1, 1)
+            )
+        return _recovery_state_pool
+
+
+def recovery_states(managers):
+    """
+    Fetch the recovery and WAL replay pause state of the given servers
+    concurrently (each using a dedicated connection to the server, released
+    after the probe).
+
+    The state of each server is cached on its manager for
+    SERVER_RECOVERY_STATE_CACHE_TTL seconds. A server, which fails to answer,
+    or does not answer within SERVER_RECOVERY_STATE_TIMEOUT seconds (its
+    probe is cancelled then), is reported as RECOVERY_STATE_UNKNOWN, and
+    probed again on the next call (the failures are not cached).
+
+    Args:
+        managers: List of ServerManager objects for the connected servers
+
+    Returns:
+        Dictionary of server id -> (in_recovery, wal_paused)
+    """
+    res = dict()
+    now = time.time()
+    ttl = config.SERVER_RECOVERY_STATE_CACHE_TTL or 0
+    probes = []
+
+    for manager in managers:
+        cached = manager.recovery_state
+        hit = cached is not None and now - cached[0] < ttl
+        metrics.record_cache('recovery_state', hit)
+        if hit:
+            res[manager.sid] = cached[1:]
+            continue
+
+        with _recovery_state_lock:
+            probe = _recovery_state_probes.get(manager)
+
+        if probe is None:
+            # Render the query here, as the template loader depends on the
+            # current request.
+            recovery_check_sql = render_template(
+                "connect/sql/#{0}#/check_recovery.sql".format(
+                    manager.version
+                )
+            )
+
+            @copy_current_request_context
+            def _probe(manager=manager, sql=recovery_check_sql):
+                try:
+                    conn = manager.connection(conn_id=RECOVERY_STATE_CONN_ID)
+                    with _recovery_state_lock:
+                        _recovery_state_conns[manager] = conn
+
+                    status, msg = conn.connect()
+                    if not status:
+                        raise Exception(msg)
+
+                    status, in_recovery, wal_paused = _check_recovery(
+                        conn, sql
+                    )
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    status = False
+                finally:
+                    with _recovery_state_lock:
+                        _recovery_state_conns.pop(manager, None)
+                    try:
+                        manager.release(conn_id=RECOVERY_STATE_CONN_ID)
+                    except Exception as e:
+                        current_app.logger.exception(e)
+                    with _recovery_state_lock:
+                        _recovery_state_probes.pop(manager, None)
+
+                if not status:
+                    return RECOVERY_STATE_UNKNOWN, RECOVERY_STATE_UNKNOWN
+
+                manager.recovery_state = (time.time(), in_recovery, wal_paused)
+                return in_recovery, wal_paused
+
+            pool = _get_recovery_state_pool()
+            # The probe is registered before it can complete (and remove
+            # itself), as it needs the lock to do so.
+            with _recovery_state_lock:
+                probe = _recovery_state_probes[manager] = \
+                    pool.apply_async(_probe)
+
+        probes.append((manager, probe))
+
+    deadline = now + (config.SERVER_RECOVERY_STATE_TIMEOUT or 0)
+
+    for manager, probe in probes:
+        try:
+            res[manager.sid] = probe.get(max(deadline - time.time(), 0))
+        except Exception:
+            current_app.logger.warning(
+                "Recovery state of the server (#{0}) is not available "
+                "within {1} second(s).".format(
+                    manager.sid, config.SERVER_RECOVERY_STATE_TIMEOUT
+                )
+            )
+            res[manager.sid] = (
+                RECOVERY_STATE_UNKNOWN, RECOVERY_STATE_UNKNOWN
+            )
+
+            # Cancel the probe, so that it does not keep running (and
+            # holding a worker) on an unresponsive server.
+            with _recovery_state_lock:
+                conn = _recovery_state_conns.get(manager)
+            try:
+                if conn is not None and conn.connected():
+                    conn.cancel_query()
+            except Exception as e:
+                current_app.logger.exception(e)
+
+    return res
+
 def server_icon_and_background(is_connected, manager, server):
     """
 
@@ -111,15 +273,18 @@ class ServerModule(sg.ServerGroupPluginModule):
 
         driver = get_driver(PG_DEFAULT_DRIVER)
 
-        for server in servers:
-            manager = driver.connection_manager(server.id)
-            conn = manager.connection()
-            connected = conn.connected()
-            in_recovery = None
-            wal_paused = None
+        servers = [
+            (server, driver.connection_manager(server.id)) for server in servers
+        ]
+        states = recovery_states([
+            manager for server, manager in servers
+            if manager.connection().connected()
+        ])
+
+        for server, manager in servers:
+            connected = manager.sid in states
+            in_recovery, wal_paused = states.get(manager.sid, (None, None))
 
-            if connected:
-                in_recovery, wal_paused = recovery_state(conn, manager.version)
             yield self.generate_browser_node(
                 "%d" % (server.id),
                 gid,
@@ -241,6 +406,7 @@ class ServerNode(PGChildNodeView):
         'wal_replay': [{
             'delete': 'pause_wal_replay', 'put': 'resume_wal_replay'
         }],
+        'cancel_queries': [{'put': 'cancel_queries'}],
         'check_pgpass': [{'get': 'check_pgpass'}]
     })
     EXP_IP4 = "^\s*((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\."\
@@ -319,16 +485,17 @@ class ServerNode(PGChildNodeView):
 
         driver = get_driver(PG_DEFAULT_DRIVER)
 
-        for server in servers:
-            manager = driver.connection_manager(server.id)
-            conn = manager.connection()
-            connected = conn.connected()
+        servers = [
+            (server, driver.connection_manager(server.id)) for server in servers
+        ]
+        states = recovery_states([
+            manager for server, manager in servers
+            if manager.connection().connected()
+        ])
 
-            if connected:
-                in_recovery, wal_paused = recovery_state(conn, manager.version)
-            else:
-                in_recovery = None
-                wal_paused = None
+        for server, manager in servers:
+            connected = manager.sid in states
+            in_recovery, wal_paused = states.get(manager.sid, (None, None))
 
             res.append(
                 self.blueprint.generate_browser_node(
@@ -378,7 +545,7 @@ class ServerNode(PGChildNodeView):
         connected = conn.connected()
 
         if connected:
-            in_recovery, wal_paused = recovery_state(conn, manager.version)
+            in_recovery, wal_paused = recovery_states([manager])[manager.sid]
         else:
             in_recovery = None
             wal_paused = None
@@ -1245,6 +1412,9 @@ class ServerNode(PGChildNodeView):
 
             # Execute SQL to pause or resume WAL replay
             if conn.connected():
+                # The cached recovery state is no longer valid
+                manager.recovery_state = None
+
                 if pause:
                     sql = "SELECT pg_xlog_replay_pause();"
                     if manager.version >= 100000:
@@ -1303,6 +1473,45 @@ class ServerNode(PGChildNodeView):
         """
         return self.wal_replay(sid, True)
 
+    def cancel_queries(self, gid, sid):
+        """
+        This method will cancel the queries running on all the connections
+        of the current user to the server.
+
+        Args:
+            gid: Server group ID
+            sid: Server ID
+        """
+        server = Server.query.filter_by(
+            user_id=current_user.id, id=sid
+        ).first()
+
+        if server is None:
+            return make_json_response(
+                success=0,
+                errormsg=gettext("Could not find the required server.")
+            )
+
+        manager = get_driver(PG_DEFAULT_DRIVER).connection_manager(sid)
+        if not manager.connection().connected():
+            return gone(errormsg=gettext('Please connect the server.'))
+
+        cancelled, errors = manager.cancel_queries()
+        for error in errors:
+            current_app.logger.warning(
+                u"Failed to cancel the query on the server #{0} - {1}".format(
+                    sid, error
+                )
+            )
+
+        return make_json_response(
+            success=1,
+            info=gettext(
+                "Cancel request sent for {0} connection(s)."
+            ).format(cancelled),
+            data={'cancelled': cancelled, 'errors': errors}
+        )
+
     def check_pgpass(self, gid, sid):
         """
         This function is used to check whether server is connected
@@ -18,13 +18,14 @@ from flask import render_template, current_app, request, jsonify
 from flask_babel import gettext as _
 from pgadmin.browser.collection import CollectionNodeModule
 from pgadmin.browser.server_groups.servers.databases.utils import \
-    parse_sec_labels_from_db, parse_variables_from_db
+    parse_sec_labels_from_db, parse_variables_from_db, \
+    get_table_stats_args, get_table_stats_result
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
 from pgadmin.browser.utils import PGChildNodeView
 from pgadmin.utils.ajax import make_json_response, \
     make_response as ajax_response, internal_server_error, unauthorized
-from pgadmin.utils.ajax import gone
+from pgadmin.utils.ajax import gone, bad_request
 from pgadmin.utils.driver import get_driver
 
 from config import PG_DEFAULT_DRIVER
@@ -110,9 +111,11 @@ class DatabaseView(PGChildNodeView):
         'sql': [{'get': 'sql'}],
         'msql': [{'get': 'msql'}, {'get': 'msql'}],
         'stats': [{'get': 'statistics'}, {'get': 'statistics'}],
+        'table_stats': [{'get': 'table_stats'}],
         'dependency': [{'get': 'dependencies'}],
         'dependent': [{'get': 'dependents'}],
         'children': [{'get': 'children'}],
+        'subtree': [{'get': 'subtree'}],
         'connect': [{
             'get': 'connect_status', 'post': 'connect', 'delete': 'disconnect'
         }],
@@ -885,6 +888,31 @@ class DatabaseView(PGChildNodeView):
             status=200
         )
 
+    @check_precondition()
+    def table_stats(self, gid, sid, did):
+        """
+        Returns the statistics (activity, I/O, and size) of all the user
+        tables in the database, fetched in a single query. The sort order,
+        and the limit are pushed down to the server
+        (see get_table_stats_args).
+        """
+        args, errmsg = get_table_stats_args(request.args)
+        if args is None:
+            return bad_request(errormsg=errmsg)
+
+        status, res = self.conn.execute_dict(render_template(
+            "/".join([self.template_path, 'table_stats.sql']),
+            args=args
+        ))
+
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=get_table_stats_result(args, res['rows']),
+            status=200
+        )
+
     @check_precondition(action="sql")
     def sql(self, gid, sid, did):
         """
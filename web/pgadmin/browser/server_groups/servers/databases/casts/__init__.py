@@ -16,7 +16,8 @@ import pgadmin.browser.server_groups.servers.databases as databases
 from flask import render_template, request, jsonify
 from flask_babel import gettext
 from pgadmin.browser.collection import CollectionNodeModule
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -232,7 +233,6 @@ class CastView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did):
         """
         This function will used to create all the child nodes within the collection.
@@ -242,6 +242,33 @@ class CastView(PGChildNodeView):
         :param did: database id
         :return:
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, paging=None):
+        """
+        This function will fetch the cast nodes within that collection (for the
+        nodes, and the subtree of the database).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, cast nodes or error message, pagination details)
+        """
         res = []
         last_system_oid = 0 if self.blueprint.show_system_objects else \
             (self.manager.db_info[did])['datlastsysoid'] \
@@ -250,11 +277,12 @@ class CastView(PGChildNodeView):
         sql = render_template(
             "/".join([self.template_path, 'nodes.sql']),
             datlastsysoid=last_system_oid,
-            showsysobj=self.blueprint.show_system_objects
+            showsysobj=self.blueprint.show_system_objects,
+            paging=paging
         )
         status, rset = self.conn.execute_2darray(sql)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -265,10 +293,7 @@ class CastView(PGChildNodeView):
                     icon="icon-cast"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, cid):
@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
     SELECT
         ca.oid,
-        concat(format_type(st.oid,NULL),'->',format_type(tt.oid,tt.typtypmod)) as name
+        concat(format_type(st.oid,NULL),'->',format_type(tt.oid,tt.typtypmod)) as name{{ PAGING.TOTAL_COUNT(paging) }}
     FROM pg_cast ca
     JOIN pg_type st ON st.oid=castsource
     JOIN pg_namespace ns ON ns.oid=st.typnamespace
@@ -21,4 +22,8 @@
         {% endif %}
         ca.oid > {{datlastsysoid}}::OID
     {% endif %}
-    ORDER BY st.typname, tt.typname
\ No newline at end of file
+    {% if not cid %}
+    {{ PAGING.NAME_FILTER(paging, "concat(format_type(st.oid,NULL),'->',format_type(tt.oid,tt.typtypmod))", 'AND' if (not showsysobj) and datlastsysoid else 'WHERE') }}
+    {% endif %}
+    ORDER BY st.typname, tt.typname
+{{ PAGING.LIMIT_OFFSET(paging) }}
\ No newline at end of file
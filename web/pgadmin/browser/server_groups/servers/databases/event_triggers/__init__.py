@@ -15,7 +15,8 @@ import pgadmin.browser.server_groups.servers.databases as database
 from flask import render_template, request, jsonify
 from flask_babel import gettext
 from pgadmin.browser.collection import CollectionNodeModule
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -219,7 +220,6 @@ class EventTriggerView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did):
         """
         This function is used to create all the child nodes within the collection.
@@ -233,12 +233,41 @@ class EventTriggerView(PGChildNodeView):
 
         Returns:
 
+        """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, paging=None):
+        """
+        This function will fetch the event trigger nodes within that collection
+        (for the nodes, and the subtree of the database).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, event trigger nodes or error message, pagination details)
         """
         result = []
-        sql = render_template("/".join([self.template_path, 'nodes.sql']))
+        sql = render_template(
+            "/".join([self.template_path, 'nodes.sql']), paging=paging
+        )
         status, res = self.conn.execute_2darray(sql)
         if not status:
-            return internal_server_error(errormsg=res)
+            return False, res, None
 
         for row in res['rows']:
             result.append(
@@ -249,10 +278,7 @@ class EventTriggerView(PGChildNodeView):
                     icon="icon-%s" % self.node_type
                 ))
 
-        return make_json_response(
-            data=result,
-            status=200
-        )
+        return True, result, get_paging_result(paging, res['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, etid):
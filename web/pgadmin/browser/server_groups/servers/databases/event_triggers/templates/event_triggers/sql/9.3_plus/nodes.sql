@@ -1,6 +1,10 @@
-SELECT e.oid, e.evtname AS name
+{% import 'macros/schemas/pagination.macros' as PAGING %}
+SELECT e.oid, e.evtname AS name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_event_trigger e
 {% if etid %}
 WHERE e.oid={{etid}}::oid
+{% else %}
+{{ PAGING.NAME_FILTER(paging, 'e.evtname', 'WHERE') }}
 {% endif %}
 ORDER BY e.evtname
+{{ PAGING.LIMIT_OFFSET(paging) }}
@@ -16,7 +16,8 @@ import pgadmin.browser.server_groups.servers.databases as databases
 from flask import render_template, request, jsonify
 from flask_babel import gettext
 from pgadmin.browser.collection import CollectionNodeModule
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, \
     make_response as ajax_response, internal_server_error, gone
 from pgadmin.utils.driver import get_driver
@@ -173,16 +174,44 @@ class ExtensionView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did):
         """
         Lists all extensions under the Extensions Collection node
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, paging=None):
+        """
+        This function will fetch the extension nodes within that collection
+        (for the nodes, and the subtree of the database).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, extension nodes or error message, pagination details)
+        """
         res = []
-        SQL = render_template("/".join([self.template_path, 'properties.sql']))
+        SQL = render_template(
+            "/".join([self.template_path, 'properties.sql']), paging=paging
+        )
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -193,10 +222,7 @@ class ExtensionView(PGChildNodeView):
                     'icon-extension'
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, eid):
@@ -1,9 +1,10 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 {#===================Fetch properties of each extension by name or oid===================#}
 SELECT
     x.oid AS eid, pg_get_userbyid(extowner) AS owner,
     x.extname AS name, n.nspname AS schema,
     x.extrelocatable AS relocatable, x.extversion AS version,
-    e.comment
+    e.comment{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_extension x
     LEFT JOIN pg_namespace n ON x.extnamespace=n.oid
@@ -13,5 +14,7 @@ FROM
 {% elif ename %}
  WHERE x.extname = {{ename|qtLiteral}}::text
 {% else %}
+{{ PAGING.NAME_FILTER(paging, 'x.extname', 'WHERE') }}
  ORDER BY x.extname
+{{ PAGING.LIMIT_OFFSET(paging) }}
 {% endif %}
@@ -18,7 +18,8 @@ from flask_babel import gettext
 from pgadmin.browser.collection import CollectionNodeModule
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db, validate_options, tokenize_options
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -241,7 +242,6 @@ class ForeignDataWrapperView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did):
         """
         This function will used to create all the child node within that collection.
@@ -252,13 +252,41 @@ class ForeignDataWrapperView(PGChildNodeView):
             sid: Server ID
             did: Database ID
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, paging=None):
+        """
+        This function will fetch the foreign data wrapper nodes within that
+        collection (for the nodes, and the subtree of the database).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, foreign data wrapper nodes or error message, pagination details)
+        """
         res = []
         sql = render_template("/".join([self.template_path, 'properties.sql']),
-                              conn=self.conn
+                              conn=self.conn,
+                              paging=paging
                               )
         status, r_set = self.conn.execute_2darray(sql)
         if not status:
-            return internal_server_error(errormsg=r_set)
+            return False, r_set, None
 
         for row in r_set['rows']:
             res.append(
@@ -269,10 +297,7 @@ class ForeignDataWrapperView(PGChildNodeView):
                     icon="icon-foreign_data_wrapper"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, r_set['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, fid):
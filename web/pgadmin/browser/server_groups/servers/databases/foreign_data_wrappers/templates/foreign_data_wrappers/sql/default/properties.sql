@@ -1,8 +1,9 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 {# ============= Get all the properties of foreign data wrapper ============= #}
 SELECT fdw.oid as fdwoid, fdwname as name, fdwhandler, fdwvalidator, description,
     array_to_string(fdwoptions, ',') AS fdwoptions, pg_get_userbyid(fdwowner) as fdwowner, array_to_string(fdwacl::text[], ', ') as acl,
     quote_ident(vp_nsp.nspname)||'.'||quote_ident(vp.proname) AS fdwvalue,
-    quote_ident(vh_nsp.nspname)||'.'||quote_ident(vh.proname) AS fdwhan
+    quote_ident(vh_nsp.nspname)||'.'||quote_ident(vh.proname) AS fdwhan{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_foreign_data_wrapper fdw
 LEFT OUTER JOIN pg_proc vh on vh.oid=fdwhandler
 LEFT OUTER JOIN pg_proc vp on vp.oid=fdwvalidator
@@ -15,4 +16,8 @@ WHERE fdw.oid={{fid}}::oid
 {% if fname %}
 WHERE fdw.fdwname={{ fname|qtLiteral }}::text
 {% endif %}
+{% if not fid and not fname %}
+{{ PAGING.NAME_FILTER(paging, 'fdw.fdwname', 'WHERE') }}
+{% endif %}
 ORDER BY fdwname
+{{ PAGING.LIMIT_OFFSET(paging) }}
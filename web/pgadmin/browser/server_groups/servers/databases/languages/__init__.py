@@ -18,7 +18,8 @@ from flask_babel import gettext
 from pgadmin.browser.collection import CollectionNodeModule
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -251,7 +252,6 @@ class LanguageView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did):
         """
         This function is used to create all the child nodes within the collection.
@@ -262,11 +262,40 @@ class LanguageView(PGChildNodeView):
             sid: Server ID
             did: Database ID
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, paging=None):
+        """
+        This function will fetch the language nodes within that collection (for
+        the nodes, and the subtree of the database).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, language nodes or error message, pagination details)
+        """
         res = []
-        sql = render_template("/".join([self.template_path, 'properties.sql']))
+        sql = render_template(
+            "/".join([self.template_path, 'properties.sql']), paging=paging
+        )
         status, result = self.conn.execute_2darray(sql)
         if not status:
-            return internal_server_error(errormsg=result)
+            return False, result, None
 
         for row in result['rows']:
             res.append(
@@ -277,10 +306,7 @@ class LanguageView(PGChildNodeView):
                     icon="icon-language"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, result['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, lid):
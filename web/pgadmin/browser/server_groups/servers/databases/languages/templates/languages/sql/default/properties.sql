@@ -1,9 +1,10 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     lan.oid as oid, lanname as name, lanpltrusted as trusted,
     array_to_string(lanacl::text[], ', ') as acl, hp.proname as lanproc,
     vp.proname as lanval, description,
     pg_get_userbyid(lan.lanowner) as lanowner, ip.proname as laninl,
-    (SELECT array_agg(provider || '=' || label) FROM pg_seclabel sl1 WHERE sl1.objoid=lan.oid) AS seclabels
+    (SELECT array_agg(provider || '=' || label) FROM pg_seclabel sl1 WHERE sl1.objoid=lan.oid) AS seclabels{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_language lan JOIN pg_proc hp ON hp.oid=lanplcallfoid
     LEFT OUTER JOIN pg_proc ip ON ip.oid=laninline
@@ -20,4 +21,6 @@ WHERE lanispl IS TRUE
 {% if lanname %} AND
     lanname={{ lanname|qtLiteral }}::text
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'lanname') }}
 ORDER BY lanname
+{{ PAGING.LIMIT_OFFSET(paging) }}
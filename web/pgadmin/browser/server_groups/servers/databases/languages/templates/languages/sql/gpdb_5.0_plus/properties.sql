@@ -1,8 +1,9 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     lan.oid as oid, lanname as name, lanpltrusted as trusted,
     array_to_string(lanacl::text[], ', ') as acl, hp.proname as lanproc,
     vp.proname as lanval, description,
-    pg_get_userbyid(lan.lanowner) as lanowner, ip.proname as laninl
+    pg_get_userbyid(lan.lanowner) as lanowner, ip.proname as laninl{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_language lan JOIN pg_proc hp ON hp.oid=lanplcallfoid
     LEFT OUTER JOIN pg_proc ip ON ip.oid=laninline
@@ -19,4 +20,6 @@ WHERE lanispl IS TRUE
 {% if lanname %} AND
     lanname={{ lanname|qtLiteral }}::text
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'lanname') }}
 ORDER BY lanname
+{{ PAGING.LIMIT_OFFSET(paging) }}
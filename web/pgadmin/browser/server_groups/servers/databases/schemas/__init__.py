@@ -15,9 +15,12 @@ import pgadmin.browser.server_groups.servers as servers
 from flask import render_template, request, jsonify, current_app
 from flask_babel import gettext
 from pgadmin.browser.collection import CollectionNodeModule, PGChildModule
+from pgadmin.browser.server_groups.servers.databases.utils import \
+    get_table_stats_args, get_table_stats_result
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone, bad_request
 from pgadmin.utils.driver import get_driver
@@ -217,6 +220,7 @@ class SchemaView(PGChildNodeView):
             {'get': 'list', 'post': 'create'}
         ],
         'children': [{'get': 'children'}],
+        'subtree': [{'get': 'subtree'}],
         'nodes': [{'get': 'nodes'}, {'get': 'nodes'}],
         'sql': [{'get': 'sql'}],
         'msql': [{'get': 'msql'}, {'get': 'msql'}],
@@ -404,7 +408,19 @@ class SchemaView(PGChildNodeView):
         Returns:
             JSON of available schema child nodes
         """
-        res = []
+        if scid is None:
+            status, res, result = self.fetch_nodes(
+                gid=gid, sid=sid, did=did, paging=get_paging_args()
+            )
+            if not status:
+                return internal_server_error(errormsg=res)
+
+            return make_json_response(
+                data=res,
+                result=result,
+                status=200
+            )
+
         SQL = render_template(
             "/".join([self.template_path, 'sql/nodes.sql']),
             show_sysobj=self.blueprint.show_system_objects,
@@ -416,26 +432,52 @@ class SchemaView(PGChildNodeView):
         if not status:
             return internal_server_error(errormsg=rset)
 
-        icon = 'icon-{0}'.format(self.node_type)
-
-        if scid is not None:
-            if len(rset['rows']) == 0:
-                return gone(gettext("""
+        if len(rset['rows']) == 0:
+            return gone(gettext("""
 Could not find the schema in the database.
 It may have been removed by another user.
 """))
-            row = rset['rows'][0]
-            return make_json_response(
-                data=self.blueprint.generate_browser_node(
-                    row['oid'],
-                    did,
-                    row['name'],
-                    icon=icon,
-                    can_create=row['can_create'],
-                    has_usage=row['has_usage']
-                ),
-                status=200
-            )
+        row = rset['rows'][0]
+        return make_json_response(
+            data=self.blueprint.generate_browser_node(
+                row['oid'],
+                did,
+                row['name'],
+                icon='icon-{0}'.format(self.node_type),
+                can_create=row['can_create'],
+                has_usage=row['has_usage']
+            ),
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, paging=None):
+        """
+        This function will fetch the schema nodes within the collection (for
+        the nodes, and the subtree of the database).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, schema nodes or error message, pagination details)
+        """
+        res = []
+        SQL = render_template(
+            "/".join([self.template_path, 'sql/nodes.sql']),
+            show_sysobj=self.blueprint.show_system_objects,
+            _=gettext,
+            paging=paging
+        )
+
+        status, rset = self.conn.execute_2darray(SQL)
+        if not status:
+            return False, rset, None
+
+        icon = 'icon-{0}'.format(self.node_type)
 
         for row in rset['rows']:
             res.append(
@@ -449,10 +491,7 @@ It may have been removed by another user.
                 )
             )
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, scid):
@@ -827,6 +866,38 @@ It may have been removed by another user.
 
         return ajax_response(response=SQL.strip("\n"))
 
+    @check_precondition
+    def statistics(self, gid, sid, did, scid):
+        """
+        This function will return the statistics (activity, I/O, and size)
+        of all the user tables in the schema, fetched in a single query. The
+        sort order, and the limit are pushed down to the server
+        (see get_table_stats_args).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+        """
+        args, errmsg = get_table_stats_args(request.args)
+        if args is None:
+            return bad_request(errormsg=errmsg)
+
+        status, res = self.conn.execute_dict(render_template(
+            'databases/sql/#{0}#/table_stats.sql'.format(
+                self.manager.version
+            ), scid=scid, args=args
+        ))
+
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=get_table_stats_result(args, res['rows']),
+            status=200
+        )
+
     @check_precondition
     def dependents(self, gid, sid, did, scid):
         """
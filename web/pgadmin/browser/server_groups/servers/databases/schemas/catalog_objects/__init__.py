@@ -16,7 +16,8 @@ from flask import render_template
 from flask_babel import gettext
 from pgadmin.browser.server_groups.servers.databases.schemas.utils \
     import SchemaChildModule
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response
 from pgadmin.utils.driver import get_driver
@@ -185,7 +186,6 @@ class CatalogObjectView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         This function will used to create all the child node within that collection.
@@ -200,14 +200,43 @@ class CatalogObjectView(PGChildNodeView):
         Returns:
             JSON of available catalog objects child nodes
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function will fetch the catalog object nodes within that
+        collection (for the nodes, and the subtree of the schema).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, catalog object nodes or error message, pagination details)
+        """
         res = []
         SQL = render_template(
-            "/".join([self.template_path, 'nodes.sql']), scid=scid
+            "/".join([self.template_path, 'nodes.sql']), scid=scid,
+            paging=paging
         )
 
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -218,10 +247,7 @@ class CatalogObjectView(PGChildNodeView):
                     icon="icon-catalog_object"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, scid, coid):
@@ -1,5 +1,6 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
-    c.oid, c.relname as name
+    c.oid, c.relname as name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_class c
 {% if scid %}
@@ -7,4 +8,6 @@ WHERE relnamespace = {{scid}}::oid
 {% elif coid %}
 WHERE c.oid = {{coid}}::oid
 {% endif %}
-ORDER BY relname;
+{{ PAGING.NAME_FILTER(paging, 'c.relname') }}
+ORDER BY relname
+{{ PAGING.LIMIT_OFFSET(paging) }};
@@ -1,15 +1,18 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
-    c.oid, c.relname as name
+    c.oid, c.relname as name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_class c
 {% if scid %}
-WHERE relnamespace = {{scid}}::oid
+WHERE (relnamespace = {{scid}}::oid
 OR  (
     -- On EnterpriseDB we need to ignore some objects in the catalog, namely, _*, dual and type_object_source.
 	select 'sys' ~ (SELECT nsp.nspname FROM pg_namespace nsp WHERE nsp.oid = {{scid}}::oid)
 	AND
 	(c.relname NOT LIKE '\\_%' AND c.relname = 'dual' AND  c.relname = 'type_object_source')
-    )
+    ))
 {% elif coid %}
 WHERE c.oid = {{coid}}::oid
 {% endif %}
-ORDER BY relname;
+{{ PAGING.NAME_FILTER(paging, 'c.relname') }}
+ORDER BY relname
+{{ PAGING.LIMIT_OFFSET(paging) }};
@@ -1,8 +1,11 @@
-SELECT c.oid, c.collname AS name
+{% import 'macros/schemas/pagination.macros' as PAGING %}
+SELECT c.oid, c.collname AS name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_collation c
 {% if scid %}
 WHERE c.collnamespace = {{scid}}::oid
 {% elif coid %}
 WHERE c.oid = {{coid}}::oid
 {% endif %}
-ORDER BY c.collname;
+{{ PAGING.NAME_FILTER(paging, 'c.collname') }}
+ORDER BY c.collname
+{{ PAGING.LIMIT_OFFSET(paging) }};
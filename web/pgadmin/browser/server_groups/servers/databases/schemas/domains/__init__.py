@@ -19,7 +19,8 @@ from pgadmin.browser.server_groups.servers.databases.schemas.utils import \
     SchemaChildModule, DataTypeReader
 from pgadmin.browser.server_groups.servers.databases.utils import \
     parse_sec_labels_from_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -296,7 +297,6 @@ class DomainView(PGChildNodeView, DataTypeReader):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         Returns all the Domains to generate Nodes in the browser.
@@ -307,13 +307,40 @@ class DomainView(PGChildNodeView, DataTypeReader):
             did: Database Id
             scid: Schema Id
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function will fetch the domain nodes within that collection (for
+        the nodes, and the subtree of the schema).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+            paging: Pagination arguments (see get_paging_args)
 
+        Returns:
+            (status, domain nodes or error message, pagination details)
+        """
         res = []
         SQL = render_template("/".join([self.template_path, 'node.sql']),
-                              scid=scid)
+                              scid=scid, paging=paging)
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -324,10 +351,7 @@ class DomainView(PGChildNodeView, DataTypeReader):
                     icon="icon-domain"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, scid, doid):
@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     d.oid, d.typname as name, pg_get_userbyid(d.typowner) as owner,
-    bn.nspname as basensp
+    bn.nspname as basensp{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_type d
 JOIN
@@ -13,5 +14,7 @@ WHERE
 {% elif doid %}
 WHERE d.oid = {{doid}}::oid
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'd.typname') }}
 ORDER BY
-    d.typname;
+    d.typname
+{{ PAGING.LIMIT_OFFSET(paging) }};
@@ -24,7 +24,8 @@ from pgadmin.browser.server_groups.servers.databases.utils import \
     parse_sec_labels_from_db
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -371,7 +372,6 @@ class ForeignTableView(PGChildNodeView, DataTypeReader):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         Returns the Foreign Tables to generate the Nodes.
@@ -382,14 +382,41 @@ class ForeignTableView(PGChildNodeView, DataTypeReader):
             did: Database Id
             scid: Schema Id
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
 
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function will fetch the foreign table nodes within that collection
+        (for the nodes, and the subtree of the schema).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, foreign table nodes or error message, pagination details)
+        """
         res = []
         SQL = render_template("/".join([self.template_path,
-                                        'node.sql']), scid=scid)
+                                        'node.sql']), scid=scid, paging=paging)
         status, rset = self.conn.execute_2darray(SQL)
 
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -400,10 +427,7 @@ class ForeignTableView(PGChildNodeView, DataTypeReader):
                     icon="icon-foreign_table"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, scid, foid):
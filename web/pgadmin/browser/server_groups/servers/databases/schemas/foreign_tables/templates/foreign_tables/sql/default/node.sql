@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     c.oid, c.relname AS name, pg_get_userbyid(relowner) AS owner,
-    ftoptions, nspname as basensp, description
+    ftoptions, nspname as basensp, description{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_class c
 JOIN
@@ -15,4 +16,6 @@ WHERE
 {% elif foid %}
     c.oid = {{foid}}::oid
 {% endif %}
-ORDER BY c.relname;
+{{ PAGING.NAME_FILTER(paging, 'c.relname') }}
+ORDER BY c.relname
+{{ PAGING.LIMIT_OFFSET(paging) }};
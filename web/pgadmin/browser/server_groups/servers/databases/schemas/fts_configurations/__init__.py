@@ -17,7 +17,8 @@ from flask import render_template, make_response, current_app, request, jsonify
 from flask_babel import gettext as _
 from pgadmin.browser.server_groups.servers.databases.schemas.utils \
     import SchemaChildModule
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -265,7 +266,6 @@ class FtsConfigurationView(PGChildNodeView):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         Return all FTS Configurations to generate nodes.
@@ -276,15 +276,43 @@ class FtsConfigurationView(PGChildNodeView):
             did: Database Id
             scid: Schema Id
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function will fetch the FTS configuration nodes within that
+        collection (for the nodes, and the subtree of the schema).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+            paging: Pagination arguments (see get_paging_args)
 
+        Returns:
+            (status, FTS configuration nodes or error message, pagination details)
+        """
         res = []
         sql = render_template(
             "/".join([self.template_path, 'nodes.sql']),
-            scid=scid
+            scid=scid,
+            paging=paging
         )
         status, rset = self.conn.execute_2darray(sql)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -295,10 +323,7 @@ class FtsConfigurationView(PGChildNodeView):
                     icon="icon-fts_configuration"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def node(self, gid, sid, did, scid, cfgid):
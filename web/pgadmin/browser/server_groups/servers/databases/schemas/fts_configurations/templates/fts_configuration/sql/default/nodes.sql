@@ -1,6 +1,7 @@
 {# FETCH FTS CONFIGURATION NAME statement #}
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
-    oid, cfgname as name
+    oid, cfgname as name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_ts_config cfg
 WHERE
@@ -9,5 +10,7 @@ WHERE
 {% elif cfgid %}
     cfg.oid = {{cfgid}}::OID
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'cfg.cfgname') }}
 
-ORDER BY name
\ No newline at end of file
+ORDER BY name
+{{ PAGING.LIMIT_OFFSET(paging) }}
@@ -1,7 +1,8 @@
 {# Fetch FTS DICTIONARY name statement #}
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     oid, dictname as name,
-    dictnamespace as schema
+    dictnamespace as schema{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_ts_dict dict
 WHERE
@@ -10,5 +11,7 @@ WHERE
 {% elif dcid %}
     dict.oid = {{dcid}}::OID
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'dict.dictname') }}
 
 ORDER BY name
+{{ PAGING.LIMIT_OFFSET(paging) }}
@@ -1,6 +1,7 @@
 {# FETCH FTS PARSER name statement #}
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
-    oid, prsname as name, prs.prsnamespace AS schema
+    oid, prsname as name, prs.prsnamespace AS schema{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_ts_parser prs
 WHERE
@@ -9,5 +10,7 @@ WHERE
 {% elif pid %}
     prs.oid = {{pid}}::OID
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'prs.prsname') }}
 
 ORDER BY name
+{{ PAGING.LIMIT_OFFSET(paging) }}
@@ -1,5 +1,6 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
-    oid, tmplname as name, tmpl.tmplnamespace AS schema
+    oid, tmplname as name, tmpl.tmplnamespace AS schema{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_ts_template tmpl
 WHERE
@@ -8,5 +9,7 @@ WHERE
 {% elif tid %}
     tmpl.oid = {{tid}}::OID
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'tmpl.tmplname') }}
 
 ORDER BY name
+{{ PAGING.LIMIT_OFFSET(paging) }}
@@ -26,7 +26,8 @@ from pgadmin.browser.server_groups.servers.databases.utils import \
     parse_sec_labels_from_db, parse_variables_from_db
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -378,7 +379,20 @@ class FunctionView(PGChildNodeView, DataTypeReader):
             scid: Schema Id
         """
 
-        res = []
+        if fnid is None:
+            status, res, result = self.fetch_nodes(
+                gid=gid, sid=sid, did=did, scid=scid,
+                paging=get_paging_args()
+            )
+            if not status:
+                return internal_server_error(errormsg=res)
+
+            return make_json_response(
+                data=res,
+                result=result,
+                status=200
+            )
+
         SQL = render_template(
             "/".join([self.sql_template_path, 'node.sql']),
             scid=scid,
@@ -389,23 +403,49 @@ class FunctionView(PGChildNodeView, DataTypeReader):
         if not status:
             return internal_server_error(errormsg=rset)
 
-        if fnid is not None:
-            if len(rset['rows']) == 0:
-                return gone(
-                     _("Could not find the specified %s.").format(self.node_type)
-                )
+        if len(rset['rows']) == 0:
+            return gone(
+                 _("Could not find the specified %s.").format(self.node_type)
+            )
 
-            row = rset['rows'][0]
-            return make_json_response(
-                data=self.blueprint.generate_browser_node(
-                    row['oid'],
-                    scid,
-                    row['name'],
-                    icon="icon-" + self.node_type,
-                    funcowner=row['funcowner'],
-                    language=row['lanname']
-                )
+        row = rset['rows'][0]
+        return make_json_response(
+            data=self.blueprint.generate_browser_node(
+                row['oid'],
+                scid,
+                row['name'],
+                icon="icon-" + self.node_type,
+                funcowner=row['funcowner'],
+                language=row['lanname']
             )
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        Fetches the Functions of the schema (for the nodes, and the subtree of
+        the schema).
+
+        Args:
+            gid: Server Group Id
+            sid: Server Id
+            did: Database Id
+            scid: Schema Id
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, function nodes or error message, pagination details)
+        """
+        res = []
+        SQL = render_template(
+            "/".join([self.sql_template_path, 'node.sql']),
+            scid=scid,
+            paging=paging
+        )
+        status, rset = self.conn.execute_2darray(SQL)
+
+        if not status:
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -418,10 +458,7 @@ class FunctionView(PGChildNodeView, DataTypeReader):
                     language=row['lanname']
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def properties(self, gid, sid, did, scid, fnid=None):
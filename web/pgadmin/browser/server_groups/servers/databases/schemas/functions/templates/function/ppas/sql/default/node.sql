@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     pr.oid, pr.proname || '(' || COALESCE(pg_catalog.pg_get_function_identity_arguments(pr.oid), '') || ')' AS name,
-    lanname, pg_get_userbyid(proowner) AS funcowner, description
+    lanname, pg_get_userbyid(proowner) AS funcowner, description{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_proc pr
 JOIN
@@ -19,5 +20,7 @@ WHERE
     AND pronamespace = {{scid}}::oid
 {% endif %}
     AND typname NOT IN ('trigger', 'event_trigger')
+{{ PAGING.NAME_FILTER(paging, 'pr.proname') }}
 ORDER BY
-    proname;
+    proname, pr.oid
+{{ PAGING.LIMIT_OFFSET(paging) }};
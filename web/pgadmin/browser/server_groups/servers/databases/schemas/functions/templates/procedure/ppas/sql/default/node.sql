@@ -1,3 +1,4 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     pr.oid,
     CASE WHEN
@@ -7,7 +8,7 @@ SELECT
     ELSE
         pr.proname
     END AS name,
-    lanname, pg_get_userbyid(proowner) AS funcowner, description
+    lanname, pg_get_userbyid(proowner) AS funcowner, description{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_proc pr
 JOIN
@@ -26,5 +27,7 @@ WHERE
     AND pronamespace = {{scid}}::oid
 {% endif %}
     AND typname NOT IN ('trigger', 'event_trigger')
+{{ PAGING.NAME_FILTER(paging, 'pr.proname') }}
 ORDER BY
-    proname;
+    proname, pr.oid
+{{ PAGING.LIMIT_OFFSET(paging) }};
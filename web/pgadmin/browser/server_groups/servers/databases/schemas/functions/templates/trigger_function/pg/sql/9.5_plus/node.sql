@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     pr.oid, pr.proname || '()' as name,
-    lanname, pg_get_userbyid(proowner) as funcowner, description
+    lanname, pg_get_userbyid(proowner) as funcowner, description{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_proc pr
 JOIN
@@ -19,5 +20,7 @@ WHERE
 {% endif %}
     AND typname IN ('trigger', 'event_trigger')
     AND lanname NOT IN ('edbspl', 'sql', 'internal')
+{{ PAGING.NAME_FILTER(paging, 'pr.proname') }}
 ORDER BY
-    proname;
+    proname, pr.oid
+{{ PAGING.LIMIT_OFFSET(paging) }};
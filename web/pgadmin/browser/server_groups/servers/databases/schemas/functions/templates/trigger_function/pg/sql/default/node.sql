@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     pr.oid, pr.proname || '()' as name,
-    lanname, pg_get_userbyid(proowner) as funcowner, description
+    lanname, pg_get_userbyid(proowner) as funcowner, description{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_proc pr
 JOIN
@@ -18,5 +19,7 @@ WHERE
     AND pronamespace = {{scid}}::oid
 {% endif %}
     AND typname = 'trigger' AND lanname != 'edbspl'
+{{ PAGING.NAME_FILTER(paging, 'pr.proname') }}
 ORDER BY
-    proname;
+    proname, pr.oid
+{{ PAGING.LIMIT_OFFSET(paging) }};
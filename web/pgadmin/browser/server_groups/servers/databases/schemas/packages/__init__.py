@@ -19,7 +19,8 @@ from pgadmin.browser.server_groups.servers.databases.schemas.utils \
     import SchemaChildModule
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, \
     make_response as ajax_response, internal_server_error, \
     precondition_required, gone
@@ -207,7 +208,20 @@ class PackageView(PGChildNodeView):
         Returns:
 
         """
-        res = []
+        if pkgid is None:
+            status, res, result = self.fetch_nodes(
+                gid=gid, sid=sid, did=did, scid=scid,
+                paging=get_paging_args()
+            )
+            if not status:
+                return internal_server_error(errormsg=res)
+
+            return make_json_response(
+                data=res,
+                result=result,
+                status=200
+            )
+
         SQL = render_template(
             "/".join([self.template_path, 'nodes.sql']),
             scid=scid,
@@ -217,21 +231,46 @@ class PackageView(PGChildNodeView):
         if not status:
             return internal_server_error(errormsg=rset)
 
-        if pkgid is not None:
-            if len(rset['rows']) == 0:
-                return gone(
-                     errormsg=_("Could not find the package.")
-                )
+        if len(rset['rows']) == 0:
+            return gone(
+                 errormsg=_("Could not find the package.")
+            )
 
-            row = rset['rows'][0]
-            return make_json_response(
-                data=self.blueprint.generate_browser_node(
-                    row['oid'],
-                    scid,
-                    row['name'],
-                    icon="icon-%s" % self.node_type
-                )
+        row = rset['rows'][0]
+        return make_json_response(
+            data=self.blueprint.generate_browser_node(
+                row['oid'],
+                scid,
+                row['name'],
+                icon="icon-%s" % self.node_type
             )
+        )
+
+    @check_precondition(action='nodes')
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function is used to fetch the package nodes within the
+        collection (for the nodes, and the subtree of the schema).
+
+        Args:
+          gid: Server Group ID
+          sid: Server ID
+          did: Database ID
+          scid: Schema ID
+          paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+          (status, package nodes or error message, pagination details)
+        """
+        res = []
+        SQL = render_template(
+            "/".join([self.template_path, 'nodes.sql']),
+            scid=scid,
+            paging=paging
+        )
+        status, rset = self.conn.execute_dict(SQL)
+        if not status:
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -242,10 +281,7 @@ class PackageView(PGChildNodeView):
                     icon="icon-%s" % self.node_type
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition(action='node')
     def node(self, gid, sid, did, scid, pkgid):
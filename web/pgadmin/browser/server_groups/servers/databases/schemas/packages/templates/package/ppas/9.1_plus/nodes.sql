@@ -1,6 +1,9 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
-    nsp.oid, nspname AS name
+    nsp.oid, nspname AS name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_namespace nsp
 WHERE nspparent = {{scid}}::oid
-ORDER BY nspname;
\ No newline at end of file
+{{ PAGING.NAME_FILTER(paging, 'nspname') }}
+ORDER BY nspname
+{{ PAGING.LIMIT_OFFSET(paging) }};
\ No newline at end of file
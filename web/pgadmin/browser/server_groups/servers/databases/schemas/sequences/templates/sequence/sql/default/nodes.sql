@@ -1,4 +1,5 @@
-SELECT cl.oid as oid, relname as name, relnamespace as schema
+{% import 'macros/schemas/pagination.macros' as PAGING %}
+SELECT cl.oid as oid, relname as name, relnamespace as schema{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_class cl
 WHERE
     relkind = 'S'
@@ -8,4 +9,6 @@ WHERE
 {% if seid %}
     AND cl.oid = {{seid|qtLiteral}}::oid
 {% endif %}
+{{ PAGING.NAME_FILTER(paging, 'relname') }}
 ORDER BY relname
+{{ PAGING.LIMIT_OFFSET(paging) }}
@@ -0,0 +1,76 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import json
+import uuid
+
+from pgadmin.browser.server_groups.servers.databases.schemas.tests import \
+    utils as schema_utils
+from pgadmin.browser.server_groups.servers.databases.tests import utils as \
+    database_utils
+from pgadmin.utils.route import BaseTestGenerator
+from regression import parent_node_dict
+from regression.python_test_utils import test_utils as utils
+from . import utils as sequence_utils
+
+
+class SequenceNodesPagingTestCase(BaseTestGenerator):
+    """This class will fetch the sequence nodes page by page."""
+    scenarios = [
+        ('Fetch first page of the filtered sequence nodes',
+         dict(url='/browser/sequence/nodes/', limit=2, offset=0,
+              expected_count=2)),
+        ('Fetch last page of the filtered sequence nodes',
+         dict(url='/browser/sequence/nodes/', limit=2, offset=2,
+              expected_count=1))
+    ]
+
+    def setUp(self):
+        self.db_name = parent_node_dict["database"][-1]["db_name"]
+        schema_info = parent_node_dict["schema"][-1]
+        self.server_id = schema_info["server_id"]
+        self.db_id = schema_info["db_id"]
+        db_con = database_utils.connect_database(self, utils.SERVER_GROUP,
+                                                 self.server_id, self.db_id)
+        if not db_con['data']["connected"]:
+            raise Exception("Could not connect to database to add sequence.")
+        self.schema_id = schema_info["schema_id"]
+        self.schema_name = schema_info["schema_name"]
+        schema_response = schema_utils.verify_schemas(self.server,
+                                                      self.db_name,
+                                                      self.schema_name)
+        if not schema_response:
+            raise Exception("Could not find the schema to add sequence.")
+        self.prefix = "test_seq_page_%s_" % str(uuid.uuid4())[1:8]
+        for idx in range(3):
+            sequence_utils.create_sequences(
+                self.server, self.db_name, self.schema_name,
+                self.prefix + str(idx))
+
+    def runTest(self):
+        """This function will fetch a page of the sequence nodes."""
+        response = self.tester.get(
+            self.url + str(utils.SERVER_GROUP) + '/' +
+            str(self.server_id) + '/' +
+            str(self.db_id) + '/' +
+            str(self.schema_id) + '/' +
+            '?filter={0}&limit={1}&offset={2}'.format(
+                self.prefix, self.limit, self.offset),
+            follow_redirects=True)
+        self.assertEquals(response.status_code, 200)
+
+        res = json.loads(response.data.decode('utf-8'))
+        self.assertEquals(len(res['data']), self.expected_count)
+        self.assertEquals(res['result']['total'], 3)
+        for node in res['data']:
+            self.assertTrue(node['label'].startswith(self.prefix))
+
+    def tearDown(self):
+        # Disconnect the database
+        database_utils.disconnect_database(self, self.server_id, self.db_id)
@@ -276,6 +276,7 @@ define('pgadmin.node.schema', [
       canDrop: true,
       canDropCascade: true,
       hasDepends: true,
+      hasSubtree: true,
       Init: function() {
         /* Avoid mulitple registration of menus */
         if (this.initialized)
@@ -1,5 +1,8 @@
-SELECT synname as name
+{% import 'macros/schemas/pagination.macros' as PAGING %}
+SELECT synname as name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_synonym s
     JOIN pg_namespace ns ON s.synnamespace = ns.oid
     AND s.synnamespace = {{scid}}::oid
-ORDER BY synname;
+{{ PAGING.NAME_FILTER(paging, 's.synname') }}
+ORDER BY synname
+{{ PAGING.LIMIT_OFFSET(paging) }};
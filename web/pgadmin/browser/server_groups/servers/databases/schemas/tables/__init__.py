@@ -11,6 +11,9 @@
 
 import simplejson as json
 import re
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
 
 import pgadmin.browser.server_groups.servers.databases as database
 from flask import render_template, request, jsonify, url_for
@@ -18,11 +21,21 @@ from flask_babel import gettext
 from pgadmin.browser.server_groups.servers.databases.schemas.utils \
     import SchemaChildModule, DataTypeReader, VacuumSettings
 from pgadmin.browser.server_groups.servers.utils import parse_priv_to_db
+from pgadmin.browser.utils import get_paging_args, get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from .utils import BaseTableView
 from pgadmin.utils.preferences import Preferences
 
+# Maximum number of the exact row counts to be remembered
+MAX_CACHED_ROW_COUNTS = 1000
+
+# Last exact row count of the tables, (sid, did, tid) -> (count, counted at),
+# and the running row counts, (sid, did, tid) -> started at.
+_row_counts = OrderedDict()
+_row_count_jobs = dict()
+_row_count_lock = Lock()
+
 
 class TableModule(SchemaChildModule):
     """
@@ -219,6 +232,7 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         'sql': [{'get': 'sql'}],
         'msql': [{'get': 'msql'}, {'get': 'msql'}],
         'stats': [{'get': 'statistics'}, {'get': 'statistics'}],
+        'pgstattuple': [{'post': 'pgstattuple'}, {'post': 'pgstattuple'}],
         'dependency': [{'get': 'dependencies'}],
         'dependent': [{'get': 'dependents'}],
         'module.js': [{}, {}, {'get': 'module_js'}],
@@ -243,7 +257,7 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         'insert_sql': [{'get': 'insert_sql'}],
         'update_sql': [{'get': 'update_sql'}],
         'delete_sql': [{'get': 'delete_sql'}],
-        'count_rows': [{'get': 'count_rows'}]
+        'count_rows': [{'get': 'count_rows', 'delete': 'cancel_count_rows'}]
     })
 
     @BaseTableView.check_precondition
@@ -315,7 +329,6 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
             status=200
         )
 
-    @BaseTableView.check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         This function is used to list all the table nodes within that collection.
@@ -329,14 +342,43 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         Returns:
             JSON of available table nodes
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @BaseTableView.check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function is used to fetch the table nodes within that collection
+        (for the nodes, and the subtree of the schema).
+
+        Args:
+            gid: Server group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, table nodes or error message, pagination details)
+        """
         res = []
         SQL = render_template(
             "/".join([self.table_template_path, 'nodes.sql']),
-            scid=scid
+            scid=scid,
+            paging=paging
         )
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -351,10 +393,7 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
                     rows_cnt=0
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @BaseTableView.check_precondition
     def get_all_tables(self, gid, sid, did, scid, tid=None):
@@ -575,10 +614,14 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         table_row_count_threshold = table_row_count_pref.get()
         estimated_row_count = int(res['rows'][0].get('reltuples', 0))
 
-        # If estimated rows are greater than threshold then
+        last_count = _row_counts.get((sid, did, tid), None)
+
+        # If estimated rows are greater than threshold then show the last
+        # exact count (if any)
         if estimated_row_count and \
                 estimated_row_count > table_row_count_threshold:
-            res['rows'][0]['rows_cnt'] = str(table_row_count_threshold) + '+'
+            res['rows'][0]['rows_cnt'] = last_count[0] if last_count else \
+                str(table_row_count_threshold) + '+'
 
         # If estimated rows is lower than threshold then calculate the count
         elif estimated_row_count and \
@@ -1464,10 +1507,43 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
         """
         return BaseTableView.get_table_statistics(self, scid, tid)
 
+    @BaseTableView.check_precondition
+    def pgstattuple(self, gid, sid, did, scid, tid=None):
+        """
+        Creates a background job to fetch the pgstattuple statistics.
+
+        Args:
+            gid: Server Group Id
+            sid: Server Id
+            did: Database Id
+            scid: Schema Id
+            tid: Table Id
+
+        Scans a particular table if tid is specified, otherwise all the
+        tables in that schema.
+        """
+        return BaseTableView.create_pgstattuple_job(self, sid, did, scid, tid)
+
+    @staticmethod
+    def _count_rows_conn_id(did, tid):
+        """
+        Returns the id of the dedicated connection used for counting the rows
+        of the given table.
+        """
+        return u'count_rows:{0}:{1}'.format(did, tid)
+
     @BaseTableView.check_precondition
     def count_rows(self, gid, sid, did, scid, tid):
         """
         Count the rows of a table.
+
+        It returns the estimated number of rows immediately, and counts the
+        exact number of rows on a dedicated asynchronous connection. Calling
+        it again (with 'poll' set in the query string) polls the running
+        count, and returns the exact number of rows as 'total_rows' once it
+        is done. The last exact count is remembered along with the time it
+        was taken.
+
         Args:
             gid: Server Group Id
             sid: Server Id
@@ -1475,28 +1551,133 @@ class TableView(BaseTableView, DataTypeReader, VacuumSettings):
             scid: Schema Id
             tid: Table Id
 
-        Returns the total rows of a table.
+        Returns the estimated, and the total rows of a table.
         """
-        data = {}
-        data['schema'], data['name'] = \
-            super(TableView, self).get_schema_and_table_name(tid)
+        key = (sid, did, tid)
+        poll = request.args.get('poll', 'false').lower() in ('true', '1')
+        conn_id = self._count_rows_conn_id(did, tid)
 
         SQL = render_template(
             "/".join(
-                [self.table_template_path, 'get_table_row_count.sql']
-            ), data=data
+                [self.table_template_path, 'get_table_row_estimate.sql']
+            ), tid=tid
         )
+        status, res = self.conn.execute_dict(SQL)
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        if len(res['rows']) == 0:
+            return gone(gettext("The specified table could not be found."))
 
-        status, count = self.conn.execute_scalar(SQL)
+        data = res['rows'][0]
 
-        if not status:
-            return internal_server_error(errormsg=count)
+        with _row_count_lock:
+            started_at = _row_count_jobs.get(key, None)
+            if started_at is None and not poll:
+                started_at = _row_count_jobs[key] = datetime.now()
+                start = True
+            else:
+                start = False
+
+        if start:
+            SQL = render_template(
+                "/".join(
+                    [self.table_template_path, 'get_table_row_count.sql']
+                ), data=data, conn=self.conn
+            )
+            count_conn = self.manager.connection(did=did, conn_id=conn_id)
+            status, msg = count_conn.connect()
+            if status:
+                status, msg = count_conn.execute_async(SQL)
+
+            if not status:
+                self._release_count_rows(key, conn_id)
+                return internal_server_error(errormsg=msg)
+
+        elif started_at is not None:
+            count_conn = self.manager.connection(did=did, conn_id=conn_id)
+            try:
+                status, result = count_conn.poll(
+                    formatted_exception_msg=True
+                )
+            except Exception as e:
+                status, result = False, str(e)
+
+            if status is False:
+                self._release_count_rows(key, conn_id)
+                return internal_server_error(errormsg=result)
+
+            if status == count_conn.ASYNC_OK:
+                self._release_count_rows(
+                    key, conn_id,
+                    int(result[0][0]) if result else None
+                )
+                started_at = None
+            elif status == count_conn.ASYNC_EXECUTION_ABORTED:
+                self._release_count_rows(key, conn_id)
+                started_at = None
+
+        last_count = _row_counts.get(key, None)
 
         return make_json_response(
             status=200,
-            info=gettext("Table rows counted"),
-            data={'total_rows': count}
+            info=gettext("Table rows counted") if started_at is None else
+            gettext("Counting the table rows..."),
+            data={
+                'estimated_rows': data['estimated_rows'],
+                'total_rows': last_count[0] if last_count else None,
+                'counted_at': last_count[1] if last_count else None,
+                'running': started_at is not None,
+                'started_at': started_at
+            }
+        )
+
+    @BaseTableView.check_precondition
+    def cancel_count_rows(self, gid, sid, did, scid, tid):
+        """
+        Cancel the running exact row count of a table.
+
+        Args:
+            gid: Server Group Id
+            sid: Server Id
+            did: Database Id
+            scid: Schema Id
+            tid: Table Id
+        """
+        key = (sid, did, tid)
+        conn_id = self._count_rows_conn_id(did, tid)
+
+        if key not in _row_count_jobs:
+            return make_json_response(
+                success=0,
+                info=gettext("Table rows are not being counted.")
+            )
+
+        status, msg = self.conn.cancel_transaction(conn_id, did)
+        self._release_count_rows(key, conn_id)
+
+        if not status:
+            return internal_server_error(errormsg=msg)
+
+        return make_json_response(
+            info=gettext("Table row count cancelled.")
         )
 
+    def _release_count_rows(self, key, conn_id, count=None):
+        """
+        Release the dedicated connection used for counting the rows, and
+        remember the exact count (if given).
+        """
+        self.manager.release(conn_id=conn_id)
+
+        with _row_count_lock:
+            _row_count_jobs.pop(key, None)
+
+            if count is not None:
+                _row_counts.pop(key, None)
+                _row_counts[key] = (count, datetime.now())
+                while len(_row_counts) > MAX_CACHED_ROW_COUNTS:
+                    _row_counts.popitem(last=False)
+
 
 TableView.register_node_view(blueprint)
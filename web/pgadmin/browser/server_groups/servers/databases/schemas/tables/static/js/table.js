@@ -97,6 +97,21 @@ define('pgadmin.node.table', [
           applies: ['object', 'context'], callback: 'count_table_rows',
           category: 'Count', priority: 2, label: gettext('Count Rows'),
           enable: true,
+        },{
+          name: 'pgstattuple_table', node: 'table', module: this,
+          applies: ['object', 'context'], callback: 'pgstattuple',
+          category: 'Statistics', priority: 2,
+          label: gettext('pgstattuple Statistics'), enable: true,
+        },{
+          name: 'pgstattuple_table_on_coll', node: 'coll-table', module: this,
+          applies: ['object', 'context'], callback: 'pgstattuple',
+          category: 'Statistics', priority: 2,
+          label: gettext('pgstattuple Statistics'), enable: true,
+        },{
+          name: 'pgstattuple_table_on_schema', node: 'schema', module: this,
+          applies: ['object', 'context'], callback: 'pgstattuple',
+          category: 'Statistics', priority: 2,
+          label: gettext('pgstattuple Statistics'), enable: true,
         },
         ]);
         pgBrowser.Events.on(
@@ -286,13 +301,8 @@ define('pgadmin.node.table', [
           if (!d)
             return false;
 
-          // Fetch the total rows of a table
-          $.ajax({
-            url: obj.generate_url(i, 'count_rows' , d, true),
-            type:'GET',
-            success: function(res) {
-              Alertify.success(res.info);
-              d.rows_cnt = res.data.total_rows;
+          var url = obj.generate_url(i, 'count_rows' , d, true),
+            refresh = function() {
               t.unload(i);
               t.setInode(i);
               t.deselect(i);
@@ -300,7 +310,7 @@ define('pgadmin.node.table', [
                 t.select(i);
               }, 10);
             },
-            error: function(xhr) {
+            onError = function(xhr) {
               try {
                 var err = $.parseJSON(xhr.responseText);
                 if (err.success == 0) {
@@ -311,6 +321,78 @@ define('pgadmin.node.table', [
               }
               t.unload(i);
             },
+            onCounted = function(res) {
+              // The exact count runs in the background on the server, show
+              // the estimate until it has finished.
+              if (res.data.running) {
+                setTimeout(function() {
+                  $.ajax({
+                    url: url + '?poll=true',
+                    type:'GET',
+                    success: onCounted,
+                    error: onError,
+                  });
+                }, 1000);
+                return;
+              }
+
+              Alertify.success(res.info);
+              if (res.data.total_rows != null) {
+                d.rows_cnt = res.data.total_rows;
+              }
+              refresh();
+            };
+
+          // Fetch the total rows of a table
+          $.ajax({
+            url: url,
+            type:'GET',
+            success: function(res) {
+              if (res.data.running) {
+                Alertify.message(res.info);
+                d.rows_cnt = (
+                  res.data.total_rows != null ? res.data.total_rows :
+                    res.data.estimated_rows
+                );
+              }
+              onCounted(res);
+            },
+            error: onError,
+          });
+        },
+        pgstattuple: function(args) {
+          var input = args || {},
+            obj = this,
+            t = pgBrowser.tree,
+            i = input.item || t.selected(),
+            d = i && i.length == 1 ? t.itemData(i) : undefined;
+          if (!d)
+            return false;
+
+          // Scans the selected table, or all the tables of the schema (when
+          // called on the schema, or the tables collection), in a
+          // background job.
+          $.ajax({
+            url: obj.generate_url(i, 'pgstattuple' , d, true),
+            type:'POST',
+            success: function(res) {
+              if (res.success == 0) {
+                Alertify.error(res.errormsg);
+                return;
+              }
+              Alertify.success(res.data.info);
+              pgBrowser.Events.trigger('pgadmin-bgprocess:created', obj);
+            },
+            error: function(xhr) {
+              try {
+                var err = $.parseJSON(xhr.responseText);
+                if (err.success == 0) {
+                  Alertify.error(err.errormsg);
+                }
+              } catch (e) {
+                console.warn(e.stack || e);
+              }
+            },
           });
         },
       },
@@ -25,5 +25,5 @@ FROM
 JOIN
     pg_class cl on cl.oid=st.relid
 WHERE
-    schemaname = {{schema_name|qtLiteral}}
+    cl.relnamespace = {{ scid }}::oid
 ORDER BY st.relname;
@@ -0,0 +1,6 @@
+SELECT nsp.nspname AS schema, rel.relname AS name,
+    (CASE WHEN rel.reltuples > 0 THEN rel.reltuples::bigint
+     ELSE pg_stat_get_live_tuples(rel.oid) END) AS estimated_rows
+FROM pg_class rel
+    JOIN pg_namespace nsp ON nsp.oid = rel.relnamespace
+WHERE rel.oid = {{ tid }}::oid;
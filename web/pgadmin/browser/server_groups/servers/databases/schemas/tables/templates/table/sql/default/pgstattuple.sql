@@ -0,0 +1,3 @@
+SELECT '{{ idx }}/{{ total }}' AS "Progress",
+    {{ conn|qtIdent(data.schema, data.name)|qtLiteral }} AS "Table", stat.*
+FROM pgstattuple({{ data.oid }}::oid) stat;
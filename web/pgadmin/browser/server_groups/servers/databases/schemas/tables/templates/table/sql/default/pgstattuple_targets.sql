@@ -0,0 +1,12 @@
+SELECT rel.oid, nsp.nspname AS schema, rel.relname AS name,
+    (SELECT (count(extname) > 0) FROM pg_extension
+        WHERE extname = 'pgstattuple') AS is_pgstattuple
+FROM pg_class rel
+    JOIN pg_namespace nsp ON nsp.oid = rel.relnamespace
+WHERE rel.relkind IN ('r', 'm', 't')
+{% if tid %}
+    AND rel.oid = {{ tid }}::oid
+{% else %}
+    AND rel.relnamespace = {{ scid }}::oid
+{% endif %}
+ORDER BY rel.relname;
@@ -1,10 +1,13 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT rel.oid, rel.relname AS name,
     (SELECT count(*) FROM pg_trigger WHERE tgrelid=rel.oid) AS triggercount,
-    (SELECT count(*) FROM pg_trigger WHERE tgrelid=rel.oid AND tgenabled = 'O') AS has_enable_triggers
+    (SELECT count(*) FROM pg_trigger WHERE tgrelid=rel.oid AND tgenabled = 'O') AS has_enable_triggers{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_class rel
     WHERE rel.relkind IN ('r','s','t') AND rel.relnamespace = {{ scid }}::oid
       AND rel.relname NOT IN (SELECT partitiontablename FROM pg_partitions)
     {% if tid %}
       AND rel.oid = {{tid}}::OID
     {% endif %}
-    ORDER BY rel.relname;
+    {{ PAGING.NAME_FILTER(paging, 'rel.relname') }}
+    ORDER BY rel.relname
+{{ PAGING.LIMIT_OFFSET(paging) }};
@@ -0,0 +1,78 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import json
+import time
+import uuid
+
+from pgadmin.browser.server_groups.servers.databases.schemas.tests import \
+    utils as schema_utils
+from pgadmin.browser.server_groups.servers.databases.tests import utils as \
+    database_utils
+from pgadmin.utils.route import BaseTestGenerator
+from regression import parent_node_dict
+from regression.python_test_utils import test_utils as utils
+from . import utils as tables_utils
+
+
+class TableCountRowsTestCase(BaseTestGenerator):
+    """This class will count the rows of a table in the background."""
+    scenarios = [
+        ('Count the rows of a table',
+         dict(url='/browser/table/count_rows/'))
+    ]
+
+    def setUp(self):
+        self.db_name = parent_node_dict["database"][-1]["db_name"]
+        schema_info = parent_node_dict["schema"][-1]
+        self.server_id = schema_info["server_id"]
+        self.db_id = schema_info["db_id"]
+        db_con = database_utils.connect_database(self, utils.SERVER_GROUP,
+                                                 self.server_id, self.db_id)
+        if not db_con['data']["connected"]:
+            raise Exception("Could not connect to database to add a table.")
+        self.schema_id = schema_info["schema_id"]
+        self.schema_name = schema_info["schema_name"]
+        schema_response = schema_utils.verify_schemas(self.server,
+                                                      self.db_name,
+                                                      self.schema_name)
+        if not schema_response:
+            raise Exception("Could not find the schema to add a table.")
+        self.table_name = "test_table_count_%s" % (str(uuid.uuid4())[1:8])
+        self.table_id = tables_utils.create_table(self.server, self.db_name,
+                                                  self.schema_name,
+                                                  self.table_name)
+
+    def runTest(self):
+        """This function will count the rows of the added table."""
+        url = self.url + str(utils.SERVER_GROUP) + '/' + \
+            str(self.server_id) + '/' + str(self.db_id) + '/' + \
+            str(self.schema_id) + '/' + str(self.table_id)
+
+        response = self.tester.get(url, follow_redirects=True)
+        self.assertEquals(response.status_code, 200)
+        data = json.loads(response.data.decode('utf-8'))['data']
+        self.assertIn('estimated_rows', data)
+
+        # Poll until the exact count has finished
+        for _ in range(50):
+            if not data['running']:
+                break
+            time.sleep(0.1)
+            response = self.tester.get(url + '?poll=true',
+                                       follow_redirects=True)
+            self.assertEquals(response.status_code, 200)
+            data = json.loads(response.data.decode('utf-8'))['data']
+
+        self.assertFalse(data['running'])
+        self.assertEquals(data['total_rows'], 0)
+
+    def tearDown(self):
+        # Disconnect the database
+        database_utils.disconnect_database(self, self.server_id, self.db_id)
@@ -0,0 +1,76 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import json
+import uuid
+
+from pgadmin.browser.server_groups.servers.databases.schemas.tests import \
+    utils as schema_utils
+from pgadmin.browser.server_groups.servers.databases.tests import utils as \
+    database_utils
+from pgadmin.utils.route import BaseTestGenerator
+from regression import parent_node_dict
+from regression.python_test_utils import test_utils as utils
+from . import utils as tables_utils
+
+
+class TablePgstattupleTestCase(BaseTestGenerator):
+    """This class will create the pgstattuple jobs of the tables."""
+    scenarios = [
+        ('Create the pgstattuple job of a table',
+         dict(url='/browser/table/pgstattuple/', with_table_id=True)),
+        ('Create the pgstattuple job of the tables of a schema',
+         dict(url='/browser/table/pgstattuple/', with_table_id=False))
+    ]
+
+    def setUp(self):
+        self.db_name = parent_node_dict["database"][-1]["db_name"]
+        schema_info = parent_node_dict["schema"][-1]
+        self.server_id = schema_info["server_id"]
+        self.db_id = schema_info["db_id"]
+        db_con = database_utils.connect_database(self, utils.SERVER_GROUP,
+                                                 self.server_id, self.db_id)
+        if not db_con['data']["connected"]:
+            raise Exception("Could not connect to database to add a table.")
+        self.schema_id = schema_info["schema_id"]
+        self.schema_name = schema_info["schema_name"]
+        schema_response = schema_utils.verify_schemas(self.server,
+                                                      self.db_name,
+                                                      self.schema_name)
+        if not schema_response:
+            raise Exception("Could not find the schema to add a table.")
+        self.table_name = "test_table_stattuple_%s" % (str(uuid.uuid4())[1:8])
+        self.table_id = tables_utils.create_table(self.server, self.db_name,
+                                                  self.schema_name,
+                                                  self.table_name)
+
+    def runTest(self):
+        """This function will create the pgstattuple job."""
+        url = self.url + str(utils.SERVER_GROUP) + '/' + \
+            str(self.server_id) + '/' + str(self.db_id) + '/' + \
+            str(self.schema_id) + '/'
+        if self.with_table_id:
+            url += str(self.table_id)
+
+        response = self.tester.post(url, follow_redirects=True)
+        self.assertEquals(response.status_code, 200)
+        res = json.loads(response.data.decode('utf-8'))
+
+        # The job can only be created, when the extension is installed in
+        # the test database.
+        if res['success']:
+            self.assertIn('job_id', res['data'])
+            self.assertTrue(res['data']['status'])
+        else:
+            self.assertIn('pgstattuple extension is not installed',
+                          res['errormsg'])
+
+    def tearDown(self):
+        # Disconnect the database
+        database_utils.disconnect_database(self, self.server_id, self.db_id)
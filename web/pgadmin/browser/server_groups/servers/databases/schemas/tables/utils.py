@@ -12,7 +12,7 @@
 import re
 from functools import wraps
 import simplejson as json
-from flask import render_template, jsonify, request
+from flask import render_template, jsonify, request, current_app
 from flask_babel import gettext
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response
@@ -21,11 +21,41 @@ from pgadmin.browser.server_groups.servers.databases.schemas.utils \
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
 from pgadmin.browser.utils import PGChildNodeView
-from pgadmin.utils import IS_PY2
+from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc, \
+    get_scheduling_options
+from pgadmin.model import Server
+from pgadmin.utils import IS_PY2, html
 from pgadmin.utils.driver import get_driver
 from config import PG_DEFAULT_DRIVER
 
 
+class PgstattupleJob(IProcessDesc):
+    """
+    Describes the background job fetching the pgstattuple statistics.
+    """
+    def __init__(self, _sid, _database, _tables):
+        self.sid = _sid
+        self.database = _database
+        self.tables = _tables
+
+    @property
+    def message(self):
+        return gettext("Table statistics (pgstattuple)")
+
+    def details(self, cmd, args):
+        res = '<div class="h5">'
+        res += html.safe_str(
+            gettext("Scanning {0} table(s) of the database '{1}'").format(
+                len(self.tables), self.database
+            )
+        )
+        res += '</div><div class="h5"><i>'
+        res += html.safe_str(', '.join(self.tables))
+        res += '</i></div>'
+
+        return res
+
+
 class BaseTableView(PGChildNodeView):
     """
     This class is base class for tables and partitioned tables.
@@ -66,6 +96,11 @@ class BaseTableView(PGChildNodeView):
       - Returns the statistics for a particular table if tid is specified,
         otherwise it will return statistics for all the tables in that
         schema.
+
+    * create_pgstattuple_job(self, sid, did, scid, tid):
+      - Creates a background job to fetch the pgstattuple statistics for a
+        particular table if tid is specified, otherwise for all the tables in
+        that schema.
     * get_reverse_engineered_sql(self, did, scid, tid, main_sql, data):
       - This function will creates reverse engineered sql for
         the table object.
@@ -755,55 +790,26 @@ class BaseTableView(PGChildNodeView):
         Returns the statistics for a particular table if tid is specified,
         otherwise it will return statistics for all the tables in that
         schema.
-        """
 
-        # Fetch schema name
-        status, schema_name = self.conn.execute_scalar(
-            render_template(
-                "/".join([self.table_template_path, 'get_schema.sql']),
-                conn=self.conn, scid=scid
-            )
-        )
-        if not status:
-            return internal_server_error(errormsg=schema_name)
+        The extended statistics from pgstattuple require a full scan of the
+        table, hence - they are not fetched here, but by a background job
+        (see create_pgstattuple_job).
+        """
 
         if tid is None:
             status, res = self.conn.execute_dict(
                 render_template(
                     "/".join([self.table_template_path,
                               'coll_table_stats.sql']), conn=self.conn,
-                    schema_name=schema_name
+                    scid=scid
                 )
             )
         else:
             # For Individual table stats
-
-            # Check if pgstattuple extension is already created?
-            # if created then only add extended stats
-            status, is_pgstattuple = self.conn.execute_scalar("""
-            SELECT (count(extname) > 0) AS is_pgstattuple
-            FROM pg_extension
-            WHERE extname='pgstattuple'
-            """)
-            if not status:
-                return internal_server_error(errormsg=is_pgstattuple)
-
-            # Fetch Table name
-            status, table_name = self.conn.execute_scalar(
-                render_template(
-                    "/".join([self.table_template_path, 'get_table.sql']),
-                    conn=self.conn, scid=scid, tid=tid
-                )
-            )
-            if not status:
-                return internal_server_error(errormsg=table_name)
-
             status, res = self.conn.execute_dict(
                 render_template(
                     "/".join([self.table_template_path, 'stats.sql']),
-                    conn=self.conn, schema_name=schema_name,
-                    table_name=table_name,
-                    is_pgstattuple=is_pgstattuple, tid=tid
+                    conn=self.conn, tid=tid
                 )
             )
 
@@ -815,6 +821,94 @@ class BaseTableView(PGChildNodeView):
             status=200
         )
 
+    def create_pgstattuple_job(self, sid, did, scid, tid):
+        """
+        Creates a background job to fetch the extended statistics (using
+        the pgstattuple extension) of a particular table if tid is specified,
+        otherwise of all the tables in that schema.
+
+        Args:
+            sid: Server Id
+            did: Database Id
+            scid: Schema Id
+            tid: Table Id
+        """
+        status, res = self.conn.execute_dict(
+            render_template(
+                "/".join([self.table_template_path,
+                          'pgstattuple_targets.sql']),
+                scid=scid, tid=tid
+            )
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        tables = res['rows']
+        if len(tables) == 0:
+            return make_json_response(
+                success=0,
+                errormsg=gettext("Could not find any table to be scanned.")
+            )
+
+        if not tables[0]['is_pgstattuple']:
+            return make_json_response(
+                success=0,
+                errormsg=gettext(
+                    "The pgstattuple extension is not installed in this "
+                    "database."
+                )
+            )
+
+        server = Server.query.filter_by(id=sid).first()
+        if server is None:
+            return make_json_response(
+                success=0,
+                errormsg=gettext("Could not find the given server")
+            )
+
+        args = [
+            '--host', server.host, '--port', str(server.port),
+            '--username', server.username, '--dbname', self.conn.db
+        ]
+
+        # One query per table, so that the results (along with the progress)
+        # show up in the job log as soon as each scan finishes.
+        for idx, table in enumerate(tables):
+            args.extend([
+                '--command', render_template(
+                    "/".join([self.table_template_path, 'pgstattuple.sql']),
+                    conn=self.conn, data=table, idx=idx + 1,
+                    total=len(tables)
+                )
+            ])
+
+        try:
+            p = BatchProcess(
+                desc=PgstattupleJob(
+                    sid, self.conn.db,
+                    [self.qtIdent(self.conn, t['schema'], t['name'])
+                     for t in tables]
+                ),
+                cmd=self.manager.utility('sql'), args=args, sid=sid,
+                **get_scheduling_options(request.args)
+            )
+            self.manager.export_password_env(p.id)
+            p.start()
+        except Exception as e:
+            current_app.logger.exception(e)
+            return make_json_response(
+                status=410,
+                success=0,
+                errormsg=str(e)
+            )
+
+        return make_json_response(
+            data={
+                'job_id': p.id, 'status': True,
+                'info': gettext('pgstattuple job created.')
+            }
+        )
+
     def get_reverse_engineered_sql(self, did, scid, tid, main_sql, data):
         """
         This function will creates reverse engineered sql for
@@ -1,9 +1,10 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 {% import 'catalog/ppas/macros/catalogs.sql' as CATALOGS %}
 SELECT
     nsp.oid,
 {{ CATALOGS.LABELS('nsp', _)  }},
     has_schema_privilege(nsp.oid, 'CREATE') as can_create,
-    has_schema_privilege(nsp.oid, 'USAGE') as has_usage
+    has_schema_privilege(nsp.oid, 'USAGE') as has_usage{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_namespace nsp
 WHERE
@@ -14,4 +15,6 @@ WHERE
     (
 {{ CATALOGS.LIST('nsp') }}
     )
-ORDER BY 2;
+    {{ PAGING.NAME_FILTER(paging, 'nsp.nspname') }}
+ORDER BY 2
+{{ PAGING.LIMIT_OFFSET(paging) }};
@@ -1,9 +1,10 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 {% import 'catalog/pg/macros/catalogs.sql' as CATALOGS %}
 SELECT
     nsp.oid,
     nsp.nspname as name,
     has_schema_privilege(nsp.oid, 'CREATE') as can_create,
-    has_schema_privilege(nsp.oid, 'USAGE') as has_usage
+    has_schema_privilege(nsp.oid, 'USAGE') as has_usage{{ PAGING.TOTAL_COUNT(paging) }}
 FROM
     pg_namespace nsp
 WHERE
@@ -17,4 +18,6 @@ WHERE
     NOT (
 {{ CATALOGS.LIST('nsp') }}
     )
-ORDER BY nspname;
+    {{ PAGING.NAME_FILTER(paging, 'nsp.nspname') }}
+ORDER BY nspname
+{{ PAGING.LIMIT_OFFSET(paging) }};
@@ -0,0 +1,72 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import json
+
+from pgadmin.browser.server_groups.servers.databases.tests import utils as \
+    database_utils
+from pgadmin.browser.server_groups.servers.tests import utils as server_utils
+from pgadmin.utils.route import BaseTestGenerator
+from regression import parent_node_dict
+from regression.python_test_utils import test_utils as utils
+
+
+class SchemaSubtreeTestCase(BaseTestGenerator):
+    """ This class will fetch the subtree of the schema node. """
+    scenarios = [
+        ('Fetch schema collections with their children',
+         dict(url='/browser/schema/subtree/', query='?depth=2', depth=2)),
+        ('Fetch schema collections only',
+         dict(url='/browser/schema/subtree/', query='?depth=1', depth=1)),
+        ('Fetch schema subtree with per-collection limit',
+         dict(url='/browser/schema/subtree/', query='?depth=2&limit=1',
+              depth=2))
+    ]
+
+    def runTest(self):
+        """ This function will fetch the subtree of the schema node. """
+        schema = parent_node_dict["schema"][-1]
+        db_id = schema["db_id"]
+        server_id = schema["server_id"]
+
+        server_response = server_utils.connect_server(self, server_id)
+        if not server_response["data"]["connected"]:
+            raise Exception("Could not connect to server to connect the"
+                            " database.")
+
+        db_con = database_utils.connect_database(self,
+                                                 utils.SERVER_GROUP,
+                                                 server_id,
+                                                 db_id)
+        if not db_con["info"] == "Database connected.":
+            raise Exception("Could not connect to database to get the schema.")
+
+        schema_id = schema["schema_id"]
+        response = self.tester.get(
+            self.url + str(utils.SERVER_GROUP) + '/' +
+            str(server_id) + '/' + str(db_id) +
+            '/' + str(schema_id) + self.query,
+            content_type='html/json')
+        self.assertEquals(response.status_code, 200)
+
+        nodes = json.loads(response.data.decode('utf-8'))['data']
+        self.assertTrue(len(nodes) > 0)
+        for node in nodes:
+            self.assertTrue(node['_type'].startswith('coll-'))
+            if self.depth == 1:
+                self.assertNotIn('branch', node)
+            elif 'limit=1' in self.query:
+                self.assertTrue(len(node.get('branch', [])) <= 1)
+                # The first page of a larger collection is attached
+                if node.get('has_more', False):
+                    self.assertEqual(len(node['branch']), 1)
+                    self.assertTrue(node['count'] > 1)
+
+        # Disconnect the database
+        database_utils.disconnect_database(self, server_id, db_id)
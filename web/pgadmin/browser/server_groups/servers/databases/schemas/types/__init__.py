@@ -19,7 +19,8 @@ from pgadmin.browser.server_groups.servers.databases.schemas.utils \
     import SchemaChildModule, DataTypeReader
 from pgadmin.browser.server_groups.servers.utils import parse_priv_from_db, \
     parse_priv_to_db
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, gone
 from pgadmin.utils.driver import get_driver
@@ -316,7 +317,6 @@ class TypeView(PGChildNodeView, DataTypeReader):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         This function will used to create all the child node within that collection.
@@ -332,14 +332,43 @@ class TypeView(PGChildNodeView, DataTypeReader):
         Returns:
             JSON of available type child nodes
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        This function will fetch the type nodes within that collection (for
+        the nodes, and the subtree of the schema).
+
+        Args:
+            gid: Server Group ID
+            sid: Server ID
+            did: Database ID
+            scid: Schema ID
+            paging: Pagination arguments (see get_paging_args)
+
+        Returns:
+            (status, type nodes or error message, pagination details)
+        """
 
         res = []
         SQL = render_template("/".join([self.template_path,
                                         'nodes.sql']), scid=scid,
-                              show_system_objects=self.blueprint.show_system_objects)
+                              show_system_objects=self.blueprint.show_system_objects,
+                              paging=paging)
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -350,10 +379,7 @@ class TypeView(PGChildNodeView, DataTypeReader):
                     icon="icon-%s" % self.node_type
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     def _cltype_formatter(self, type):
         """
@@ -1,4 +1,5 @@
-SELECT t.oid, t.typname AS name
+{% import 'macros/schemas/pagination.macros' as PAGING %}
+SELECT t.oid, t.typname AS name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_type t
     LEFT OUTER JOIN pg_type e ON e.oid=t.typelem
     LEFT OUTER JOIN pg_class ct ON ct.oid=t.typrelid AND ct.relkind <> 'c'
@@ -10,4 +11,6 @@ WHERE t.typtype != 'd' AND t.typname NOT LIKE E'\\_%' AND t.typnamespace = {{sci
 {% if not show_system_objects %}
     AND ct.oid is NULL
 {% endif %}
-ORDER BY t.typname;
\ No newline at end of file
+{{ PAGING.NAME_FILTER(paging, 't.typname') }}
+ORDER BY t.typname
+{{ PAGING.LIMIT_OFFSET(paging) }};
\ No newline at end of file
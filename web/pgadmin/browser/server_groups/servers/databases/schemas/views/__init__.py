@@ -17,7 +17,8 @@ from flask import render_template, request, jsonify, current_app
 from flask_babel import gettext
 from pgadmin.browser.server_groups.servers.databases.schemas.utils import \
     SchemaChildModule, parse_rule_definition, VacuumSettings
-from pgadmin.browser.utils import PGChildNodeView
+from pgadmin.browser.utils import PGChildNodeView, get_paging_args, \
+    get_paging_result
 from pgadmin.utils.ajax import make_json_response, internal_server_error, \
     make_response as ajax_response, bad_request, gone
 from pgadmin.utils.driver import get_driver
@@ -366,17 +367,35 @@ class ViewNode(PGChildNodeView, VacuumSettings):
             status=200
         )
 
-    @check_precondition
     def nodes(self, gid, sid, did, scid):
         """
         Lists all views under the Views Collection node
         """
+        status, res, result = self.fetch_nodes(
+            gid=gid, sid=sid, did=did, scid=scid, paging=get_paging_args()
+        )
+        if not status:
+            return internal_server_error(errormsg=res)
+
+        return make_json_response(
+            data=res,
+            result=result,
+            status=200
+        )
+
+    @check_precondition
+    def fetch_nodes(self, gid, sid, did, scid, paging=None):
+        """
+        Fetches the views under the Views Collection node (for the nodes, and
+        the subtree of the schema), returns (status, view nodes or error
+        message, pagination details)
+        """
         res = []
         SQL = render_template("/".join(
-            [self.template_path, 'sql/nodes.sql']), scid=scid)
+            [self.template_path, 'sql/nodes.sql']), scid=scid, paging=paging)
         status, rset = self.conn.execute_2darray(SQL)
         if not status:
-            return internal_server_error(errormsg=rset)
+            return False, rset, None
 
         for row in rset['rows']:
             res.append(
@@ -387,10 +406,7 @@ class ViewNode(PGChildNodeView, VacuumSettings):
                     icon="icon-view"
                 ))
 
-        return make_json_response(
-            data=res,
-            status=200
-        )
+        return True, res, get_paging_result(paging, rset['rows'])
 
     @check_precondition
     def properties(self, gid, sid, did, scid, vid):
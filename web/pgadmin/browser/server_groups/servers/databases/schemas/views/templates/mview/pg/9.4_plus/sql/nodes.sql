@@ -1,6 +1,7 @@
+{% import 'macros/schemas/pagination.macros' as PAGING %}
 SELECT
     c.oid,
-    c.relname AS name
+    c.relname AS name{{ PAGING.TOTAL_COUNT(paging) }}
 FROM pg_class c
 WHERE
   c.relkind = 'm'
@@ -8,6 +9,8 @@ WHERE
     AND c.oid = {{vid}}::oid
 {% elif scid %}
     AND c.relnamespace = {{scid}}::oid
+    {{ PAGING.NAME_FILTER(paging, 'c.relname') }}
 ORDER BY
     c.relname
+{{ PAGING.LIMIT_OFFSET(paging) }}
 {% endif %}
\ No newline at end of file
@@ -27,6 +27,7 @@ define('pgadmin.node.database', [
       hasSQL: true,
       hasDepends: true,
       hasStatistics: true,
+      hasSubtree: true,
       statsPrettifyFields: ['Size', 'Size of temporary files'],
       canDrop: function(node) {
         return node.canDrop;
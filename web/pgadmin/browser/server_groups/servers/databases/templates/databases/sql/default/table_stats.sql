@@ -0,0 +1,37 @@
+{### Statistics of all the user tables of a database/schema in a single pass ###}
+SELECT
+    st.relid AS oid,
+    st.schemaname AS schema,
+    st.relname AS name,
+    st.seq_scan, st.seq_tup_read,
+    st.idx_scan, st.idx_tup_fetch,
+    st.n_tup_ins, st.n_tup_upd, st.n_tup_del, st.n_tup_hot_upd,
+    st.n_live_tup, st.n_dead_tup,
+    st.last_vacuum, st.last_autovacuum,
+    st.last_analyze, st.last_autoanalyze,
+    st.vacuum_count, st.autovacuum_count,
+    st.analyze_count, st.autoanalyze_count,
+    io.heap_blks_read, io.heap_blks_hit,
+    io.idx_blks_read, io.idx_blks_hit,
+    io.toast_blks_read, io.toast_blks_hit,
+    pg_relation_size(st.relid) AS table_size,
+    pg_indexes_size(st.relid) AS indexes_size,
+    pg_total_relation_size(st.relid) AS total_size,
+    count(*) OVER () AS total_count
+FROM
+    pg_stat_user_tables st
+JOIN
+    pg_statio_user_tables io ON io.relid = st.relid
+{% if scid %}
+JOIN
+    pg_class cl ON cl.oid = st.relid
+WHERE
+    cl.relnamespace = {{ scid }}::oid
+{% endif %}
+ORDER BY {{ args.sort }} {% if args.desc %}DESC{% else %}ASC{% endif %} NULLS LAST, st.relid
+{% if args.limit %}
+LIMIT {{ args.limit|int }}
+{% endif %}
+{% if args.offset %}
+OFFSET {{ args.offset|int }}
+{% endif %}
@@ -0,0 +1,61 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import json
+
+from pgadmin.utils.route import BaseTestGenerator
+from regression import parent_node_dict
+from regression.python_test_utils import test_utils as utils
+from . import utils as database_utils
+
+
+class DatabaseTableStatsTestCase(BaseTestGenerator):
+    """
+    This class will fetch the statistics of all the tables in the database
+    added under last added server.
+    """
+    scenarios = [
+        ('Fetch the table statistics sorted by size',
+         dict(url='/browser/database/table_stats/',
+              args='?sort=total_size&order=desc&limit=5',
+              status_code=200)),
+        ('Fetch the table statistics sorted on an invalid column',
+         dict(url='/browser/database/table_stats/',
+              args='?sort=relname;DROP',
+              status_code=400))
+    ]
+
+    def runTest(self):
+        """ This function will fetch the table statistics. """
+        server_data = parent_node_dict["database"][-1]
+        server_id = server_data["server_id"]
+        db_id = server_data['db_id']
+        db_con = database_utils.connect_database(self,
+                                                 utils.SERVER_GROUP,
+                                                 server_id,
+                                                 db_id)
+        try:
+            if db_con["info"] != "Database connected.":
+                raise Exception("Could not connect to database.")
+
+            response = self.tester.get(
+                self.url + str(utils.SERVER_GROUP) + '/' + str(
+                    server_id) + '/' + str(db_id) + self.args,
+                follow_redirects=True)
+            self.assertEquals(response.status_code, self.status_code)
+
+            if self.status_code == 200:
+                data = json.loads(response.data.decode('utf-8'))['data']
+                self.assertTrue(len(data['rows']) <= 5)
+                self.assertTrue(data['total'] >= len(data['rows']))
+                sizes = [row['total_size'] for row in data['rows']]
+                self.assertEquals(sizes, sorted(sizes, reverse=True))
+        finally:
+            # Disconnect database to delete it
+            database_utils.disconnect_database(self, server_id, db_id)
@@ -9,6 +9,8 @@
 
 """Database helper utilities"""
 
+from flask_babel import gettext
+
 
 def parse_sec_labels_from_db(db_sec_labels):
     """
@@ -85,3 +87,81 @@ def parse_variables_from_db(db_variables):
                     variables_lst.append(var_dict)
 
     return {"variables": variables_lst}
+
+
+# Columns, the statistics of the tables can be sorted on
+TABLE_STATS_SORT_COLUMNS = (
+    'name', 'schema', 'seq_scan', 'seq_tup_read', 'idx_scan',
+    'idx_tup_fetch', 'n_tup_ins', 'n_tup_upd', 'n_tup_del', 'n_tup_hot_upd',
+    'n_live_tup', 'n_dead_tup', 'last_vacuum', 'last_autovacuum',
+    'last_analyze', 'last_autoanalyze', 'heap_blks_read', 'heap_blks_hit',
+    'idx_blks_read', 'idx_blks_hit', 'table_size', 'indexes_size',
+    'total_size'
+)
+
+
+def get_table_stats_args(args):
+    """
+    Function to parse the sorting, and limit arguments for the statistics of
+    the tables (passed to the table_stats.sql template as 'args').
+
+    Args:
+        args: Request arguments
+
+            sort:   Column to sort on (one of TABLE_STATS_SORT_COLUMNS,
+                    default: total_size)
+            order:  'asc' or 'desc' (default: 'desc')
+            limit:  Maximum number of tables to be returned
+            offset: Number of tables to be skipped
+
+    Returns:
+        None, and the error message if the arguments are not valid, otherwise
+        the parsed arguments, and None.
+    """
+    sort = args.get('sort', 'total_size')
+    order = args.get('order', 'desc').lower()
+
+    if sort not in TABLE_STATS_SORT_COLUMNS:
+        return None, gettext('Invalid sort column - {0}').format(sort)
+
+    if order not in ('asc', 'desc'):
+        return None, gettext('Invalid sort order - {0}').format(order)
+
+    limit = args.get('limit', None, type=int)
+    offset = args.get('offset', None, type=int)
+
+    return {
+        'sort': sort,
+        'desc': order == 'desc',
+        'limit': limit if limit is not None and limit > 0 else None,
+        'offset': offset if offset is not None and offset > 0 else None
+    }, None
+
+
+def get_table_stats_result(args, rows):
+    """
+    Function to prepare the response of the statistics of the tables.
+
+    Args:
+        args: Parsed arguments (see get_table_stats_args)
+        rows: Rows fetched using the table_stats.sql template
+
+    Returns:
+        Statistics of the tables, along with the total number of tables
+        irrespective of limit/offset.
+    """
+    total = None
+    for row in rows:
+        total = row.pop('total_count')
+
+    if total is None and not args['offset']:
+        total = 0
+
+    return {
+        'total': total,
+        'sort': args['sort'],
+        'order': 'desc' if args['desc'] else 'asc',
+        'limit': args['limit'],
+        'offset': args['offset'] or 0,
+        'rows': rows
+    }
@@ -104,6 +104,11 @@ define('pgadmin.node.server', [
           applies: ['tools', 'context'], callback: 'resume_wal_replay',
           category: 'wal_replay_resume', priority: 8, label: gettext('Resume Replay of WAL'),
           icon: 'fa fa-play-circle', enable : 'wal_resume_enabled',
+        },{
+          name: 'cancel_queries', node: 'server', module: this,
+          applies: ['tools', 'context'], callback: 'cancel_queries',
+          category: 'cancel_queries', priority: 10, label: gettext('Cancel Running Queries'),
+          icon: 'fa fa-stop', enable : 'is_connected',
         }]);
 
         _.bindAll(this, 'connection_lost');
@@ -642,6 +647,50 @@ define('pgadmin.node.server', [
             },
           });
         },
+
+        /* Cancel the queries running on all the connections to the server */
+        cancel_queries: function(args) {
+          var input = args || {},
+            obj = this,
+            t = pgBrowser.tree,
+            i = input.item || t.selected(),
+            d = i && i.length == 1 ? t.itemData(i) : undefined;
+
+          if (!d)
+            return false;
+
+          Alertify.confirm(
+            gettext('Cancel running queries'),
+            S(
+              gettext('Are you sure you want to cancel all the queries running on the server %s?')
+            ).sprintf(d.label).value(),
+            function() {
+              $.ajax({
+                url: obj.generate_url(i, 'cancel_queries' , d, true),
+                type:'PUT',
+                dataType: 'json',
+                success: function(res) {
+                  if (res.success == 1) {
+                    Alertify.success(res.info);
+                  }
+                },
+                error: function(xhr) {
+                  try {
+                    var err = $.parseJSON(xhr.responseText);
+                    if (err.success == 0) {
+                      Alertify.error(err.errormsg);
+                    }
+                  } catch (e) {
+                    console.warn(e.stack || e);
+                  }
+                },
+              });
+            },
+            function() { return true; }
+          );
+
+          return false;
+        },
       },
       model: pgAdmin.Browser.Node.Model.extend({
         defaults: {
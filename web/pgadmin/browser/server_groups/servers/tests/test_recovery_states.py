@@ -0,0 +1,135 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+import threading
+import time
+
+from pgadmin.browser.server_groups import servers
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch, Mock
+else:
+    from unittest.mock import patch, Mock
+
+
+class TestRecoveryStates(BaseTestGenerator):
+    """Test the concurrent recovery state lookup for the server nodes"""
+    scenarios = [
+        ('when the recovery state is cached, should not query the server',
+         dict(
+             cached=(True, False),
+             server_delay=0,
+             server_error=False,
+             expected_state=(True, False),
+             expected_queries=0,
+             expected_cached=(True, False),
+             expected_cancel=False
+         )),
+        ('when the recovery state is not cached, should query the server',
+         dict(
+             cached=None,
+             server_delay=0,
+             server_error=False,
+             expected_state=(True, True),
+             expected_queries=1,
+             expected_cached=(True, True),
+             expected_cancel=False
+         )),
+        ('when the query fails, should return unknown and not cache it',
+         dict(
+             cached=None,
+             server_delay=0,
+             server_error=True,
+             expected_state=(servers.RECOVERY_STATE_UNKNOWN,
+                             servers.RECOVERY_STATE_UNKNOWN),
+             expected_queries=1,
+             expected_cached=None,
+             expected_cancel=False
+         )),
+        ('when the server does not respond in time, should cancel the probe',
+         dict(
+             cached=None,
+             server_delay=5,
+             server_error=False,
+             expected_state=(servers.RECOVERY_STATE_UNKNOWN,
+                             servers.RECOVERY_STATE_UNKNOWN),
+             expected_queries=1,
+             expected_cached=None,
+             expected_cancel=True
+         ))
+    ]
+
+    @patch('pgadmin.browser.server_groups.servers.config')
+    @patch('pgadmin.browser.server_groups.servers.copy_current_request_context',
+           lambda f: f)
+    @patch('pgadmin.browser.server_groups.servers.current_app')
+    @patch('pgadmin.browser.server_groups.servers.render_template')
+    def runTest(self, render_template_mock, current_app_mock, config_mock):
+        config_mock.SERVER_RECOVERY_STATE_WORKERS = 2
+        config_mock.SERVER_RECOVERY_STATE_TIMEOUT = 0.2
+        config_mock.SERVER_RECOVERY_STATE_CACHE_TTL = 10
+        render_template_mock.return_value = 'SELECT 1'
+
+        cancelled = threading.Event()
+        replied = threading.Event()
+
+        def execute_dict(sql):
+            try:
+                if cancelled.wait(self.server_delay):
+                    return False, 'canceling statement due to user request'
+                if self.server_error:
+                    return False, 'connection lost'
+                return True, {'rows': [
+                    {'inrecovery': True, 'isreplaypaused': True}
+                ]}
+            finally:
+                replied.set()
+
+        def cancel_query():
+            cancelled.set()
+            return True, ''
+
+        manager = Mock()
+        manager.sid = 1
+        manager.version = 100000
+        manager.recovery_state = None if self.cached is None else \
+            (time.time(),) + self.cached
+        conn = manager.connection.return_value
+        conn.connected.return_value = True
+        conn.connect.return_value = (True, None)
+        conn.execute_dict.side_effect = execute_dict
+        conn.cancel_query.side_effect = cancel_query
+
+        result = servers.recovery_states([manager])
+
+        self.assertEqual(result[1], self.expected_state)
+
+        if self.expected_queries:
+            # The probe runs on its own connection
+            replied.wait(5)
+            time.sleep(0.1)
+            manager.connection.assert_called_with(
+                conn_id=servers.RECOVERY_STATE_CONN_ID
+            )
+            # which is released after the probe
+            manager.release.assert_called_once_with(
+                conn_id=servers.RECOVERY_STATE_CONN_ID
+            )
+        else:
+            self.assertFalse(manager.release.called)
+
+        self.assertEqual(conn.execute_dict.call_count, self.expected_queries)
+        self.assertEqual(conn.cancel_query.called, self.expected_cancel)
+
+        if self.expected_cached is None:
+            self.assertIsNone(manager.recovery_state)
+        else:
+            self.assertEqual(manager.recovery_state[1:], self.expected_cached)
@@ -38,8 +38,7 @@ define('pgadmin.browser', [
     }
   };
 
-  var processTreeData = function(payload) {
-    var data = JSON.parse(payload).data;
+  var processTreeNodes = function(data) {
     if (data.length && data[0]._type !== 'column' &&
       data[0]._type !== 'catalog_object_column') {
       data = data.sort(function(a, b) {
@@ -49,10 +48,18 @@ define('pgadmin.browser', [
     _.each(data, function(d){
       d._label = d.label;
       d.label = _.escape(d.label);
+      // Children fetched along with the node (i.e. subtree)
+      if (d.branch) {
+        d.branch = processTreeNodes(d.branch);
+      }
     });
     return data;
   };
 
+  var processTreeData = function(payload) {
+    return processTreeNodes(JSON.parse(payload).data);
+  };
+
   var initializeBrowserTree = pgAdmin.Browser.initializeBrowserTree =
     function(b) {
       $('#tree').aciTree({
@@ -66,8 +73,14 @@ define('pgadmin.browser', [
           if (item != null) {
             var d = this.itemData(item);
             var n = b.Nodes[d._type];
-            if (n)
+            if (n && n.hasSubtree)
+              settings.url = n.generate_url(item, 'subtree', d, true) +
+                '?' + $.param({depth: 2, limit: n.subtreeLimit});
+            else if (n) {
               settings.url = n.generate_url(item, 'children', d, true);
+              // All the nodes of the collection are (re)loaded now
+              delete d.has_more;
+            }
           }
         },
         loaderDelay: 100,
@@ -483,6 +496,7 @@ define('pgadmin.browser', [
         });
       }, 300000);
       obj.Events.on('pgadmin:browser:tree:add', obj.onAddTreeNode, obj);
+      obj.Events.on('pgadmin-browser:tree:opened', obj.onOpenTreeNode, obj);
       obj.Events.on('pgadmin:browser:tree:update', obj.onUpdateTreeNode, obj);
       obj.Events.on('pgadmin:browser:tree:refresh', obj.onRefreshTreeNode, obj);
     },
@@ -1664,6 +1678,57 @@ define('pgadmin.browser', [
       }
     },
 
+    // Fetch the remaining nodes of a collection (page by page), of which only
+    // the first page was fetched along with its parent (see hasSubtree).
+    onOpenTreeNode: function(_i, d, n) {
+      var self = this,
+        offset = self.tree.children(_i).length;
+
+      if (!n || !d || !d.has_more || d._fetching_more)
+        return;
+
+      d._fetching_more = true;
+
+      var fetchPage = function() {
+        $.ajax({
+          url: n.generate_url(_i, 'children', d, true) + '?' +
+            $.param({limit: n.subtreeLimit, offset: offset}),
+          type: 'GET',
+          dataType: 'json',
+        })
+        .done(function(res) {
+          var nodes = processTreeNodes(res.data);
+
+          if (!nodes.length) {
+            d.has_more = d._fetching_more = false;
+            return;
+          }
+
+          self.tree.append(_i, {
+            itemData: nodes,
+            success: function() {
+              offset += nodes.length;
+              if (res.result && res.result.total > offset && d.has_more) {
+                fetchPage();
+              } else {
+                d.has_more = d._fetching_more = false;
+              }
+            },
+            fail: function() {
+              d._fetching_more = false;
+              console.warn(arguments);
+            },
+          });
+        })
+        .fail(function() {
+          d._fetching_more = false;
+          console.warn(arguments);
+        });
+      };
+
+      fetchPage();
+    },
+
     removeChildTreeNodesById: function(_parentNode, _collType, _childIds) {
       var tree = pgBrowser.tree;
       if(_parentNode && _collType) {
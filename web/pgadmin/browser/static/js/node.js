@@ -74,6 +74,12 @@ define('pgadmin.browser.node', [
       return o.label + (d ? (' - ' + d.label) : '');
     },
     hasId: true,
+    // Fetch the collections along with their nodes (up to subtreeLimit nodes
+    // per collection) in a single request, when the node is expanded. The
+    // remaining nodes of a larger collection are fetched subtreeLimit nodes
+    // at a time, when the collection is expanded.
+    hasSubtree: false,
+    subtreeLimit: 100,
     ///////
     // Initialization function
     // Generally - used to register the menus for this type of node.
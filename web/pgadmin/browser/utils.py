@@ -15,6 +15,7 @@ import flask
 from flask import render_template, current_app
 from flask_babel import gettext
 from flask.views import View, MethodViewType, with_metaclass
+from pgadmin.utils import metrics
 from pgadmin.utils.ajax import make_json_response, precondition_required
 
 from config import PG_DEFAULT_DRIVER
@@ -31,6 +32,63 @@ def is_version_in_range(sversion, min_ver, max_ver):
             return True
     return False
 
+
+def get_paging_args():
+    """
+    Returns the pagination and name filter arguments for the listing of the
+    collection nodes (passed to the nodes.sql templates as 'paging'), or None
+    when the request does not ask for any of them.
+
+    Query string arguments:
+        limit:  Maximum number of nodes to be returned
+        offset: Number of nodes to be skipped
+        filter: Case-insensitive substring to match against the node names
+    """
+    limit = flask.request.args.get('limit', None, type=int)
+    offset = flask.request.args.get('offset', None, type=int)
+    name_filter = flask.request.args.get('filter', None)
+
+    if limit is None and offset is None and not name_filter:
+        return None
+
+    if name_filter:
+        # Escape the LIKE pattern characters
+        name_filter = u'%{0}%'.format(
+            name_filter.replace('\\', '\\\\').replace(
+                '%', '\\%').replace('_', '\\_')
+        )
+
+    return {
+        'limit': limit if limit is not None and limit > 0 else None,
+        'offset': offset if offset is not None and offset > 0 else None,
+        'filter': name_filter or None
+    }
+
+
+def get_paging_result(paging, rows):
+    """
+    Returns the pagination details to be sent along with the listing of the
+    collection nodes fetched using the given paging arguments. 'total' is the
+    number of the nodes matching the filter, irrespective of limit/offset.
+    """
+    if paging is None:
+        return None
+
+    if len(rows) > 0:
+        total = rows[0]['total_count']
+    elif not paging['offset']:
+        total = 0
+    else:
+        # The offset is beyond the last node, we can't tell the count.
+        total = None
+
+    return {
+        'total': total,
+        'limit': paging['limit'],
+        'offset': paging['offset'] or 0
+    }
+
+
 class PGChildModule(object):
     """
     class PGChildModule
@@ -116,6 +174,7 @@ class NodeView(with_metaclass(MethodViewType, View)):
     Current Node   | /nodes/[Parent URL]/id      | GET         | node
 
     Children       | /children/[Parent URL]/id   | GET         | children
+    Subtree        | /subtree/[Parent URL]/id    | GET         | subtree
 
     NOTE:
     Parent URL can be seen as the path to identify the particular node.
@@ -239,11 +298,16 @@ class NodeView(with_metaclass(MethodViewType, View)):
                 )
             )
 
+        metrics.set_node(self.node_type, meth)
+
         return method(*args, **kwargs)
 
     @classmethod
     def register_node_view(cls, blueprint):
         cls.blueprint = blueprint
+        # Allows the parent nodes to build the nodes of this module in-process
+        # (i.e. subtree).
+        blueprint.node_view = cls
         id_url, url = cls.get_node_urls()
 
         commands = cls.generate_ops()
@@ -298,6 +362,9 @@ class NodeView(with_metaclass(MethodViewType, View)):
 
 
 class PGChildNodeView(NodeView):
+    # Maximum number of levels allowed to be fetched by subtree
+    MAX_SUBTREE_DEPTH = 3
+
     def children(self, **kwargs):
         """Build a list of treeview nodes from the child nodes."""
 
@@ -340,6 +407,124 @@ class PGChildNodeView(NodeView):
             )
         )
 
+    def subtree(self, **kwargs):
+        """
+        Build the treeview nodes under the selected node down to the requested
+        depth in a single request, i.e. for a schema - all of its collections,
+        and the first level of the children of each collection.
+
+        Every child node is attached to its parent node in the 'branch'
+        attribute (as expected by the browser tree). The nodes of a collection
+        are fetched only when its node view implements fetch_nodes (the
+        nodes.sql query with the limit applied), the other collections are
+        loaded by the browser tree, when expanded. A collection having more
+        nodes than the given limit gets the first 'limit' nodes, with
+        'has_more', and 'count' set on the collection node - the browser tree
+        fetches the remaining nodes page by page (limit/offset), when the
+        collection is expanded.
+
+        Query string arguments:
+            depth: Number of levels to be fetched (default: 2)
+            limit: Maximum number of nodes to be fetched for each collection
+        """
+        if 'sid' not in kwargs:
+            return precondition_required(
+                gettext('Required properties are missing.')
+            )
+
+        depth = flask.request.args.get('depth', 2, type=int)
+        limit = flask.request.args.get('limit', None, type=int)
+
+        depth = max(min(depth, self.MAX_SUBTREE_DEPTH), 1)
+        if limit is not None and limit < 1:
+            limit = None
+
+        from pgadmin.utils.driver import get_driver
+        manager = get_driver(PG_DEFAULT_DRIVER).connection_manager(
+            sid=kwargs['sid']
+        )
+
+        conn = manager.connection(did=kwargs.get('did', None))
+
+        if not conn.connected():
+            return precondition_required(
+                gettext(
+                    "Connection to the server has been lost."
+                )
+            )
+
+        return make_json_response(
+            data=self._subtree_children(
+                self.blueprint, manager, kwargs, depth, limit
+            )
+        )
+
+    @classmethod
+    def _subtree_children(cls, module, manager, kwargs, depth, limit):
+        """
+        Returns the child nodes (sorted by label) of the node of the given
+        module identified by kwargs, along with their children down to the
+        given depth.
+        """
+        nodes = []
+        for submodule in module.submodules:
+            if isinstance(submodule, PGChildModule) and \
+                    not submodule.BackendSupported(manager, **kwargs):
+                continue
+
+            for node in submodule.get_nodes(**kwargs):
+                if depth > 1 and \
+                        node['_type'] == 'coll-%s' % submodule.node_type:
+                    cls._subtree_collection(
+                        node, submodule, manager, kwargs, depth - 1, limit
+                    )
+                nodes.append(node)
+
+        return sorted(nodes, key=lambda c: c['label'])
+
+    @classmethod
+    def _subtree_collection(cls, coll, module, manager, kwargs, depth, limit):
+        """
+        Fetch the nodes of the given collection node using the fetch_nodes
+        method of the node view of the module, and attach them to the
+        collection node.
+        """
+        node_view = getattr(module, 'node_view', None)
+        if node_view is None or not hasattr(node_view, 'fetch_nodes'):
+            return
+
+        paging = None
+        if limit is not None:
+            paging = {'limit': limit, 'offset': None, 'filter': None}
+
+        res = node_view(cmd='nodes').fetch_nodes(paging=paging, **kwargs)
+
+        # The precondition of the node view has failed (a response returned)
+        if not isinstance(res, tuple):
+            return
+
+        status, nodes, result = res
+        if not status:
+            coll['errormsg'] = nodes
+            return
+
+        if result is not None and result['total'] is not None:
+            coll['count'] = result['total']
+            if result['total'] > len(nodes):
+                coll['has_more'] = True
+
+        if depth > 1:
+            id_name = node_view.ids[0]['id']
+            for node in nodes:
+                if node.get('inode', False):
+                    node_kwargs = dict(kwargs)
+                    node_kwargs[id_name] = node['_id']
+                    node['branch'] = cls._subtree_children(
+                        module, manager, node_kwargs, depth - 1, limit
+                    )
+
+        coll['branch'] = nodes
+
     def get_dependencies(self, conn, object_id, where=None):
         """
         This function is used to fetch the dependencies for the selected node.
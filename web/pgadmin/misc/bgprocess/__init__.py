@@ -46,7 +46,7 @@ class BGProcessModule(PgAdminModule):
         """
         return [
             'bgprocess.status', 'bgprocess.detailed_status',
-            'bgprocess.acknowledge', 'bgprocess.list'
+            'bgprocess.acknowledge', 'bgprocess.list', 'bgprocess.history'
         ]
 
 
@@ -62,6 +62,16 @@ def index():
     return make_response(response=BatchProcess.list())
 
 
+@blueprint.route('/history', methods=['GET'], endpoint='history')
+@login_required
+def history():
+    """
+    Returns the summary of the background processes removed as per the
+    retention limits.
+    """
+    return make_response(response=BatchProcess.history())
+
+
 @blueprint.route('/<pid>', methods=['GET'], endpoint='status')
 @blueprint.route(
     '/<pid>/<int:out>/<int:err>/', methods=['GET'], endpoint='detailed_status'
@@ -21,6 +21,9 @@ This script will:
 * Create log files for both stdout, and stdout.
 * Update the start time, end time, exit code, etc in the configuration
   database.
+* Report the progress (size, and number of the lines flushed to the log
+  files) in the 'status' file, so that the status can be served without
+  scanning the log files.
 
 Args:
   list of program and arguments passed to it.
@@ -28,6 +31,14 @@ Args:
 It also depends on the following environment variable for proper execution.
 PROCID - Process-id
 OUTDIR - Output directory
+
+Optionally, the progress of the process is metered as per the JSON object in
+the PGA_BGP_PROGRESS environment variable (see ProgressMeter), and the log
+files are limited as per the following environment variables (see
+ProcessLogger):
+PGA_BGP_LOG_MAX_LINE - Maximum length of a line (in bytes)
+PGA_BGP_LOG_MAX_SIZE - Maximum size of a log file segment (in bytes)
+PGA_BGP_LOG_COMPRESS - Compress the rotated log file segments ('1')
 """
 from __future__ import print_function
 
@@ -36,8 +47,9 @@ import sys
 import os
 from datetime import datetime, timedelta, tzinfo
 from subprocess import Popen, PIPE
-from threading import Thread
+from threading import Thread, Lock, Event
 import signal
+import time
 
 _IS_WIN = (os.name == 'nt')
 _IS_PY2 = (sys.version_info[0] == 2)
@@ -48,6 +60,26 @@ _u = None
 _out_dir = None
 _log_file = None
 
+# Minimum interval (in seconds) between the progress updates in the status
+_STATUS_INTERVAL = 1
+_status = dict()
+_status_lock = Lock()
+_status_updated = 0
+
+# Size of the chunks read from the stdout/stderr of the process, and of the
+# buffer of the log files
+_READ_SIZE = 65536
+_WRITE_BUFFER_SIZE = 65536
+# Interval (in seconds) between the flushes of the log files
+_FLUSH_INTERVAL = 0.5
+_LINESEP = os.linesep.encode('utf-8')
+# Maximum length of a logged line (longer lines are truncated), and maximum
+# size of a log file segment (bigger files are rotated), 0 - no limit
+_MAX_LINE_LENGTH = 0
+_MAX_LOG_SIZE = 0
+# Compress the rotated segments of the log files
+_COMPRESS_LOGS = False
+
 if _IS_PY2:
     def _log(msg):
         with open(_log_file, 'a') as fp:
@@ -127,11 +159,191 @@ def get_current_time(format='%Y-%m-%d %H:%M:%S.%f %z'):
     ).strftime(format)
 
 
+class ProgressMeter(Thread):
+    """
+    This class definition is responsible for metering the progress of the
+    process, and reporting it in the status.
+
+    Configuration (PGA_BGP_PROGRESS environment variable, JSON object):
+    * file   - Input/output file (or directory) of the process
+    * mode   - 'read': the process reads the file (e.g. pg_restore, COPY
+               FROM), the read offset of the file is metered (Linux only),
+               'write': the process writes the file (e.g. pg_dump, COPY TO),
+               the size of the file is metered.
+    * tables - Count the tables processed as per the verbose output of
+               pg_dump/pg_restore (or, the COPY worker).
+    * list   - Find out the total number of tables from the archive table of
+               contents (pg_restore --list).
+    * total_tables - Total number of tables (if known upfront).
+    """
+    # Verbose messages for each table data dumped/restored/exported
+    TABLE_PATTERNS = [
+        b'dumping contents of table ', b'processing data for table ',
+        b'Exported table ', b'Processed table '
+    ]
+
+    def __init__(self, config):
+        Thread.__init__(self)
+        self.daemon = True
+        self.process = None
+        self.file = config.get('file', None)
+        self.mode = config.get('mode', None)
+        self.count_tables = config.get('tables', False)
+        self.list_tables = config.get('list', False)
+        self.progress = {
+            'bytes_done': None,
+            'bytes_total': None,
+            'tables_done': 0 if self.count_tables else None,
+            'tables_total': config.get('total_tables', None),
+            'rows_done': None
+        }
+        self.fd = None
+
+    def prepare(self, command):
+        """
+        This function will find out the total number of tables, and bytes (if
+        possible), before the process is started.
+
+        Args:
+            command: Command (with the arguments) of the process
+        """
+        if self.file and self.mode == 'read':
+            self.progress['bytes_total'] = self._size()
+
+        if self.list_tables and self.progress['tables_total'] is None:
+            try:
+                toc = Popen(
+                    [command[0], '--list', self.file], stdout=PIPE,
+                    stderr=PIPE, stdin=None
+                ).communicate()[0]
+                self.progress['tables_total'] = len([
+                    l for l in toc.splitlines()
+                    if not l.startswith(b';') and b' TABLE DATA ' in l
+                ])
+            except Exception:
+                _log_exception()
+
+    def attach_process(self, process):
+        """
+        This function will attach the process to be metered.
+        """
+        self.process = process
+
+    def parse(self, stream_type, line):
+        """
+        Parse a line of the output of the process.
+        """
+        if self.count_tables and any(
+                pattern in line for pattern in self.TABLE_PATTERNS):
+            self.progress['tables_done'] += 1
+        elif stream_type == 'out' and line.startswith(b'Planned '):
+            # The maintenance worker reports the number of the tables to be
+            # processed upfront
+            try:
+                self.progress['tables_total'] = int(line.split()[1])
+            except (IndexError, ValueError):
+                pass
+        elif stream_type == 'out' and line.startswith(b'COPY '):
+            # psql reports the number of the rows copied at the end (the
+            # COPY worker of the import/export tool, once in a while too)
+            try:
+                self.progress['rows_done'] = int(line[5:].strip())
+            except ValueError:
+                pass
+
+    def _size(self):
+        try:
+            if os.path.isdir(self.file):
+                return sum(
+                    os.path.getsize(os.path.join(root, f))
+                    for root, dirs, files in os.walk(self.file)
+                    for f in files
+                )
+            return os.path.getsize(self.file)
+        except OSError:
+            return None
+
+    def _read_offset(self):
+        """
+        Find the offset of the file being read by the process (Linux only).
+        """
+        proc = '/proc/{0}'.format(self.process.pid)
+        try:
+            if self.fd is None:
+                target = os.path.realpath(self.file)
+                for fd in os.listdir(os.path.join(proc, 'fd')):
+                    if os.path.realpath(
+                            os.path.join(proc, 'fd', fd)) == target:
+                        self.fd = fd
+                        break
+                else:
+                    return None
+
+            with open(os.path.join(proc, 'fdinfo', self.fd), 'r') as fp:
+                for line in fp:
+                    if line.startswith('pos:'):
+                        return int(line[4:].strip())
+        except (OSError, IOError, ValueError):
+            # The file is not opened yet (or, already closed)
+            self.fd = None
+        return None
+
+    def measure(self):
+        if self.file and self.mode == 'write':
+            self.progress['bytes_done'] = self._size()
+        elif self.file and self.mode == 'read' and not _IS_WIN:
+            pos = self._read_offset()
+            if pos is not None:
+                self.progress['bytes_done'] = pos
+
+    def report(self, force=False):
+        with _status_lock:
+            _status['progress'] = dict(self.progress)
+            if force or time.time() - _status_updated >= _STATUS_INTERVAL:
+                _write_status()
+
+    def run(self):
+        while self.process and self.process.poll() is None:
+            self.measure()
+            self.report()
+            time.sleep(_STATUS_INTERVAL)
+
+    def finish(self, exit_code):
+        if self.file and self.mode == 'read' and exit_code == 0:
+            self.progress['bytes_done'] = self.progress['bytes_total']
+        else:
+            self.measure()
+        with _status_lock:
+            _status['progress'] = dict(self.progress)
+
+
+def _env_int(name, default):
+    """
+    Returns the integer value of the environment variable (or, the default
+    value, if not set, or not valid).
+    """
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
 class ProcessLogger(Thread):
     """
     This class definition is responsible for capturing & logging
     stdout & stderr messages from subprocess
 
+    The stream is read in large chunks, and split into the lines in bulk.
+    Each line is prefixed with a timestamp (formatted at most once per
+    millisecond), and written through a buffered writer, which is flushed
+    periodically (see LogFlusher), and not for every line.
+
+    Lines longer than _MAX_LINE_LENGTH are truncated, and the log file is
+    rotated (and, the old segment compressed) once it grows beyond
+    _MAX_LOG_SIZE. The size reported in the status is the total size of all
+    the segments (i.e. the offset in the virtual log), 'base' being the size
+    of the rotated segments, and 'file' the name of the current segment.
+
     Methods:
     --------
     * __init__(stream_type)
@@ -154,12 +366,99 @@ class ProcessLogger(Thread):
         Returns:
             None
         """
-        import codecs
-
         Thread.__init__(self)
         self.process = None
         self.stream = None
-        self.logger = open(os.path.join(_out_dir, stream_type),  'wb')
+        self.stream_type = stream_type
+        self.meter = None
+        self.lock = Lock()
+        # Name of the current segment of the log file
+        self.file = stream_type
+        self.segment = 0
+        self.logger = open(
+            os.path.join(_out_dir, self.file), 'wb', _WRITE_BUFFER_SIZE
+        )
+        # Size, and number of the lines flushed to the log file
+        self.pos = 0
+        self.lines = 0
+        # Size of the rotated segments of the log file
+        self.base = 0
+        # Lines written, but not yet flushed
+        self.pending = 0
+        self.dirty = False
+        # Incomplete line at the end of the last chunk, and the number of
+        # bytes truncated from it
+        self.partial = b''
+        self.truncated = 0
+        self._msec = None
+        self._prefix = None
+
+    def timestamp(self):
+        """
+        Returns the timestamp prefix of the log lines (cached for the
+        current millisecond).
+        """
+        msec = int(time.time() * 1000)
+        if msec != self._msec:
+            self._msec = msec
+            self._prefix = datetime.utcfromtimestamp(msec // 1000).replace(
+                microsecond=(msec % 1000) * 1000
+            ).strftime('%y%m%d%H%M%S%f').encode('utf-8') + b','
+        return self._prefix
+
+    def progress(self, force=False):
+        """
+        Flush the log file, and report the new size, and the number of lines
+        (at most every _STATUS_INTERVAL seconds, unless forced).
+
+        The caller must hold the lock.
+        """
+        self.logger.flush()
+        size = self.logger.tell()
+        self.pos = self.base + size
+        self.lines += self.pending
+        self.pending = 0
+        self.dirty = False
+        report_progress(
+            self.stream_type, self.pos, self.lines, force,
+            file=self.file, base=self.base
+        )
+
+        if _MAX_LOG_SIZE and size >= _MAX_LOG_SIZE:
+            self.rotate()
+
+    def flush(self):
+        """
+        Flush the lines written since the last flush (if any).
+        """
+        with self.lock:
+            if self.logger and self.dirty:
+                self.progress()
+
+    def rotate(self):
+        """
+        Start a new segment of the log file, and compress the old one in the
+        background (if asked).
+
+        The caller must hold the lock.
+        """
+        self.logger.close()
+        old_file = os.path.join(_out_dir, self.file)
+
+        self.segment += 1
+        self.base = self.pos
+        self.file = '{0}.{1}'.format(self.stream_type, self.segment)
+        self.logger = open(
+            os.path.join(_out_dir, self.file), 'wb', _WRITE_BUFFER_SIZE
+        )
+        # Let the readers know about the new segment right away
+        report_progress(
+            self.stream_type, self.pos, self.lines, True,
+            file=self.file, base=self.base
+        )
+
+        if _COMPRESS_LOGS:
+            Thread(target=_compress_log, args=(old_file,)).start()
 
     def attach_process_stream(self, process, stream):
         """
@@ -175,68 +474,182 @@ class ProcessLogger(Thread):
         self.process = process
         self.stream = stream
 
-    if not _IS_PY2:
-        def log(self, msg):
-            """
-            This function will update log file
+    def cap(self, line, truncated=0):
+        """
+        Truncate the line to _MAX_LINE_LENGTH bytes (if required), and mark
+        the number of bytes truncated at the end of it.
+        """
+        if _MAX_LINE_LENGTH and len(line) > _MAX_LINE_LENGTH:
+            truncated += len(line) - _MAX_LINE_LENGTH
+            line = line[:_MAX_LINE_LENGTH]
+        if truncated:
+            line += ' ... [{0} bytes truncated]'.format(
+                truncated
+            ).encode('utf-8')
+        return line
+
+    def write(self, lines):
+        """
+        Write the (complete) lines, without the line endings, to the log
+        file.
+        """
+        if not lines:
+            return
+
+        prefix = self.timestamp()
+        with self.lock:
+            if not self.logger:
+                return
+            self.logger.write(b''.join(
+                prefix + line + _LINESEP for line in lines
+            ))
+            self.pending += len(lines)
+            self.dirty = True
+            if _MAX_LOG_SIZE and self.logger.tell() >= _MAX_LOG_SIZE:
+                # Flush, and rotate the log file
+                self.progress()
+
+    def feed(self, data):
+        """
+        Split the chunk read from the stream into the lines, and log them.
+        The incomplete line at the end is kept for the next chunk.
+        """
+        lines = data.split(b'\n')
+        lines[0] = self.partial + lines[0]
+        self.partial = lines.pop()
+        # Bytes truncated from the line completed by this chunk
+        truncated = self.truncated if lines else 0
+        if lines:
+            self.truncated = 0
+
+        if _MAX_LINE_LENGTH and len(self.partial) > _MAX_LINE_LENGTH:
+            # Do not hold the oversized line in the memory
+            self.truncated += len(self.partial) - _MAX_LINE_LENGTH
+            self.partial = self.partial[:_MAX_LINE_LENGTH]
+
+        if not lines:
+            return
+
+        lines = [
+            self.cap(line.rstrip(b'\r'), truncated if idx == 0 else 0)
+            for idx, line in enumerate(lines)
+        ]
+
+        if self.meter:
+            for line in lines:
+                self.meter.parse(self.stream_type, line)
+
+        self.write(lines)
+
+    def log(self, msg):
+        """
+        This function will update log file
+
+        Args:
+            msg: message
 
-            Args:
-                msg: message
+        Returns:
+            None
+        """
+        # Write into log file
+        if self.logger:
+            if msg:
+                if not isinstance(msg, bytes):
+                    msg = msg.encode('utf-8')
+                lines = msg.lstrip(b'\r\n' if _IS_WIN else b'\n').rstrip(
+                    b'\r\n'
+                ).split(b'\n')
+                self.write([self.cap(line.rstrip(b'\r')) for line in lines])
+                self.flush()
+
+            return True
+        return False
 
-            Returns:
-                None
-            """
-            # Write into log file
-            if self.logger:
-                if msg:
-                    self.logger.write(get_current_time(format='%y%m%d%H%M%S%f').encode('utf-8'))
-                    self.logger.write(b',')
-                    self.logger.write(msg.lstrip(b'\r\n' if _IS_WIN else b'\n'))
-                    self.logger.write(os.linesep.encode('utf-8'))
-
-                return True
-            return False
-    else:
-        def log(self, msg):
-            """
-            This function will update log file
+    def run(self):
+        if self.process and self.stream:
+            fd = self.stream.fileno()
+            while True:
+                data = os.read(fd, _READ_SIZE)
+                if not data:
+                    break
+                self.feed(data)
 
-            Args:
-                msg: message
+            # The last line may not be terminated by a newline
+            if self.partial or self.truncated:
+                self.feed(b'\n')
 
-            Returns:
-                None
-            """
-            # Write into log file
+    def release(self):
+        with self.lock:
             if self.logger:
-                if msg:
-                    self.logger.write(
-                        b'{0},{1}{2}'.format(
-                            get_current_time(
-                                format='%y%m%d%H%M%S%f'
-                            ),
-                            msg.lstrip(b'\r\n' if _IS_WIN else b'\n'), os.linesep
-                        )
-                    )
+                self.progress()
+                self.logger.close()
+                self.logger = None
+                with _status_lock:
+                    _status[self.stream_type] = {
+                        'pos': self.pos, 'lines': self.lines,
+                        'file': self.file, 'base': self.base
+                    }
+
+
+class LogFlusher(Thread):
+    """
+    This class definition is responsible for flushing the log files
+    periodically, so that the status reports the progress of the process
+    even when it is quiet.
+    """
 
-                return True
-            return False
+    def __init__(self, loggers):
+        Thread.__init__(self)
+        self.daemon = True
+        self.loggers = loggers
+        self.stopped = Event()
 
     def run(self):
-        if self.process and self.stream:
-            while True:
-                nextline = self.stream.readline()
+        while not self.stopped.wait(_FLUSH_INTERVAL):
+            for logger in self.loggers:
+                logger.flush()
 
-                if nextline:
-                    self.log(nextline)
-                else:
-                    if self.process.poll() is not None:
-                        break
+    def stop(self):
+        self.stopped.set()
 
-    def release(self):
-        if self.logger:
-            self.logger.close()
-            self.logger = None
+
+def _compress_log(filename):
+    """
+    Compress the rotated segment of the log file (i.e. 'out.1' as
+    'out.1.gz'), and remove it.
+    """
+    import gzip
+    import shutil
+
+    try:
+        with open(filename, 'rb') as src:
+            with gzip.open(filename + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst, _READ_SIZE)
+        os.remove(filename)
+    except Exception:
+        _log_exception()
+
+
+def _write_status():
+    """
+    Write the status atomically (i.e. write a temporary file, and rename it),
+    so that the readers never see a partially written status.
+    """
+    import json
+    global _status_updated
+
+    _status['updated'] = get_current_time()
+    status_file = os.path.join(_out_dir, 'status')
+    tmp_file = status_file + '.tmp'
+
+    with open(tmp_file, 'w') as fp:
+        json.dump(_status, fp)
+
+    if _IS_WIN and os.path.exists(status_file):
+        os.remove(status_file)
+    os.rename(tmp_file, status_file)
+
+    _status_updated = time.time()
 
 
 def update_status(**kw):
@@ -252,18 +665,44 @@ def update_status(**kw):
     import json
 
     if _out_dir:
-        status = dict(
-            (k, v) for k, v in kw.items() if k in [
-                'start_time', 'end_time', 'exit_code', 'pid'
-            ]
-        )
-        _log('Updating the status:\n{0}'.format(json.dumps(status)))
-        with open(os.path.join(_out_dir, 'status'), 'w') as fp:
-            json.dump(status, fp)
+        with _status_lock:
+            _status.update(dict(
+                (k, v) for k, v in kw.items() if k in [
+                    'start_time', 'end_time', 'exit_code', 'pid'
+                ]
+            ))
+            _log('Updating the status:\n{0}'.format(json.dumps(_status)))
+            _write_status()
     else:
         raise ValueError("Please verify pid and db_file arguments.")
 
 
+def report_progress(stream_type, pos, lines, force=False, file=None,
+                    base=0):
+    """
+    This function will update the size, and the number of lines flushed to
+    the log file of the given stream in the status.
+
+    Args:
+        stream_type: 'out' or 'err'
+        pos: Size of the log file (including the rotated segments)
+        lines: Number of lines in the log file
+        force: Write the status, even if it was written recently
+        file: Name of the current segment of the log file
+        base: Size of the rotated segments of the log file
+
+    Returns:
+        None
+    """
+    with _status_lock:
+        _status[stream_type] = {
+            'pos': pos, 'lines': lines, 'file': file or stream_type,
+            'base': base
+        }
+        if force or time.time() - _status_updated >= _STATUS_INTERVAL:
+            _write_status()
+
+
 def execute():
     """
     This function will execute the background process
@@ -279,6 +718,8 @@ def execute():
     process_stdout = ProcessLogger('out')
     process_stderr = ProcessLogger('err')
     process = None
+    meter = None
+    flusher = None
 
     try:
         # update start_time
@@ -307,21 +748,36 @@ def execute():
         else:
             kwargs['env'] = os.environ.copy()
 
+        if 'PGA_BGP_PROGRESS' in os.environ:
+            import json
+            _log('Preparing to meter the progress...')
+            meter = ProgressMeter(json.loads(os.environ['PGA_BGP_PROGRESS']))
+            meter.prepare(command)
+
         _log('Starting the command execution...')
         process = Popen(
             command, stdout=PIPE, stderr=PIPE, stdin=None, **kwargs
         )
 
+        if meter:
+            _log('Metering the progress...')
+            meter.attach_process(process)
+            process_stdout.meter = process_stderr.meter = meter
+            meter.start()
+
         _log('Attaching the loggers to stdout, and stderr...')
         # Attach the stream to the process logger, and start logging.
         process_stdout.attach_process_stream(process, process.stdout)
         process_stdout.start()
         process_stderr.attach_process_stream(process, process.stderr)
         process_stderr.start()
+        flusher = LogFlusher([process_stdout, process_stderr])
+        flusher.start()
 
         # Join both threads together
         process_stdout.join()
         process_stderr.join()
+        flusher.stop()
 
         _log('Waiting for the process to finish...')
         # Child process return code
@@ -333,6 +789,9 @@ def execute():
         _log('Process exited with code: {0}'.format(exitCode))
         args.update({'exit_code': exitCode})
 
+        if meter:
+            meter.finish(exitCode)
+
         # Add end_time
         args.update({'end_time': get_current_time()})
 
@@ -366,13 +825,17 @@ def execute():
         args.update({'end_time': get_current_time()})
         args.update({'exit_code': -1})
     finally:
-        # Update the execution end_time, and exit-code.
-        update_status(**args)
-        _log('Exiting the process executor...')
+        if flusher:
+            flusher.stop()
+        # Flush the logs before reporting the end of the execution, so that
+        # the final status has the complete size of the logs.
         if process_stderr:
             process_stderr.release()
         if process_stdout:
             process_stdout.release()
+        # Update the execution end_time, and exit-code.
+        update_status(**args)
+        _log('Exiting the process executor...')
         _log('Bye!')
 
 
@@ -425,6 +888,10 @@ if __name__ == '__main__':
     _out_dir = u(os.environ['OUTDIR'])
     _log_file = os.path.join(_out_dir, ('log_%s' % os.getpid()))
 
+    _MAX_LINE_LENGTH = _env_int('PGA_BGP_LOG_MAX_LINE', 0)
+    _MAX_LOG_SIZE = _env_int('PGA_BGP_LOG_MAX_SIZE', 0)
+    _COMPRESS_LOGS = os.environ.get('PGA_BGP_LOG_COMPRESS', '0') == '1'
+
     _log('Starting the process executor...')
 
     # Ignore any signals
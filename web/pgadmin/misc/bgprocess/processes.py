@@ -12,14 +12,19 @@
 Introduce a function to run the process executor in detached mode.
 """
 import csv
+import errno
+import json
 import os
+import socket
 import sys
+import threading
+import time
 from abc import ABCMeta, abstractproperty, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from pickle import dumps, loads
 from subprocess import Popen
 
-from pgadmin.utils import IS_PY2, u, file_quote, fs_encoding
+from pgadmin.utils import IS_PY2, u, file_quote, fs_encoding, metrics
 
 if IS_PY2:
     from StringIO import StringIO
@@ -30,9 +35,30 @@ from dateutil import parser
 from flask import current_app
 from flask_babel import gettext as _
 from flask_security import current_user
+from sqlalchemy import text
 
 import config
-from pgadmin.model import Process, db
+from pgadmin.model import Process, ProcessSummary, db
+
+# Serializes the scheduling of the queued processes within this server
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+# Thread applying the retention limits periodically
+_sweeper_lock = threading.Lock()
+_sweeper_thread = None
+
+# Maximum number of bytes read from a log file for a single status request
+MAX_LOG_READ_SIZE = 256 * 1024
+
+# Status reported by the process executors, pid -> (mtime, size, status)
+_status_cache = dict()
+# Process list entries of the finished processes, pid -> entry
+_process_info_cache = dict()
+
+# Stored along with the environment of a process queued with the password of
+# the server (not passed to the process executor) - identifies the pgAdmin
+# process holding the password (see get_password_holder).
+PASSWORD_HOLDER = 'PGA_BGP_PASSWORD_HOLDER'
 
 
 def get_current_time(format='%Y-%m-%d %H:%M:%S.%f %z'):
@@ -44,6 +70,448 @@ def get_current_time(format='%Y-%m-%d %H:%M:%S.%f %z'):
     ).strftime(format)
 
 
+def to_process_time(value, format='%Y-%m-%d %H:%M:%S.%f %z'):
+    """
+    Convert the given datetime (or, its string representation) to the time
+    string (in UTC) used for the process information. A datetime without the
+    timezone is considered to be in UTC.
+    """
+    if value is None or value == '':
+        return None
+
+    if not isinstance(value, datetime):
+        value = parser.parse(value)
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=pytz.utc)
+
+    return value.astimezone(pytz.utc).strftime(format)
+
+
+def get_scheduling_options(data):
+    """
+    Returns the scheduling options for a background process from the request
+    data - i.e. 'priority' (higher starts first), and 'not_before' (start the
+    process not before this time).
+    """
+    return {
+        'priority': int(data.get('priority', None) or 0),
+        'not_before': to_process_time(data.get('not_before', None))
+    }
+
+
+def get_log_options():
+    """
+    Returns the environment variables limiting the log files of a background
+    process (see ProcessLogger in process_executor.py).
+    """
+    return {
+        'PGA_BGP_LOG_MAX_LINE': str(config.BG_PROCESS_LOG_MAX_LINE_LENGTH),
+        'PGA_BGP_LOG_MAX_SIZE': str(config.BG_PROCESS_LOG_MAX_SIZE),
+        'PGA_BGP_LOG_COMPRESS': '1' if config.BG_PROCESS_LOG_COMPRESS else '0'
+    }
+
+
+def get_progress(status, end_time=None):
+    """
+    Compute the progress of a process from the progress metered by the
+    process executor (see ProgressMeter in process_executor.py).
+
+    Args:
+        status: Status written by the process executor
+        end_time: End time of the process (None, if it is still running)
+
+    Returns:
+        None, if the progress is not metered, otherwise - the bytes, and the
+        tables done (along with the totals), percent complete, throughput
+        (MB/s, rows/s), and the estimated time to complete (seconds).
+    """
+    progress = status.get('progress', None) if status else None
+    if progress is None or not status.get('start_time', None):
+        return None
+
+    res = dict(progress)
+    elapsed = (
+        parser.parse(end_time or get_current_time()) -
+        parser.parse(status['start_time'])
+    ).total_seconds()
+
+    bytes_done = progress.get('bytes_done', None)
+    bytes_total = progress.get('bytes_total', None)
+    tables_done = progress.get('tables_done', None)
+    tables_total = progress.get('tables_total', None)
+    rows_done = progress.get('rows_done', None)
+
+    fraction = None
+    if bytes_done is not None and bytes_total:
+        fraction = min(float(bytes_done) / bytes_total, 1.0)
+    elif tables_done is not None and tables_total:
+        fraction = min(float(tables_done) / tables_total, 1.0)
+
+    res['percent'] = round(fraction * 100, 1) \
+        if fraction is not None else None
+    res['mb_per_sec'] = round(bytes_done / elapsed / (1024 * 1024), 2) \
+        if bytes_done is not None and elapsed > 0 else None
+    res['rows_per_sec'] = round(rows_done / elapsed, 1) \
+        if rows_done is not None and elapsed > 0 else None
+    res['eta'] = None
+
+    if end_time is not None:
+        res['eta'] = 0
+    elif fraction:
+        res['eta'] = round(elapsed * (1 - fraction) / fraction, 1)
+
+    return res
+
+
+def get_python_interpreter():
+    """
+    Find the python interpreter to run the process executor (and, the python
+    scripts run as background processes, e.g. the in-process COPY worker).
+
+    Returns:
+        Path of the python interpreter (quoted, if required)
+    """
+
+    def which(program, paths):
+        def is_exe(fpath):
+            return os.path.exists(fpath) and os.access(fpath, os.X_OK)
+
+        for path in paths:
+            if not os.path.isdir(path):
+                continue
+            exe_file = os.path.join(u(path, fs_encoding), program)
+            if is_exe(exe_file):
+                return file_quote(exe_file)
+        return None
+
+    paths = os.environ['PATH'].split(os.pathsep)
+    interpreter = None
+
+    if os.name == 'nt':
+        paths.insert(0, os.path.join(u(sys.prefix), u'Scripts'))
+        paths.insert(0, u(sys.prefix))
+
+        interpreter = which(u'pythonw.exe', paths)
+        if interpreter is None:
+            interpreter = which(u'python.exe', paths)
+
+        if interpreter is None and current_app.PGADMIN_RUNTIME:
+            # We've faced an issue with Windows 2008 R2 (x86) regarding,
+            # not honouring the environment variables set under the Qt
+            # (e.g. runtime), and also setting PYTHONHOME same as
+            # sys.executable (i.e. pgAdmin4.exe).
+            #
+            # As we know, we're running it under the runtime, we can assume
+            # that 'venv' directory will be available outside of 'bin'
+            # directory.
+            #
+            # We would try out luck to find python executable based on that
+            # assumptions.
+            bin_path = os.path.dirname(sys.executable)
+
+            venv = os.path.realpath(
+                os.path.join(bin_path, u'..\\venv')
+            )
+
+            interpreter = which(u'pythonw.exe', [venv])
+            if interpreter is None:
+                interpreter = which(u'pythonw.exe', [venv])
+
+            if interpreter is not None:
+                # Our assumptions are proven right.
+                # Let's append the 'bin' directory to the PATH environment
+                # variable. And, also set PYTHONHOME environment variable
+                # to 'venv' directory.
+                os.environ['PATH'] = bin_path + ';' + os.environ['PATH']
+                os.environ['PYTHONHOME'] = venv
+    else:
+        # Let's not use sys.prefix in runtime.
+        # 'sys.prefix' is not identified on *nix systems for some unknown
+        # reason, while running under the runtime.
+        # We're already adding '<installation path>/pgAdmin 4/venv/bin'
+        # directory in the PATH environment variable. Hence - it will
+        # anyway be the redundant value in paths.
+        if not current_app.PGADMIN_RUNTIME:
+            paths.insert(0, os.path.join(u(sys.prefix), u'bin'))
+        interpreter = which(u'python', paths)
+
+    return interpreter if interpreter is not None else 'python'
+
+
+def _queue_order(p):
+    return -(p.priority or 0), p.queued_time, p.pid
+
+
+def get_processes_to_start(
+    queued, running, now, max_running, max_running_per_server
+):
+    """
+    Pick the queued processes, which can be started now.
+
+    Processes are picked in the order of the priority (higher first), and
+    then in the order they were queued. A deferred process (not_before in
+    future), or a process for a server, which has reached its limit, does
+    not block the processes behind it.
+
+    Args:
+        queued: Queued processes
+        running: Running processes
+        now: Current time (see get_current_time)
+        max_running: Maximum number of running processes (0 - no limit)
+        max_running_per_server: Maximum number of running processes per
+            server (0 - no limit)
+
+    Returns:
+        List of the processes to be started
+    """
+    per_server = dict()
+    for p in running:
+        per_server[p.server_id] = per_server.get(p.server_id, 0) + 1
+    total = len(running)
+
+    res = []
+    for p in sorted(queued, key=_queue_order):
+        if max_running and total >= max_running:
+            break
+
+        if p.not_before is not None and p.not_before > now:
+            continue
+
+        if p.server_id is not None and max_running_per_server and \
+                per_server.get(p.server_id, 0) >= max_running_per_server:
+            continue
+
+        res.append(p)
+        total += 1
+        per_server[p.server_id] = per_server.get(p.server_id, 0) + 1
+
+    return res
+
+
+def get_password_holder():
+    """
+    Identifies this pgAdmin process. The password of the server is exported
+    (see export_password_env) only into the environment of the pgAdmin
+    process, which queued a process.
+    """
+    return u'{0}:{1}'.format(socket.gethostname(), os.getpid())
+
+
+def is_password_holder_alive(holder):
+    """
+    Checks whether the pgAdmin process identified by the holder (see
+    get_password_holder) is still running. A pgAdmin process on another host
+    can not be checked, and is assumed to be running.
+    """
+    host, _sep, pid = holder.rpartition(':')
+    if host != socket.gethostname():
+        return True
+
+    pid = int(pid)
+    if pid == os.getpid():
+        return True
+
+    if os.name == 'nt':
+        # os.kill terminates the process on Windows, where the desktop
+        # runtime runs a single pgAdmin process anyway.
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+def get_processes_to_launch(queued, environ, holder,
+                            is_alive=is_password_holder_alive):
+    """
+    Split the queued processes into the ones, which can be launched by this
+    pgAdmin process, and the ones, which can not be launched anymore.
+
+    A process queued with the password of the server can only be launched by
+    the pgAdmin process holding the password in its environment. Other
+    pgAdmin processes leave it in the queue, and it can not be launched at
+    all, once that pgAdmin process is gone (e.g. restarted).
+
+    Args:
+        queued: Queued processes
+        environ: Environment of this pgAdmin process
+        holder: This pgAdmin process (see get_password_holder)
+        is_alive: Checks whether a pgAdmin process is running
+
+    Returns:
+        (processes to be launched, processes to be failed)
+    """
+    launchable = []
+    orphaned = []
+    for p in queued:
+        env = json.loads(p.env) if p.env else dict()
+        p_holder = env.get(PASSWORD_HOLDER, None)
+
+        if p_holder is None or str(p.pid) in environ:
+            launchable.append(p)
+        elif p_holder == holder or not is_alive(p_holder):
+            orphaned.append(p)
+
+    return launchable, orphaned
+
+
+def get_log_size(logdir):
+    """
+    Returns the total size (in bytes) of the files in the log directory of a
+    process.
+    """
+    size = 0
+    for root, dirs, files in os.walk(logdir):
+        for f in files:
+            try:
+                size += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return size
+
+
+def get_processes_to_expire(finished, now, max_age, max_count, max_log_size,
+                            log_sizes):
+    """
+    Pick the finished processes to be removed as per the retention limits.
+
+    The processes are kept newest first, a process is removed when it was
+    acknowledged (while running), it finished more than 'max_age' days ago,
+    its user has already 'max_count' newer processes kept, or its logs do
+    not fit in 'max_log_size' along with the logs of the newer processes
+    kept.
+
+    Args:
+        finished: Finished processes (of all the users)
+        now: Current time (see get_current_time)
+        max_age: Maximum age (in days) of the processes (0 - no limit)
+        max_count: Maximum number of processes per user (0 - no limit)
+        max_log_size: Maximum size of the logs (in bytes) of all the
+            processes (0 - no limit)
+        log_sizes: Size of the logs of the processes, pid -> size
+
+    Returns:
+        List of the processes to be removed (oldest first)
+    """
+    cutoff = parser.parse(now) - timedelta(days=max_age) if max_age \
+        else None
+    per_user = dict()
+    total = 0
+
+    res = []
+    for p in sorted(finished, key=lambda p: p.end_time, reverse=True):
+        size = log_sizes.get(p.pid, 0)
+
+        if p.acknowledge is not None or (
+            cutoff is not None and parser.parse(p.end_time) < cutoff
+        ) or (
+            max_count and per_user.get(p.user_id, 0) >= max_count
+        ) or (
+            max_log_size and total + size > max_log_size
+        ):
+            res.append(p)
+            continue
+
+        per_user[p.user_id] = per_user.get(p.user_id, 0) + 1
+        total += size
+
+    res.reverse()
+    return res
+
+
+def compress_logs(logdir):
+    """
+    Compress the stdout, and stderr logs (including the rotated segments) of
+    a finished process (i.e. 'out' as 'out.gz').
+
+    Returns:
+        Number of the log files compressed
+    """
+    import gzip
+    import shutil
+
+    count = 0
+    for f in os.listdir(logdir):
+        if f.split('.')[0] not in ('out', 'err') or f.endswith('.gz'):
+            continue
+
+        filename = os.path.join(logdir, f)
+        with open(filename, 'rb') as src:
+            with gzip.open(filename + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+        os.remove(filename)
+        count += 1
+
+    return count
+
+
+def open_log(logfile):
+    """
+    Open the log file for reading, the compressed one (see compress_logs),
+    if the log file has been compressed.
+    """
+    if not os.path.exists(logfile) and os.path.exists(logfile + '.gz'):
+        import gzip
+        return gzip.open(logfile + '.gz', 'rb')
+    return open(logfile, 'rb')
+
+
+def get_queue_info(
+    queued, running, now, avg_duration, max_running, max_running_per_server
+):
+    """
+    Find out the position in the queue, and the estimated start time of the
+    queued processes.
+
+    The estimate assumes that the processes run for 'avg_duration' seconds
+    on average, and start in rounds of the available slots (per server, when
+    limited, otherwise global).
+
+    Returns:
+        Dictionary of the process id to a (position, estimated start time)
+        tuple, the estimated start time is None, when it can not be
+        estimated.
+    """
+    res = dict()
+    ahead = dict()
+    per_server = dict()
+    for p in running:
+        per_server[p.server_id] = per_server.get(p.server_id, 0) + 1
+
+    current = parser.parse(now)
+
+    for idx, p in enumerate(sorted(queued, key=_queue_order)):
+        if p.server_id is not None and max_running_per_server:
+            slots = max_running_per_server
+            busy = per_server.get(p.server_id, 0) + \
+                ahead.get(p.server_id, 0)
+        else:
+            slots = max_running
+            busy = len(running) + idx
+
+        ahead[p.server_id] = ahead.get(p.server_id, 0) + 1
+
+        estimated = None
+        if not slots or busy < slots:
+            estimated = current
+        elif avg_duration is not None:
+            estimated = current + timedelta(
+                seconds=avg_duration * ((busy - slots) // slots + 1)
+            )
+
+        if p.not_before is not None:
+            not_before = parser.parse(p.not_before)
+            if estimated is None or estimated < not_before:
+                estimated = not_before
+
+        res[p.pid] = (idx + 1, estimated)
+
+    return res
+
+
 class IProcessDesc(object):
     __metaclass__ = ABCMeta
 
@@ -66,7 +534,11 @@ class BatchProcess(object):
         if 'id' in kwargs:
             self._retrieve_process(kwargs['id'])
         else:
-            self._create_process(kwargs['desc'], kwargs['cmd'], kwargs['args'])
+            self._create_process(
+                kwargs['desc'], kwargs['cmd'], kwargs['args'],
+                kwargs.get('sid', None), kwargs.get('priority', 0),
+                kwargs.get('not_before', None)
+            )
 
     def _retrieve_process(self, _id):
         p = Process.query.filter_by(pid=_id, user_id=current_user.id).first()
@@ -99,7 +571,8 @@ class BatchProcess(object):
         # Exit code
         self.ecode = p.exit_code
 
-    def _create_process(self, _desc, _cmd, _args):
+    def _create_process(self, _desc, _cmd, _args, _sid=None, _priority=0,
+                        _not_before=None):
         ctime = get_current_time(format='%y%m%d%H%M%S%f')
         log_dir = os.path.join(
             config.SESSION_DB_PATH, 'process_logs'
@@ -169,24 +642,77 @@ class BatchProcess(object):
             pid=int(id), command=_cmd,
             arguments=args_val.decode('utf-8', 'replace') if IS_PY2 and hasattr(args_val, 'decode') \
                 else args_val,
-            logdir=log_dir, desc=dumps(self.desc), user_id=current_user.id
+            logdir=log_dir, desc=dumps(self.desc), user_id=current_user.id,
+            server_id=_sid, priority=_priority or 0,
+            not_before=to_process_time(_not_before)
         )
         db.session.add(j)
         db.session.commit()
 
-    def start(self, cb=None):
+    def start(self, cb=None, progress=None):
+        """
+        Queue the process to be started by the scheduler.
+
+        The process is started right away, unless it is deferred, or the
+        limits on the number of running processes (globally, and per server)
+        have been reached - in which case it waits in the queue.
+
+        Args:
+            cb: Callback function to add the environment variables required
+                by the process (gets a dictionary to be updated).
+            progress: How to meter the progress of the process (see
+                ProgressMeter in process_executor.py), e.g.
+                {'file': <archive>, 'mode': 'read', 'tables': True}
+        """
+        if self.stime is not None:
+            if self.etime is None:
+                raise Exception(_('The process has already been started.'))
+            raise Exception(
+                _('The process has already finished and cannot be restarted.')
+            )
 
-        def which(program, paths):
-            def is_exe(fpath):
-                return os.path.exists(fpath) and os.access(fpath, os.X_OK)
+        p = Process.query.filter_by(
+            pid=self.id, user_id=current_user.id
+        ).first()
 
-            for path in paths:
-                if not os.path.isdir(path):
-                    continue
-                exe_file = os.path.join(u(path, fs_encoding), program)
-                if is_exe(exe_file):
-                    return file_quote(exe_file)
-            return None
+        if p.queued_time is not None:
+            raise Exception(_('The process has already been queued.'))
+
+        env = dict()
+        if cb is not None:
+            cb(env)
+        if progress is not None:
+            env['PGA_BGP_PROGRESS'] = json.dumps(progress)
+        env.update(get_log_options())
+        if str(self.id) in os.environ:
+            # The password has been exported by the caller, only this
+            # pgAdmin process can launch it.
+            env[PASSWORD_HOLDER] = get_password_holder()
+
+        p.env = json.dumps(env) if env else None
+        p.queued_time = get_current_time()
+        db.session.commit()
+
+        if BatchProcess.schedule():
+            BatchProcess._start_scheduler()
+
+    @staticmethod
+    def _get_arguments(p):
+        args = []
+        args_csv = StringIO(
+            p.arguments.encode('utf-8')
+            if hasattr(p.arguments, 'decode') else p.arguments
+        )
+        args_reader = csv.reader(args_csv, delimiter=str(','))
+        for arg in args_reader:
+            args = args + arg
+        return args
+
+    @staticmethod
+    def _launch(p):
+        """
+        Start the process executor for the given (queued) process.
+        """
 
         def convert_environment_variables(env):
             """
@@ -207,73 +733,15 @@ class BatchProcess(object):
                 temp_env[key] = value
             return temp_env
 
-        if self.stime is not None:
-            if self.etime is None:
-                raise Exception(_('The process has already been started.'))
-            raise Exception(
-                _('The process has already finished and cannot be restarted.')
-            )
+        p.launch_time = get_current_time()
 
         executor = file_quote(os.path.join(
             os.path.dirname(u(__file__)), u'process_executor.py'
         ))
-        paths = os.environ['PATH'].split(os.pathsep)
-        interpreter = None
-
-        if os.name == 'nt':
-            paths.insert(0, os.path.join(u(sys.prefix), u'Scripts'))
-            paths.insert(0, u(sys.prefix))
-
-            interpreter = which(u'pythonw.exe', paths)
-            if interpreter is None:
-                interpreter = which(u'python.exe', paths)
-
-            if interpreter is None and current_app.PGADMIN_RUNTIME:
-                # We've faced an issue with Windows 2008 R2 (x86) regarding,
-                # not honouring the environment variables set under the Qt
-                # (e.g. runtime), and also setting PYTHONHOME same as
-                # sys.executable (i.e. pgAdmin4.exe).
-                #
-                # As we know, we're running it under the runtime, we can assume
-                # that 'venv' directory will be available outside of 'bin'
-                # directory.
-                #
-                # We would try out luck to find python executable based on that
-                # assumptions.
-                bin_path = os.path.dirname(sys.executable)
-
-                venv = os.path.realpath(
-                    os.path.join(bin_path, u'..\\venv')
-                )
+        interpreter = get_python_interpreter()
 
-                interpreter = which(u'pythonw.exe', [venv])
-                if interpreter is None:
-                    interpreter = which(u'pythonw.exe', [venv])
-
-                if interpreter is not None:
-                    # Our assumptions are proven right.
-                    # Let's append the 'bin' directory to the PATH environment
-                    # variable. And, also set PYTHONHOME environment variable
-                    # to 'venv' directory.
-                    os.environ['PATH'] = bin_path + ';' + os.environ['PATH']
-                    os.environ['PYTHONHOME'] = venv
-        else:
-            # Let's not use sys.prefix in runtime.
-            # 'sys.prefix' is not identified on *nix systems for some unknown
-            # reason, while running under the runtime.
-            # We're already adding '<installation path>/pgAdmin 4/venv/bin'
-            # directory in the PATH environment variable. Hence - it will
-            # anyway be the redundant value in paths.
-            if not current_app.PGADMIN_RUNTIME:
-                paths.insert(0, os.path.join(u(sys.prefix), u'bin'))
-            interpreter = which(u'python', paths)
-
-        p = None
-        cmd = [
-            interpreter if interpreter is not None else 'python',
-            executor, self.cmd
-        ]
-        cmd.extend(self.args)
+        cmd = [interpreter, executor, p.command]
+        cmd.extend(BatchProcess._get_arguments(p))
 
         if os.name == 'nt' and IS_PY2:
             command = []
@@ -293,12 +761,14 @@ class BatchProcess(object):
 
         # Make a copy of environment, and add new variables to support
         env = os.environ.copy()
-        env['PROCID'] = self.id
-        env['OUTDIR'] = self.log_dir
+        env['PROCID'] = str(p.pid)
+        env['OUTDIR'] = p.logdir
         env['PGA_BGP_FOREGROUND'] = "1"
 
-        if cb is not None:
-            cb(env)
+        # Environment variables set by the caller while queuing the process
+        if p.env:
+            env.update(json.loads(p.env))
+            env.pop(PASSWORD_HOLDER, None)
 
         if IS_PY2:
             # We need environment variables & values in string
@@ -317,7 +787,7 @@ class BatchProcess(object):
             stdout = open(stdout, "a")
             stderr = open(stderr, "a")
 
-            p = Popen(
+            proc = Popen(
                 cmd, close_fds=False, env=env, stdout=stdout.fileno(),
                 stderr=stderr.fileno(), stdin=stdin.fileno(),
                 creationflags=(CREATE_NEW_PROCESS_GROUP | DETACHED_PROCESS)
@@ -330,33 +800,236 @@ class BatchProcess(object):
                 # Explicitly ignoring signals in the child process
                 signal.signal(signal.SIGINT, signal.SIG_IGN)
 
-            p = Popen(
+            proc = Popen(
                 cmd, close_fds=True, stdout=None, stderr=None, stdin=None,
                 preexec_fn=preexec_function, env=env
             )
 
-        self.ecode = p.poll()
+        # The executor has got its own copy of the password
+        os.environ.pop(str(p.pid), None)
+
+        ecode = proc.poll()
 
         # Execution completed immediately.
         # Process executor cannot update the status, if it was not able to
         # start properly.
-        if self.ecode is not None and self.ecode != 0:
+        if ecode is not None and ecode != 0:
             # There is no way to find out the error message from this process
             # as standard output, and standard error were redirected to
             # devnull.
-            p = Process.query.filter_by(
-                pid=self.id, user_id=current_user.id
-            ).first()
             p.start_time = p.end_time = get_current_time()
             if not p.exit_code:
-                p.exit_code = self.ecode
-            db.session.commit()
+                p.exit_code = ecode
 
-    def status(self, out=0, err=0):
-        import re
+        db.session.commit()
 
-        ctime = get_current_time(format='%Y%m%d%H%M%S%f')
+    @staticmethod
+    def schedule():
+        """
+        Start the queued processes (of all the users), which are allowed to
+        run as per the limits - BG_PROCESS_MAX_RUNNING, and
+        BG_PROCESS_MAX_RUNNING_PER_SERVER.
+
+        The server mode runs several pgAdmin processes, each of them running
+        its own scheduler. The processes to be started are picked, and
+        claimed (see _claim) in the write transaction (see _lock_queue), so
+        that a queued process is launched only once, and the limits are
+        applied to the processes running across all the pgAdmin processes.
+        The claimed processes are launched after the commit.
+
+        Returns:
+            True, if there are processes left in the queue.
+        """
+        with _scheduler_lock:
+            if Process.query.filter(
+                Process.queued_time.isnot(None),
+                Process.launch_time.is_(None), Process.end_time.is_(None)
+            ).count() == 0:
+                return False
 
+            try:
+                BatchProcess._lock_queue()
+
+                running = Process.query.filter(
+                    Process.launch_time.isnot(None),
+                    Process.end_time.is_(None)
+                ).all()
+                queued = Process.query.filter(
+                    Process.queued_time.isnot(None),
+                    Process.launch_time.is_(None), Process.end_time.is_(None)
+                ).all()
+
+                launchable, orphaned = get_processes_to_launch(
+                    queued, os.environ, get_password_holder()
+                )
+                now = get_current_time()
+
+                orphaned = [
+                    p for p in orphaned if BatchProcess._claim(p, now)
+                ]
+                for p in orphaned:
+                    BatchProcess._fail(p, _(
+                        "The process could not be started, as the password "
+                        "of the server is not available anymore (the pgAdmin "
+                        "process, which queued it, is not running). Please "
+                        "run it again."
+                    ))
+
+                # Find out the processes finished since the last check
+                for p in running:
+                    BatchProcess.update_process_info(p)
+                running = [p for p in running if p.end_time is None]
+
+                to_start = [
+                    p for p in get_processes_to_start(
+                        launchable, running, now,
+                        config.BG_PROCESS_MAX_RUNNING,
+                        config.BG_PROCESS_MAX_RUNNING_PER_SERVER
+                    ) if BatchProcess._claim(p, now)
+                ]
+
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+            for p in to_start:
+                try:
+                    BatchProcess._launch(p)
+                except Exception as e:
+                    current_app.logger.exception(e)
+                    BatchProcess._fail(p, str(e))
+                    db.session.commit()
+
+            return len(queued) > len(to_start) + len(orphaned)
+
+    @staticmethod
+    def _lock_queue():
+        """
+        Take the write lock of the configuration database, before reading the
+        queue, so that the schedulers of the other pgAdmin processes wait for
+        the commit (as with BEGIN IMMEDIATE). SQLite begins the transaction
+        (deferred) at the first write, hence the no-op update.
+        """
+        db.session.execute(text('UPDATE process SET pid = pid WHERE 1 = 0'))
+
+    @staticmethod
+    def _claim(p, now):
+        """
+        Claim the queued process to be launched (or, failed) by this pgAdmin
+        process, i.e. set its launch time, unless another pgAdmin process has
+        already claimed (or, removed) it.
+
+        Returns:
+            True, if claimed
+        """
+        claimed = db.session.execute(text(
+            'UPDATE process SET launch_time = :now WHERE pid = :pid AND '
+            'launch_time IS NULL AND end_time IS NULL'
+        ), {'now': now, 'pid': p.pid}).rowcount == 1
+
+        if claimed:
+            p.launch_time = now
+        return claimed
+
+    @staticmethod
+    def _fail(p, message):
+        """
+        Mark the queued process as failed without launching it, the message
+        is written into its error log.
+        """
+        p.launch_time = p.start_time = p.end_time = get_current_time()
+        p.exit_code = -1
+        os.environ.pop(str(p.pid), None)
+
+        if not p.logdir:
+            return
+
+        try:
+            with open(os.path.join(p.logdir, 'err'), 'ab') as fp:
+                fp.write(
+                    datetime.utcnow().strftime('%y%m%d%H%M%S%f').encode(
+                        'utf-8'
+                    ) + b',' + u(message).encode('utf-8') + b'\n'
+                )
+        except (IOError, OSError) as e:
+            current_app.logger.exception(e)
+
+    @staticmethod
+    def _start_scheduler():
+        """
+        Start the thread checking the queue periodically (unless running),
+        it stops when there are no more processes waiting in the queue.
+        """
+        global _scheduler_thread
+
+        if _scheduler_thread is not None and _scheduler_thread.is_alive():
+            return
+
+        app = current_app._get_current_object()
+
+        def run():
+            waiting = True
+            while waiting:
+                time.sleep(config.BG_PROCESS_SCHEDULER_INTERVAL)
+                with app.app_context():
+                    try:
+                        waiting = BatchProcess.schedule()
+                    except Exception as e:
+                        app.logger.exception(e)
+                    finally:
+                        db.session.remove()
+
+        _scheduler_thread = threading.Thread(
+            target=run, name='bgprocess-scheduler'
+        )
+        _scheduler_thread.daemon = True
+        _scheduler_thread.start()
+
+    @staticmethod
+    def _average_duration():
+        """
+        Average execution time (in seconds) of the recently finished
+        processes, None if there are none.
+        """
+        finished = Process.query.filter(
+            Process.start_time.isnot(None), Process.end_time.isnot(None)
+        ).order_by(Process.end_time.desc()).limit(50).all()
+
+        if len(finished) == 0:
+            return None
+
+        return sum(
+            (parser.parse(p.end_time) - parser.parse(p.start_time))
+            .total_seconds() for p in finished
+        ) / len(finished)
+
+    @staticmethod
+    def _queue_info():
+        """
+        Position in the queue, and estimated start time of the queued
+        processes (see get_queue_info).
+        """
+        queued = Process.query.filter(
+            Process.queued_time.isnot(None),
+            Process.launch_time.is_(None), Process.end_time.is_(None)
+        ).all()
+
+        if len(queued) == 0:
+            return dict()
+
+        running = Process.query.filter(
+            Process.launch_time.isnot(None), Process.end_time.is_(None)
+        ).all()
+
+        return get_queue_info(
+            queued, running, get_current_time(),
+            BatchProcess._average_duration(),
+            config.BG_PROCESS_MAX_RUNNING,
+            config.BG_PROCESS_MAX_RUNNING_PER_SERVER
+        )
+
+    def status(self, out=0, err=0):
         stdout = []
         stderr = []
         out_completed = err_completed = False
@@ -365,51 +1038,77 @@ class BatchProcess(object):
         if enc is None or enc == 'ascii':
             enc = 'utf-8'
 
-        def read_log(logfile, log, pos, ctime, ecode=None):
-            completed = True
-            idx = 0
-            c = re.compile(r"(\d+),(.*$)")
-
-            if not os.path.isfile(logfile):
-                return 0, False
-
-            with open(logfile, 'rb') as f:
-                eofs = os.fstat(f.fileno()).st_size
-                f.seek(pos, 0)
-                if pos == eofs and ecode is None:
-                    completed = False
-
-                while pos < eofs:
-                    idx += 1
-                    line = f.readline()
-                    line = line.decode(enc, 'replace')
-                    r = c.split(line)
-                    if len(r) < 3:
-                        # ignore this line
-                        pos = f.tell()
-                        continue
-                    if r[1] > ctime:
-                        completed = False
-                        break
-                    log.append([r[1], r[2]])
-                    pos = f.tell()
-                    if idx >= 1024:
-                        completed = False
-                        break
-                    if pos == eofs:
-                        if ecode is None:
-                            completed = False
-                        break
-
-            return pos, completed
+        def read_log(logfile, log, pos, info, ecode=None):
+            """
+            Read the complete lines written after 'pos' up to the size of the
+            log reported by the process executor (or, the actual size of the
+            file, when not reported).
+
+            The executor may rotate the log file, in which case 'pos' is the
+            offset in all the segments of the log, 'base' - size of the
+            rotated segments, and 'file' - name of the current segment. The
+            lines in the rotated segments, not read yet, are skipped.
+            """
+            end = info.get('pos', None)
+            base = info.get('base', 0)
+            if info.get('file', None):
+                logfile = os.path.join(os.path.dirname(logfile), info['file'])
+
+            if end is None:
+                if not os.path.isfile(logfile):
+                    return 0, False
+                end = os.path.getsize(logfile)
+
+            if pos < base:
+                pos = base
+
+            if pos >= end:
+                return pos, ecode is not None
+
+            try:
+                with open_log(logfile) as f:
+                    f.seek(pos - base, 0)
+                    data = f.read(min(end - pos, MAX_LOG_READ_SIZE))
+            except IOError:
+                # The segment has just been rotated, read it next time
+                return pos, False
+
+            last = data.rfind(b'\n')
+            if last == -1:
+                if len(data) < MAX_LOG_READ_SIZE:
+                    # Wait for the rest of the line
+                    return pos, False
+                # A single line bigger than the read size
+                last = len(data) - 1
+
+            for line in data[:last + 1].splitlines():
+                r = line.split(b',', 1)
+                if len(r) < 2:
+                    # ignore this line
+                    continue
+                log.append([r[0].decode(enc, 'replace'),
+                            r[1].decode(enc, 'replace')])
+
+            pos += last + 1
+
+            return pos, pos >= end and ecode is not None
 
         j = Process.query.filter_by(
             pid=self.id, user_id=current_user.id
         ).first()
 
         execution_time = None
+        progress = None
+        queue_status = dict()
 
         if j is not None:
+            if BatchProcess._is_queued(j):
+                if BatchProcess.schedule():
+                    BatchProcess._start_scheduler()
+                queue_status = BatchProcess._queue_status(
+                    j, BatchProcess._queue_info()
+                )
+
             status, updated = BatchProcess.update_process_info(j)
             if updated:
                 db.session.commit()
@@ -423,73 +1122,331 @@ class BatchProcess(object):
 
                 execution_time = (etime - stime).total_seconds()
 
+            try:
+                data = BatchProcess._read_status(j) or dict()
+            except ValueError:
+                data = dict()
+            progress = get_progress(data, j.end_time)
+
             if process_output:
-                out, out_completed = read_log(self.stdout, stdout, out, ctime,
-                                              self.ecode)
-                err, err_completed = read_log(self.stderr, stderr, err, ctime,
-                                              self.ecode)
+                out, out_completed = read_log(
+                    self.stdout, stdout, out, data.get('out', dict()),
+                    self.ecode
+                )
+                err, err_completed = read_log(
+                    self.stderr, stderr, err, data.get('err', dict()),
+                    self.ecode
+                )
         else:
             out_completed = err_completed = False
 
         if out == -1 or err == -1:
-            return {
+            res = {
+                'start_time': self.stime,
+                'exit_code': self.ecode,
+                'execution_time': execution_time
+            }
+        else:
+            res = {
+                'out': {'pos': out, 'lines': stdout, 'done': out_completed},
+                'err': {'pos': err, 'lines': stderr, 'done': err_completed},
                 'start_time': self.stime,
                 'exit_code': self.ecode,
                 'execution_time': execution_time
             }
 
+        if self.stime is not None:
+            res['stime'] = parser.parse(self.stime)
+        if progress is not None:
+            res['progress'] = progress
+        res.update(queue_status)
+
+        return res
+
+    @staticmethod
+    def _is_queued(p):
+        return p.queued_time is not None and p.launch_time is None and \
+            p.end_time is None
+
+    @staticmethod
+    def _queue_status(p, queue_info):
+        """
+        Queue related information of a queued process (for the status).
+        """
+        position, estimated_start = queue_info.get(p.pid, (None, None))
+
         return {
-            'out': {'pos': out, 'lines': stdout, 'done': out_completed},
-            'err': {'pos': err, 'lines': stderr, 'done': err_completed},
-            'start_time': self.stime,
-            'exit_code': self.ecode,
-            'execution_time': execution_time
+            'queued': True,
+            'queue_position': position,
+            'estimated_start': estimated_start,
+            'priority': p.priority or 0,
+            'not_before': parser.parse(p.not_before)
+            if p.not_before is not None else None
         }
 
+    @staticmethod
+    def _read_status(p):
+        """
+        Read the status written by the process executor, it is parsed again
+        only when the status file has changed.
+
+        Returns:
+            The status (dict), None if it is not available.
+        """
+        status = os.path.join(p.logdir, 'status')
+        try:
+            st = os.stat(status)
+        except OSError:
+            return None
+
+        cached = _status_cache.get(p.pid, None)
+        hit = cached is not None and cached[0] == st.st_mtime and \
+            cached[1] == st.st_size
+        metrics.record_cache('bgprocess_status', hit)
+        if hit:
+            return cached[2]
+
+        with open(status, 'r') as fp:
+            data = json.load(fp)
+
+        _status_cache[p.pid] = (st.st_mtime, st.st_size, data)
+
+        return data
+
     @staticmethod
     def update_process_info(p):
         if p.start_time is None or p.end_time is None:
-            status = os.path.join(p.logdir, 'status')
-            if not os.path.isfile(status):
+            try:
+                data = BatchProcess._read_status(p)
+            except ValueError as e:
+                current_app.logger.warning(
+                    _("Status for the background process '{0}' could not be loaded.").format(
+                        p.pid
+                    )
+                )
+                current_app.logger.exception(e)
                 return False, False
 
-            with open(status, 'r') as fp:
-                import json
-                try:
-                    data = json.load(fp)
+            if data is None:
+                return False, False
 
-                    #  First - check for the existance of 'start_time'.
-                    if 'start_time' in data and data['start_time']:
-                        p.start_time = data['start_time']
+            updated = False
 
-                        # We can't have 'exit_code' without the 'start_time'
-                        if 'exit_code' in data and \
-                                data['exit_code'] is not None:
-                            p.exit_code = data['exit_code']
+            #  First - check for the existance of 'start_time'.
+            if 'start_time' in data and data['start_time']:
+                updated = p.start_time != data['start_time']
+                p.start_time = data['start_time']
 
-                            # We can't have 'end_time' without the 'exit_code'.
-                            if 'end_time' in data and data['end_time']:
-                                p.end_time = data['end_time']
+                # We can't have 'exit_code' without the 'start_time'
+                if 'exit_code' in data and \
+                        data['exit_code'] is not None:
+                    updated = updated or p.exit_code != data['exit_code']
+                    p.exit_code = data['exit_code']
 
-                    return True, True
+                    # We can't have 'end_time' without the 'exit_code'.
+                    if 'end_time' in data and data['end_time']:
+                        updated = True
+                        p.end_time = data['end_time']
 
-                except ValueError as e:
-                    current_app.logger.warning(
-                        _("Status for the background process '{0}' could not be loaded.").format(
-                            p.pid
-                        )
-                    )
-                    current_app.logger.exception(e)
-                    return False, False
+            return True, updated
         return True, False
 
+    @staticmethod
+    def sweep():
+        """
+        Apply the retention limits on the finished processes (of all the
+        users) - remove the expired processes, and their logs, keeping their
+        summary (see get_processes_to_expire), and compress the logs of the
+        processes finished more than BG_PROCESS_LOG_COMPRESS_AGE days ago.
+
+        Returns:
+            Number of the processes removed
+        """
+        with _sweeper_lock:
+            finished = Process.query.filter(
+                Process.end_time.isnot(None)
+            ).all()
+
+            if len(finished) == 0:
+                return 0
+
+            now = get_current_time()
+            log_sizes = dict(
+                (p.pid, get_log_size(p.logdir)) for p in finished
+                if p.logdir
+            )
+
+            expired = get_processes_to_expire(
+                finished, now,
+                config.BG_PROCESS_RETENTION_MAX_AGE,
+                config.BG_PROCESS_RETENTION_MAX_COUNT,
+                config.BG_PROCESS_RETENTION_MAX_LOG_SIZE,
+                log_sizes
+            )
+
+            for p in expired:
+                db.session.merge(
+                    BatchProcess._summarize(p, log_sizes.get(p.pid, None))
+                )
+                BatchProcess._remove(p)
+
+            db.session.commit()
+
+            if config.BG_PROCESS_LOG_COMPRESS_AGE:
+                cutoff = parser.parse(now) - timedelta(
+                    days=config.BG_PROCESS_LOG_COMPRESS_AGE
+                )
+                expired = set(p.pid for p in expired)
+                for p in finished:
+                    if p.pid in expired or not p.logdir or \
+                            parser.parse(p.end_time) >= cutoff:
+                        continue
+                    try:
+                        compress_logs(p.logdir)
+                    except (IOError, OSError) as e:
+                        current_app.logger.exception(e)
+
+            return len(expired)
+
+    @staticmethod
+    def _start_sweeper():
+        """
+        Start the thread applying the retention limits every
+        BG_PROCESS_RETENTION_INTERVAL seconds (unless running).
+        """
+        global _sweeper_thread
+
+        if not config.BG_PROCESS_RETENTION_INTERVAL or (
+            _sweeper_thread is not None and _sweeper_thread.is_alive()
+        ):
+            return
+
+        app = current_app._get_current_object()
+
+        def run():
+            while True:
+                with app.app_context():
+                    try:
+                        removed = BatchProcess.sweep()
+                        if removed:
+                            app.logger.info(
+                                'Removed %d background process(es) as per '
+                                'the retention limits.', removed
+                            )
+                    except Exception as e:
+                        app.logger.exception(e)
+                    finally:
+                        db.session.remove()
+                time.sleep(config.BG_PROCESS_RETENTION_INTERVAL)
+
+        _sweeper_thread = threading.Thread(
+            target=run, name='bgprocess-sweeper'
+        )
+        _sweeper_thread.daemon = True
+        _sweeper_thread.start()
+
+    @staticmethod
+    def _summarize(p, log_size):
+        """
+        Returns the summary of a finished process to be kept after removing
+        it.
+        """
+        try:
+            desc, details = BatchProcess._get_description(p)
+        except Exception:
+            # The description of the process can not be loaded anymore
+            desc = None
+
+        execution_time = None
+        if p.start_time is not None:
+            execution_time = (
+                parser.parse(p.end_time) - parser.parse(p.start_time)
+            ).total_seconds()
+
+        return ProcessSummary(
+            pid=p.pid, user_id=p.user_id, server_id=p.server_id,
+            command=p.command,
+            desc=u(desc) if desc is not None else None,
+            start_time=p.start_time, end_time=p.end_time,
+            exit_code=p.exit_code, execution_time=execution_time,
+            log_size=log_size, removed_time=get_current_time()
+        )
+
+    @staticmethod
+    def _remove(p):
+        """
+        Delete the process information from the configuration, and the log
+        files related to the process.
+        """
+        import shutil
+
+        logdir = p.logdir
+        _process_info_cache.pop(p.pid, None)
+        _status_cache.pop(p.pid, None)
+        db.session.delete(p)
+        if logdir:
+            shutil.rmtree(logdir, True)
+
+    @staticmethod
+    def history():
+        """
+        Returns the summary of the processes of the current user removed as
+        per the retention limits (newest first).
+        """
+        return [{
+            'id': s.pid,
+            'server_id': s.server_id,
+            'command': s.command,
+            'desc': s.desc,
+            'stime': s.start_time,
+            'etime': s.end_time,
+            'exit_code': s.exit_code,
+            'execution_time': s.execution_time,
+            'log_size': s.log_size
+        } for s in ProcessSummary.query.filter_by(
+            user_id=current_user.id
+        ).order_by(ProcessSummary.end_time.desc())]
+
     @staticmethod
     def list():
+        if BatchProcess.schedule():
+            BatchProcess._start_scheduler()
+        BatchProcess._start_sweeper()
+
         processes = Process.query.filter_by(user_id=current_user.id)
         changed = False
+        queue_info = None
 
         res = []
         for p in processes:
+            if BatchProcess._is_queued(p):
+                if p.acknowledge is not None:
+                    continue
+
+                if queue_info is None:
+                    queue_info = BatchProcess._queue_info()
+
+                desc, details = BatchProcess._get_description(p)
+                info = {
+                    'id': p.pid,
+                    'desc': desc,
+                    'details': details,
+                    'etime': None,
+                    'exit_code': None,
+                    'acknowledge': p.acknowledge,
+                    'execution_time': None
+                }
+                info.update(BatchProcess._queue_status(p, queue_info))
+                res.append(info)
+                continue
+
+            # Nothing changes for a finished process, but the acknowledgement
+            if p.end_time is not None and p.pid in _process_info_cache:
+                info = dict(_process_info_cache[p.pid])
+                info['acknowledge'] = p.acknowledge
+                res.append(info)
+                continue
+
             status, updated = BatchProcess.update_process_info(p)
             if not status:
                 continue
@@ -508,22 +1465,9 @@ class BatchProcess(object):
             etime = parser.parse(p.end_time or get_current_time())
 
             execution_time = (etime - stime).total_seconds()
-            desc = loads(p.desc)
-            details = desc
-
-            if isinstance(desc, IProcessDesc):
-                args = []
-                args_csv = StringIO(
-                  p.arguments.encode('utf-8') \
-                      if hasattr(p.arguments, 'decode') else p.arguments
-                )
-                args_reader = csv.reader(args_csv, delimiter=str(','))
-                for arg in args_reader:
-                    args = args + arg
-                details = desc.details(p.command, args)
-                desc = desc.message
+            desc, details = BatchProcess._get_description(p)
 
-            res.append({
+            info = {
                 'id': p.pid,
                 'desc': desc,
                 'details': details,
@@ -532,13 +1476,34 @@ class BatchProcess(object):
                 'exit_code': p.exit_code,
                 'acknowledge': p.acknowledge,
                 'execution_time': execution_time
-            })
+            }
+            res.append(info)
+
+            if p.end_time is not None:
+                _process_info_cache[p.pid] = info
+                _status_cache.pop(p.pid, None)
 
         if changed:
             db.session.commit()
 
         return res
 
+    @staticmethod
+    def _get_description(p):
+        """
+        Returns the description, and the details of the process.
+        """
+        desc = loads(p.desc)
+        details = desc
+
+        if isinstance(desc, IProcessDesc):
+            details = desc.details(
+                p.command, BatchProcess._get_arguments(p)
+            )
+            desc = desc.message
+
+        return desc, details
+
     @staticmethod
     def acknowledge(_pid):
         """
@@ -546,23 +1511,28 @@ class BatchProcess(object):
 
         Update the acknowledgement status, if the process is still running.
         And, delete the process information from the configuration, and the log
-        files related to the process, if it has already been completed.
+        files related to the process, if it has already been completed, or it
+        is still waiting in the queue (i.e. cancel it).
         """
-        p = Process.query.filter_by(
-            user_id=current_user.id, pid=_pid
-        ).first()
+        # The scheduler must not launch the process being cancelled
+        with _scheduler_lock:
+            BatchProcess._lock_queue()
+            p = Process.query.filter_by(
+                user_id=current_user.id, pid=_pid
+            ).first()
 
-        if p is None:
-            raise LookupError(
-                _("Could not find a process with the specified ID.")
-            )
+            if p is None:
+                db.session.rollback()
+                raise LookupError(
+                    _("Could not find a process with the specified ID.")
+                )
 
-        if p.end_time is not None:
-            logdir = p.logdir
-            db.session.delete(p)
-            import shutil
-            shutil.rmtree(logdir, True)
-        else:
-            p.acknowledge = get_current_time()
+            if p.end_time is not None:
+                BatchProcess._remove(p)
+            elif BatchProcess._is_queued(p):
+                os.environ.pop(str(p.pid), None)
+                BatchProcess._remove(p)
+            else:
+                p.acknowledge = get_current_time()
 
-        db.session.commit()
+            db.session.commit()
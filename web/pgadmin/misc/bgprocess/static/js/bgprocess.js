@@ -39,6 +39,7 @@ define('misc.bgprocess', [
           exit_code: null,
           acknowledge: info['acknowledge'],
           execution_time: null,
+          progress: null,
           out: -1,
           err: -1,
           lot_more: false,
@@ -105,7 +106,8 @@ define('misc.bgprocess', [
           out = [],
           err = [];
 
-        if ('stime' in data)
+        // Queued processes do not have the start time yet
+        if ('stime' in data && data.stime)
           self.stime = new Date(data.stime);
 
         if ('execution_time' in data)
@@ -120,6 +122,9 @@ define('misc.bgprocess', [
         if ('exit_code' in data)
           self.exit_code = data.exit_code;
 
+        if ('progress' in data)
+          self.progress = data.progress;
+
         if ('out' in data) {
           self.out = data.out && data.out.pos;
 
@@ -178,6 +183,25 @@ define('misc.bgprocess', [
             self.curr_status = gettext['Running...'];
           }
 
+          if (self.progress && _.isNull(self.exit_code)) {
+            var details = [];
+            if (!_.isNull(self.progress.percent))
+              details.push(self.progress.percent + '%');
+            if (!_.isNull(self.progress.mb_per_sec))
+              details.push(self.progress.mb_per_sec + ' MB/s');
+            if (!_.isNull(self.progress.rows_per_sec))
+              details.push(self.progress.rows_per_sec + ' ' + gettext('rows/s'));
+            if (!_.isNull(self.progress.eta))
+              details.push(
+                S(gettext('%s seconds remaining')).sprintf(
+                  String(Math.round(self.progress.eta))
+                ).value()
+              );
+            if (details.length)
+              self.curr_status = gettext('Running...') + ' (' +
+                details.join(', ') + ')';
+          }
+
           if (!_.isNull(self.exit_code)) {
             if (self.exit_code == 0) {
               self.curr_status = gettext('Successfully completed.');
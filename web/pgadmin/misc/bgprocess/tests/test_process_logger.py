@@ -0,0 +1,97 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pgadmin.misc.bgprocess import process_executor
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+
+class BGProcessLoggerTestCase(BaseTestGenerator):
+    """Test the chunked logging of the output of a background process"""
+    scenarios = [
+        ('Lines split across the chunks',
+         dict(
+             chunks=[b'first li', b'ne\r\nsecond line\nthi', b'rd line'],
+             max_line=0,
+             max_size=0,
+             expected=[b'first line', b'second line', b'third line'],
+             expected_files=['out']
+         )),
+        ('Oversized lines are truncated',
+         dict(
+             chunks=[b'short\n' + b'x' * 30, b'x' * 30 + b'\nend\n'],
+             max_line=10,
+             max_size=0,
+             expected=[b'short', b'x' * 10 + b' ... [50 bytes truncated]',
+                       b'end'],
+             expected_files=['out']
+         )),
+        ('Log file is rotated, and the old segment compressed',
+         dict(
+             chunks=[b'a' * 40 + b'\n', b'b' * 40 + b'\n',
+                     b'c' * 40 + b'\n'],
+             max_line=0,
+             max_size=100,
+             expected=[b'c' * 40],
+             expected_files=['out.1', 'out.gz']
+         ))
+    ]
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def runTest(self):
+        with patch.multiple(
+            process_executor, _out_dir=self.out_dir,
+            _MAX_LINE_LENGTH=self.max_line, _MAX_LOG_SIZE=self.max_size,
+            _COMPRESS_LOGS=True, _status=dict()
+        ):
+            logger = process_executor.ProcessLogger('out')
+            for chunk in self.chunks:
+                logger.feed(chunk)
+                logger.flush()
+            # The last line may not be terminated by a newline
+            if logger.partial:
+                logger.feed(b'\n')
+            logger.release()
+
+            status = process_executor._status['out']
+
+        with open(os.path.join(self.out_dir, status['file']), 'rb') as fp:
+            lines = [line.split(b',', 1)[1] for line in fp.read().splitlines()]
+
+        self.assertEqual(lines, self.expected)
+        self.assertEqual(
+            status['pos'] - status['base'],
+            os.path.getsize(os.path.join(self.out_dir, status['file']))
+        )
+
+        files = [f for f in os.listdir(self.out_dir) if f.startswith('out')]
+        # The old segments are compressed in the background
+        for _ in range(50):
+            if sorted(files) == self.expected_files:
+                break
+            time.sleep(0.1)
+            files = [
+                f for f in os.listdir(self.out_dir) if f.startswith('out')
+            ]
+        self.assertEqual(sorted(files), self.expected_files)
@@ -0,0 +1,99 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+
+from pgadmin.misc.bgprocess.process_executor import ProgressMeter
+from pgadmin.misc.bgprocess.processes import get_progress
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+
+class BGProcessProgressTestCase(BaseTestGenerator):
+    """Test the progress computed from the metered progress"""
+    scenarios = [
+        ('Progress of a restore as per the archive consumed',
+         dict(
+             progress={'bytes_done': 25 * 1024 * 1024,
+                       'bytes_total': 100 * 1024 * 1024,
+                       'tables_done': 1, 'tables_total': 10,
+                       'rows_done': None},
+             end_time=None,
+             expected={'percent': 25.0, 'mb_per_sec': 2.5, 'eta': 30.0,
+                       'rows_per_sec': None}
+         )),
+        ('Progress of a restore as per the tables restored',
+         dict(
+             progress={'bytes_done': None, 'bytes_total': None,
+                       'tables_done': 5, 'tables_total': 10,
+                       'rows_done': None},
+             end_time=None,
+             expected={'percent': 50.0, 'mb_per_sec': None, 'eta': 10.0}
+         )),
+        ('Progress of a finished import',
+         dict(
+             progress={'bytes_done': 1024 * 1024, 'bytes_total': 1024 * 1024,
+                       'tables_done': None, 'tables_total': None,
+                       'rows_done': 1000},
+             end_time='2018-01-01 10:00:10.000000 +0000',
+             expected={'percent': 100.0, 'rows_per_sec': 100.0, 'eta': 0}
+         ))
+    ]
+
+    @patch('pgadmin.misc.bgprocess.processes.get_current_time')
+    def runTest(self, get_current_time_mock):
+        # 10 seconds after the start
+        get_current_time_mock.return_value = \
+            '2018-01-01 10:00:10.000000 +0000'
+
+        res = get_progress({
+            'start_time': '2018-01-01 10:00:00.000000 +0000',
+            'progress': self.progress
+        }, self.end_time)
+
+        for key, value in self.expected.items():
+            self.assertEqual(res[key], value)
+
+
+class ProgressMeterParseTestCase(BaseTestGenerator):
+    """Test the parsing of the verbose output by the progress meter"""
+    scenarios = [
+        ('Count the tables dumped by pg_dump',
+         dict(
+             config={'tables': True},
+             lines=[('err', b'pg_dump: dumping contents of table "public.a"'),
+                    ('err', b'pg_dump: dumping contents of table "public.b"'),
+                    ('err', b'pg_dump: saving encoding = UTF8')],
+             expected={'tables_done': 2, 'rows_done': None}
+         )),
+        ('Count the tables restored by pg_restore',
+         dict(
+             config={'tables': True},
+             lines=[('err', b'pg_restore: processing data for table "a"')],
+             expected={'tables_done': 1, 'rows_done': None}
+         )),
+        ('Find the rows copied by psql',
+         dict(
+             config={},
+             lines=[('out', b'COPY 12345\n')],
+             expected={'tables_done': None, 'rows_done': 12345}
+         ))
+    ]
+
+    def runTest(self):
+        meter = ProgressMeter(self.config)
+        for stream_type, line in self.lines:
+            meter.parse(stream_type, line)
+
+        for key, value in self.expected.items():
+            self.assertEqual(meter.progress[key], value)
@@ -0,0 +1,103 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import os
+import shutil
+import tempfile
+
+from pgadmin.misc.bgprocess.processes import compress_logs, \
+    get_processes_to_expire, open_log
+from pgadmin.utils.route import BaseTestGenerator
+
+NOW = '2018-01-31 10:00:00.000000 +0000'
+
+
+class FinishedProcess(object):
+    """Stands for a row of a finished process in the process table"""
+    def __init__(self, pid, user_id=1, days_ago=0, acknowledge=None):
+        self.pid = pid
+        self.user_id = user_id
+        self.end_time = '2018-01-%02d 09:00:00.000000 +0000' % (31 - days_ago)
+        self.acknowledge = acknowledge
+
+
+class BGProcessRetentionTestCase(BaseTestGenerator):
+    """Test the selection of the finished processes to be removed"""
+    scenarios = [
+        ('Remove the processes older than the maximum age',
+         dict(
+             finished=[FinishedProcess(1, days_ago=10),
+                       FinishedProcess(2, days_ago=3),
+                       FinishedProcess(3, days_ago=1)],
+             max_age=7, max_count=0, max_log_size=0, log_sizes={},
+             expected=[1]
+         )),
+        ('Keep the newest processes of each user within the maximum count',
+         dict(
+             finished=[FinishedProcess(1, 1, 5), FinishedProcess(2, 1, 4),
+                       FinishedProcess(3, 2, 3), FinishedProcess(4, 1, 2),
+                       FinishedProcess(5, 2, 1)],
+             max_age=0, max_count=2, max_log_size=0, log_sizes={},
+             expected=[1]
+         )),
+        ('Remove the oldest processes exceeding the maximum log size',
+         dict(
+             finished=[FinishedProcess(1, 1, 3), FinishedProcess(2, 2, 2),
+                       FinishedProcess(3, 1, 1)],
+             max_age=0, max_count=0, max_log_size=1000,
+             log_sizes={1: 300, 2: 400, 3: 500},
+             expected=[1]
+         )),
+        ('Remove the processes acknowledged while running',
+         dict(
+             finished=[FinishedProcess(1, days_ago=1,
+                                       acknowledge='2018-01-30'),
+                       FinishedProcess(2, days_ago=1)],
+             max_age=30, max_count=100, max_log_size=0, log_sizes={},
+             expected=[1]
+         ))
+    ]
+
+    def runTest(self):
+        expired = get_processes_to_expire(
+            self.finished, NOW, self.max_age, self.max_count,
+            self.max_log_size, self.log_sizes
+        )
+        self.assertEqual([p.pid for p in expired], self.expected)
+
+
+class BGProcessLogCompressionTestCase(BaseTestGenerator):
+    """Test the compression of the logs of a finished process"""
+    scenarios = [
+        ('Compress the logs, and read them back',
+         dict(
+             files={'out': b'1,out\n', 'out.1': b'2,more\n', 'err': b'',
+                    'status': b'{}'},
+             expected=['err.gz', 'out.1.gz', 'out.gz', 'status']
+         ))
+    ]
+
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.logdir)
+
+    def runTest(self):
+        for name, data in self.files.items():
+            with open(os.path.join(self.logdir, name), 'wb') as fp:
+                fp.write(data)
+
+        self.assertEqual(compress_logs(self.logdir), 3)
+        self.assertEqual(sorted(os.listdir(self.logdir)), self.expected)
+
+        for name in ('out', 'out.1'):
+            with open_log(os.path.join(self.logdir, name)) as fp:
+                fp.seek(2, 0)
+                self.assertEqual(fp.read(), self.files[name][2:])
@@ -0,0 +1,341 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pickle import dumps
+
+from pgadmin.misc.bgprocess.processes import BatchProcess, \
+    PASSWORD_HOLDER, get_current_time, get_processes_to_launch, \
+    get_processes_to_start, get_queue_info
+from pgadmin.model import Process, User, db
+from pgadmin.utils.route import BaseTestGenerator
+from regression.test_setup import config_data
+
+if sys.version_info < (3, 3):
+    from mock import patch, MagicMock
+else:
+    from unittest.mock import patch, MagicMock
+
+PROCESSES = 'pgadmin.misc.bgprocess.processes'
+NOW = '2018-01-01 10:00:00.000000 +0000'
+LATER = '2018-01-01 11:00:00.000000 +0000'
+
+
+class DummyProcess(object):
+    """Stands for a row in the process table"""
+    def __init__(self, pid, server_id=1, priority=0, not_before=None,
+                 command=None, arguments=None, logdir=None, holder=None):
+        self.pid = pid
+        self.server_id = server_id
+        self.priority = priority
+        self.queued_time = '2018-01-01 09:00:00.%06d +0000' % pid
+        self.not_before = not_before
+        self.command = command
+        self.arguments = arguments
+        self.logdir = logdir
+        self.env = None if holder is None else \
+            json.dumps({PASSWORD_HOLDER: holder})
+        self.launch_time = self.start_time = self.end_time = None
+        self.exit_code = None
+
+
+class BGProcessSchedulerTestCase(BaseTestGenerator):
+    """Test the selection of the queued processes to be started"""
+    scenarios = [
+        ('Start the queued processes in the order, within the global limit',
+         dict(
+             queued=[DummyProcess(1, 1), DummyProcess(2, 2),
+                     DummyProcess(3, 3)],
+             running=[DummyProcess(10, 4)],
+             max_running=3, max_running_per_server=0,
+             expected=[1, 2]
+         )),
+        ('Skip the processes of the servers, which reached the limit',
+         dict(
+             queued=[DummyProcess(1, 1), DummyProcess(2, 1),
+                     DummyProcess(3, 2)],
+             running=[DummyProcess(10, 1)],
+             max_running=0, max_running_per_server=1,
+             expected=[3]
+         )),
+        ('Start the processes with the higher priority first',
+         dict(
+             queued=[DummyProcess(1, 1), DummyProcess(2, 1, priority=5)],
+             running=[],
+             max_running=1, max_running_per_server=0,
+             expected=[2]
+         )),
+        ('Do not start the deferred processes before their time',
+         dict(
+             queued=[DummyProcess(1, 1, not_before=LATER),
+                     DummyProcess(2, 1)],
+             running=[],
+             max_running=0, max_running_per_server=0,
+             expected=[2]
+         ))
+    ]
+
+    def runTest(self):
+        res = get_processes_to_start(
+            self.queued, self.running, NOW, self.max_running,
+            self.max_running_per_server
+        )
+        self.assertEqual([p.pid for p in res], self.expected)
+
+        # Every queued process has a position in the queue
+        info = get_queue_info(
+            self.queued, self.running, NOW, 60, self.max_running,
+            self.max_running_per_server
+        )
+        self.assertEqual(
+            sorted(pos for pos, _ in info.values()),
+            list(range(1, len(self.queued) + 1))
+        )
+
+        # The processes to be started are expected to start now
+        for p in res:
+            if p.not_before is None:
+                self.assertEqual(
+                    info[p.pid][1].strftime('%Y-%m-%d %H:%M:%S.%f %z'), NOW
+                )
+
+
+class BGProcessLaunchTestCase(BaseTestGenerator):
+    """Launch a queued process running a dummy utility"""
+    scenarios = [
+        ('Launch a process with a dummy utility',
+         dict(exit_code=0, lines=3)),
+        ('Launch a failing process with a dummy utility',
+         dict(exit_code=3, lines=0))
+    ]
+
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+
+    def runTest(self):
+        p = DummyProcess(
+            1, command=sys.executable,
+            arguments='-c,import sys; print(("x\\n" * {0})[:-1]); '
+                      'sys.exit({1})'.format(self.lines, self.exit_code),
+            logdir=self.logdir
+        )
+
+        with self.app.app_context():
+            BatchProcess._launch(p)
+
+        self.assertIsNotNone(p.launch_time)
+
+        status = None
+        for _ in range(100):
+            try:
+                with open(os.path.join(self.logdir, 'status')) as fp:
+                    status = json.load(fp)
+                if status.get('exit_code', None) is not None:
+                    break
+            except (IOError, ValueError):
+                pass
+            time.sleep(0.1)
+
+        self.assertIsNotNone(status)
+        self.assertEqual(status['exit_code'], self.exit_code)
+
+        # The executor reports the size, and the lines of the flushed logs
+        if self.lines:
+            self.assertEqual(
+                status['out']['pos'],
+                os.path.getsize(os.path.join(self.logdir, 'out'))
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.logdir, True)
+
+
+class BGProcessPasswordTestCase(BaseTestGenerator):
+    """
+    Only the pgAdmin process holding the password of the server launches the
+    queued process
+    """
+    scenarios = [
+        ('Launch the processes queued without the password',
+         dict(
+             queued=[DummyProcess(1), DummyProcess(2)],
+             environ={}, alive=[],
+             expected=([1, 2], [])
+         )),
+        ('Launch the processes having the password in the environment',
+         dict(
+             queued=[DummyProcess(1, holder='host:1'),
+                     DummyProcess(2, holder='host:2')],
+             environ={'1': 'secret'}, alive=['host:2'],
+             expected=([1], [])
+         )),
+        ('Fail the processes, whose password is not available anymore',
+         dict(
+             queued=[DummyProcess(1, holder='host:1'),
+                     DummyProcess(2, holder='host:2')],
+             environ={}, alive=['host:2'],
+             expected=([], [1])
+         )),
+        ('Fail the processes, whose password has been lost by this process',
+         dict(
+             queued=[DummyProcess(1, holder='host:3')],
+             environ={}, alive=['host:3'],
+             expected=([], [1])
+         ))
+    ]
+
+    def runTest(self):
+        launchable, orphaned = get_processes_to_launch(
+            self.queued, self.environ, 'host:3',
+            lambda holder: holder in self.alive
+        )
+        self.assertEqual(
+            ([p.pid for p in launchable], [p.pid for p in orphaned]),
+            self.expected
+        )
+
+
+class BGProcessAcknowledgeTestCase(BaseTestGenerator):
+    """Acknowledging a queued process cancels it"""
+    scenarios = [
+        ('Acknowledge a queued process',
+         dict(url='/misc/bgprocess/'))
+    ]
+
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+        self.pid = datetime.now().strftime('%y%m%d%H%M%S%f') + '99'
+
+        with self.app.app_context():
+            user = User.query.filter_by(
+                email=config_data['pgAdmin4_login_credentials'][
+                    'login_username']
+            ).first()
+            # Deferred, so that the scheduler leaves it in the queue
+            db.session.add(Process(
+                pid=self.pid, user_id=user.id, command=sys.executable,
+                arguments='-c,pass', logdir=self.logdir,
+                desc=dumps(u'Queued process'), queued_time=get_current_time(),
+                not_before='2999-01-01 00:00:00.000000 +0000'
+            ))
+            db.session.commit()
+
+    def runTest(self):
+        response = self.tester.put(self.url + self.pid)
+        self.assertEquals(response.status_code, 200)
+
+        # The process is removed, and will never be launched
+        with self.app.app_context():
+            self.assertIsNone(Process.query.filter_by(pid=self.pid).first())
+        self.assertFalse(os.path.exists(self.logdir))
+
+        response = self.tester.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        self.assertNotIn(
+            self.pid,
+            [p['id'] for p in json.loads(response.data.decode('utf-8'))]
+        )
+
+    def tearDown(self):
+        with self.app.app_context():
+            Process.query.filter_by(pid=self.pid).delete()
+            db.session.commit()
+        shutil.rmtree(self.logdir, True)
+
+
+class BGProcessClaimTestCase(BaseTestGenerator):
+    """
+    The schedulers of the pgAdmin processes (using their own sessions) launch
+    a queued process only once, and apply the limits together
+    """
+    scenarios = [
+        ('Launch a queued process by one of the schedulers',
+         dict(queued=1, max_running_per_server=0, expected=1)),
+        ('Apply the limit per server across the schedulers',
+         dict(queued=3, max_running_per_server=1, expected=1))
+    ]
+
+    def setUp(self):
+        self.logdir = tempfile.mkdtemp()
+        self.server_id = 2 ** 31 - 1
+        self.pids = [
+            datetime.now().strftime('%y%m%d%H%M%S%f') + '9%d' % idx
+            for idx in range(self.queued)
+        ]
+
+        with self.app.app_context():
+            user = User.query.filter_by(
+                email=config_data['pgAdmin4_login_credentials'][
+                    'login_username']
+            ).first()
+            for pid in self.pids:
+                db.session.add(Process(
+                    pid=pid, user_id=user.id, command=sys.executable,
+                    arguments='-c,pass', logdir=self.logdir,
+                    desc=dumps(u'Queued process'),
+                    queued_time=get_current_time(), server_id=self.server_id
+                ))
+            db.session.commit()
+
+    def runTest(self):
+        launched = []
+        barrier = threading.Barrier(2) \
+            if hasattr(threading, 'Barrier') else None
+
+        def launch(p):
+            launched.append(p.pid)
+
+        def schedule():
+            # Each thread uses its own session (connection)
+            with self.app.app_context():
+                try:
+                    if barrier is not None:
+                        barrier.wait()
+                    BatchProcess.schedule()
+                finally:
+                    db.session.remove()
+
+        # The lock of this pgAdmin process is bypassed, as the schedulers
+        # stand for the different pgAdmin processes.
+        with patch(PROCESSES + '._scheduler_lock', MagicMock()), \
+                patch(PROCESSES + '.BatchProcess._launch',
+                      staticmethod(launch)), \
+                patch(PROCESSES + '.config.BG_PROCESS_MAX_RUNNING', 0), \
+                patch(PROCESSES + '.config.BG_PROCESS_MAX_RUNNING_PER_SERVER',
+                      self.max_running_per_server):
+            schedulers = [threading.Thread(target=schedule) for _ in range(2)]
+            for scheduler in schedulers:
+                scheduler.start()
+            for scheduler in schedulers:
+                scheduler.join()
+
+        mine = [pid for pid in launched if pid in self.pids]
+        self.assertEqual(len(mine), self.expected)
+        self.assertEqual(len(set(mine)), len(mine))
+
+        with self.app.app_context():
+            claimed = Process.query.filter(
+                Process.pid.in_(self.pids), Process.launch_time.isnot(None)
+            ).count()
+        self.assertEqual(claimed, self.expected)
+
+    def tearDown(self):
+        with self.app.app_context():
+            Process.query.filter(Process.pid.in_(self.pids)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+        shutil.rmtree(self.logdir, True)
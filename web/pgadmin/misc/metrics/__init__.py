@@ -0,0 +1,53 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+A blueprint module collecting the metrics of every request served by the
+application, and exposing them in the Prometheus text format.
+"""
+from flask import Response
+from flask_security import login_required, roles_required
+from pgadmin.utils import PgAdminModule
+from pgadmin.utils import metrics
+
+MODULE_NAME = 'metrics'
+
+# Initialise the module
+blueprint = PgAdminModule(MODULE_NAME, __name__, url_prefix='/metrics')
+
+
+@blueprint.before_app_request
+def start_request():
+    """Start collecting the metrics of the request."""
+    metrics.start_request()
+
+
+@blueprint.after_app_request
+def finish_request(response):
+    """Record the metrics of the request."""
+    metrics.finish_request()
+    return response
+
+
+@blueprint.teardown_app_request
+def teardown_request(exception=None):
+    """Record the metrics of the request, which failed with an exception."""
+    metrics.finish_request()
+
+
+@blueprint.route('/', methods=['GET'], endpoint='index')
+@login_required
+@roles_required('Administrator')
+def index():
+    """Returns the metrics collected in the Prometheus text format."""
+    return Response(
+        response=metrics.render(),
+        status=200,
+        mimetype='text/plain; version=0.0.4'
+    )
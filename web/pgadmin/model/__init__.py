@@ -29,7 +29,7 @@ from flask_sqlalchemy import SQLAlchemy
 #
 ##########################################################################
 
-SCHEMA_VERSION = 15
+SCHEMA_VERSION = 18
 
 ##########################################################################
 #
@@ -223,6 +223,60 @@ class Process(db.Model):
     end_time = db.Column(db.String(), nullable=True)
     exit_code = db.Column(db.Integer(), nullable=True)
     acknowledge = db.Column(db.String(), nullable=True)
+    server_id = db.Column(db.Integer(), nullable=True)
+    priority = db.Column(db.Integer(), nullable=True, default=0)
+    queued_time = db.Column(db.String(), nullable=True)
+    not_before = db.Column(db.String(), nullable=True)
+    launch_time = db.Column(db.String(), nullable=True)
+    env = db.Column(db.String(), nullable=True)
+
+
+class ProcessSummary(db.Model):
+    """
+    Define the ProcessSummary table - summary of the background processes
+    removed as per the retention limits.
+    """
+    __tablename__ = 'process_summary'
+    pid = db.Column(db.String(), nullable=False, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey('user.id'),
+        nullable=False
+    )
+    server_id = db.Column(db.Integer(), nullable=True)
+    command = db.Column(db.String(), nullable=False)
+    desc = db.Column(db.String(), nullable=True)
+    start_time = db.Column(db.String(), nullable=True)
+    end_time = db.Column(db.String(), nullable=True)
+    exit_code = db.Column(db.Integer(), nullable=True)
+    execution_time = db.Column(db.Float(), nullable=True)
+    log_size = db.Column(db.Integer(), nullable=True)
+    removed_time = db.Column(db.String(), nullable=False)
+
+
+class QueryHistory(db.Model):
+    """
+    Define the QueryHistory table - the queries executed in the Query Tool.
+    The queries are indexed for the full text search in the
+    query_history_fts table (maintained by the triggers).
+    """
+    __tablename__ = 'query_history'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey('user.id'),
+        nullable=False
+    )
+    server_id = db.Column(db.Integer(), nullable=True)
+    db_name = db.Column(db.String(), nullable=True)
+    query = db.Column(db.String(), nullable=False)
+    query_hash = db.Column(db.String(), nullable=False)
+    fingerprint = db.Column(db.String(), nullable=False)
+    start_time = db.Column(db.String(), nullable=False)
+    duration = db.Column(db.Float(), nullable=True)
+    rows = db.Column(db.Integer(), nullable=True)
+    status = db.Column(db.String(), nullable=False)
+    message = db.Column(db.String(), nullable=True)
 
 
 class Keys(db.Model):
@@ -17,7 +17,8 @@ from flask import render_template, request, current_app, \
     url_for, Response
 from flask_babel import gettext as _
 from flask_security import login_required, current_user
-from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc
+from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc, \
+    get_scheduling_options
 from pgadmin.utils import PgAdminModule, get_storage_directory, html, \
     fs_short_path, document_dir
 from pgadmin.utils.ajax import make_json_response, bad_request
@@ -321,10 +322,14 @@ def create_backup_job(sid):
                 ) else data['file'],
                 *args
             ),
-            cmd=utility, args=args
+            cmd=utility, args=args, sid=sid,
+            **get_scheduling_options(data)
         )
         manager.export_password_env(p.id)
-        p.start()
+        p.start(progress={
+            'file': backup_file, 'mode': 'write',
+            'tables': bool(data.get('verbose', False))
+        })
         jid = p.id
     except Exception as e:
         current_app.logger.exception(e)
@@ -483,10 +488,14 @@ def create_backup_objects_job(sid):
                 *args,
                 database=data['database']
             ),
-            cmd=utility, args=args
+            cmd=utility, args=args, sid=sid,
+            **get_scheduling_options(data)
         )
         manager.export_password_env(p.id)
-        p.start()
+        p.start(progress={
+            'file': backup_file, 'mode': 'write',
+            'tables': bool(data.get('verbose', False))
+        })
         jid = p.id
     except Exception as e:
         current_app.logger.exception(e)
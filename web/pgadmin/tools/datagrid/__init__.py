@@ -20,6 +20,7 @@ from flask import current_app as app
 from flask_babel import gettext
 from flask_security import login_required
 from pgadmin.tools.sqleditor.command import *
+from pgadmin.tools.sqleditor.statements import discard_script
 from pgadmin.utils import PgAdminModule
 from pgadmin.utils.ajax import make_json_response, bad_request, \
     internal_server_error
@@ -365,6 +366,10 @@ def close(trans_id):
         if conn.connected():
             manager.release(did=cmd_obj.did, conn_id=cmd_obj.conn_id)
 
+        # Discard the statements (and their result sets) of the script
+        # executed separately, if any.
+        discard_script((cmd_obj.sid, cmd_obj.conn_id))
+
         # Remove the information of unique transaction id from the session variable.
         grid_data.pop(str(trans_id), None)
         session['gridData'] = grid_data
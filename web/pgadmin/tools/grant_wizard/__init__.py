@@ -34,6 +34,21 @@ from pgadmin.utils.preferences import Preferences
 MODULE_NAME = 'grant_wizard'
 server_info = {}
 
+# Object types (in the order) fetched for a node type, along with the
+# template and its arguments to fetch the objects of the type
+OBJECT_TYPES = [
+    ('function', 'function.sql', {'type': 'function'}),
+    ('procedure', 'function.sql', {'type': 'procedure'}),
+    ('trigger_function', 'function.sql', {'type': 'trigger_function'}),
+    ('sequence', 'sequence.sql', {}),
+    ('table', 'table.sql', {}),
+    ('view', 'view.sql', {'node_type': 'v'}),
+    ('mview', 'view.sql', {'node_type': 'm'})
+]
+
+# Maximum number of objects granted the privileges in a single statement
+MAX_OBJECTS_PER_GRANT = 500
+
 
 class GrantWizardModule(PgAdminModule):
     """
@@ -191,11 +206,9 @@ def properties(sid, did, node_id, node_type):
 
     server_prop = server_info
 
-    res_data = []
     manager = get_driver(PG_DEFAULT_DRIVER).connection_manager(sid)
     conn = manager.connection(did=did)
 
-    node_types = []
     show_sysobj = blueprint.show_system_objects().get()
     if node_type == 'database':
 
@@ -205,117 +218,144 @@ def properties(sid, did, node_id, node_type):
         SQL = render_template("/".join(
             [server_prop['template_path'], '/sql/get_schemas.sql']),
             show_sysobj=show_sysobj)
-        status, res = conn.execute_dict(SQL)
-
-        if not status:
-            return internal_server_error(errormsg=res)
-        node_types = res['rows']
     else:
         SQL = render_template("/".join(
             [server_prop['template_path'], '/sql/get_schemas.sql']),
             nspid=node_id, show_sysobj=False)
-        status, res = conn.execute_dict(SQL)
-
-        if not status:
-            return internal_server_error(errormsg=res)
-        node_types = res['rows']
         ntype = node_type
 
-    for row in node_types:
-        if 'oid' in row:
-            node_id = row['oid']
-
-        # Fetch functions against schema
-        if ntype in ['schema', 'function']:
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/function.sql']),
-                node_id=node_id, type='function')
-
-            status, res = conn.execute_dict(SQL)
-
-            if not status:
-                return internal_server_error(errormsg=res)
+    status, res = conn.execute_dict(SQL)
 
-            res_data.extend(res['rows'])
+    if not status:
+        return internal_server_error(errormsg=res)
 
-        # Fetch procedures only if server type is ppas
-        if (len(server_prop) > 0 and
-                    server_prop['server_type'] == 'ppas' and
-                    ntype in ['schema', 'procedure']):
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/function.sql']),
-                node_id=node_id, type='procedure')
-
-            status, res = conn.execute_dict(SQL)
-
-            if not status:
-                return internal_server_error(errormsg=res)
-
-            res_data.extend(res['rows'])
-
-        # Fetch trigger functions
-        if ntype in ['schema', 'trigger_function']:
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/function.sql']),
-                node_id=node_id, type='trigger_function')
-            status, res = conn.execute_dict(SQL)
-
-            if not status:
-                return internal_server_error(errormsg=res)
-
-            res_data.extend(res['rows'])
+    nspids = [row['oid'] for row in res['rows']]
+    if len(nspids) == 0:
+        return ajax_response(
+            response=[],
+            status=200
+        )
 
-        # Fetch Sequences against schema
-        if ntype in ['schema', 'sequence']:
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/sequence.sql']),
-                node_id=node_id)
+    # Fetch the objects of all the object types, for all the schemas, with
+    # a single query
+    queries = []
+    for otype, template, args in OBJECT_TYPES:
+        if ntype not in ['schema', otype]:
+            continue
 
-            status, res = conn.execute_dict(SQL)
-            if not status:
-                return internal_server_error(errormsg=res)
-            res_data.extend(res['rows'])
+        # Procedures are only for the ppas servers
+        if otype == 'procedure' and server_prop['server_type'] != 'ppas':
+            continue
 
-        # Fetch Tables against schema
-        if ntype in ['schema', 'table']:
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/table.sql']),
-                node_id=node_id)
+        queries.append(render_template(
+            "/".join([server_prop['template_path'], '/sql/' + template]),
+            nspids=nspids, **args
+        ))
 
-            status, res = conn.execute_dict(SQL)
-            if not status:
-                return internal_server_error(errormsg=res)
+    # The objects can be fetched in the pages (limit, and offset)
+    try:
+        limit = int(request.args.get('limit', 0))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return make_json_response(
+            status=400,
+            success=0,
+            errormsg=gettext("Invalid limit or offset.")
+        )
 
-            res_data.extend(res['rows'])
+    SQL = render_template(
+        "/".join([server_prop['template_path'], '/sql/objects.sql']),
+        queries=queries, limit=limit, offset=offset
+    )
 
-        # Fetch Views against schema
-        if ntype in ['schema', 'view']:
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/view.sql']),
-                node_id=node_id, node_type='v')
+    status, res = conn.execute_dict(SQL)
+    if not status:
+        return internal_server_error(errormsg=res)
 
-            status, res = conn.execute_dict(SQL)
-            if not status:
-                return internal_server_error(errormsg=res)
+    return ajax_response(
+        response=res['rows'],
+        status=200
+    )
 
-            res_data.extend(res['rows'])
 
-        # Fetch Materialzed Views against schema
-        if ntype in ['schema', 'mview']:
-            SQL = render_template("/".join(
-                [server_prop['template_path'], '/sql/view.sql']),
-                node_id=node_id, node_type='m')
+def get_grant_objects(objects, object_types):
+    """
+    Returns the objects of the given object types, in the chunks of at most
+    MAX_OBJECTS_PER_GRANT objects, to be granted the privileges in bulk.
+    """
+    objects = [obj for obj in objects if obj['object_type'] in object_types]
 
-            status, res = conn.execute_dict(SQL)
-            if not status:
-                return internal_server_error(errormsg=res)
+    return [
+        objects[idx:idx + MAX_OBJECTS_PER_GRANT]
+        for idx in range(0, len(objects), MAX_OBJECTS_PER_GRANT)
+    ]
 
-            res_data.extend(res['rows'])
 
-    return ajax_response(
-        response=res_data,
-        status=200
-    )
+def get_grant_sql(server_prop, conn, data, acls):
+    """
+    Returns the SQL granting the privileges to the selected objects.
+    """
+    # Parse privileges
+    data['priv'] = {}
+    if 'acl' in data:
+        # Get function acls
+        data['priv']['function'] = parse_priv_to_db(
+            data['acl'],
+            acls['function']['acl'])
+
+        data['priv']['sequence'] = parse_priv_to_db(
+            data['acl'],
+            acls['sequence']['acl'])
+
+        data['priv']['table'] = parse_priv_to_db(
+            data['acl'],
+            acls['table']['acl'])
+
+    # Pass database objects and get SQL for privileges
+    SQL_data = ''
+    data_func = {
+        'objects': [
+            ('FUNCTION', objects) for objects in get_grant_objects(
+                data['objects'], ['Function', 'Trigger Function']
+            )
+        ] + [
+            ('PROCEDURE', objects) for objects in get_grant_objects(
+                data['objects'], ['Procedure']
+            )
+        ],
+        'priv': data['priv']['function']
+    }
+    SQL = render_template(
+        "/".join([server_prop['template_path'],
+                  '/sql/grant_function.sql']),
+        data=data_func, conn=conn)
+    if SQL and SQL.strip('\n') != '':
+        SQL_data += SQL
+
+    data_seq = {
+        'objects': get_grant_objects(data['objects'], ['Sequence']),
+        'priv': data['priv']['sequence']
+    }
+    SQL = render_template(
+        "/".join([server_prop['template_path'],
+                  '/sql/grant_sequence.sql']),
+        data=data_seq, conn=conn)
+    if SQL and SQL.strip('\n') != '':
+        SQL_data += SQL
+
+    data_table = {
+        'objects': get_grant_objects(
+            data['objects'], ['Table', 'View', 'Materialized View']
+        ),
+        'priv': data['priv']['table']
+    }
+    SQL = render_template(
+        "/".join([server_prop['template_path'], '/sql/grant_table.sql']),
+        data=data_table, conn=conn)
+    if SQL and SQL.strip('\n') != '':
+        SQL_data += SQL
+
+    return SQL_data
 
 
 @blueprint.route(
@@ -351,50 +391,7 @@ def msql(sid, did):
         current_app.logger.exception(e)
 
     try:
-
-        # Parse privileges
-        data['priv'] = {}
-        if 'acl' in data:
-            # Get function acls
-            data['priv']['function'] = parse_priv_to_db(
-                data['acl'],
-                acls['function']['acl'])
-
-            data['priv']['sequence'] = parse_priv_to_db(
-                data['acl'],
-                acls['sequence']['acl'])
-
-            data['priv']['table'] = parse_priv_to_db(
-                data['acl'],
-                acls['table']['acl'])
-
-        # Pass database objects and get SQL for privileges
-        SQL_data = ''
-        data_func = {'objects': data['objects'],
-                     'priv': data['priv']['function']}
-        SQL = render_template(
-            "/".join([server_prop['template_path'],
-                      '/sql/grant_function.sql']),
-            data=data_func, conn=conn)
-        if SQL and SQL.strip('\n') != '':
-            SQL_data += SQL
-
-        data_seq = {'objects': data['objects'],
-                    'priv': data['priv']['sequence']}
-        SQL = render_template(
-            "/".join([server_prop['template_path'],
-                      '/sql/grant_sequence.sql']),
-            data=data_seq, conn=conn)
-        if SQL and SQL.strip('\n') != '':
-            SQL_data += SQL
-
-        data_table = {'objects': data['objects'],
-                      'priv': data['priv']['table']}
-        SQL = render_template(
-            "/".join([server_prop['template_path'], '/sql/grant_table.sql']),
-            data=data_table, conn=conn)
-        if SQL and SQL.strip('\n') != '':
-            SQL_data += SQL
+        SQL_data = get_grant_sql(server_prop, conn, data, acls)
 
         res = {'data': SQL_data}
 
@@ -438,51 +435,7 @@ def save(sid, did):
         current_app.logger.exception(e)
 
     try:
-
-        # Parse privileges
-        data['priv'] = {}
-        if 'acl' in data:
-            # Get function acls
-            data['priv']['function'] = parse_priv_to_db(
-                data['acl'],
-                acls['function']['acl'])
-
-            data['priv']['sequence'] = parse_priv_to_db(
-                data['acl'],
-                acls['sequence']['acl'])
-
-            data['priv']['table'] = parse_priv_to_db(
-                data['acl'],
-                acls['table']['acl'])
-
-        # Pass database objects and get SQL for privileges
-        # Pass database objects and get SQL for privileges
-        SQL_data = ''
-        data_func = {'objects': data['objects'],
-                     'priv': data['priv']['function']}
-        SQL = render_template(
-            "/".join([server_prop['template_path'],
-                      '/sql/grant_function.sql']),
-            data=data_func, conn=conn)
-        if SQL and SQL.strip('\n') != '':
-            SQL_data += SQL
-
-        data_seq = {'objects': data['objects'],
-                    'priv': data['priv']['sequence']}
-        SQL = render_template(
-            "/".join([server_prop['template_path'],
-                      '/sql/grant_sequence.sql']),
-            data=data_seq, conn=conn)
-        if SQL and SQL.strip('\n') != '':
-            SQL_data += SQL
-
-        data_table = {'objects': data['objects'],
-                      'priv': data['priv']['table']}
-        SQL = render_template(
-            "/".join([server_prop['template_path'], '/sql/grant_table.sql']),
-            data=data_table, conn=conn)
-        if SQL and SQL.strip('\n') != '':
-            SQL_data += SQL
+        SQL_data = get_grant_sql(server_prop, conn, data, acls)
 
         status, res = conn.execute_dict(SQL_data)
         if not status:
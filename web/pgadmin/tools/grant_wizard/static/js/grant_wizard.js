@@ -633,13 +633,35 @@ define([
               */
               $('.wizard-progress-bar p').show();
 
-              coll.fetch({
-                success: function() {
-                  $('.wizard-progress-bar p').html('');
-                  $('.wizard-progress-bar').hide();
-                },
-                reset: true,
-              }, this);
+              /**
+                Fetch the objects in the pages, so that the objects fetched
+                are shown (and can be selected) while the rest are fetched
+              */
+              var pageSize = 1000,
+                fetchPage = function(offset) {
+                  coll.fetch({
+                    data: {
+                      'offset': offset,
+                      'limit': pageSize,
+                    },
+                    success: function(c, res) {
+                      if (!self.coll) {
+                        // The wizard has been closed
+                        return;
+                      }
+                      if (_.isArray(res) && res.length == pageSize) {
+                        fetchPage(offset + pageSize);
+                        return;
+                      }
+                      $('.wizard-progress-bar p').html('');
+                      $('.wizard-progress-bar').hide();
+                    },
+                    reset: offset == 0,
+                    remove: false,
+                  }, this);
+                };
+
+              fetchPage(0);
 
               //////////////////////////////////////////////////////////////////////
               //                                                                  //
@@ -1,9 +1,12 @@
 {# ===== Grant Permissions on Database Objects Selected ==== #}
-{% import 'macros/schemas/privilege.macros' as PRIVILEGE %}
-{% for obj in data.objects -%}
+{# Objects (chunks) are granted the privileges in bulk #}
 {% for priv in data.priv -%}
-{% if obj.object_type == 'Table' or obj.object_type == 'View' or obj.object_type == 'Materialized View'%}
-{{ PRIVILEGE.SET(conn, 'TABLE', priv['grantee'], obj.name, priv['without_grant'], priv['with_grant'], obj.nspname ) }}
+{% for objects in data.objects -%}
+{% if priv['without_grant'] %}
+GRANT {{ priv['without_grant']|join(', ') }} ON TABLE {% for obj in objects %}{% if not loop.first %}, {% endif %}{{ conn|qtIdent(obj.nspname, obj.name) }}{% endfor %} TO {{ priv['grantee'] }};
+{% endif %}
+{% if priv['with_grant'] %}
+GRANT {{ priv['with_grant']|join(', ') }} ON TABLE {% for obj in objects %}{% if not loop.first %}, {% endif %}{{ conn|qtIdent(obj.nspname, obj.name) }}{% endfor %} TO {{ priv['grantee'] }} WITH GRANT OPTION;
 {% endif %}
 {% endfor -%}
 {% endfor -%}
@@ -0,0 +1,11 @@
+{# ===== Fetch list of Database objects of all the object types at once ===== #}
+{% if queries %}
+SELECT * FROM (
+{{ queries|join('UNION ALL\n') }}
+) obj
+ORDER BY
+    object_type, nspname, name, proargs
+{% if limit %}
+LIMIT {{ limit }} OFFSET {{ offset }}
+{% endif %}
+{% endif %}
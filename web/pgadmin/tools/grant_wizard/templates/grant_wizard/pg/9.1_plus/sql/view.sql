@@ -1,9 +1,10 @@
 {# ===== Fetch list of Database object types(View) ===== #}
-{% if node_id and node_type %}
+{% if nspids and node_type %}
 {% set ntype = "View" if node_type == 'v' else "Materialized View" %}
 SELECT
     c.relname AS name,
     nsp.nspname AS nspname,
+    NULL::text AS proargs,
     '{{ ntype }}' AS object_type,
     'icon-view' AS icon
 FROM
@@ -24,7 +25,5 @@ WHERE
       ))
      ) AND (c.relkind = '{{ node_type }}'::char)
     )
-    AND c.relnamespace = {{ node_id }}::oid
-ORDER BY
-    c.relname
+    AND c.relnamespace = ANY(ARRAY[{{ nspids|join(', ') }}]::oid[])
 {% endif %}
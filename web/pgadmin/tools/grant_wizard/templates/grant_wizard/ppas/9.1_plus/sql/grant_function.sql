@@ -1,9 +1,12 @@
 {# ===== Grant Permissions on Database Objects Selected ==== #}
-{% import 'macros/functions/privilege.macros' as PRIVILEGE_FUNCTION %}
-{% for obj in data.objects -%}
+{# Objects (chunks) are granted the privileges in bulk #}
 {% for priv in data.priv -%}
-{% if (obj.object_type == 'Function' or obj.object_type == 'Trigger Function' or obj.object_type == 'Procedure') %}{% set func_type = 'PROCEDURE' if obj.object_type == 'Procedure' else 'FUNCTION' if obj.object_type == 'Function' or obj.object_type == 'Trigger Function' -%}
-{{ PRIVILEGE_FUNCTION.SET(conn, func_type, priv['grantee'], obj.name, priv['without_grant'], priv['with_grant'], obj.nspname, obj.proargs)}}
-{% endif -%}
+{% for func_type, objects in data.objects -%}
+{% if priv['without_grant'] %}
+GRANT {{ priv['without_grant']|join(', ') }} ON {{ func_type }} {% for obj in objects %}{% if not loop.first %}, {% endif %}{{ conn|qtIdent(obj.nspname, obj.name) }}({{ obj.proargs }}){% endfor %} TO {{ priv['grantee'] }};
+{% endif %}
+{% if priv['with_grant'] %}
+GRANT {{ priv['with_grant']|join(', ') }} ON {{ func_type }} {% for obj in objects %}{% if not loop.first %}, {% endif %}{{ conn|qtIdent(obj.nspname, obj.name) }}({{ obj.proargs }}){% endfor %} TO {{ priv['grantee'] }} WITH GRANT OPTION;
+{% endif %}
 {% endfor -%}
 {% endfor -%}
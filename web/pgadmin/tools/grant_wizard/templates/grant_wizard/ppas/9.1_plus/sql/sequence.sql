@@ -1,8 +1,9 @@
 {# ===== Fetch list of Database object types(Sequence) ===== #}
-{% if node_id %}
+{% if nspids %}
 SELECT
     cl.relname AS name,
     nsp.nspname AS nspname,
+    NULL::text AS proargs,
     'Sequence' AS object_type,
     'icon-sequence' AS icon
 FROM
@@ -10,7 +11,5 @@ FROM
 JOIN pg_namespace nsp ON nsp.oid=cl.relnamespace
 LEFT OUTER JOIN pg_description des ON (des.objoid=cl.oid AND des.classoid='pg_class'::regclass)
 WHERE
-    relkind = 'S' AND relnamespace  = {{ node_id }}::oid
-ORDER BY
-    cl.relname
+    relkind = 'S' AND relnamespace  = ANY(ARRAY[{{ nspids|join(', ') }}]::oid[])
 {% endif %}
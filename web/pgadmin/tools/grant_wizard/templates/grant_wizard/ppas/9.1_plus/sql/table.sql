@@ -1,8 +1,9 @@
 {# ===== Fetch list of Database object types(Tables) ===== #}
-{% if node_id %}
+{% if nspids %}
 SELECT
     rel.relname AS name,
     nsp.nspname AS nspname,
+    NULL::text AS proargs,
     'Table' AS object_type,
     'icon-table' AS icon
 FROM
@@ -14,7 +15,5 @@ LEFT OUTER JOIN pg_constraint con ON con.conrelid=rel.oid AND con.contype='p'
 LEFT OUTER JOIN pg_class tst ON tst.oid = rel.reltoastrelid
 LEFT JOIN pg_type typ ON rel.reloftype=typ.oid
 WHERE
-    rel.relkind IN ('r','s','t') AND rel.relnamespace = {{ node_id }}::oid
-ORDER BY
-    rel.relname
+    rel.relkind IN ('r','s','t') AND rel.relnamespace = ANY(ARRAY[{{ nspids|join(', ') }}]::oid[])
 {% endif %}
@@ -1,10 +1,11 @@
 {# ===== Fetch list of Database object types(View) ===== #}
-{% if node_id and node_type %}
+{% if nspids and node_type %}
 {% set ntype = "View" if node_type == 'v' else "Materialized View" %}
 {% set view_icon = "icon-view" if node_type == 'v' else "icon-mview" %}
 SELECT
     c.relname AS name,
     nsp.nspname AS nspname,
+    NULL::text AS proargs,
     '{{ ntype }}' AS object_type,
     '{{ view_icon }}' AS icon
 FROM
@@ -25,7 +26,5 @@ WHERE
       ))
      ) AND (c.relkind = '{{ node_type }}'::char)
     )
-    AND c.relnamespace = {{ node_id }}::oid
-ORDER BY
-    c.relname
+    AND c.relnamespace = ANY(ARRAY[{{ nspids|join(', ') }}]::oid[])
 {% endif %}
@@ -0,0 +1,61 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import sys
+
+from pgadmin.tools import grant_wizard
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+
+def make_objects(object_type, count):
+    return [
+        {'object_type': object_type, 'name': 'obj%d' % idx,
+         'nspname': 'public'} for idx in range(count)
+    ]
+
+
+class GrantWizardObjectsTestCase(BaseTestGenerator):
+    """Test the grouping of the selected objects for the bulk grants"""
+    scenarios = [
+        ('Pick the objects of the given types only',
+         dict(
+             objects=make_objects('Table', 2) + make_objects('Sequence', 3) +
+             make_objects('View', 1),
+             object_types=['Table', 'View', 'Materialized View'],
+             expected=[3]
+         )),
+        ('Split the objects in the chunks',
+         dict(
+             objects=make_objects('Table', 5),
+             object_types=['Table'],
+             expected=[2, 2, 1]
+         )),
+        ('No objects of the given types',
+         dict(
+             objects=make_objects('Sequence', 3),
+             object_types=['Function', 'Trigger Function'],
+             expected=[]
+         ))
+    ]
+
+    @patch('pgadmin.tools.grant_wizard.MAX_OBJECTS_PER_GRANT', 2)
+    def runTest(self):
+        chunks = grant_wizard.get_grant_objects(
+            self.objects, self.object_types
+        )
+
+        self.assertEqual([len(chunk) for chunk in chunks], self.expected)
+        for chunk in chunks:
+            for obj in chunk:
+                self.assertIn(obj['object_type'], self.object_types)
@@ -10,21 +10,28 @@
 """A blueprint module implementing the import and export functionality"""
 
 import simplejson as json
+import csv
 import os
 
 from flask import url_for, Response, render_template, request, current_app
 from flask_babel import gettext as _
 from flask_security import login_required, current_user
-from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc
+from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc, \
+    get_scheduling_options, get_python_interpreter
+from pgadmin.tools.import_export import copy_worker
 from pgadmin.utils import PgAdminModule, get_storage_directory, html, \
-    fs_short_path, document_dir, IS_WIN
-from pgadmin.utils.ajax import make_json_response, bad_request
+    fs_short_path, document_dir, IS_WIN, IS_PY2
+from pgadmin.utils.ajax import make_json_response, bad_request, \
+    internal_server_error
 
+import config
 from config import PG_DEFAULT_DRIVER
 from pgadmin.model import Server
 
 MODULE_NAME = 'import_export'
 
+ENGINES = ['psql', 'copy']
+
 
 class ImportExportModule(PgAdminModule):
     """
@@ -58,7 +65,7 @@ class ImportExportModule(PgAdminModule):
         Returns:
             list: URL endpoints for backup module
         """
-        return ['import_export.create_job']
+        return ['import_export.create_job', 'import_export.create_schema_job']
 
 
 blueprint = ImportExportModule(MODULE_NAME, __name__)
@@ -149,6 +156,56 @@ class IEMessage(IProcessDesc):
         return res
 
 
+class SchemaExportMessage(IEMessage):
+    """
+    SchemaExportMessage(IEMessage)
+
+    Defines the message shown for the schema export operation.
+    """
+
+    @property
+    def message(self):
+        # Fetch the server details like hostname, port, roles etc
+        s = Server.query.filter_by(
+            id=self.sid, user_id=current_user.id
+        ).first()
+
+        return _(
+            "Exporting the tables of the schema '{0}' on database '{1}' "
+            "and server ({2}:{3})..."
+        ).format(
+            self.schema, self.database, s.host, s.port
+        )
+
+    def details(self, cmd, args):
+        # Fetch the server details like hostname, port, roles etc
+        s = Server.query.filter_by(
+            id=self.sid, user_id=current_user.id
+        ).first()
+
+        res = '<div class="h5">'
+        res += _(
+            "Exporting the tables of the schema '{0}' on database '{1}' "
+            "for the server '{2}'..."
+        ).format(
+            html.safe_str(self.schema),
+            html.safe_str(self.database),
+            "{0} ({1}:{2})".format(
+                html.safe_str(s.name),
+                html.safe_str(s.host),
+                html.safe_str(s.port)
+            )
+        )
+
+        res += '</div><div class="h5">'
+        res += _("Running command:")
+        res += '</b><br><span class="pg-bg-cmd enable-selection">'
+        res += html.safe_str(self._cmd)
+        res += '</span></div>'
+
+        return res
+
+
 @blueprint.route("/")
 @login_required
 def index():
@@ -193,6 +250,124 @@ def filename_with_file_manager_path(_file, _present=False):
     return fs_short_path(_file)
 
 
+def get_copy_options(data):
+    """
+    Args:
+        data: Import/export options sent by the client
+
+    Returns:
+        Tuple of the engine, compression, buffer size, and an error message
+        (if any)
+    """
+    engine = data.get('engine', None) or config.IMPORT_EXPORT_ENGINE
+    if engine not in ENGINES:
+        return None, None, None, _('Invalid import/export engine.')
+
+    compression = copy_worker.get_compression(
+        data['filename'], data.get('compression', None)
+    )
+
+    try:
+        buffer_size = int(
+            data.get('buffer_size', None) or config.IMPORT_EXPORT_BUFFER_SIZE
+        )
+    except (TypeError, ValueError):
+        buffer_size = 0
+    if buffer_size <= 0:
+        return None, None, None, _('Invalid buffer size.')
+
+    if compression is not None and engine != 'copy':
+        return None, None, None, _(
+            'Compressed files are only supported by the copy engine.'
+        )
+    if compression == 'zstd' and copy_worker.zstandard is None:
+        return None, None, None, _(
+            'The zstandard package is required for zstd compressed files.'
+        )
+
+    return engine, compression, buffer_size, None
+
+
+def get_mapped_columns(data, compression):
+    """
+    Find out the table columns in the order of the columns in the header of
+    the file to be imported, as per the column mapping.
+
+    Args:
+        data: Import options (having 'column_mapping' - a dictionary of the
+              name of the column in the file to the name of the column in the
+              table, the unmapped columns are imported into the columns
+              having the same name)
+        compression: Compression of the file
+
+    Returns:
+        list of the table columns
+    """
+    mapping = data['column_mapping']
+
+    with copy_worker.open_file(
+        data['filename'], 'rb', compression
+    ) as stream:
+        line = copy_worker.read_first_line(stream)
+
+    line = line.decode(data.get('encoding', None) or 'utf-8')
+
+    delimiter = data.get('delimiter', None) or ','
+    if delimiter == '[tab]':
+        delimiter = '\t'
+    quote = data.get('quote', None) or '"'
+
+    if IS_PY2:
+        # The csv module does not support unicode in python 2
+        header = [
+            col.decode('utf-8') for col in next(csv.reader(
+                [line.encode('utf-8')], delimiter=str(delimiter),
+                quotechar=str(quote)
+            ))
+        ]
+    else:
+        header = next(csv.reader([line], delimiter=delimiter, quotechar=quote))
+
+    return [mapping.get(col, col) for col in header]
+
+
+def get_parallel_arguments(conn, data, columns, ignore_column_list, jobs,
+                           transaction):
+    """
+    Returns:
+        Arguments of the COPY worker for importing the file in parallel
+    """
+    # The header is skipped by the worker, and not by the COPY command
+    # run for each chunk.
+    options = render_template(
+        'import_export/sql/copy_options.sql',
+        conn=conn,
+        data=dict(data, header=False),
+        ignore_column_list=ignore_column_list
+    )
+
+    args = [
+        '--jobs', str(jobs),
+        '--transaction', transaction,
+        '--chunk-size', str(config.IMPORT_PARALLEL_CHUNK_SIZE),
+        '--schema', data['schema'],
+        '--table', data['table'],
+        '--options', options.strip()
+    ]
+    if columns:
+        args.extend(['--columns', columns])
+    if data['format'] == 'csv':
+        quote = data.get('quote', None) or '"'
+        args.extend([
+            '--quote', quote,
+            '--escape', data.get('escape', None) or quote
+        ])
+        if data.get('header', False):
+            args.append('--skip-header')
+
+    return args
+
+
 @blueprint.route('/job/<int:sid>', methods=['POST'], endpoint="create_job")
 @login_required
 def create_import_export_job(sid):
@@ -252,6 +427,41 @@ def create_import_export_job(sid):
     else:
         return bad_request(errormsg=_('Please specify a valid file'))
 
+    engine, compression, buffer_size, errmsg = get_copy_options(data)
+    if errmsg:
+        return bad_request(errormsg=errmsg)
+
+    try:
+        jobs = int(data.get('jobs', None) or 1)
+    except (TypeError, ValueError):
+        jobs = 0
+    if jobs <= 0:
+        return bad_request(errormsg=_('Invalid number of parallel jobs.'))
+
+    transaction = data.get('transaction', None) or 'chunk'
+    if transaction not in copy_worker.TRANSACTIONS:
+        return bad_request(errormsg=_('Invalid transaction mode.'))
+
+    if jobs > 1 and (engine != 'copy' or not data['is_import'] or
+                     data['format'] == 'binary'):
+        return bad_request(errormsg=_(
+            'Only the text/CSV files can be imported in parallel using the '
+            'copy engine.'
+        ))
+    jobs = min(jobs, config.IMPORT_MAX_PARALLEL_JOBS)
+
+    if data.get('column_mapping', None):
+        if not data['is_import'] or data['format'] != 'csv' or \
+                not data.get('header', False):
+            return bad_request(errormsg=_(
+                'Column mapping is only supported for importing the CSV '
+                'files having the header.'
+            ))
+        try:
+            data['columns'] = get_mapped_columns(data, compression)
+        except Exception as e:
+            return bad_request(errormsg=str(e))
+
     cols = None
     icols = None
 
@@ -288,10 +498,29 @@ def create_import_export_job(sid):
         conn=conn,
         data=data,
         columns=cols,
-        ignore_column_list=icols
+        ignore_column_list=icols,
+        stdio=(engine == 'copy')
     )
 
-    args = ['--command', query]
+    if engine == 'copy':
+        # Run the COPY command in-process using the python worker
+        utility = get_python_interpreter()
+        args = [
+            os.path.join(os.path.dirname(__file__), 'copy_worker.py'),
+            '--mode', 'import' if data['is_import'] else 'export',
+            '--file', data['filename'],
+            '--buffer-size', str(buffer_size),
+            '--format', data['format']
+        ]
+        if compression is not None:
+            args.extend(['--compression', compression])
+        if jobs > 1:
+            args.extend(get_parallel_arguments(
+                conn, data, cols, icols, jobs, transaction
+            ))
+        args.extend(['--command', query])
+    else:
+        args = ['--command', query]
 
     try:
         p = BatchProcess(
@@ -303,7 +532,8 @@ def create_import_export_job(sid):
                 storage_dir,
                 utility, *args
             ),
-            cmd=utility, args=args
+            cmd=utility, args=args, sid=sid,
+            **get_scheduling_options(data)
         )
         manager.export_password_env(p.id)
         def export_pg_env(env):
@@ -312,7 +542,169 @@ def create_import_export_job(sid):
             env['PGUSER'] = server.username
             env['PGDATABASE'] = data['database']
 
-        p.start(export_pg_env)
+        p.start(export_pg_env, progress={
+            'file': data['filename'],
+            'mode': 'read' if data['is_import'] else 'write'
+        })
+        jid = p.id
+    except Exception as e:
+        current_app.logger.exception(e)
+        return bad_request(errormsg=str(e))
+
+    # Return response
+    return make_json_response(
+        data={'job_id': jid, 'success': 1}
+    )
+
+
+def directory_with_file_manager_path(_dir):
+    """
+    Args:
+        _dir: Directory name returned from client file manager
+
+    Returns:
+        Directory to use for the export with full path taken from preference,
+        it is created (if not present)
+    """
+    storage_dir = get_storage_directory()
+
+    if storage_dir:
+        _dir = os.path.join(storage_dir, _dir.lstrip(u'/').lstrip(u'\\'))
+    elif not os.path.isabs(_dir):
+        _dir = os.path.join(document_dir(), _dir)
+
+    if not os.path.isdir(_dir):
+        os.makedirs(_dir)
+
+    return fs_short_path(_dir)
+
+
+@blueprint.route(
+    '/job/schema/<int:sid>/<int:did>', methods=['POST'],
+    endpoint="create_schema_job"
+)
+@login_required
+def create_schema_export_job(sid, did):
+    """
+    Args:
+        sid: Server ID
+        did: Database ID
+
+        Creates a new job for exporting all the tables of a schema into a
+        directory (one file per table, along with a manifest)
+
+    Returns:
+        None
+    """
+    if request.form:
+        # Convert ImmutableDict to dict
+        data = dict(request.form)
+        data = json.loads(data['data'][0], encoding='utf-8')
+    else:
+        data = json.loads(request.data, encoding='utf-8')
+
+    # Fetch the server details like hostname, port, roles etc
+    server = Server.query.filter_by(
+        id=sid).first()
+
+    if server is None:
+        return bad_request(errormsg=_("Could not find the given server"))
+
+    from pgadmin.utils.driver import get_driver
+    driver = get_driver(PG_DEFAULT_DRIVER)
+    manager = driver.connection_manager(server.id)
+    conn = manager.connection(did=did)
+
+    if not conn.connected():
+        return bad_request(errormsg=_("Please connect to the server first..."))
+
+    if not data.get('filename', None):
+        return bad_request(errormsg=_('Please specify a valid directory'))
+
+    if not data.get('schema', None):
+        return bad_request(errormsg=_('Please specify a schema'))
+
+    try:
+        data['filename'] = directory_with_file_manager_path(data['filename'])
+    except Exception as e:
+        return bad_request(errormsg=str(e))
+
+    if IS_WIN:
+        data['filename'] = data['filename'].replace('\\', '/')
+
+    data['is_import'] = False
+    data['engine'] = 'copy'
+    data.setdefault('format', 'csv')
+    engine, compression, buffer_size, errmsg = get_copy_options(
+        dict(data, filename='')
+    )
+    if errmsg:
+        return bad_request(errormsg=errmsg)
+
+    try:
+        jobs = int(data.get('jobs', None) or 1)
+    except (TypeError, ValueError):
+        jobs = 0
+    if jobs <= 0:
+        return bad_request(errormsg=_('Invalid number of parallel jobs.'))
+    jobs = min(jobs, config.IMPORT_MAX_PARALLEL_JOBS)
+
+    status, tables = conn.execute_scalar(render_template(
+        'import_export/sql/count_tables.sql', schema=data['schema']
+    ))
+    if not status:
+        return internal_server_error(errormsg=tables)
+
+    options = render_template(
+        'import_export/sql/copy_options.sql',
+        conn=conn,
+        data=data,
+        ignore_column_list=None
+    )
+
+    utility = get_python_interpreter()
+    args = [
+        os.path.join(os.path.dirname(__file__), 'copy_worker.py'),
+        '--mode', 'export-schema',
+        '--file', data['filename'],
+        '--schema', data['schema'],
+        '--jobs', str(jobs),
+        '--buffer-size', str(buffer_size),
+        '--format', data['format'],
+        '--options', options.strip()
+    ]
+    if compression is not None:
+        args.extend(['--compression', compression])
+    if data['format'] == 'csv' and data.get('header', False):
+        args.append('--header')
+
+    try:
+        p = BatchProcess(
+            desc=SchemaExportMessage(
+                sid,
+                data['schema'],
+                None,
+                data['database'],
+                get_storage_directory(),
+                utility, *args
+            ),
+            cmd=utility, args=args, sid=sid,
+            **get_scheduling_options(data)
+        )
+        manager.export_password_env(p.id)
+
+        def export_pg_env(env):
+            env['PGHOST'] = server.host
+            env['PGPORT'] = str(server.port)
+            env['PGUSER'] = server.username
+            env['PGDATABASE'] = data['database']
+
+        p.start(export_pg_env, progress={
+            'file': data['filename'],
+            'mode': 'write',
+            'tables': True,
+            'total_tables': tables
+        })
         jid = p.id
     except Exception as e:
         current_app.logger.exception(e)
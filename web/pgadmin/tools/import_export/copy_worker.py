@@ -0,0 +1,920 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+This python script is responsible for copying the table data between a file,
+and the database server in-process (using the COPY protocol of psycopg2),
+without running the psql utility.
+
+It is run by the process executor (as a background process), and connects to
+the database server as per the libpq environment variables (PGHOST, PGPORT,
+PGUSER, PGDATABASE, PGPASSWORD etc.).
+
+Text/CSV files can also be imported in parallel (--jobs), the file is split
+into the chunks on the record boundaries, which are loaded concurrently over
+multiple connections (see ParallelLoader).
+
+All the tables of a schema can also be exported into a directory (one file per
+table, along with a manifest) concurrently over multiple connections sharing
+the same snapshot (see SchemaExporter).
+
+It reports the number of the rows copied on the standard output as
+'COPY <n>', which is parsed by the progress meter of the process executor.
+
+It can also be imported to open the (compressed) files, i.e. to read the
+header of the file.
+"""
+from __future__ import print_function
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from threading import Thread, Lock, Event
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ['gzip', 'zstd']
+
+# Default size (in bytes) of the buffer used for each read/write
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Minimum interval (in seconds) between the reports of the rows copied
+PROGRESS_INTERVAL = 5
+
+# Default size (in bytes) of the chunks loaded in parallel
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+TRANSACTIONS = ['chunk', 'all']
+
+# Name of the manifest written along with the files of a schema export
+MANIFEST_FILE = 'manifest.json'
+
+FILE_EXTENSIONS = {
+    'csv': '.csv', 'text': '.txt', 'binary': '.bin',
+    'gzip': '.gz', 'zstd': '.zst', None: ''
+}
+
+
+def get_compression(filename, compression=None):
+    """
+    Find out the compression of the file - if not given explicitly, it is
+    guessed from the file extension.
+
+    Returns:
+        'gzip', 'zstd', or None (not compressed)
+    """
+    if compression in COMPRESSIONS:
+        return compression
+    if compression:
+        return None
+
+    name = filename.lower()
+    if name.endswith('.gz'):
+        return 'gzip'
+    if name.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+class CompressedStream(object):
+    """
+    File-like object wrapping the (compressed) stream, making sure the
+    underlying file is closed along with it.
+    """
+
+    def __init__(self, stream, fp=None):
+        self.stream = stream
+        self.fp = fp
+
+    def read(self, size=-1):
+        return self.stream.read(size)
+
+    def write(self, data):
+        return self.stream.write(data)
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            if self.fp is not None and not self.fp.closed:
+                self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_file(filename, mode, compression=None,
+              buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Open the file for streaming the data to/from the COPY command, it is
+    (de)compressed on the fly.
+
+    Args:
+        filename: Name of the file
+        mode: 'rb' (import), or 'wb' (export)
+        compression: 'gzip', 'zstd', or None
+        buffer_size: Size of the buffer for the file
+
+    Returns:
+        A file-like object with read/write, and close methods
+    """
+    if compression == 'zstd' and zstandard is None:
+        raise RuntimeError(
+            'The zstandard module is required for zstd compressed files.'
+        )
+
+    return compress_stream(
+        open(filename, mode, buffer_size), mode, compression, buffer_size
+    )
+
+
+def compress_stream(fp, mode, compression=None,
+                    buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Wrap the file object to (de)compress the data on the fly.
+    """
+    if compression == 'gzip':
+        return CompressedStream(gzip.GzipFile(fileobj=fp, mode=mode), fp)
+
+    if compression == 'zstd':
+        if mode == 'rb':
+            stream = zstandard.ZstdDecompressor().stream_reader(
+                fp, read_size=buffer_size
+            )
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(
+                fp, write_size=buffer_size
+            )
+        return CompressedStream(stream, fp)
+
+    return fp
+
+
+def read_first_line(stream, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Read the first line (i.e. header) from the stream.
+    """
+    line = b''
+    while b'\n' not in line:
+        data = stream.read(min(buffer_size, 65536))
+        if not data:
+            break
+        line += data
+    return line.split(b'\n', 1)[0].rstrip(b'\r')
+
+
+class RowCounter(object):
+    """
+    File-like object counting the rows (lines) passing through the stream,
+    and reporting them on the standard output once in a while.
+
+    The count is approximate for the values having newlines (in CSV), and
+    it is not counted for the binary format.
+    """
+
+    def __init__(self, stream, count=True, interval=PROGRESS_INTERVAL):
+        self.stream = stream
+        self.count = count
+        self.interval = interval
+        self.rows = 0
+        self.bytes = 0
+        self.reported = time.time()
+
+    def _count(self, data):
+        self.bytes += len(data)
+        if self.count:
+            self.rows += data.count(b'\n')
+            if time.time() - self.reported >= self.interval:
+                self.reported = time.time()
+                report_rows(self.rows)
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self._count(data)
+        return data
+
+    def readline(self, size=-1):
+        data = self.stream.readline(size)
+        self._count(data)
+        return data
+
+    def write(self, data):
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        self._count(data)
+        return self.stream.write(data)
+
+
+def report_rows(rows):
+    print('COPY {0}'.format(rows))
+    sys.stdout.flush()
+
+
+def copy(conn, query, filename, is_import, compression=None,
+         buffer_size=DEFAULT_BUFFER_SIZE, count_rows=True,
+         interval=PROGRESS_INTERVAL):
+    """
+    Copy the data between the file, and the database server.
+
+    Args:
+        conn: psycopg2 connection
+        query: COPY ... FROM STDIN/TO STDOUT command
+        filename: Name of the file
+        is_import: Import (True), or export (False)
+        compression: 'gzip', 'zstd', or None
+        buffer_size: Size of the buffer for each read/write
+        count_rows: Count the rows copied (not for the binary format)
+        interval: Minimum interval (in seconds) between the reports
+
+    Returns:
+        Number of the rows copied
+    """
+    stream = open_file(
+        filename, 'rb' if is_import else 'wb', compression, buffer_size
+    )
+    try:
+        counter = RowCounter(stream, count_rows, interval)
+        cur = conn.cursor()
+        cur.copy_expert(query, counter, size=buffer_size)
+        rows = cur.rowcount
+        cur.close()
+        conn.commit()
+    finally:
+        stream.close()
+
+    if rows is None or rows < 0:
+        rows = counter.rows
+    return rows
+
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def count_quotes(data, quote, escape=None):
+    """
+    Count the quote characters in the data, ignoring the escaped ones.
+    """
+    if escape and escape != quote:
+        data = data.replace(escape + escape, b'').replace(escape + quote, b'')
+    return data.count(quote)
+
+
+def find_boundary(data, quote=None, escape=None):
+    """
+    Find the end of the last complete record in the data (starting at a
+    record boundary), i.e. the newline outside of the quoted values.
+
+    Args:
+        data: Data read from the file
+        quote: Quote character (CSV format), or None (text format, where the
+               newlines in the values are always escaped)
+        escape: Escape character (CSV format)
+
+    Returns:
+        Position after the last complete record, or 0 if there is none
+    """
+    end = data.rfind(b'\n')
+    if end < 0 or quote is None:
+        return end + 1
+
+    inside = count_quotes(data[:end + 1], quote, escape) % 2
+    while end >= 0 and inside:
+        prev = data.rfind(b'\n', 0, end)
+        inside ^= count_quotes(data[prev + 1:end + 1], quote, escape) % 2
+        end = prev
+
+    return end + 1
+
+
+def split_records(stream, chunk_size=DEFAULT_CHUNK_SIZE, quote=None,
+                  escape=None, skip_header=False):
+    """
+    Split the data read from the stream into the chunks of complete records.
+
+    Args:
+        stream: File-like object to read from
+        chunk_size: Approximate size (in bytes) of each chunk
+        quote: Quote character (CSV format), or None (text format)
+        escape: Escape character (CSV format)
+        skip_header: Skip the first line (header) of the data
+
+    Yields:
+        Chunks of the records (bytes)
+    """
+    rest = b''
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        data = rest + data
+
+        if skip_header:
+            pos = data.find(b'\n')
+            if pos < 0:
+                rest = data
+                continue
+            data = data[pos + 1:]
+            skip_header = False
+
+        pos = find_boundary(data, quote, escape)
+        if pos == 0:
+            # A record larger than the chunk, keep on reading
+            rest = data
+            continue
+
+        rest = data[pos:]
+        yield data[:pos]
+
+    if rest.strip():
+        yield rest
+
+
+class ParallelLoader(object):
+    """
+    Load the chunks of a file into the table concurrently over multiple
+    connections.
+
+    With the 'chunk' transaction mode, each chunk is copied into the table,
+    and committed on its own - the chunks loaded before a failure are kept.
+
+    With the 'all' transaction mode, each connection copies the chunks into
+    its own UNLOGGED staging table, and all of them are moved into the table
+    in a single transaction at the end - nothing is loaded on a failure.
+    """
+
+    def __init__(self, connect, schema, table, columns, options, jobs=2,
+                 transaction='chunk', interval=PROGRESS_INTERVAL):
+        """
+        Args:
+            connect: Function returning a new (psycopg2) connection
+            schema: Schema of the table
+            table: Name of the table
+            columns: Quoted column list, i.e. '("a", "b")' (or None)
+            options: Options of the COPY command (e.g. 'CSV NULL ...')
+            jobs: Number of the connections
+            transaction: 'chunk', or 'all'
+            interval: Minimum interval (in seconds) between the reports
+        """
+        self.connect = connect
+        self.table = quote_ident(schema) + '.' + quote_ident(table)
+        self.schema = schema
+        self.columns = columns or ''
+        self.options = options or ''
+        self.jobs = jobs
+        self.transaction = transaction
+        self.interval = interval
+        self.queue = Queue(jobs * 2)
+        self.failed = Event()
+        self.lock = Lock()
+        self.rows = 0
+        self.chunks = 0
+        self.errors = []
+        self.staging = []
+
+    def _copy_command(self, table):
+        return 'COPY {0} {1} FROM STDIN {2}'.format(
+            table, self.columns, self.options
+        )
+
+    def _select_list(self):
+        return self.columns.strip()[1:-1] if self.columns else '*'
+
+    def _create_staging(self, conn, idx):
+        staging = quote_ident(self.schema) + '.' + quote_ident(
+            'pga_staging_{0}_{1}'.format(os.getpid(), idx)
+        )
+        cur = conn.cursor()
+        cur.execute(
+            'CREATE UNLOGGED TABLE {0} AS SELECT {1} FROM {2} '
+            'WITH NO DATA'.format(staging, self._select_list(), self.table)
+        )
+        cur.close()
+        conn.commit()
+        with self.lock:
+            self.staging.append(staging)
+        return staging
+
+    def _load(self, idx):
+        conn = None
+        try:
+            conn = self.connect()
+            target = self.table
+            if self.transaction == 'all':
+                target = self._create_staging(conn, idx)
+            query = self._copy_command(target)
+
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                if self.failed.is_set():
+                    continue
+                num, chunk = item
+                try:
+                    cur = conn.cursor()
+                    cur.copy_expert(query, io.BytesIO(chunk))
+                    rows = cur.rowcount
+                    cur.close()
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    self._fail(
+                        'Chunk {0} could not be loaded: {1}'.format(
+                            num, str(e).strip()
+                        )
+                    )
+                    continue
+
+                if rows is None or rows < 0:
+                    rows = chunk.count(b'\n')
+                with self.lock:
+                    self.rows += rows
+                    self.chunks += 1
+        except Exception as e:
+            self._fail(str(e).strip())
+            # Keep on consuming, so that the reader is not blocked
+            while self.queue.get() is not None:
+                pass
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _fail(self, msg):
+        with self.lock:
+            self.errors.append(msg)
+        self.failed.set()
+
+    def _swap_in(self):
+        """
+        Move the rows from all the staging tables into the table in a single
+        transaction.
+        """
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            if not self.failed.is_set():
+                select_list = self._select_list()
+                for staging in self.staging:
+                    cur.execute('INSERT INTO {0} {1} SELECT {2} FROM {3}'.format(
+                        self.table, self.columns, select_list, staging
+                    ))
+            for staging in self.staging:
+                cur.execute('DROP TABLE IF EXISTS {0}'.format(staging))
+            cur.close()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self._fail(str(e).strip())
+            self._drop_staging(conn)
+        finally:
+            conn.close()
+
+    def _drop_staging(self, conn):
+        try:
+            cur = conn.cursor()
+            for staging in self.staging:
+                cur.execute('DROP TABLE IF EXISTS {0}'.format(staging))
+            cur.close()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+
+    def load(self, chunks):
+        """
+        Load the chunks (an iterable of the bytes).
+
+        Returns:
+            Number of the rows loaded (committed)
+        """
+        threads = [
+            Thread(target=self._load, args=(idx,))
+            for idx in range(self.jobs)
+        ]
+        for t in threads:
+            t.daemon = True
+            t.start()
+
+        reported = time.time()
+        try:
+            for num, chunk in enumerate(chunks):
+                if self.failed.is_set():
+                    break
+                self.queue.put((num, chunk))
+
+                if time.time() - reported >= self.interval:
+                    reported = time.time()
+                    with self.lock:
+                        report_rows(self.rows)
+        except Exception as e:
+            self._fail(str(e).strip())
+        finally:
+            for t in threads:
+                self.queue.put(None)
+            for t in threads:
+                t.join()
+
+        if self.transaction == 'all':
+            self._swap_in()
+            if self.failed.is_set():
+                return 0
+
+        return self.rows
+
+
+class ChecksumFile(object):
+    """
+    File-like object computing the checksum (SHA-256), and size of the data
+    written to the file.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self.fp.write(data)
+
+    def flush(self):
+        return self.fp.flush()
+
+    def close(self):
+        return self.fp.close()
+
+    @property
+    def closed(self):
+        return self.fp.closed
+
+
+def get_file_name(table, fmt, compression, used):
+    """
+    Returns:
+        A unique (within the directory) file name for the table
+    """
+    name = re.sub(r'[^\w.-]', '_', table, flags=re.UNICODE) or 'table'
+    base, idx = name, 1
+    while name.lower() in used:
+        idx += 1
+        name = '{0}_{1}'.format(base, idx)
+    used.add(name.lower())
+    return name + FILE_EXTENSIONS.get(fmt, '') + FILE_EXTENSIONS[compression]
+
+
+class SchemaExporter(object):
+    """
+    Export all the tables of a schema into a directory, one (compressed)
+    file per table, concurrently over multiple connections.
+
+    All the connections share the snapshot exported by the first one (using
+    pg_export_snapshot), so the files are consistent with each other. The
+    manifest (manifest.json) has the row count, size and checksum of each
+    file.
+    """
+    TABLES_SQL = (
+        "SELECT c.relname FROM pg_class c "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = %s AND c.relkind = 'r' "
+        "ORDER BY pg_relation_size(c.oid) DESC, c.relname"
+    )
+
+    def __init__(self, connect, schema, directory, options, fmt='csv',
+                 compression=None, jobs=2, buffer_size=DEFAULT_BUFFER_SIZE,
+                 header=False, interval=PROGRESS_INTERVAL):
+        """
+        Args:
+            connect: Function returning a new (psycopg2) connection
+            schema: Name of the schema
+            directory: Directory to export the files into
+            options: Options of the COPY command (e.g. 'CSV HEADER')
+            fmt: 'csv', 'text', or 'binary'
+            compression: 'gzip', 'zstd', or None
+            jobs: Number of the connections
+            buffer_size: Size of the buffer for each write
+            header: The files have the header (to find out the row count)
+            interval: Minimum interval (in seconds) between the reports
+        """
+        self.connect = connect
+        self.schema = schema
+        self.directory = directory
+        self.options = options or ''
+        self.format = fmt
+        self.compression = compression
+        self.jobs = jobs
+        self.buffer_size = buffer_size
+        self.header = header
+        self.interval = interval
+        self.queue = Queue()
+        self.failed = Event()
+        self.lock = Lock()
+        self.rows = 0
+        self.errors = []
+        self.tables = []
+        self.snapshot = None
+        self.reported = time.time()
+
+    def _fail(self, msg):
+        with self.lock:
+            self.errors.append(msg)
+        self.failed.set()
+
+    def _export_table(self, conn, entry):
+        table = quote_ident(self.schema) + '.' + quote_ident(entry['table'])
+        path = os.path.join(self.directory, entry['file'])
+
+        fp = ChecksumFile(open(path, 'wb', self.buffer_size))
+        stream = compress_stream(
+            fp, 'wb', self.compression, self.buffer_size
+        )
+        try:
+            counter = RowCounter(
+                stream, self.format != 'binary', interval=sys.maxsize
+            )
+            cur = conn.cursor()
+            cur.copy_expert(
+                'COPY {0} TO STDOUT {1}'.format(table, self.options),
+                counter, size=self.buffer_size
+            )
+            rows = cur.rowcount
+            cur.close()
+        finally:
+            stream.close()
+
+        if rows is None or rows < 0:
+            rows = None
+            if self.format != 'binary':
+                rows = counter.rows - (1 if self.header else 0)
+
+        entry.update({
+            'rows': rows,
+            'bytes': fp.bytes,
+            'sha256': fp.sha256.hexdigest()
+        })
+
+        print('Exported table {0} into {1} ({2} rows)'.format(
+            table, entry['file'], '?' if rows is None else rows
+        ))
+        with self.lock:
+            self.rows += rows or 0
+            if time.time() - self.reported >= self.interval:
+                self.reported = time.time()
+                report_rows(self.rows)
+
+    def _export(self, conn=None):
+        own = conn is None
+        try:
+            if own:
+                conn = self.connect()
+                conn.set_session(
+                    isolation_level='REPEATABLE READ', readonly=True
+                )
+                cur = conn.cursor()
+                cur.execute('SET TRANSACTION SNAPSHOT %s', (self.snapshot,))
+                cur.close()
+
+            while not self.failed.is_set():
+                entry = self.queue.get()
+                if entry is None:
+                    break
+                try:
+                    self._export_table(conn, entry)
+                except Exception as e:
+                    self._fail('Table {0} could not be exported: {1}'.format(
+                        entry['table'], str(e).strip()
+                    ))
+        except Exception as e:
+            self._fail(str(e).strip())
+        finally:
+            if own and conn is not None:
+                conn.close()
+
+    def _write_manifest(self):
+        manifest = {
+            'schema': self.schema,
+            'snapshot': self.snapshot,
+            'created': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'format': self.format,
+            'compression': self.compression,
+            'tables': self.tables
+        }
+        with open(os.path.join(self.directory, MANIFEST_FILE), 'w') as fp:
+            json.dump(manifest, fp, indent=2)
+
+    def export(self):
+        """
+        Export the tables, and write the manifest.
+
+        Returns:
+            Number of the rows exported
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        conn = self.connect()
+        try:
+            conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+            cur = conn.cursor()
+            cur.execute(self.TABLES_SQL, (self.schema,))
+            used = set([MANIFEST_FILE])
+            for row in cur.fetchall():
+                self.tables.append({
+                    'table': row[0],
+                    'file': get_file_name(
+                        row[0], self.format, self.compression, used
+                    )
+                })
+                self.queue.put(self.tables[-1])
+
+            jobs = min(self.jobs, len(self.tables))
+            if jobs > 1 and conn.server_version >= 90200:
+                # Share the snapshot of this transaction with the other
+                # connections, it must be kept open until they are done.
+                cur.execute('SELECT pg_export_snapshot()')
+                self.snapshot = cur.fetchone()[0]
+            else:
+                jobs = 1
+            cur.close()
+
+            for _ in range(jobs):
+                self.queue.put(None)
+
+            threads = [
+                Thread(target=self._export) for _ in range(jobs - 1)
+            ]
+            for t in threads:
+                t.daemon = True
+                t.start()
+
+            # This connection exports the tables too
+            self._export(conn)
+
+            for t in threads:
+                t.join()
+            conn.commit()
+        finally:
+            conn.close()
+
+        if not self.failed.is_set():
+            self._write_manifest()
+
+        return self.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Copy the table data between a file, and the database '
+                    'server.'
+    )
+    parser.add_argument(
+        '--mode', choices=['import', 'export', 'export-schema'],
+        required=True
+    )
+    parser.add_argument('--file', required=True)
+    parser.add_argument('--compression', choices=COMPRESSIONS, default=None)
+    parser.add_argument(
+        '--buffer-size', type=int, default=DEFAULT_BUFFER_SIZE
+    )
+    parser.add_argument('--format', default='text')
+    parser.add_argument('--command')
+
+    # Parallel import
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--transaction', choices=TRANSACTIONS,
+                        default='chunk')
+    parser.add_argument('--schema')
+    parser.add_argument('--table')
+    parser.add_argument('--columns', default='')
+    parser.add_argument('--options', default='')
+    parser.add_argument('--quote', default='"')
+    parser.add_argument('--escape', default=None)
+    parser.add_argument('--skip-header', action='store_true')
+
+    # Schema export
+    parser.add_argument('--header', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.mode == 'export-schema':
+        if not args.schema:
+            parser.error('The --schema argument is required.')
+        return export_schema(args)
+
+    if args.jobs > 1:
+        if args.mode != 'import' or args.format == 'binary' or \
+                not args.table:
+            parser.error(
+                'Only the text/CSV data can be imported in parallel into '
+                'the given --table.'
+            )
+        return load_parallel(args)
+
+    if not args.command:
+        parser.error('The --command argument is required.')
+
+    import psycopg2
+
+    try:
+        # Connection parameters are taken from the environment variables
+        conn = psycopg2.connect('')
+    except psycopg2.Error as e:
+        print(str(e).strip(), file=sys.stderr)
+        return 1
+
+    try:
+        rows = copy(
+            conn, args.command, args.file, args.mode == 'import',
+            args.compression, args.buffer_size, args.format != 'binary'
+        )
+    except (psycopg2.Error, IOError, OSError, RuntimeError) as e:
+        print(str(e).strip(), file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+    report_rows(rows)
+    return 0
+
+
+def export_schema(args):
+    import psycopg2
+
+    exporter = SchemaExporter(
+        lambda: psycopg2.connect(''), args.schema, args.file, args.options,
+        args.format, args.compression, args.jobs, args.buffer_size,
+        args.header
+    )
+
+    try:
+        rows = exporter.export()
+    except (psycopg2.Error, IOError, OSError, RuntimeError) as e:
+        print(str(e).strip(), file=sys.stderr)
+        return 1
+
+    for error in exporter.errors:
+        print(error, file=sys.stderr)
+
+    report_rows(rows)
+    return 1 if exporter.errors else 0
+
+
+def load_parallel(args):
+    import psycopg2
+
+    def encode(value):
+        return value.encode('utf-8') if value else None
+
+    quote = encode(args.quote) if args.format == 'csv' else None
+    loader = ParallelLoader(
+        lambda: psycopg2.connect(''), args.schema, args.table, args.columns,
+        args.options, args.jobs, args.transaction
+    )
+
+    try:
+        with open_file(
+            args.file, 'rb', args.compression, args.buffer_size
+        ) as stream:
+            rows = loader.load(split_records(
+                stream, args.chunk_size, quote, encode(args.escape),
+                args.skip_header
+            ))
+    except (IOError, OSError, RuntimeError) as e:
+        print(str(e).strip(), file=sys.stderr)
+        return 1
+
+    for error in loader.errors:
+        print(error, file=sys.stderr)
+
+    report_rows(rows)
+    return 1 if loader.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -22,6 +22,10 @@ define([
       filename: undefined,
       format: 'csv',
       encoding: undefined,
+      compression: undefined,
+      engine: undefined,
+      jobs: 1,
+      transaction: 'chunk',
       oid: undefined,
       header: undefined,
       delimiter: '',
@@ -101,6 +105,75 @@ define([
         url: 'get_encodings',
         first_empty: true,
         group: gettext('File Info'),
+      }, {
+        id: 'engine',
+        label: gettext('Engine'),
+        cell: 'string',
+        control: 'select2',
+        group: gettext('File Info'),
+        options: [{
+          'label': 'psql',
+          'value': 'psql',
+        }, {
+          'label': 'COPY',
+          'value': 'copy',
+        }],
+        select2: {
+          allowClear: true,
+          width: '100%',
+          placeholder: gettext('Default'),
+        },
+        helpMessage: gettext('Specifies how the data is copied. psql runs the \\copy command using the psql utility, COPY runs the COPY command within pgAdmin without requiring the client utilities, and supports the compressed files.'),
+      }, {
+        id: 'compression',
+        label: gettext('Compression'),
+        cell: 'string',
+        control: 'select2',
+        group: gettext('File Info'),
+        deps: ['engine'],
+        options: [{
+          'label': 'gzip',
+          'value': 'gzip',
+        }, {
+          'label': 'zstd',
+          'value': 'zstd',
+        }],
+        disabled: 'isDisabled',
+        select2: {
+          allowClear: true,
+          width: '100%',
+          placeholder: gettext('As per the file extension'),
+        },
+        helpMessage: gettext('Specifies the compression of the file. By default, the files having the .gz or .zst extension are considered compressed. This option is allowed only when using the COPY engine.'),
+      }, {
+        id: 'jobs',
+        label: gettext('Parallel jobs'),
+        type: 'int',
+        min: 1,
+        group: gettext('File Info'),
+        deps: ['is_import', 'engine', 'format'],
+        disabled: 'isDisabled',
+        helpMessage: gettext('Specifies the number of connections used to import the file concurrently, the file is split into the chunks of complete records. This option is allowed only in import, when using the COPY engine, and the CSV or text format.'),
+      }, {
+        id: 'transaction',
+        label: gettext('Transaction'),
+        cell: 'string',
+        control: 'select2',
+        group: gettext('File Info'),
+        deps: ['is_import', 'engine', 'format', 'jobs'],
+        options: [{
+          'label': gettext('Per chunk'),
+          'value': 'chunk',
+        }, {
+          'label': gettext('All or nothing'),
+          'value': 'all',
+        }],
+        disabled: 'isDisabled',
+        select2: {
+          allowClear: false,
+          width: '100%',
+        },
+        helpMessage: gettext('Per chunk commits each chunk on its own, the chunks imported before a failure are kept. All or nothing imports the chunks into the unlogged staging tables, which are moved into the table in a single transaction at the end.'),
       }],
     }, {
       id: 'columns',
@@ -362,6 +435,14 @@ define([
       case 'null_string':
       case 'delimiter':
         return (m.get('format') == 'binary');
+      case 'compression':
+        return (m.get('engine') == 'psql');
+      case 'jobs':
+        return (!m.get('is_import') || m.get('engine') != 'copy' ||
+          m.get('format') == 'binary');
+      case 'transaction':
+        return (!m.get('is_import') || m.get('engine') != 'copy' ||
+          m.get('format') == 'binary' || !(m.get('jobs') > 1));
       default:
         return false;
       }
@@ -374,6 +455,50 @@ define([
     },
   });
 
+  // Model for exporting all the tables of a schema into a directory
+  var SchemaExportModel = ImportExportModel.extend({
+    defaults: _.extend({}, ImportExportModel.prototype.defaults, {
+      engine: 'copy',
+      jobs: 4,
+    }),
+    schema: _.map(_.reject(ImportExportModel.prototype.schema, function(f) {
+      return _.indexOf(['is_import', 'columns', 'icolumns'], f.id) !== -1;
+    }), function(f) {
+      if (f.id || f.label != gettext('File Info')) {
+        return f;
+      }
+      return _.extend({}, f, {
+        schema: [{
+          id: 'filename',
+          label: gettext('Directory'),
+          type: 'text',
+          control: Backform.FileControl,
+          group: gettext('File Info'),
+          dialog_type: 'select_folder',
+          supp_types: ['*'],
+          helpMessage: gettext('The tables are exported into one file each, along with a manifest (manifest.json) having the row count and checksum of each file.'),
+        }].concat(_.map(_.reject(f.schema, function(c) {
+          return _.indexOf(['filename', 'engine', 'transaction'], c.id) !== -1;
+        }), function(c) {
+          if (c.id != 'jobs')
+            return c;
+          return _.extend({}, c, {
+            helpMessage: gettext('Specifies the number of connections used to export the tables concurrently. All of them share the same snapshot, so the files are consistent with each other.'),
+          });
+        })),
+      });
+    }),
+    isDisabled: function(m) {
+      switch (this.name) {
+      case 'compression':
+      case 'jobs':
+        return false;
+      default:
+        return ImportExportModel.prototype.isDisabled.apply(this, arguments);
+      }
+    },
+  });
+
   pgTools.import_utility = {
     init: function() {
       // We do not want to initialize the module multiple times.
@@ -413,15 +538,32 @@ define([
         label: gettext('Import/Export...'),
         icon: 'fa fa-shopping-cart',
         enable: menu_enabled,
+      }, {
+        name: 'export_schema',
+        node: 'schema',
+        module: this,
+        applies: ['tools', 'context'],
+        callback: 'callback_export_schema',
+        category: 'import',
+        priority: 11,
+        label: gettext('Export Schema Data...'),
+        icon: 'fa fa-shopping-cart',
       }]);
     },
 
     /*
       Open the dialog for the import functionality
     */
+    callback_export_schema: function(args, item) {
+      return this.callback_import_export(
+        _.extend({}, args, {schema_export: true}), item
+      );
+    },
+
     callback_import_export: function(args, item) {
       var i = item || pgBrowser.tree.selected(),
-        server_data = null;
+        server_data = null,
+        schema_export = !!(args && args.schema_export);
 
       while (i) {
         var node_data = pgBrowser.tree.itemData(i);
@@ -454,7 +596,9 @@ define([
 
       var preference = pgBrowser.get_preference(module, preference_name);
 
-      if (preference) {
+      if (schema_export) {
+        // The tables are exported in-process, psql is not required.
+      } else if (preference) {
         if (!preference.value) {
           Alertify.alert(gettext('Configuration required'), msg);
           return;
@@ -478,11 +622,12 @@ define([
         Alertify.dialog('ImportDialog', function factory() {
 
           return {
-            main: function(title, node, item, data) {
+            main: function(title, node, item, data, schema_export) {
               this.set('title', title);
               this.setting('pg_node', node);
               this.setting('pg_item', item);
               this.setting('pg_item_data', data);
+              this.setting('pg_schema_export', schema_export);
             },
 
             build: function() {
@@ -513,6 +658,7 @@ define([
               pg_node: null,
               pg_item: null,
               pg_item_data: null,
+              pg_schema_export: false,
             },
 
             // Callback functions when click on the buttons of the Alertify dialogs
@@ -523,15 +669,24 @@ define([
                   i = this.settings['pg_item'],
                   treeInfo = n.getTreeNodeHierarchy.apply(n, [i]);
 
+                var schema_export = this.settings['pg_schema_export'];
+
                 this.view.model.set({
                   'database': treeInfo.database._label,
                   'schema': treeInfo.schema._label,
-                  'table': treeInfo.table._label,
                 });
+                if (!schema_export) {
+                  this.view.model.set('table', treeInfo.table._label);
+                }
                 var self = this;
 
                 $.ajax({
-                  url: url_for(
+                  url: schema_export ? url_for(
+                    'import_export.create_schema_job', {
+                      'sid': treeInfo.server._id,
+                      'did': treeInfo.database._id,
+                    }
+                  ) : url_for(
                     'import_export.create_job', {
                       'sid': treeInfo.server._id,
                     }
@@ -598,7 +753,9 @@ define([
                 n = this.settings.pg_node,
                 i = this.settings.pg_item,
                 treeInfo = n.getTreeNodeHierarchy.apply(n, [i]),
-                newModel = new ImportExportModel({}, {
+                Model = this.settings.pg_schema_export ?
+                  SchemaExportModel : ImportExportModel,
+                newModel = new Model({}, {
                   node_info: treeInfo,
                 }),
                 fields = Backform.generateViewSchema(
@@ -659,9 +816,11 @@ define([
 
       // Open the Alertify dialog for the import/export module
       Alertify.ImportDialog(
-        S(
+        schema_export ? S(
+          gettext('Export data - schema \'%s\'')
+        ).sprintf(treeInfo.schema.label).value() : S(
           gettext('Import/Export data - table \'%s\'')
-        ).sprintf(treeInfo.table.label).value(), node, i, d
+        ).sprintf(treeInfo.table.label).value(), node, i, d, schema_export
       ).set('resizable', true).resizeTo('70%', '80%');
     },
   };
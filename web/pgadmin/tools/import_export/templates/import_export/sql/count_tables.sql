@@ -0,0 +1,4 @@
+SELECT count(*)
+FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = {{ schema|qtLiteral }} AND c.relkind = 'r'
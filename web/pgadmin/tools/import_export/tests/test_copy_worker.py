@@ -0,0 +1,323 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from pgadmin.tools.import_export import copy_worker
+from pgadmin.utils.route import BaseTestGenerator
+
+ROWS = b''.join(
+    '{0},row {0}\n'.format(i).encode('utf-8') for i in range(1000)
+)
+
+
+class FakeCursor(object):
+    """Cursor streaming the data as the COPY protocol of psycopg2 does"""
+    rowcount = -1
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def copy_expert(self, sql, file, size=8192):
+        if 'STDIN' in sql:
+            data = file.read(size)
+            while data:
+                self.conn.received += data
+                data = file.read(size)
+        else:
+            for line in ROWS.splitlines(True):
+                file.write(line)
+
+    def close(self):
+        pass
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.received = b''
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+class CopyWorkerTestCase(BaseTestGenerator):
+    """Test the in-process COPY worker with the (compressed) files"""
+    scenarios = [
+        ('Import a plain file',
+         dict(is_import=True, filename='data.csv', compression=None)),
+        ('Import a gzip compressed file',
+         dict(is_import=True, filename='data.csv.gz', compression='gzip')),
+        ('Import a zstd compressed file',
+         dict(is_import=True, filename='data.csv.zst', compression='zstd')),
+        ('Export to a plain file',
+         dict(is_import=False, filename='data.csv', compression=None)),
+        ('Export to a gzip compressed file',
+         dict(is_import=False, filename='data.csv.gz', compression='gzip')),
+        ('Export to a zstd compressed file',
+         dict(is_import=False, filename='data.csv.zst', compression='zstd'))
+    ]
+
+    def setUp(self):
+        if self.compression == 'zstd' and copy_worker.zstandard is None:
+            self.skipTest('The zstandard package is not installed')
+        self.tmpdir = tempfile.mkdtemp()
+        self.file = os.path.join(self.tmpdir, self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def runTest(self):
+        compression = copy_worker.get_compression(self.file)
+        self.assertEqual(compression, self.compression)
+
+        conn = FakeConnection()
+
+        if self.is_import:
+            with copy_worker.open_file(self.file, 'wb', compression) as fp:
+                fp.write(ROWS)
+
+            rows = copy_worker.copy(
+                conn, 'COPY t FROM STDIN', self.file, True, compression,
+                buffer_size=4096
+            )
+            self.assertEqual(conn.received, ROWS)
+        else:
+            rows = copy_worker.copy(
+                conn, 'COPY t TO STDOUT', self.file, False, compression,
+                buffer_size=4096
+            )
+            with copy_worker.open_file(self.file, 'rb', compression) as fp:
+                self.assertEqual(copy_worker.read_first_line(fp), b'0,row 0')
+
+        self.assertEqual(rows, 1000)
+
+
+class SplitRecordsTestCase(BaseTestGenerator):
+    """Test splitting the file into the chunks on the record boundaries"""
+    scenarios = [
+        ('Split the text data on each line',
+         dict(data=b'1\ta\n2\tb\n3\tc\n', quote=None, escape=None,
+              skip_header=False, chunk_size=3)),
+        ('Split the CSV data with the quoted newlines',
+         dict(data=b'id,val\n1,"a\nb"\n2,"x""\ny"\n3,z\n', quote=b'"',
+              escape=b'"', skip_header=True, chunk_size=4)),
+        ('Split the CSV data with the escaped quotes',
+         dict(data=b'1,"a\\"\nb"\n2,c\n', quote=b'"', escape=b'\\',
+              skip_header=False, chunk_size=4))
+    ]
+
+    def runTest(self):
+        chunks = list(copy_worker.split_records(
+            io.BytesIO(self.data), self.chunk_size, self.quote, self.escape,
+            self.skip_header
+        ))
+
+        data = self.data
+        if self.skip_header:
+            data = data[data.index(b'\n') + 1:]
+        self.assertEqual(b''.join(chunks), data)
+
+        for chunk in chunks:
+            self.assertTrue(chunk.endswith(b'\n'))
+            if self.quote is not None:
+                self.assertEqual(
+                    copy_worker.count_quotes(
+                        chunk, self.quote, self.escape
+                    ) % 2, 0
+                )
+
+
+class FakeParallelConnection(object):
+    """Connection recording the commands, and the chunks copied"""
+
+    def __init__(self, log, fail=False):
+        self.log = log
+        self.fail = fail
+
+    def cursor(self):
+        conn = self
+
+        class Cursor(object):
+            rowcount = -1
+
+            def execute(self, sql):
+                conn.log.append(sql)
+
+            def copy_expert(self, sql, file, size=8192):
+                if conn.fail:
+                    raise Exception('invalid input syntax')
+                conn.log.append((sql, file.read()))
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ParallelLoaderTestCase(BaseTestGenerator):
+    """Test loading the chunks in parallel"""
+    scenarios = [
+        ('Load the chunks into the table',
+         dict(transaction='chunk', fail=False, expected_rows=3)),
+        ('Load the chunks into the staging tables, and move them',
+         dict(transaction='all', fail=False, expected_rows=3)),
+        ('Do not load anything on a failure with all or nothing',
+         dict(transaction='all', fail=True, expected_rows=0))
+    ]
+
+    def runTest(self):
+        log = []
+        loader = copy_worker.ParallelLoader(
+            lambda: FakeParallelConnection(log, self.fail), 'public', 't',
+            '("a", "b")', 'CSV', jobs=2, transaction=self.transaction
+        )
+        rows = loader.load([b'1,a\n', b'2,b\n', b'3,c\n'])
+
+        self.assertEqual(rows, self.expected_rows)
+        self.assertEqual(bool(loader.errors), self.fail)
+
+        copied = [entry for entry in log if isinstance(entry, tuple)]
+        commands = [entry for entry in log if not isinstance(entry, tuple)]
+
+        if self.transaction == 'chunk':
+            self.assertEqual(
+                sorted(data for sql, data in copied),
+                [b'1,a\n', b'2,b\n', b'3,c\n']
+            )
+            self.assertTrue(all(
+                sql.startswith('COPY "public"."t" ("a", "b") FROM STDIN')
+                for sql, data in copied
+            ))
+        else:
+            self.assertEqual(
+                len([c for c in commands if c.startswith('CREATE UNLOGGED')]),
+                2
+            )
+            self.assertEqual(
+                len([c for c in commands if c.startswith('INSERT INTO')]),
+                0 if self.fail else 2
+            )
+            self.assertEqual(
+                len([c for c in commands if c.startswith('DROP TABLE')]), 2
+            )
+
+
+class FakeExportConnection(object):
+    """Connection exporting the tables of a schema from a snapshot"""
+    server_version = 100000
+
+    def __init__(self, log):
+        self.log = log
+
+    def set_session(self, **kwargs):
+        pass
+
+    def cursor(self):
+        conn = self
+
+        class Cursor(object):
+            rowcount = -1
+            result = None
+
+            def execute(self, sql, params=None):
+                conn.log.append(sql)
+                if 'pg_class' in sql:
+                    self.result = [('a',), ('b/c',), ('B/C',)]
+                elif 'pg_export_snapshot' in sql:
+                    self.result = [('00000003-0000001B-1',)]
+
+            def fetchall(self):
+                return self.result
+
+            def fetchone(self):
+                return self.result[0]
+
+            def copy_expert(self, sql, file, size=8192):
+                conn.log.append(sql)
+                file.write(b'id\n')
+                for line in ROWS.splitlines(True):
+                    file.write(line)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SchemaExporterTestCase(BaseTestGenerator):
+    """Test exporting the tables of a schema with the manifest"""
+    scenarios = [
+        ('Export the tables into the plain files',
+         dict(compression=None, jobs=2, extension='.csv')),
+        ('Export the tables into the gzip compressed files',
+         dict(compression='gzip', jobs=3, extension='.csv.gz'))
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def runTest(self):
+        log = []
+        exporter = copy_worker.SchemaExporter(
+            lambda: FakeExportConnection(log), 'public', self.tmpdir,
+            'CSV HEADER', 'csv', self.compression, self.jobs, header=True
+        )
+        rows = exporter.export()
+
+        self.assertEqual(exporter.errors, [])
+        self.assertEqual(rows, 3000)
+        self.assertIn('SELECT pg_export_snapshot()', log)
+        self.assertEqual(
+            log.count('SET TRANSACTION SNAPSHOT %s'), self.jobs - 1
+        )
+
+        with open(os.path.join(
+                self.tmpdir, copy_worker.MANIFEST_FILE)) as fp:
+            manifest = json.load(fp)
+
+        self.assertEqual(manifest['snapshot'], '00000003-0000001B-1')
+        self.assertEqual(
+            [t['file'] for t in manifest['tables']],
+            ['a' + self.extension, 'b_c' + self.extension,
+             'B_C_2' + self.extension]
+        )
+        for table in manifest['tables']:
+            self.assertEqual(table['rows'], 1000)
+            with open(os.path.join(self.tmpdir, table['file']), 'rb') as fp:
+                data = fp.read()
+            self.assertEqual(table['bytes'], len(data))
+            self.assertEqual(
+                table['sha256'], hashlib.sha256(data).hexdigest()
+            )
@@ -10,20 +10,26 @@
 """A blueprint module implementing the maintenance tool for vacuum"""
 
 import simplejson as json
+import os
 
 from flask import url_for, Response, render_template, request, current_app
 from flask_babel import gettext as _
 from flask_security import login_required
-from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc
+from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc, \
+    get_scheduling_options, get_python_interpreter
 from pgadmin.utils import PgAdminModule, html
 from pgadmin.utils.ajax import bad_request, make_json_response
 from pgadmin.utils.driver import get_driver
 
+import config
 from config import PG_DEFAULT_DRIVER
 from pgadmin.model import Server
 
 MODULE_NAME = 'maintenance'
 
+# Orders of the tables in a maintenance plan
+PLAN_ORDERS = ['size', 'bloat', 'dead_tuples']
+
 
 class MaintenanceModule(PgAdminModule):
     """
@@ -85,6 +91,8 @@ class Message(IProcessDesc):
     @property
     def message(self):
         res = _("Maintenance ({0})")
+        if is_batch(self.data):
+            res = _("Maintenance ({0}) of many tables")
 
         if self.data['op'] == "VACUUM":
             return res.format(_('Vacuum'))
@@ -134,6 +142,7 @@ class Message(IProcessDesc):
 
         res += '</div><div class="h5">'
         res += html.safe_str(
+            _("Tables selected by the query:") if is_batch(self.data) else
             _("Running Query:")
         )
         res += '</b><br><i>'
@@ -143,6 +152,51 @@ class Message(IProcessDesc):
         return res
 
 
+def is_batch(data):
+    """
+    Returns:
+        True, if the maintenance operation is run on the tables selected by
+        the criteria (i.e. a batch for the whole database/schema)
+    """
+    return bool(data.get('batch', False)) or \
+        (bool(data.get('schema', None)) and not data.get('table', None))
+
+
+def get_plan_options(data):
+    """
+    Validate the criteria to select the tables for a batch.
+
+    Args:
+        data: Maintenance options sent by the client
+
+    Returns:
+        Tuple of the options (dictionary), and an error message (if any)
+    """
+    options = dict(schema=data.get('schema', None))
+    try:
+        for key, conv in [
+            ('min_dead_tuples', int), ('min_dead_ratio', float),
+            ('min_size', int), ('limit', int), ('jobs', int),
+            ('timeout', float)
+        ]:
+            value = data.get(key, None)
+            options[key] = conv(value) if value not in (None, '') else None
+            if options[key] is not None and options[key] < 0:
+                raise ValueError
+    except (TypeError, ValueError):
+        return None, _('Invalid criteria ({0}).').format(key)
+
+    options['order_by'] = data.get('order_by', None) or 'size'
+    if options['order_by'] not in PLAN_ORDERS:
+        return None, _('Invalid order of the tables.')
+
+    options['jobs'] = min(
+        options['jobs'] or 1, config.MAINTENANCE_MAX_PARALLEL_JOBS
+    )
+
+    return options, None
+
+
 @blueprint.route("/")
 @login_required
 def index():
@@ -215,28 +269,64 @@ def create_maintenance_job(sid, did):
             errormsg=_("Please connect to the server first.")
         )
 
-    utility = manager.utility('sql')
+    progress = None
+    export_pg_env = None
+
+    if is_batch(data):
+        options, errmsg = get_plan_options(data)
+        if errmsg:
+            return make_json_response(success=0, errormsg=errmsg)
+
+        # Select the tables, and create the command for each of them when
+        # the job starts.
+        query = render_template(
+            'maintenance/sql/plan.sql', conn=conn,
+            command=render_template(
+                'maintenance/sql/plan_command.sql', data=data
+            ).strip(),
+            **options
+        )
 
-    # Create the command for the vacuum operation
-    query = render_template(
-        'maintenance/sql/command.sql', conn=conn, data=data,
-        index_name=index_name
-    )
+        utility = get_python_interpreter()
+        args = [
+            os.path.join(os.path.dirname(__file__), 'maintenance_worker.py'),
+            '--jobs', str(options['jobs']),
+            '--plan-query', query
+        ]
+        if options['timeout']:
+            args.extend(['--timeout', str(options['timeout'])])
 
-    args = [
-        '--host', server.host, '--port', str(server.port),
-        '--username', server.username, '--dbname',
-        data['database'],
-        '--command', query
-    ]
+        progress = {'tables': True}
+
+        def export_pg_env(env):
+            env['PGHOST'] = server.host
+            env['PGPORT'] = str(server.port)
+            env['PGUSER'] = server.username
+            env['PGDATABASE'] = data['database']
+    else:
+        utility = manager.utility('sql')
+
+        # Create the command for the vacuum operation
+        query = render_template(
+            'maintenance/sql/command.sql', conn=conn, data=data,
+            index_name=index_name
+        )
+
+        args = [
+            '--host', server.host, '--port', str(server.port),
+            '--username', server.username, '--dbname',
+            data['database'],
+            '--command', query
+        ]
 
     try:
         p = BatchProcess(
             desc=Message(sid, data, query),
-            cmd=utility, args=args
+            cmd=utility, args=args, sid=sid,
+            **get_scheduling_options(data)
         )
         manager.export_password_env(p.id)
-        p.start()
+        p.start(export_pg_env, progress=progress)
         jid = p.id
     except Exception as e:
         current_app.logger.exception(e)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+This python script is responsible for running a maintenance operation
+(VACUUM, ANALYZE, REINDEX, CLUSTER) on many tables, concurrently over a
+bounded pool of connections.
+
+It is run by the process executor (as a background process), and connects to
+the database server as per the libpq environment variables (PGHOST, PGPORT,
+PGUSER, PGDATABASE, PGPASSWORD etc.).
+
+The tables are selected by the plan query (run when the job starts, so that
+the latest statistics are used), which returns the target tables, and the
+command to be run for each of them in the order of execution.
+
+It reports 'Planned <n> tables', and 'Processed table <name> ...' for each
+table on the standard output, which are parsed by the progress meter of the
+process executor. A failure on a table does not stop the other tables from
+being processed, but the exit code is non-zero.
+"""
+from __future__ import print_function
+
+import argparse
+import sys
+import time
+from threading import Thread, Lock
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+_print_lock = Lock()
+
+
+def _print(msg, err=False):
+    fp = sys.stderr if err else sys.stdout
+    with _print_lock:
+        print(msg, file=fp)
+        fp.flush()
+
+
+class MaintenanceRunner(object):
+    """
+    Run the planned maintenance commands over a bounded pool of connections,
+    timing each of them, and isolating the failures.
+    """
+
+    def __init__(self, connect, jobs=1, timeout=0):
+        """
+        Args:
+            connect: Function returning a new (psycopg2) connection
+            jobs: Number of the connections
+            timeout: Statement timeout (in seconds) for each command (0 - no
+                     timeout)
+        """
+        self.connect = connect
+        self.jobs = max(jobs, 1)
+        self.timeout = timeout
+        self.queue = Queue()
+        self.lock = Lock()
+        self.results = []
+
+    def plan(self, query):
+        """
+        Run the plan query.
+
+        Returns:
+            list of the targets (dictionaries having 'target', 'command' etc.)
+        """
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            cur.execute(query)
+            columns = [desc[0] for desc in cur.description]
+            targets = [dict(zip(columns, row)) for row in cur.fetchall()]
+            cur.close()
+            conn.commit()
+        finally:
+            conn.close()
+
+        _print('Planned {0} tables'.format(len(targets)))
+        for target in targets:
+            _print('  {0}: {1} bytes, {2} dead tuples ({3}%)'.format(
+                target['target'], target.get('size', '?'),
+                target.get('n_dead_tup', '?'), target.get('dead_ratio', '?')
+            ))
+
+        return targets
+
+    def _process(self, conn, target):
+        start = time.time()
+        error = None
+        del conn.notices[:]
+        try:
+            cur = conn.cursor()
+            cur.execute(target['command'])
+            cur.close()
+        except Exception as e:
+            error = str(e).strip()
+
+        elapsed = time.time() - start
+
+        # VERBOSE messages
+        for notice in conn.notices:
+            _print(notice.strip(), err=True)
+
+        result = dict(target, elapsed=round(elapsed, 3), error=error)
+        with self.lock:
+            self.results.append(result)
+
+        if error is None:
+            _print('Processed table {0} in {1:.3f} s'.format(
+                target['target'], elapsed
+            ))
+        else:
+            _print('Processed table {0} in {1:.3f} s with error: {2}'.format(
+                target['target'], elapsed, error
+            ), err=True)
+
+    def _run(self):
+        conn = None
+        try:
+            conn = self.connect()
+            # VACUUM cannot be run inside a transaction block
+            conn.autocommit = True
+            if self.timeout:
+                cur = conn.cursor()
+                cur.execute(
+                    'SET statement_timeout = %s', (int(self.timeout * 1000),)
+                )
+                cur.close()
+        except Exception as e:
+            _print(str(e).strip(), err=True)
+            if conn is not None:
+                conn.close()
+            return
+
+        try:
+            while True:
+                target = self.queue.get()
+                if target is None:
+                    break
+                self._process(conn, target)
+        finally:
+            conn.close()
+
+    def run(self, targets):
+        """
+        Run the commands for the targets.
+
+        Returns:
+            list of the results (targets with 'elapsed', and 'error')
+        """
+        for target in targets:
+            self.queue.put(target)
+
+        jobs = min(self.jobs, len(targets))
+        for _ in range(jobs):
+            self.queue.put(None)
+
+        threads = [Thread(target=self._run) for _ in range(jobs)]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        for t in threads:
+            t.join()
+
+        return self.results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Run a maintenance operation on many tables.'
+    )
+    parser.add_argument('--plan-query', required=True)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=0)
+    args = parser.parse_args(argv)
+
+    import psycopg2
+
+    start = time.time()
+    runner = MaintenanceRunner(
+        lambda: psycopg2.connect(''), args.jobs, args.timeout
+    )
+
+    try:
+        targets = runner.plan(args.plan_query)
+    except psycopg2.Error as e:
+        _print(str(e).strip(), err=True)
+        return 1
+
+    results = runner.run(targets)
+    failed = len([r for r in results if r['error'] is not None])
+
+    _print('{0} of {1} tables processed successfully in {2:.3f} s'.format(
+        len(results) - failed, len(targets), time.time() - start
+    ))
+
+    return 1 if failed or len(results) < len(targets) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
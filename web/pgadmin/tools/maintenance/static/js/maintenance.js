@@ -42,6 +42,14 @@ define([
       vacuum_freeze: false,
       vacuum_analyze: false,
       verbose: true,
+      batch: false,
+      min_dead_tuples: undefined,
+      min_dead_ratio: undefined,
+      min_size: undefined,
+      order_by: 'size',
+      limit: undefined,
+      jobs: 1,
+      timeout: undefined,
     },
     initialize: function() {
       var node_info = arguments[1]['node_info'];
@@ -51,6 +59,11 @@ define([
         this.set('op', 'REINDEX');
         this.set('verbose', false);
       }
+      // The tables of a schema are always processed one by one
+      if ('schema' in node_info && !('table' in node_info) &&
+        !('partition' in node_info)) {
+        this.set('batch', true);
+      }
     },
     schema: [{
       id: 'op',
@@ -130,8 +143,112 @@ define([
       label: gettext('Verbose Messages'),
       disabled: 'isDisabled',
     },
+    {
+      type: 'nested',
+      control: 'fieldset',
+      label: gettext('Tables'),
+      group: gettext('Options'),
+      visible: 'isBatchVisible',
+      schema: [{
+        id: 'batch',
+        label: gettext('Select tables'),
+        group: gettext('Tables'),
+        control: Backform.CustomSwitchControl,
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+        helpMessage: gettext('Run the operation on each of the tables matching the criteria below, instead of the whole database.'),
+      }, {
+        id: 'min_dead_tuples',
+        label: gettext('Minimum dead tuples'),
+        type: 'int',
+        min: 0,
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+      }, {
+        id: 'min_dead_ratio',
+        label: gettext('Minimum dead tuples (%)'),
+        type: 'numeric',
+        min: 0,
+        max: 100,
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+      }, {
+        id: 'min_size',
+        label: gettext('Minimum size (MB)'),
+        type: 'int',
+        min: 0,
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+      }, {
+        id: 'order_by',
+        label: gettext('Order by'),
+        control: 'select2',
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+        options: [{
+          'label': gettext('Size'),
+          'value': 'size',
+        }, {
+          'label': gettext('Bloat (dead tuples %)'),
+          'value': 'bloat',
+        }, {
+          'label': gettext('Dead tuples'),
+          'value': 'dead_tuples',
+        }],
+        select2: {
+          allowClear: false,
+          width: '100%',
+        },
+      }, {
+        id: 'limit',
+        label: gettext('Maximum tables'),
+        type: 'int',
+        min: 1,
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+      }, {
+        id: 'jobs',
+        label: gettext('Parallel jobs'),
+        type: 'int',
+        min: 1,
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+        helpMessage: gettext('Number of the tables processed at a time, each over its own connection.'),
+      }, {
+        id: 'timeout',
+        label: gettext('Timeout per table (seconds)'),
+        type: 'int',
+        min: 0,
+        group: gettext('Tables'),
+        deps: ['batch'],
+        disabled: 'isDisabled',
+        visible: 'isBatchVisible',
+        helpMessage: gettext('The operation on a table is cancelled after the given time, and the next table is processed. Leave it empty for no timeout.'),
+      }],
+    },
     ],
 
+    // The tables can be selected by the criteria only for a database, or
+    // schema.
+    isBatchVisible: function() {
+      var node_info = this.node_info || {};
+      return !('table' in node_info) && !('partition' in node_info) &&
+        !('primary_key' in node_info) && !('unique_constraint' in node_info) &&
+        !('index' in node_info);
+    },
+
     // Enable/Disable the items based on the user maintenance operation
     // selection.
     isDisabled: function(m) {
@@ -153,6 +270,16 @@ define([
           }
         }
         return m.get('op') == 'REINDEX';
+      case 'batch':
+        return ('schema' in node_info);
+      case 'min_dead_tuples':
+      case 'min_dead_ratio':
+      case 'min_size':
+      case 'order_by':
+      case 'limit':
+      case 'jobs':
+      case 'timeout':
+        return !m.get('batch');
       default:
         return false;
       }
@@ -169,7 +296,7 @@ define([
       this.initialized = true;
 
       var maintenance_supported_nodes = [
-        'database', 'table', 'primary_key',
+        'database', 'schema', 'table', 'primary_key',
         'unique_constraint', 'index', 'partition',
       ];
 
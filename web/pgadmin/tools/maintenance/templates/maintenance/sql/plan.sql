@@ -0,0 +1,30 @@
+SELECT * FROM (
+    SELECT
+        quote_ident(st.schemaname) || '.' || quote_ident(st.relname) AS target,
+        {{ command|qtLiteral }} || ' ' || quote_ident(st.schemaname) || '.' ||
+            quote_ident(st.relname) AS command,
+        pg_total_relation_size(st.relid) AS size,
+        st.n_live_tup,
+        st.n_dead_tup,
+        CASE WHEN st.n_live_tup + st.n_dead_tup > 0 THEN
+            round(100.0 * st.n_dead_tup / (st.n_live_tup + st.n_dead_tup), 2)
+        ELSE 0 END AS dead_ratio
+    FROM pg_stat_user_tables st
+{% if schema %}
+    WHERE st.schemaname = {{ schema|qtLiteral }}
+{% endif %}
+) t
+WHERE true
+{% if min_dead_tuples %}
+    AND n_dead_tup >= {{ min_dead_tuples }}
+{% endif %}
+{% if min_dead_ratio %}
+    AND dead_ratio >= {{ min_dead_ratio }}
+{% endif %}
+{% if min_size %}
+    AND size >= {{ min_size }}::bigint * 1024 * 1024
+{% endif %}
+ORDER BY {% if order_by == 'bloat' %}dead_ratio DESC, {% elif order_by == 'dead_tuples' %}n_dead_tup DESC, {% endif %}size DESC, target
+{% if limit %}
+LIMIT {{ limit }}
+{% endif %}
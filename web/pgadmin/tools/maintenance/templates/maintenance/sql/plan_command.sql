@@ -0,0 +1 @@
+{% if data.op == "VACUUM" %}VACUUM{% if data.vacuum_full %} FULL{% endif %}{% if data.vacuum_freeze %} FREEZE{% endif %}{% if data.vacuum_analyze %} ANALYZE{% endif %}{% if data.verbose %} VERBOSE{% endif %}{% elif data.op == "ANALYZE" %}ANALYZE{% if data.verbose %} VERBOSE{% endif %}{% elif data.op == "REINDEX" %}REINDEX TABLE{% elif data.op == "CLUSTER" %}CLUSTER{% if data.verbose %} VERBOSE{% endif %}{% endif %}
@@ -0,0 +1,108 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import time
+from threading import Lock
+
+from pgadmin.tools.maintenance.maintenance_worker import MaintenanceRunner
+from pgadmin.utils.route import BaseTestGenerator
+
+TARGETS = [
+    ('public.a', 'VACUUM ANALYZE public.a', 3000, 10, 90, 90.0),
+    ('public.b', 'VACUUM ANALYZE public.b', 2000, 10, 50, 83.33),
+    ('public.c', 'VACUUM ANALYZE public.c', 1000, 10, 10, 50.0),
+    ('public.d', 'VACUUM ANALYZE public.d', 500, 10, 5, 33.33)
+]
+
+
+class FakeServer(object):
+    """Server running the maintenance commands, and tracking concurrency"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.lock = Lock()
+        self.running = 0
+        self.max_running = 0
+        self.executed = []
+
+    def connect(self):
+        server = self
+
+        class Cursor(object):
+            description = [
+                ('target',), ('command',), ('size',), ('n_live_tup',),
+                ('n_dead_tup',), ('dead_ratio',)
+            ]
+
+            def execute(self, sql, params=None):
+                if not sql.startswith('VACUUM'):
+                    return
+                with server.lock:
+                    server.running += 1
+                    server.max_running = max(
+                        server.max_running, server.running
+                    )
+                time.sleep(0.05)
+                with server.lock:
+                    server.running -= 1
+                    server.executed.append(sql)
+                if server.fail_on and server.fail_on in sql:
+                    raise Exception('canceling statement due to timeout')
+
+            def fetchall(self):
+                return TARGETS
+
+            def close(self):
+                pass
+
+        class Connection(object):
+            autocommit = False
+            notices = []
+
+            def cursor(self):
+                return Cursor()
+
+            def commit(self):
+                pass
+
+            def close(self):
+                pass
+
+        return Connection()
+
+
+class MaintenanceRunnerTestCase(BaseTestGenerator):
+    """Test running the maintenance plan over a bounded pool"""
+    scenarios = [
+        ('Process all the tables, two at a time',
+         dict(jobs=2, fail_on=None, expected_errors=0)),
+        ('Keep on processing the tables after a failure',
+         dict(jobs=3, fail_on='public.b', expected_errors=1))
+    ]
+
+    def runTest(self):
+        server = FakeServer(self.fail_on)
+        runner = MaintenanceRunner(server.connect, self.jobs)
+
+        targets = runner.plan('SELECT ...')
+        self.assertEqual(
+            [t['target'] for t in targets],
+            ['public.a', 'public.b', 'public.c', 'public.d']
+        )
+
+        results = runner.run(targets)
+
+        self.assertEqual(len(server.executed), 4)
+        self.assertEqual(server.max_running, self.jobs)
+        self.assertEqual(
+            len([r for r in results if r['error'] is not None]),
+            self.expected_errors
+        )
+        for result in results:
+            self.assertTrue(result['elapsed'] >= 0.05)
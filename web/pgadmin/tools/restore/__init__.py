@@ -16,7 +16,8 @@ from flask import render_template, request, current_app, \
     url_for, Response
 from flask_babel import gettext as _
 from flask_security import login_required, current_user
-from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc
+from pgadmin.misc.bgprocess.processes import BatchProcess, IProcessDesc, \
+    get_scheduling_options
 from pgadmin.utils import PgAdminModule, get_storage_directory, html, \
     fs_short_path, document_dir
 from pgadmin.utils.ajax import make_json_response, bad_request
@@ -326,10 +327,15 @@ def create_restore_job(sid):
                 ) else data['file'],
 		*args
             ),
-            cmd=utility, args=args
+            cmd=utility, args=args, sid=sid,
+            **get_scheduling_options(data)
         )
         manager.export_password_env(p.id)
-        p.start()
+        p.start(progress=None if 'list' in data else {
+            'file': _file, 'mode': 'read',
+            'tables': bool(data.get('verbose', False)),
+            'list': bool(data.get('verbose', False))
+        })
         jid = p.id
     except Exception as e:
         current_app.logger.exception(e)
@@ -14,20 +14,28 @@ import pickle
 import random
 import codecs
 
+import six
 from flask import Response, url_for, render_template, session, request
 from flask_babel import gettext
 from flask_security import login_required
+from pgadmin.tools.sqleditor import history
 from pgadmin.tools.sqleditor.command import QueryToolCommand
 from pgadmin.utils import PgAdminModule
 from pgadmin.utils import get_storage_directory
+from pgadmin.tools.sqleditor.statements import ScriptExecution, \
+    format_results, start_script, get_script, discard_script, poll_script
 from pgadmin.utils.ajax import make_json_response, bad_request, \
-    success_return, internal_server_error, unauthorized
+    success_return, internal_server_error, unauthorized, gone
 from pgadmin.utils.driver import get_driver
 from pgadmin.utils.sqlautocomplete.autocomplete import SQLAutoComplete
+from pgadmin.utils.sqlautocomplete.parseutils import split_statements, \
+    strip_leading_comments
 from pgadmin.misc.file_manager import Filemanager
 from pgadmin.utils.menu import MenuItem
 
-from config import PG_DEFAULT_DRIVER, ON_DEMAND_RECORD_COUNT
+from config import PG_DEFAULT_DRIVER, ON_DEMAND_RECORD_COUNT, \
+    QUERY_TOOL_RESULT_SETS_MAX, QUERY_TOOL_RESULT_ROWS_MAX, \
+    QUERY_TOOL_SCRIPT_POLL_TIME
 
 MODULE_NAME = 'sqleditor'
 
@@ -98,9 +106,13 @@ class SqlEditorModule(PgAdminModule):
             'sqleditor.view_data_start',
             'sqleditor.query_tool_start',
             'sqleditor.query_tool_preferences',
+            'sqleditor.statement_result',
+            'sqleditor.query_history',
+            'sqleditor.query_history_stats',
             'sqleditor.poll',
             'sqleditor.fetch',
             'sqleditor.fetch_all',
+            'sqleditor.fetch_rows',
             'sqleditor.save',
             'sqleditor.get_filter',
             'sqleditor.apply_filter',
@@ -179,6 +191,19 @@ class SqlEditorModule(PgAdminModule):
             category_label=gettext('Options')
         )
 
+        self.execute_statements_separately = self.preference.register(
+            'Options', 'execute_statements_separately',
+            gettext("Execute statements separately?"), 'boolean', False,
+            category_label=gettext('Options'),
+            help_str=gettext(
+                'If set to True, the statements of a script are executed one '
+                'after another, reporting the status, number of rows '
+                'affected, and duration of each statement, and the execution '
+                'stops at the first failing statement. The data output '
+                'shows the result of the last statement.'
+            )
+        )
+
         self.sql_font_size = self.preference.register(
             'Options', 'sql_font_size',
             gettext("Font size"), 'numeric', '1',
@@ -591,18 +616,46 @@ def start_query_tool(trans_id):
             session_obj['command_obj'] = pickle.dumps(trans_obj, -1)
             update_session_grid_transaction(trans_id, session_obj)
 
+            # Execute the statements of the script one after another, if
+            # asked (the rest are executed on polling the result).
+            script = None
+            if blueprint.execute_statements_separately.get() and \
+                    isinstance(sql, six.string_types) and \
+                    not sql.lstrip().upper().startswith('EXPLAIN'):
+                statements = split_statements(sql)
+                if len(statements) > 1:
+                    script = ScriptExecution(
+                        statements, QUERY_TOOL_RESULT_SETS_MAX,
+                        QUERY_TOOL_RESULT_ROWS_MAX
+                    )
+                    sql = script.next_statement()
+
+            if script is None:
+                discard_script((trans_obj.sid, conn_id))
+            else:
+                start_script((trans_obj.sid, conn_id), script)
+
             # If auto commit is False and transaction status is Idle
             # then call is_begin_not_required() function to check BEGIN
-            # is required or not.
-
-            if not trans_obj.auto_commit \
-                    and conn.transaction_status() == TX_STATUS_IDLE \
-                    and is_begin_required(sql):
-                conn.execute_void("BEGIN;")
+            # is required or not (checked again for each statement of the
+            # script, see poll).
+            begin_if_required(
+                conn, trans_obj,
+                sql if script is None else strip_leading_comments(sql)
+            )
 
             # Execute sql asynchronously with params is None
             # and formatted_error is True.
             status, result = conn.execute_async(sql)
+            if not status:
+                if script is not None:
+                    discard_script((trans_obj.sid, conn_id))
+                history.record(
+                    trans_obj.sid, conn.db, sql, 'Error', None,
+                    message=result
+                )
+            elif script is None:
+                history.start_query((trans_obj.sid, conn_id), sql)
 
             # If the transaction aborted for some reason and
             # Auto RollBack is True then issue a rollback to cleanup.
@@ -709,11 +762,43 @@ def poll(trans_id):
     has_oids = False
     oids = None
 
+    script = None
+    statements = None
+
     # Check the transaction and connection status
     status, error_msg, conn, trans_obj, session_obj = check_transaction_status(trans_id)
     if status and conn is not None and session_obj is not None:
-        status, result = conn.poll(formatted_exception_msg=True, no_result=True)
+        if isinstance(trans_obj, QueryToolCommand):
+            script = get_script((trans_obj.sid, trans_obj.conn_id))
+
+        if script is not None:
+            status, result = poll_script(
+                conn, script, QUERY_TOOL_SCRIPT_POLL_TIME,
+                prepare=lambda statement: begin_if_required(
+                    conn, trans_obj, strip_leading_comments(statement)
+                )
+            )
+        else:
+            status, result = conn.poll(
+                formatted_exception_msg=True, no_result=True
+            )
+
         if not status:
+            if script is not None:
+                # Report the statements executed, and the one failed, and
+                # cleanup the aborted transaction, as the rest of the script
+                # is not executed.
+                statements = script.pop_results()
+                record_statements(trans_obj, conn, script, statements)
+                result = format_results(statements)
+                if conn.transaction_status() == TX_STATUS_INERROR and \
+                        trans_obj.auto_rollback:
+                    conn.execute_void("ROLLBACK;")
+            else:
+                history.finish_query(
+                    (trans_obj.sid, trans_obj.conn_id), trans_obj.sid,
+                    conn.db, 'Error', message=result
+                )
             return internal_server_error(result)
         elif status == ASYNC_OK:
             status = 'Success'
@@ -832,9 +917,22 @@ def poll(trans_id):
 
         elif status == ASYNC_EXECUTION_ABORTED:
             status = 'Cancel'
+            if script is not None:
+                record_statements(
+                    trans_obj, conn, script, script.pop_results()
+                )
+            else:
+                history.finish_query(
+                    (trans_obj.sid, trans_obj.conn_id), trans_obj.sid,
+                    conn.db, status
+                )
         else:
             status = 'Busy'
             messages = conn.messages()
+            if script is not None:
+                statements = script.pop_results()
+                record_statements(trans_obj, conn, script, statements)
+                messages.insert(0, format_results(statements))
             if messages and len(messages) > 0:
                 result = ''.join(messages)
 
@@ -847,6 +945,18 @@ def poll(trans_id):
     additional_messages = None
     if status == 'Success':
         messages = conn.messages()
+        if script is not None:
+            # The messages of the last statement are reported with its status
+            statements = script.pop_results()
+            record_statements(trans_obj, conn, script, statements)
+            if statements and messages:
+                statements[-1]['messages'] = ''.join(messages)
+            messages = [format_results(statements)]
+        else:
+            history.finish_query(
+                (trans_obj.sid, trans_obj.conn_id), trans_obj.sid, conn.db,
+                status, rows_affected, conn.status_message()
+            )
         if messages:
             additional_messages = ''.join(messages)
 
@@ -872,7 +982,112 @@ def poll(trans_id):
             'types': types,
             'client_primary_key': client_primary_key,
             'has_oids': has_oids,
-            'oids': oids
+            'oids': oids,
+            'statements': statements
+        }
+    )
+
+
+def record_statements(trans_obj, conn, script, statements):
+    """
+    Record the statements of the script executed separately in the query
+    history.
+    """
+    for res in statements:
+        history.record(
+            trans_obj.sid, conn.db, script.statements[res['statement'] - 1][1],
+            res['status'], res['duration'], res['rows_affected'],
+            res['message']
+        )
+
+
+@blueprint.route(
+    '/query_history/', methods=["GET"], endpoint='query_history'
+)
+@login_required
+def query_history():
+    """
+    This method returns a page of the query history of the user (newest
+    first).
+
+    Query args:
+        sid: only the queries executed on the server
+        search: only the queries having the words (prefixes)
+        before: only the queries older than the query having this id (i.e.
+                the 'next' id of the previous page)
+        limit: number of the queries per page
+    """
+    return make_json_response(
+        data=history.get_history(
+            server_id=request.args.get('sid', type=int),
+            search=request.args.get('search'),
+            before=request.args.get('before', type=int),
+            limit=request.args.get('limit', 50, type=int)
+        )
+    )
+
+
+@blueprint.route(
+    '/query_history/stats', methods=["GET"], endpoint='query_history_stats'
+)
+@login_required
+def query_history_stats():
+    """
+    This method returns the statistics (count, errors, total, mean, p50, p95
+    and max duration) of the queries of the user per fingerprint (the query
+    with the literals replaced by the placeholders), the most time consuming
+    first.
+
+    Query args:
+        sid: only the queries executed on the server
+        limit: number of the fingerprints
+    """
+    return make_json_response(
+        data=history.get_statistics(
+            server_id=request.args.get('sid', type=int),
+            limit=request.args.get('limit', 50, type=int)
+        )
+    )
+
+
+@blueprint.route(
+    '/query_tool/statement/<int:trans_id>/<int:statement>',
+    methods=["GET"], endpoint='statement_result'
+)
+@login_required
+def statement_result(trans_id, statement):
+    """
+    This method returns the status, and the result set retained of a
+    statement of the script executed separately.
+
+    Args:
+        trans_id: unique transaction id
+        statement: number of the statement (1 based)
+    """
+    status, error_msg, conn, trans_obj, session_obj = \
+        check_transaction_status(trans_id)
+    if not status or trans_obj is None:
+        return make_json_response(
+            data={'status': 'NotConnected', 'result': error_msg}
+        )
+
+    script = get_script((trans_obj.sid, trans_obj.conn_id))
+    if script is None or statement < 1 or statement > len(script.results):
+        return gone(gettext('The statement could not be found.'))
+
+    result_set = script.result_set(statement)
+    if result_set is None:
+        return gone(gettext(
+            'The result of the statement is not available anymore.'
+        ))
+
+    return make_json_response(
+        data={
+            'status': 'Success',
+            'statement': script.results[statement - 1],
+            'colinfo': result_set['colinfo'],
+            'result': result_set['result'],
+            'truncated': result_set['truncated']
         }
     )
 
@@ -920,6 +1135,58 @@ def fetch(trans_id, fetch_all=None):
     )
 
 
+@blueprint.route(
+    '/fetch/<int:trans_id>/rows/<int:from_row>', methods=["GET"],
+    endpoint='fetch_rows'
+)
+@login_required
+def fetch_rows(trans_id, from_row):
+    """
+    This method returns the rows of the result from the given row (1 based),
+    i.e. jumps to the row, without changing the rows fetched by the fetch
+    method. The rows of a large result are read directly from the temporary
+    file it has been written into.
+
+    Query args:
+        count: number of the rows (at most ON_DEMAND_RECORD_COUNT)
+
+    Args:
+        trans_id: unique transaction id
+        from_row: first row to fetch
+    """
+    result = None
+    rows_fetched_from = 0
+    rows_fetched_to = 0
+    count = max(min(
+        request.args.get('count', ON_DEMAND_RECORD_COUNT, type=int),
+        ON_DEMAND_RECORD_COUNT
+    ), 1)
+
+    # Check the transaction and connection status
+    status, error_msg, conn, trans_obj, session_obj = \
+        check_transaction_status(trans_id)
+    if status and conn is not None and session_obj is not None:
+        status, result = conn.async_fetch_rows(max(from_row - 1, 0), count)
+        if not status:
+            status = 'Error'
+        else:
+            status = 'Success'
+            if result:
+                rows_fetched_from = max(from_row, 1)
+                rows_fetched_to = rows_fetched_from + len(result) - 1
+    else:
+        status = 'NotConnected'
+        result = error_msg
+
+    return make_json_response(
+        data={
+            'status': status, 'result': result,
+            'rows_fetched_from': rows_fetched_from,
+            'rows_fetched_to': rows_fetched_to
+        }
+    )
+
+
 def fetch_pg_types(columns_info, trans_obj):
     """
     This method is used to fetch the pg types, which is required
@@ -1500,6 +1767,18 @@ def script():
            )
 
 
+def begin_if_required(conn, trans_obj, query):
+    """
+    Start a transaction before executing the query, if auto commit is False,
+    no transaction is in progress, and the query does not control the
+    transaction itself (see is_begin_required).
+    """
+    if not trans_obj.auto_commit \
+            and conn.transaction_status() == TX_STATUS_IDLE \
+            and is_begin_required(query):
+        conn.execute_void("BEGIN;")
+
+
 def is_begin_required(query):
     word_len = 0
     query = query.strip()
@@ -0,0 +1,422 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+History of the queries executed in the Query Tool, stored in the
+configuration database, searchable (using the full text search index, when
+available), and aggregated per fingerprint (i.e. the query normalised, with
+the literals replaced by the placeholders).
+"""
+
+import datetime
+import hashlib
+import math
+import re
+import threading
+import time
+
+from flask import current_app
+from flask_security import current_user
+from sqlalchemy import text
+
+import config
+from pgadmin.model import db, QueryHistory
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# Maximum number of the queries returned per page
+MAX_PAGE_SIZE = 1000
+
+# Maximum length of the (status/error) message stored
+MAX_MESSAGE_LENGTH = 1024
+
+# Queries being executed (not of a script executed separately), keyed by the
+# server id, and the id of the asynchronous connection.
+_pending = dict()
+_pending_lock = threading.Lock()
+
+_sweeper_lock = threading.Lock()
+_sweeper_thread = None
+_fts_available = None
+
+_TOKENS = re.compile(r"""
+    (?P<string>(?:(?<!\w)[EeBbXxNnUu])?'(?:[^']|'')*')
+  | (?P<dollar>\$(?P<tag>(?:[^\W\d]\w*)?)\$.*?\$(?P=tag)\$)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<number>(?<![\w.$])\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)
+  | (?P<param>\$\d+)
+""", re.VERBOSE | re.DOTALL | re.UNICODE)
+_LIST = r'\(\s*\?(?:\s*,\s*\?)*\s*\)'
+_LISTS = re.compile(r'{0}(?:\s*,\s*{0})*'.format(_LIST))
+_SPACES = re.compile(r'\s+', re.UNICODE)
+# Statements which may carry the credentials (passwords, connection strings)
+# in their literals
+_CREDENTIALS = re.compile(
+    r'\b(?:password|user\s+mapping|subscription|dblink\w*)\b',
+    re.IGNORECASE | re.UNICODE
+)
+_WORDS = re.compile(r'\w+', re.UNICODE)
+
+
+def _replace_token(match):
+    return ' ' if match.group('comment') is not None else '?'
+
+
+def normalize(query):
+    """
+    Normalise the query, i.e. remove the comments, replace the literals (and
+    the lists of them) with the placeholders, and collapse the whitespaces,
+    so that the queries differing only by the literals are the same.
+    """
+    query = _TOKENS.sub(_replace_token, query)
+    query = _LISTS.sub('(?)', query)
+    return _SPACES.sub(' ', query).strip().rstrip(';').strip().lower()
+
+
+def _hash(value):
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+def fingerprint(query):
+    """Returns the fingerprint (hash of the normalised query)."""
+    return _hash(normalize(query))
+
+
+def percentile_offset(count, pct):
+    """
+    Returns the (0 based) offset of the (nearest rank) percentile in the
+    'count' sorted values.
+    """
+    return max(int(math.ceil(pct / 100.0 * count)) - 1, 0)
+
+
+def percentile(values, pct):
+    """Returns the (nearest rank) percentile of the sorted values."""
+    if not values:
+        return None
+    return values[percentile_offset(len(values), pct)]
+
+
+def redact(query):
+    """
+    Returns the text of the query to be stored in the history, i.e. the
+    normalised query (without the literals, and the comments) for the
+    statements which may carry the credentials, the query as it is otherwise.
+    """
+    if _CREDENTIALS.search(query):
+        return normalize(query)
+    return query
+
+
+def fts_match(search):
+    """
+    Returns the full text search query (the words of the search, as the
+    prefixes) for the search text, None if there is no word in it.
+    """
+    words = _WORDS.findall(search)
+    if not words:
+        return None
+    return u' '.join(u'{0}*'.format(word) for word in words)
+
+
+def start_query(key, query):
+    """The query has been sent for the execution."""
+    with _pending_lock:
+        _pending[key] = (query, _monotonic())
+
+
+def finish_query(key, server_id, db_name, status, rows=None, message=None):
+    """
+    The query sent for the execution has completed, record it (if it has
+    been started).
+    """
+    with _pending_lock:
+        pending = _pending.pop(key, None)
+
+    if pending is None:
+        return
+
+    query, started_at = pending
+    record(
+        server_id, db_name, query, status,
+        int((_monotonic() - started_at) * 1000), rows, message
+    )
+
+
+def record(server_id, db_name, query, status, duration, rows=None,
+           message=None):
+    """
+    Record the query in the history of the current user.
+
+    Args:
+        server_id: Server id
+        db_name: Name of the database
+        query: Query executed
+        status: 'Success', 'Error', or 'Cancel'
+        duration: Duration of the execution (in milliseconds)
+        rows: Number of the rows returned/affected
+        message: Status message or error
+    """
+    if not config.QUERY_HISTORY_ENABLED:
+        return
+
+    _start_sweeper()
+
+    # The error of a statement carrying the credentials may quote them
+    redacted = redact(query)
+    if redacted is not query:
+        query, message = redacted, None
+
+    max_length = config.QUERY_HISTORY_MAX_QUERY_LENGTH
+    start_time = datetime.datetime.utcnow() - \
+        datetime.timedelta(milliseconds=duration or 0)
+
+    try:
+        db.session.add(QueryHistory(
+            user_id=current_user.id,
+            server_id=server_id,
+            db_name=db_name,
+            query=query[:max_length] if max_length else query,
+            query_hash=_hash(query),
+            fingerprint=fingerprint(query),
+            start_time=start_time.strftime('%Y-%m-%d %H:%M:%S.%f'),
+            duration=duration,
+            rows=rows if rows is None or rows >= 0 else None,
+            status=status,
+            message=message[:MAX_MESSAGE_LENGTH] if message else None
+        ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(
+            u"Failed to record the query in the history: {0}".format(e)
+        )
+
+
+def apply_retention():
+    """
+    Remove the queries (of all the users) older than QUERY_HISTORY_MAX_AGE
+    days, and the queries of a user beyond QUERY_HISTORY_MAX_ENTRIES (the
+    oldest first).
+
+    Returns:
+        Number of the queries removed
+    """
+    removed = 0
+
+    with _sweeper_lock:
+        if config.QUERY_HISTORY_MAX_AGE:
+            removed += db.session.execute(text(
+                'DELETE FROM query_history WHERE start_time < :cutoff'
+            ), {
+                'cutoff': (
+                    datetime.datetime.utcnow() -
+                    datetime.timedelta(days=config.QUERY_HISTORY_MAX_AGE)
+                ).strftime('%Y-%m-%d %H:%M:%S.%f')
+            }).rowcount
+
+        if config.QUERY_HISTORY_MAX_ENTRIES:
+            users = [row.user_id for row in db.session.execute(text(
+                'SELECT user_id FROM query_history GROUP BY user_id '
+                'HAVING COUNT(*) > :max_entries'
+            ), {'max_entries': config.QUERY_HISTORY_MAX_ENTRIES})]
+
+            for user_id in users:
+                removed += db.session.execute(text("""
+                    DELETE FROM query_history
+                    WHERE user_id = :user_id AND id <= (
+                        SELECT id FROM query_history WHERE user_id = :user_id
+                        ORDER BY id DESC LIMIT 1 OFFSET :max_entries
+                    )
+                """), {
+                    'user_id': user_id,
+                    'max_entries': config.QUERY_HISTORY_MAX_ENTRIES
+                }).rowcount
+
+        db.session.commit()
+
+    return removed
+
+
+def _start_sweeper():
+    """
+    Start the thread applying the retention limits every
+    QUERY_HISTORY_RETENTION_INTERVAL seconds (unless running).
+    """
+    global _sweeper_thread
+
+    if not config.QUERY_HISTORY_RETENTION_INTERVAL or (
+        _sweeper_thread is not None and _sweeper_thread.is_alive()
+    ):
+        return
+
+    app = current_app._get_current_object()
+
+    def run():
+        while True:
+            with app.app_context():
+                try:
+                    removed = apply_retention()
+                    if removed:
+                        app.logger.info(
+                            'Removed %d query(ies) from the query history as '
+                            'per the retention limits.', removed
+                        )
+                except Exception as e:
+                    app.logger.exception(e)
+                finally:
+                    db.session.remove()
+            time.sleep(config.QUERY_HISTORY_RETENTION_INTERVAL)
+
+    _sweeper_thread = threading.Thread(
+        target=run, name='query-history-sweeper'
+    )
+    _sweeper_thread.daemon = True
+    _sweeper_thread.start()
+
+
+def _has_fts():
+    global _fts_available
+
+    if _fts_available is None:
+        _fts_available = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND "
+            "name = 'query_history_fts'"
+        )).first() is not None
+
+    return _fts_available
+
+
+def _as_dict(row):
+    return {
+        'id': row.id,
+        'server_id': row.server_id,
+        'db': row.db_name,
+        'query': row.query,
+        'query_hash': row.query_hash,
+        'fingerprint': row.fingerprint,
+        'start_time': row.start_time,
+        'duration': row.duration,
+        'rows': row.rows,
+        'status': row.status,
+        'message': row.message
+    }
+
+
+def get_history(server_id=None, search=None, before=None, limit=50):
+    """
+    Returns a page of the history of the current user (newest first), the
+    next page is fetched by passing the 'next' id returned as 'before'.
+
+    Args:
+        server_id: Only the queries executed on the server
+        search: Only the queries having the words (prefixes)
+        before: Only the queries older than the one having this id
+        limit: Number of the queries per page
+    """
+    conditions = ['user_id = :user_id']
+    params = {
+        'user_id': current_user.id,
+        'limit': max(min(limit, MAX_PAGE_SIZE), 1)
+    }
+
+    if server_id is not None:
+        conditions.append('server_id = :server_id')
+        params['server_id'] = server_id
+
+    if before is not None:
+        conditions.append('id < :before')
+        params['before'] = before
+
+    if search:
+        match = fts_match(search)
+        if match is not None and _has_fts():
+            conditions.append(
+                'id IN (SELECT docid FROM query_history_fts '
+                'WHERE query_history_fts MATCH :match)'
+            )
+            params['match'] = match
+        else:
+            conditions.append("query LIKE :like ESCAPE '\\'")
+            params['like'] = u'%{0}%'.format(
+                re.sub(r'([\\%_])', r'\\\1', search)
+            )
+
+    rows = [_as_dict(row) for row in db.session.execute(text(
+        'SELECT * FROM query_history WHERE {0} '
+        'ORDER BY id DESC LIMIT :limit'.format(' AND '.join(conditions))
+    ), params)]
+
+    return {
+        'rows': rows,
+        'next': rows[-1]['id'] if len(rows) == params['limit'] else None
+    }
+
+
+def get_statistics(server_id=None, limit=50):
+    """
+    Returns the statistics of the durations of the queries of the current
+    user per fingerprint (the most time consuming first).
+
+    The queries are aggregated in the database, the percentiles of the
+    durations of a fingerprint are looked up by their rank (using the index
+    on the user, fingerprint, and duration).
+    """
+    conditions = ['user_id = :user_id']
+    params = {
+        'user_id': current_user.id,
+        'limit': max(min(limit, MAX_PAGE_SIZE), 1)
+    }
+
+    if server_id is not None:
+        conditions.append('server_id = :server_id')
+        params['server_id'] = server_id
+
+    where = ' AND '.join(conditions)
+    rows = db.session.execute(text("""
+        SELECT s.*, h.query, h.start_time AS last_run
+        FROM (
+            SELECT fingerprint, COUNT(*) AS count,
+                COUNT(duration) AS timed,
+                SUM(CASE WHEN status != 'Success' THEN 1 ELSE 0 END)
+                    AS errors,
+                TOTAL(duration) AS total, AVG(duration) AS mean,
+                MAX(duration) AS max, MAX(id) AS last_id
+            FROM query_history WHERE {0}
+            GROUP BY fingerprint ORDER BY total DESC LIMIT :limit
+        ) s JOIN query_history h ON h.id = s.last_id
+        ORDER BY s.total DESC
+    """.format(where)), params).fetchall()
+
+    rank = text("""
+        SELECT duration FROM query_history
+        WHERE {0} AND fingerprint = :fingerprint AND duration IS NOT NULL
+        ORDER BY duration LIMIT 1 OFFSET :offset
+    """.format(where))
+
+    def _percentile(row, pct):
+        if not row.timed:
+            return None
+        return db.session.execute(rank, dict(
+            params, fingerprint=row.fingerprint,
+            offset=percentile_offset(row.timed, pct)
+        )).scalar()
+
+    return [{
+        'fingerprint': row.fingerprint,
+        'query': row.query,
+        'last_run': row.last_run,
+        'count': row.count,
+        'errors': row.errors,
+        'total': row.total,
+        'mean': row.mean,
+        'p50': _percentile(row, 50),
+        'p95': _percentile(row, 95),
+        'max': row.max
+    } for row in rows]
@@ -0,0 +1,239 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Execution of the statements of a script separately (one after another) on
+the asynchronous connection of the Query Tool, keeping the status, and the
+result sets (bounded) of each statement.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from flask_babel import gettext
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# Maximum length of the statement reported in the status of the statement
+MAX_STATEMENT_LENGTH = 256
+
+# Script executions in progress (or completed, but not replaced yet), keyed by
+# the server id, and the id of the asynchronous connection.
+_executions = dict()
+_executions_lock = Lock()
+
+
+class ScriptExecution(object):
+    """
+    class ScriptExecution
+
+    Keeps the statements of a script, the statement being executed, and the
+    status (status message, rows affected, duration, messages from the
+    server) of each statement executed.
+
+    The result sets of the statements (except the last one, which is shown in
+    the data grid) are retained, at most 'max_result_sets' of them, and at
+    most 'max_rows' rows of each, discarding the oldest result sets.
+    """
+
+    def __init__(self, statements, max_result_sets=0, max_rows=0):
+        """
+        Args:
+            statements: list of (line, statement) as returned by
+                        split_statements
+            max_result_sets: number of the result sets retained
+            max_rows: number of the rows retained per result set
+        """
+        self.statements = statements
+        self.max_result_sets = max_result_sets
+        self.max_rows = max_rows
+        self.current = -1
+        self.started_at = None
+        self.results = []
+        self.reported = 0
+        self.result_sets = OrderedDict()
+        self.aborted = False
+
+    def __len__(self):
+        return len(self.statements)
+
+    def is_last(self):
+        return self.current >= len(self.statements) - 1
+
+    def next_statement(self):
+        """Returns the next statement to be executed."""
+        self.current += 1
+        self.started_at = _monotonic()
+        return self.statements[self.current][1]
+
+    def finish_statement(self, status, message=None, rows_affected=-1,
+                         messages=None, columns=None, rows=None):
+        """
+        Record the status of the statement being executed, and retain its
+        result set (if any).
+        """
+        line, statement = self.statements[self.current]
+        if len(statement) > MAX_STATEMENT_LENGTH:
+            statement = statement[:MAX_STATEMENT_LENGTH] + '...'
+
+        res = {
+            'statement': self.current + 1,
+            'line': line + 1,
+            'query': statement,
+            'status': status,
+            'message': message,
+            'rows_affected': rows_affected,
+            'duration': int((_monotonic() - self.started_at) * 1000),
+            'messages': ''.join(messages) if messages else None,
+            'has_result': False
+        }
+        self.results.append(res)
+
+        if columns is not None and rows is not None and \
+                self.max_result_sets > 0:
+            truncated = self.max_rows > 0 and len(rows) > self.max_rows
+            self.result_sets[self.current + 1] = {
+                'colinfo': columns,
+                'result': rows[:self.max_rows] if truncated else rows,
+                'truncated': truncated
+            }
+            res['has_result'] = True
+
+            while len(self.result_sets) > self.max_result_sets:
+                number, _ = self.result_sets.popitem(last=False)
+                self.results[number - 1]['has_result'] = False
+
+        return res
+
+    def abort(self):
+        """Do not execute the remaining statements."""
+        self.aborted = True
+        self.statements = self.statements[:self.current + 1]
+
+    def pop_results(self):
+        """Returns the status of the statements executed since the last call."""
+        res = self.results[self.reported:]
+        self.reported = len(self.results)
+        return res
+
+    def result_set(self, number):
+        """Returns the result set retained for the statement (1 based)."""
+        return self.result_sets.get(number)
+
+
+def format_results(results):
+    """Format the status of the statements for the messages panel."""
+    res = []
+    for result in results:
+        if result['messages']:
+            res.append(result['messages'])
+        res.append(gettext(
+            "Statement {0} (line {1}): {2} ({3} msec).\n"
+        ).format(
+            result['statement'], result['line'],
+            result['message'] or result['status'], result['duration']
+        ))
+    return ''.join(res)
+
+
+def start_script(key, script):
+    """Register the script being executed (replacing the previous one)."""
+    with _executions_lock:
+        _executions[key] = script
+
+
+def get_script(key):
+    with _executions_lock:
+        return _executions.get(key)
+
+
+def discard_script(key):
+    with _executions_lock:
+        return _executions.pop(key, None)
+
+
+def poll_script(conn, script, time_budget, prepare=None):
+    """
+    Poll the statement being executed, and execute the next statements of
+    the script once it completes, as long as the statements complete within
+    the time budget (i.e. a script of short statements does not need a poll
+    request per statement).
+
+    Args:
+        conn: asynchronous connection
+        script: ScriptExecution
+        time_budget: time (in seconds) to spend executing the statements
+        prepare: function called with each statement before executing it
+                 (e.g. to start a transaction, if required)
+
+    Returns:
+        The status and result of the poll (as returned by Connection.poll),
+        the result of the last statement is left for the caller to fetch.
+    """
+    deadline = _monotonic() + time_budget
+
+    while True:
+        status, result = conn.poll(formatted_exception_msg=True,
+                                   no_result=True)
+
+        if not status:
+            script.finish_statement(
+                'Error', message=result, messages=conn.messages()
+            )
+            script.abort()
+            return status, result
+
+        if status == conn.ASYNC_EXECUTION_ABORTED:
+            script.finish_statement('Cancel', messages=conn.messages())
+            script.abort()
+            return status, result
+
+        if status != conn.ASYNC_OK:
+            return status, result
+
+        columns = conn.get_column_info()
+        rows_affected = conn.rows_affected()
+        message = conn.status_message()
+
+        if script.is_last():
+            # The messages, and the result of the last statement are reported
+            # by the caller.
+            script.finish_statement(
+                'Success', message=message, rows_affected=rows_affected
+            )
+            return status, result
+
+        rows = None
+        if columns is not None and script.max_result_sets > 0:
+            # Fetch one more row to know if the result set is truncated
+            st, rows = conn.async_fetchmany_2darray(
+                script.max_rows + 1 if script.max_rows > 0 else -1
+            )
+            if not st:
+                rows = None
+
+        script.finish_statement(
+            'Success', message=message, rows_affected=rows_affected,
+            messages=conn.messages(), columns=columns, rows=rows or []
+        )
+
+        statement = script.next_statement()
+        if prepare is not None:
+            prepare(statement)
+
+        status, result = conn.execute_async(statement)
+        if not status:
+            script.finish_statement('Error', message=result)
+            script.abort()
+            return status, result
+
+        if status != conn.ASYNC_OK or _monotonic() >= deadline:
+            # Report the progress, the statement is polled next time.
+            return conn.ASYNC_READ_TIMEOUT, None
@@ -0,0 +1,108 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.tools.sqleditor.history import normalize, fingerprint, \
+    percentile, percentile_offset, fts_match, redact
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class QueryFingerprintTestCase(BaseTestGenerator):
+    """Test the normalisation of the queries for the fingerprints"""
+    scenarios = [
+        ('Literals are replaced with the placeholders',
+         dict(
+             query="SELECT * FROM t1 WHERE a = 10 AND b = 'x''y' "
+                   "AND c > 1.5e3;",
+             other="select *\n  from t1 where a = 7 and b = E'z' "
+                   "and c > 2 -- recent",
+             expected='select * from t1 where a = ? and b = ? and c > ?'
+         )),
+        ('Lists of literals are collapsed',
+         dict(
+             query='SELECT * FROM t WHERE id IN (1, 2, 3)',
+             other='SELECT * FROM t WHERE id IN ($1)',
+             expected='select * from t where id in (?)'
+         )),
+        ('Dollar quoted strings, and comments are removed',
+         dict(
+             query="/* report */ SELECT $fn$ it's; $fn$, '--' || $$a$$",
+             other="SELECT 'b', $x$ c $x$ || '--'",
+             expected='select ?, ? || ?'
+         )),
+        ('Multiple rows of values are collapsed',
+         dict(
+             query="INSERT INTO t VALUES (1, 'a'), (2, 'b'), (3, 'c');",
+             other="INSERT INTO t VALUES (4, 'd')",
+             expected='insert into t values (?)'
+         ))
+    ]
+
+    def runTest(self):
+        self.assertEqual(normalize(self.query), self.expected)
+        self.assertEqual(fingerprint(self.query), fingerprint(self.other))
+
+
+class QueryStatisticsTestCase(BaseTestGenerator):
+    """Test the percentiles of the durations, and the search queries"""
+    scenarios = [
+        ('Percentiles of the durations',
+         dict(
+             values=list(range(1, 101)),
+             expected={50: 50, 95: 95, 100: 100}
+         )),
+        ('Percentiles of a single duration',
+         dict(
+             values=[7],
+             expected={50: 7, 95: 7}
+         ))
+    ]
+
+    def runTest(self):
+        for pct, expected in self.expected.items():
+            self.assertEqual(percentile(self.values, pct), expected)
+            # The offset used for looking up the percentile in the database
+            self.assertEqual(
+                self.values[percentile_offset(len(self.values), pct)],
+                expected
+            )
+
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(fts_match(u'pg_class "rel"'), u'pg_class* rel*')
+        self.assertIsNone(fts_match(u'" *'))
+
+
+class QueryRedactionTestCase(BaseTestGenerator):
+    """Test the literals of the statements carrying credentials are removed"""
+    scenarios = [
+        ('Password of a role',
+         dict(
+             query="ALTER ROLE joe PASSWORD 'secret' VALID UNTIL 'infinity'",
+             expected='alter role joe password ? valid until ?'
+         )),
+        ('Options of a user mapping',
+         dict(
+             query="CREATE USER MAPPING FOR joe SERVER srv\n"
+                   "  OPTIONS (user 'joe', password 'secret');",
+             expected='create user mapping for joe server srv '
+                      'options (user ?, password ?)'
+         )),
+        ('Connection string of dblink',
+         dict(
+             query="SELECT dblink_connect('c1', 'host=db password=secret')",
+             expected='select dblink_connect(?)'
+         )),
+        ('Other statements are kept as they are',
+         dict(
+             query="SELECT * FROM users WHERE name = 'joe' -- passwd",
+             expected="SELECT * FROM users WHERE name = 'joe' -- passwd"
+         ))
+    ]
+
+    def runTest(self):
+        self.assertEqual(redact(self.query), self.expected)
@@ -0,0 +1,161 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.tools.sqleditor.statements import ScriptExecution, poll_script
+from pgadmin.utils.route import BaseTestGenerator
+from pgadmin.utils.sqlautocomplete.parseutils import split_statements, \
+    strip_leading_comments
+
+
+class FakeConnection(object):
+    """
+    Stands for the asynchronous connection, executing the statements
+    immediately, a statement is 'SELECT <n>' (returning n rows), 'FAIL', or
+    any other statement (returning no rows).
+    """
+    ASYNC_OK = 1
+    ASYNC_READ_TIMEOUT = 2
+    ASYNC_EXECUTION_ABORTED = 5
+
+    def __init__(self):
+        self.executed = []
+        self.rows = None
+
+    def execute_async(self, query):
+        # Skip the comments preceding the statement
+        self.executed.append(query.splitlines()[-1].strip(' ;'))
+        return True, self.ASYNC_OK
+
+    def poll(self, formatted_exception_msg=False, no_result=False):
+        query = self.executed[-1]
+        if query == 'FAIL':
+            return False, 'ERROR:  syntax error at or near "FAIL"'
+        self.rows = None
+        if query.startswith('SELECT'):
+            self.rows = [(i,) for i in range(int(query.split()[1]))]
+        return self.ASYNC_OK, None
+
+    def get_column_info(self):
+        if self.rows is None:
+            return None
+        return [{'name': 'n', 'type_code': 23}]
+
+    def rows_affected(self):
+        return len(self.rows) if self.rows is not None else -1
+
+    def status_message(self):
+        if self.rows is not None:
+            return 'SELECT {0}'.format(len(self.rows))
+        return self.executed[-1].split()[0]
+
+    def async_fetchmany_2darray(self, records=2000):
+        return True, self.rows[:records] if records > 0 else self.rows
+
+    def messages(self):
+        return []
+
+
+class ScriptExecutionTestCase(BaseTestGenerator):
+    """Test executing the statements of a script separately"""
+    scenarios = [
+        ('All the statements are executed in order',
+         dict(
+             sql='CREATE TABLE t(n int);\n\n'
+                 '-- fill it\nSELECT 3;\n'
+                 "DO $$ BEGIN RAISE NOTICE 'a;b'; END $$;\n"
+                 'SELECT 2;',
+             max_result_sets=10, max_rows=10,
+             expected_lines=[1, 4, 5, 6],
+             expected_status=['Success', 'Success', 'Success', 'Success'],
+             expected_poll_status=FakeConnection.ASYNC_OK,
+             expected_result_sets={2: 3}
+         )),
+        ('Execution stops at the failing statement',
+         dict(
+             sql='SELECT 1; FAIL; SELECT 2;',
+             max_result_sets=10, max_rows=10,
+             expected_lines=[1, 1],
+             expected_status=['Success', 'Error'],
+             expected_poll_status=False,
+             expected_result_sets={1: 1}
+         )),
+        ('Result sets retained are bounded',
+         dict(
+             sql='SELECT 5; SELECT 5; SELECT 5; SELECT 1;',
+             max_result_sets=2, max_rows=3,
+             expected_lines=[1, 1, 1, 1],
+             expected_status=['Success', 'Success', 'Success', 'Success'],
+             expected_poll_status=FakeConnection.ASYNC_OK,
+             expected_result_sets={2: 3, 3: 3}
+         ))
+    ]
+
+    def runTest(self):
+        statements = split_statements(self.sql)
+        script = ScriptExecution(
+            statements, self.max_result_sets, self.max_rows
+        )
+        conn = FakeConnection()
+        conn.execute_async(script.next_statement())
+
+        prepared = []
+        status, result = poll_script(
+            conn, script, time_budget=60, prepare=prepared.append
+        )
+        self.assertEqual(status, self.expected_poll_status)
+
+        results = script.pop_results()
+        # Every statement executed on polling is prepared (e.g. BEGIN)
+        self.assertEqual(
+            prepared, [stmt for _, stmt in statements[1:len(results)]]
+        )
+        self.assertEqual([res['line'] for res in results],
+                         self.expected_lines)
+        self.assertEqual([res['status'] for res in results],
+                         self.expected_status)
+        self.assertEqual(script.pop_results(), [])
+
+        for number, res in enumerate(results, 1):
+            result_set = script.result_set(number)
+            if number in self.expected_result_sets:
+                self.assertTrue(res['has_result'])
+                self.assertEqual(len(result_set['result']),
+                                 self.expected_result_sets[number])
+            else:
+                self.assertFalse(res['has_result'])
+                self.assertIsNone(result_set)
+
+
+class SplitStatementsTestCase(BaseTestGenerator):
+    """Test the line numbers of the statements of a script"""
+    scenarios = [
+        ('Comments preceding the statements are skipped',
+         dict(
+             sql='/* setup */\nCREATE TABLE t(n int);\n'
+                 '-- fill it\n\n  INSERT INTO t VALUES (1);\n'
+                 '/* one */ /* two */ SELECT 1;',
+             expected_lines=[1, 4, 5],
+             expected_starts=['CREATE', 'INSERT', 'SELECT']
+         )),
+        ('Empty statements are skipped',
+         dict(
+             sql='SELECT 1;\n;\n-- nothing\n;\nSELECT 2;',
+             expected_lines=[0, 4],
+             expected_starts=['SELECT', 'SELECT']
+         ))
+    ]
+
+    def runTest(self):
+        statements = split_statements(self.sql)
+        self.assertEqual([line for line, _ in statements],
+                         self.expected_lines)
+        self.assertEqual(
+            [strip_leading_comments(stmt).split()[0] for _, stmt in statements],
+            self.expected_starts
+        )
@@ -11,23 +11,261 @@
 
 import datetime
 import decimal
+import uuid
 
 import simplejson as json
 from flask import Response
 from flask_babel import gettext as _
 
+import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _timedelta_to_str(obj):
+    return (datetime.datetime.min + obj).time().isoformat()
+
+
+# Converters for the data types, which are not supported by the JSON encoders
+# (type -> converter). Decimals are converted to strings (as the numeric
+# values of a query result, see typecast.py) to keep them exact with every
+# encoder.
+JSON_CONVERTERS = {
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+    datetime.timedelta: _timedelta_to_str,
+    decimal.Decimal: str
+}
+
+# Number of the rows sampled to find the columns to be converted in bulk
+CONVERT_SAMPLE_ROWS = 10
+
+
+def json_default(obj):
+    """
+    Converts the objects, which are not supported by the JSON encoders.
+    The converter is looked up by the exact type first (fast path), and then
+    by the instance checks.
+    """
+    converter = JSON_CONVERTERS.get(type(obj))
+    if converter is not None:
+        return converter(obj)
+
+    if isinstance(obj, datetime.datetime) \
+            or hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    elif isinstance(obj, datetime.timedelta):
+        return _timedelta_to_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+
+    raise TypeError(repr(obj) + " is not JSON serializable")
+
 
 class DataTypeJSONEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, datetime.datetime) \
-                or hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        elif isinstance(obj, datetime.timedelta):
-            return (datetime.datetime.min + obj).time().isoformat()
-        if isinstance(obj, decimal.Decimal):
-            return float(obj)
+        try:
+            return json_default(obj)
+        except TypeError:
+            return json.JSONEncoder.default(self, obj)
+
+
+def _simplejson_dumps(obj):
+    # Decimals are passed to json_default (see JSON_CONVERTERS)
+    return json.dumps(
+        obj, cls=DataTypeJSONEncoder, separators=(',', ':'),
+        use_decimal=False
+    )
+
+
+def _orjson_dumps(obj):
+    try:
+        # The date/time objects are passed to json_default, to keep the same
+        # format as the other encoders.
+        return orjson.dumps(
+            obj, default=json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode('utf-8')
+    except TypeError:
+        # Not supported by orjson (e.g. integers beyond 64 bit)
+        return _simplejson_dumps(obj)
+
+
+# JSON encoders available (name -> function encoding an object as string)
+JSON_ENCODERS = {
+    'simplejson': _simplejson_dumps
+}
+if orjson is not None:
+    JSON_ENCODERS['orjson'] = _orjson_dumps
+
+
+def register_json_encoder(name, dumps):
+    """
+    Register a JSON encoder, which can be chosen using the JSON_ENCODER
+    configuration.
+
+    Args:
+        name: Name of the encoder
+        dumps: Function encoding an object as (unicode) string, using
+               json_default for the data types not supported by it
+    """
+    JSON_ENCODERS[name] = dumps
+
+
+def get_json_encoder():
+    """
+    Returns the JSON encoder chosen by the JSON_ENCODER configuration ('auto'
+    chooses the fastest one available).
+    """
+    name = config.JSON_ENCODER
+    if name == 'auto':
+        name = 'orjson' if 'orjson' in JSON_ENCODERS else 'simplejson'
+    return JSON_ENCODERS.get(name, _simplejson_dumps)
+
+
+def encode_json(obj):
+    """Encode the object as JSON using the chosen encoder."""
+    return get_json_encoder()(obj)
+
+
+def convert_rows(rows):
+    """
+    Convert the values of the data types not supported by the JSON encoders
+    in the rows (list of dicts, lists or tuples) in bulk, i.e. the columns
+    holding such values are found from the first rows, and only those columns
+    are converted, rather than calling the default hook of the encoder for
+    every value.
+
+    Returns:
+        The rows (copied, if they have any such column)
+    """
+    if not rows:
+        return rows
+
+    first = rows[0]
+    if isinstance(first, dict):
+        keys = list(first.keys())
+        copy = dict
+    elif isinstance(first, (list, tuple)):
+        keys = range(len(first))
+        copy = list
+    else:
+        return rows
 
-        return json.JSONEncoder.default(self, obj)
+    try:
+        converters = []
+        for key in keys:
+            for row in rows[:CONVERT_SAMPLE_ROWS]:
+                value = row[key]
+                if value is not None:
+                    converter = JSON_CONVERTERS.get(type(value))
+                    if converter is not None:
+                        converters.append((key, type(value), converter))
+                    break
+
+        if not converters:
+            return rows
+
+        res = []
+        for row in rows:
+            row = copy(row)
+            for key, value_type, converter in converters:
+                value = row[key]
+                # Any other value is left to the encoder
+                if type(value) is value_type:
+                    row[key] = converter(value)
+            res.append(row)
+        return res
+    except (KeyError, IndexError, TypeError):
+        # Not the rows of a result set
+        return rows
+
+
+def _find_large_array(doc, threshold):
+    """
+    Find an array (the rows) having at least 'threshold' items in the
+    document, i.e. the document itself, or an item of it (at most two levels
+    deep).
+
+    Returns:
+        The list of keys leading to the array (None, if not found)
+    """
+    if isinstance(doc, (list, tuple)):
+        return [] if len(doc) >= threshold else None
+
+    if not isinstance(doc, dict):
+        return None
+
+    for key, value in doc.items():
+        if isinstance(value, (list, tuple)) and len(value) >= threshold:
+            return [key]
+    for key, value in doc.items():
+        if isinstance(value, dict):
+            for subkey, subvalue in value.items():
+                if isinstance(subvalue, (list, tuple)) and \
+                        len(subvalue) >= threshold:
+                    return [key, subkey]
+    return None
+
+
+def _iter_json_array(rows, batch_size):
+    """Encode the array of rows incrementally, in the batches of rows."""
+    yield u'['
+    for idx in range(0, len(rows), batch_size):
+        chunk = encode_json(convert_rows(rows[idx:idx + batch_size]))
+        yield (u',' if idx else u'') + chunk[1:-1]
+    yield u']'
+
+
+def iter_json(doc, path, batch_size):
+    """
+    Encode the document incrementally, the array at the given path (list of
+    keys) is encoded in the batches of rows, i.e. the whole document is never
+    kept in the memory as a string.
+    """
+    if not path:
+        for chunk in _iter_json_array(doc, batch_size):
+            yield chunk
+        return
+
+    # Replace the array with a placeholder in the (copied) document
+    placeholder = u'pga-json-array-{0}'.format(uuid.uuid4().hex)
+    envelope = dict(doc)
+    container = envelope
+    for key in path[:-1]:
+        container[key] = dict(container[key])
+        container = container[key]
+    rows = container[path[-1]]
+    container[path[-1]] = placeholder
+
+    head, tail = encode_json(envelope).split(u'"' + placeholder + u'"', 1)
+    yield head
+    for chunk in _iter_json_array(rows, batch_size):
+        yield chunk
+    yield tail
+
+
+def json_response(doc, status=200):
+    """
+    Create the JSON response for the document. A document having a large
+    array (at least JSON_STREAM_THRESHOLD items) is streamed (i.e. sent as
+    chunked response).
+    """
+    threshold = config.JSON_STREAM_THRESHOLD
+    path = _find_large_array(doc, threshold) if threshold else None
+
+    return Response(
+        response=encode_json(doc) if path is None else iter_json(
+            doc, path, config.JSON_STREAM_BATCH_SIZE
+        ),
+        status=status,
+        mimetype="application/json",
+        headers=get_no_cache_header()
+    )
 
 def get_no_cache_header():
     """
@@ -54,22 +292,12 @@ def make_json_response(
     doc['result'] = result
     doc['data'] = data
 
-    return Response(
-        response=json.dumps(doc, cls=DataTypeJSONEncoder, separators=(',',':')),
-        status=status,
-        mimetype="application/json",
-        headers=get_no_cache_header()
-    )
+    return json_response(doc, status)
 
 
 def make_response(response=None, status=200):
     """Create a JSON response handled by the backbone models."""
-    return Response(
-        response=json.dumps(response, cls=DataTypeJSONEncoder, separators=(',',':')),
-        status=status,
-        mimetype="application/json",
-        headers=get_no_cache_header()
-    )
+    return json_response(response, status)
 
 
 def internal_server_error(errormsg=''):
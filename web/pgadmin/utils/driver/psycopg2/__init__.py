@@ -14,10 +14,12 @@ object.
 """
 
 import datetime
+import math
 import os
-import random
 import select
 import sys
+import threading
+import time
 
 import simplejson as json
 import psycopg2
@@ -30,10 +32,14 @@ from psycopg2.extensions import adapt, encodings
 import config
 from pgadmin.model import Server, User
 from pgadmin.utils.exception import ConnectionLost
-from pgadmin.utils import get_complete_file_path
+from pgadmin.utils import get_complete_file_path, metrics
 from .keywords import ScanKeyword
 from ..abstract import BaseDriver, BaseConnection
 from .cursor import DictCursor
+from .notices import NoticeRing
+from .spill import ResultSpill
+from .instrumentation import QueryTrace, query_logging_enabled, \
+    QUERY_LOG_LEVEL
 from .typecast import register_global_typecasters, register_string_typecasters,\
     register_binary_typecasters, register_array_to_string_typecasters,\
     ALL_JSON_TYPES
@@ -56,6 +62,90 @@ _ = gettext
 # Register global type caster which will be applicable to all connections.
 register_global_typecasters()
 
+# Session settings applied on every connection
+SESSION_SETTINGS = [
+    ('DateStyle', 'ISO'),
+    ('client_min_messages', 'notice'),
+    ('bytea_output', 'escape'),
+    ('client_encoding', 'UNICODE')
+]
+
+# Run parameters reported by the server at the connection startup (without
+# any round trip), which tell whether the cached server information is still
+# valid for a new connection.
+FINGERPRINT_PARAMETERS = [
+    'server_version', 'server_encoding', 'session_authorization',
+    'is_superuser'
+]
+
+# Fetches the server, database, and role information in a single round trip.
+BOOTSTRAP_QUERY = """
+SELECT
+    version() AS version,
+    db.oid as did, db.datname, db.datallowconn, pg_encoding_to_char(db.encoding) AS serverencoding,
+    has_database_privilege(db.oid, 'CREATE') as cancreate, datlastsysoid,
+    r.oid as user_id, r.rolname as user_name, r.rolsuper as is_superuser,
+    r.rolcreaterole as can_create_role, r.rolcreatedb as can_create_db
+FROM
+    pg_database db
+    LEFT JOIN pg_catalog.pg_roles r ON (r.rolname = current_user)
+WHERE db.datname = current_database()"""
+
+
+def get_startup_options(role=None):
+    """
+    Returns the libpq 'options' applying the session settings (and, the
+    role) at the connection startup, i.e. without any additional round trip.
+    """
+    settings = list(SESSION_SETTINGS)
+    if role:
+        settings.append(('role', role))
+
+    return u' '.join(
+        u'-c {0}={1}'.format(
+            name, value.replace(u'\\', u'\\\\').replace(u' ', u'\\ ')
+        ) for name, value in settings
+    )
+
+
+def send_cancel_requests(connections, timeout):
+    """
+    Send the cancel requests (libpq PQcancel) for the queries running on the
+    psycopg2 connections in parallel. A cancel request does not need a new
+    session (i.e. no authentication, and no TLS negotiation), but it may
+    still block on an unreachable server, hence - we wait for the requests
+    at most 'timeout' seconds.
+
+    Args:
+        connections: List of psycopg2 connections
+        timeout: Maximum time (in seconds) to wait for the cancel requests
+
+    Returns:
+        List of the error messages (None, if the cancel request was sent)
+    """
+    errors = [None] * len(connections)
+
+    def _cancel(idx, conn):
+        try:
+            conn.cancel()
+        except Exception as e:
+            errors[idx] = str(e)
+
+    threads = []
+    for idx, conn in enumerate(connections):
+        thread = threading.Thread(target=_cancel, args=(idx, conn))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    deadline = time.time() + timeout
+    for idx, thread in enumerate(threads):
+        thread.join(max(deadline - time.time(), 0))
+        if thread.is_alive():
+            errors[idx] = gettext("Timed out sending the cancel request.")
+
+    return errors
+
 
 class Connection(BaseConnection):
     """
@@ -127,6 +217,10 @@ class Connection(BaseConnection):
       - This method is used to cancel the transaction for the
         specified connection id and database id.
 
+    * cancel_query()
+      - Cancel the query running on this connection using the libpq cancel
+        request.
+
     * messages()
       - Returns the list of messages/notices sends from the PostgreSQL database
         server.
@@ -151,6 +245,7 @@ class Connection(BaseConnection):
         self.async = async
         self.__async_cursor = None
         self.__async_query_id = None
+        self.__async_trace = None
         self.__backend_pid = None
         self.execution_aborted = False
         self.row_count = 0
@@ -265,6 +360,11 @@ class Connection(BaseConnection):
             import os
             os.environ['PGAPPNAME'] = '{0} - {1}'.format(config.APP_NAME, conn_id)
 
+            # The session settings are applied at the startup (unless the
+            # server, or a connection pooler in between, does not support it)
+            startup_options = get_startup_options(mgr.role) \
+                if config.CONNECTION_STARTUP_OPTIONS else None
+
             pg_conn = psycopg2.connect(
                 host=mgr.host,
                 hostaddr=mgr.hostaddr,
@@ -279,7 +379,8 @@ class Connection(BaseConnection):
                 sslkey=get_complete_file_path(mgr.sslkey),
                 sslrootcert=get_complete_file_path(mgr.sslrootcert),
                 sslcrl=get_complete_file_path(mgr.sslcrl),
-                sslcompression=True if mgr.sslcompression else False
+                sslcompression=True if mgr.sslcompression else False,
+                options=startup_options
             )
 
             # If connection is asynchronous then we will have to wait
@@ -363,47 +464,38 @@ Failed to connect to the database server(#{server_id}) for connection ({conn_id}
         if self.use_binary_placeholder:
             register_binary_typecasters(self.conn)
 
-        status = _execute(cur, """
-SET DateStyle=ISO;
-SET client_min_messages=notice;
-SET bytea_output=escape;
-SET client_encoding='UNICODE';""")
-
-        if status is not None:
-            self.conn.close()
-            self.conn = None
-
-            return False, status
-
-        if mgr.role:
-            status = _execute(cur, u"SET ROLE TO %s", [mgr.role])
-
-            if status is not None:
-                self.conn.close()
-                self.conn = None
-                current_app.logger.error("""
-Connect to the database server (#{server_id}) for connection ({conn_id}), but - failed to setup the role with error message as below:
-{msg}
-""".format(
-                    server_id=self.manager.sid,
-                    conn_id=conn_id,
-                    msg=status
-                )
-                )
-                return False, \
-                       _("Failed to setup the role with error message:\n{0}").format(
-                           status
-                       )
-
-        if mgr.ver is None:
-            status = _execute(cur, "SELECT version()")
+        # Everything needed is fetched in a single round trip. The session
+        # settings, and the role have been applied at the startup, unless the
+        # startup options are disabled. The server information is fetched
+        # only when not cached, or no longer valid.
+        queries = []
+        params = []
+        if not config.CONNECTION_STARTUP_OPTIONS:
+            queries.append(u';\n'.join(
+                u'SET {0}={1}'.format(name, value) if name != 'client_encoding'
+                else u"SET {0}='{1}'".format(name, value)
+                for name, value in SESSION_SETTINGS
+            ))
+            if mgr.role:
+                queries.append(u"SET ROLE TO %s")
+                params.append(mgr.role)
+
+        fingerprint = self._fingerprint()
+        db_info = mgr.database_info(self.db)
+        bootstrap = not mgr.is_valid(fingerprint) or db_info is None
+        metrics.record_cache('server_info', not bootstrap)
+        if bootstrap:
+            queries.append(BOOTSTRAP_QUERY)
+
+        if len(queries) > 0:
+            status = _execute(cur, u';\n'.join(queries), params or None)
 
             if status is not None:
                 self.conn.close()
                 self.conn = None
                 self.wasConnected = False
                 current_app.logger.error("""
-Failed to fetch the version information on the established connection to the database server (#{server_id}) for '{conn_id}' with below error message:
+Failed to initialize the connection to the database server (#{server_id}) for '{conn_id}' with below error message:
 {msg}
 """.format(
                     server_id=self.manager.sid,
@@ -411,44 +503,45 @@ Failed to fetch the version information on the established connection to the dat
                     msg=status
                 )
                 )
+                if len(params) > 0:
+                    return False, \
+                        _("Failed to setup the role with error message:\n{0}").format(
+                            status
+                        )
                 return False, status
 
-            if cur.rowcount > 0:
-                row = cur.fetchmany(1)[0]
-                mgr.ver = row['version']
-                mgr.sversion = self.conn.server_version
+        if bootstrap and cur.rowcount > 0:
+            row = cur.fetchmany(1)[0]
 
-        status = _execute(cur, """
-SELECT
-    db.oid as did, db.datname, db.datallowconn, pg_encoding_to_char(db.encoding) AS serverencoding,
-    has_database_privilege(db.oid, 'CREATE') as cancreate, datlastsysoid
-FROM
-    pg_database db
-WHERE db.datname = current_database()""")
+            if mgr.ver != row['version']:
+                # Identify the server type again
+                mgr.server_type = mgr.server_cls = None
+            mgr.ver = row['version']
+            mgr.sversion = self.conn.server_version
 
-        if status is None:
             mgr.db_info = mgr.db_info or dict()
-            if cur.rowcount > 0:
-                res = cur.fetchmany(1)[0]
-                mgr.db_info[res['did']] = res.copy()
-
-                # We do not have database oid for the maintenance database.
-                if len(mgr.db_info) == 1:
-                    mgr.did = res['did']
+            mgr.db_info[row['did']] = dict(
+                (k, row[k]) for k in (
+                    'did', 'datname', 'datallowconn', 'serverencoding',
+                    'cancreate', 'datlastsysoid'
+                )
+            )
 
-        status = _execute(cur, """
-SELECT
-    oid as id, rolname as name, rolsuper as is_superuser,
-    rolcreaterole as can_create_role, rolcreatedb as can_create_db
-FROM
-    pg_catalog.pg_roles
-WHERE
-    rolname = current_user""")
+            # We do not have database oid for the maintenance database.
+            if len(mgr.db_info) == 1:
+                mgr.did = row['did']
 
-        if status is None:
             mgr.user_info = dict()
-            if cur.rowcount > 0:
-                mgr.user_info = cur.fetchmany(1)[0]
+            if row['user_id'] is not None:
+                mgr.user_info = {
+                    'id': row['user_id'],
+                    'name': row['user_name'],
+                    'is_superuser': row['is_superuser'],
+                    'can_create_role': row['can_create_role'],
+                    'can_create_db': row['can_create_db']
+                }
+
+            mgr.fingerprint = (fingerprint, datetime.datetime.now())
 
         if 'password' in kwargs:
             mgr.password = kwargs['password']
@@ -461,16 +554,29 @@ WHERE
             from pgadmin.browser.server_groups.servers.types import ServerType
             server_types = ServerType.types()
 
-        for st in server_types:
-            if st.instanceOf(mgr.ver):
-                mgr.server_type = st.stype
-                mgr.server_cls = st
-                break
+        if mgr.server_cls is None:
+            for st in server_types:
+                if st.instanceOf(mgr.ver):
+                    mgr.server_type = st.stype
+                    mgr.server_cls = st
+                    break
 
         mgr.update_session()
 
         return True, None
 
+    def _fingerprint(self):
+        """
+        Returns the run parameters reported by the server at the startup of
+        the connection (see FINGERPRINT_PARAMETERS).
+        """
+        return tuple(
+            [self.conn.server_version] + [
+                self.conn.get_parameter_status(p)
+                for p in FINGERPRINT_PARAMETERS
+            ]
+        )
+
     def __cursor(self, server_cursor=False):
         if self.wasConnected is False:
             raise ConnectionLost(
@@ -591,30 +697,22 @@ WHERE
         Returns:
             Generator response
         """
+        trace = QueryTrace(self, 'with server cursor', query)
         status, cur = self.__cursor(server_cursor=True)
         self.row_count = 0
 
         if not status:
             return False, str(cur)
-        query_id = random.randint(1, 9999999)
 
         if IS_PY2 and type(query) == unicode:
             query = query.encode('utf-8')
 
-        current_app.logger.log(
-           25,
-           u"Execute (with server cursor) for server #{server_id} - {conn_id} "
-           u"(Query-id: {query_id}):\n{query}".format(
-               server_id=self.manager.sid,
-               conn_id=self.conn_id,
-               query=query.decode('utf-8') if
-               sys.version_info < (3,) else query,
-               query_id=query_id
-           )
-        )
+        trace.log()
         try:
+            trace.execute()
             self.__internal_blocking_execute(cur, query, params)
         except psycopg2.Error as pe:
+            trace.finish(error=True)
             cur.close()
             errmsg = self._formatted_exception_msg(pe, formatted_exception_msg)
             current_app.logger.error(
@@ -625,11 +723,13 @@ WHERE
                     conn_id=self.conn_id,
                     query=query,
                     errmsg=errmsg,
-                    query_id=query_id
+                    query_id=trace.id
                 )
             )
             return False, errmsg
 
+        trace.fetch()
+
         def handle_json_data(json_columns, results):
             """
             [ This is only for Python2.x]
@@ -683,9 +783,12 @@ WHERE
             if not results:
                 if not cur.closed:
                     cur.close()
+                trace.finish(rows=0)
                 yield gettext('The query executed did not return any data.')
                 return
 
+            row_count = len(results)
+
             header = []
             json_columns = []
             conn_encoding = cur.connection.encoding
@@ -741,7 +844,9 @@ WHERE
                 if not results:
                     if not cur.closed:
                         cur.close()
+                    trace.finish(rows=row_count)
                     break
+                row_count += len(results)
                 res_io = StringIO()
 
                 csv_writer = csv.DictWriter(
@@ -760,25 +865,19 @@ WHERE
         return True, gen
 
     def execute_scalar(self, query, params=None, formatted_exception_msg=False):
+        trace = QueryTrace(self, 'scalar', query)
         status, cur = self.__cursor()
         self.row_count = 0
 
         if not status:
             return False, str(cur)
-        query_id = random.randint(1, 9999999)
 
-        current_app.logger.log(
-            25,
-            u"Execute (scalar) for server #{server_id} - {conn_id} (Query-id: {query_id}):\n{query}".format(
-                server_id=self.manager.sid,
-                conn_id=self.conn_id,
-                query=query,
-                query_id=query_id
-            )
-        )
+        trace.log()
         try:
+            trace.execute()
             self.__internal_blocking_execute(cur, query, params)
         except psycopg2.Error as pe:
+            trace.finish(error=True)
             cur.close()
             if not self.connected():
                 if self.auto_reconnect and not self.reconnecting:
@@ -797,17 +896,20 @@ WHERE
                     conn_id=self.conn_id,
                     query=query,
                     errmsg=errmsg,
-                    query_id=query_id
+                    query_id=trace.id
                 )
             )
             return False, errmsg
 
+        trace.fetch()
         self.row_count = cur.rowcount
         if cur.rowcount > 0:
             res = cur.fetchone()
             if len(res) > 0:
+                trace.finish(rows=self.row_count, result=[res[:1]])
                 return True, res[0]
 
+        trace.finish(rows=self.row_count)
         return True, None
 
     def execute_async(self, query, params=None, formatted_exception_msg=True):
@@ -826,29 +928,31 @@ WHERE
         else:
             query = query.encode('utf-8')
 
+        trace = QueryTrace(self, 'async', query)
+        self.__close_spill()
         self.__async_cursor = None
+        self.__async_trace = None
         status, cur = self.__cursor()
 
         if not status:
             return False, str(cur)
-        query_id = random.randint(1, 9999999)
 
-        current_app.logger.log(
-            25,
-            u"Execute (async) for server #{server_id} - {conn_id} (Query-id: {query_id}):\n{query}".format(
-                server_id=self.manager.sid,
-                conn_id=self.conn_id,
-                query=query.decode('utf-8'),
-                query_id=query_id
-            )
-        )
+        trace.log()
 
         try:
-            self.__notices = []
+            # The notices are buffered, as they are received, in a bounded
+            # buffer.
+            self.__notices = NoticeRing(
+                config.NOTICES_BUFFER_MAX_COUNT,
+                config.NOTICES_BUFFER_MAX_BYTES
+            )
+            cur.connection.notices = self.__notices
             self.execution_aborted = False
+            trace.execute()
             cur.execute(query, params)
             res = self._wait_timeout(cur.connection)
         except psycopg2.Error as pe:
+            trace.finish(error=True)
             errmsg = self._formatted_exception_msg(pe, formatted_exception_msg)
             current_app.logger.error(u"""
 Failed to execute query (execute_async) for the server #{server_id} - {conn_id}
@@ -858,13 +962,14 @@ Failed to execute query (execute_async) for the server #{server_id} - {conn_id}
                 conn_id=self.conn_id,
                 query=query.decode('utf-8'),
                 errmsg=errmsg,
-                query_id=query_id
+                query_id=trace.id
             )
             )
             return False, errmsg
 
         self.__async_cursor = cur
-        self.__async_query_id = query_id
+        self.__async_query_id = trace.id
+        self.__async_trace = trace
 
         return True, res
 
@@ -877,26 +982,20 @@ Failed to execute query (execute_async) for the server #{server_id} - {conn_id}
             params: extra parameters to the function
             formatted_exception_msg: if True then function return the formatted exception message
         """
+        trace = QueryTrace(self, 'void', query)
         status, cur = self.__cursor()
         self.row_count = 0
 
         if not status:
             return False, str(cur)
-        query_id = random.randint(1, 9999999)
 
-        current_app.logger.log(
-            25,
-            u"Execute (void) for server #{server_id} - {conn_id} (Query-id: {query_id}):\n{query}".format(
-                server_id=self.manager.sid,
-                conn_id=self.conn_id,
-                query=query,
-                query_id=query_id
-            )
-        )
+        trace.log()
 
         try:
+            trace.execute()
             self.__internal_blocking_execute(cur, query, params)
         except psycopg2.Error as pe:
+            trace.finish(error=True)
             cur.close()
             if not self.connected():
                 if self.auto_reconnect and not self.reconnecting:
@@ -917,12 +1016,14 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
                 conn_id=self.conn_id,
                 query=query,
                 errmsg=errmsg,
-                query_id=query_id
+                query_id=trace.id
             )
             )
             return False, errmsg
 
         self.row_count = cur.rowcount
+        trace.fetch()
+        trace.finish(rows=self.row_count)
 
         return True, None
 
@@ -957,25 +1058,19 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
         )
 
     def execute_2darray(self, query, params=None, formatted_exception_msg=False):
+        trace = QueryTrace(self, '2darray', query)
         status, cur = self.__cursor()
         self.row_count = 0
 
         if not status:
             return False, str(cur)
 
-        query_id = random.randint(1, 9999999)
-        current_app.logger.log(
-            25,
-            u"Execute (2darray) for server #{server_id} - {conn_id} (Query-id: {query_id}):\n{query}".format(
-                server_id=self.manager.sid,
-                conn_id=self.conn_id,
-                query=query,
-                query_id=query_id
-            )
-        )
+        trace.log()
         try:
+            trace.execute()
             self.__internal_blocking_execute(cur, query, params)
         except psycopg2.Error as pe:
+            trace.finish(error=True)
             cur.close()
             if not self.connected():
                 if self.auto_reconnect and \
@@ -990,11 +1085,13 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
                     conn_id=self.conn_id,
                     query=query,
                     errmsg=errmsg,
-                    query_id=query_id
+                    query_id=trace.id
                 )
             )
             return False, errmsg
 
+        trace.fetch()
+
         # Get Resultset Column Name, Type and size
         columns = cur.description and [
             desc.to_dict() for desc in cur.ordered_description()
@@ -1006,27 +1103,24 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
             for row in cur:
                 rows.append(row)
 
+        trace.finish(rows=self.row_count, result=rows)
+
         return True, {'columns': columns, 'rows': rows}
 
     def execute_dict(self, query, params=None, formatted_exception_msg=False):
+        trace = QueryTrace(self, 'dict', query)
         status, cur = self.__cursor()
         self.row_count = 0
 
         if not status:
             return False, str(cur)
-        query_id = random.randint(1, 9999999)
-        current_app.logger.log(
-            25,
-            u"Execute (dict) for server #{server_id} - {conn_id} (Query-id: {query_id}):\n{query}".format(
-                server_id=self.manager.sid,
-                conn_id=self.conn_id,
-                query=query,
-                query_id=query_id
-            )
-        )
+
+        trace.log()
         try:
+            trace.execute()
             self.__internal_blocking_execute(cur, query, params)
         except psycopg2.Error as pe:
+            trace.finish(error=True)
             cur.close()
             if not self.connected():
                 if self.auto_reconnect and not self.reconnecting:
@@ -1044,12 +1138,14 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
                 u"Failed to execute query (execute_dict) for the server #{server_id}- {conn_id} (Query-id: {query_id}):\nError Message:{errmsg}".format(
                     server_id=self.manager.sid,
                     conn_id=self.conn_id,
-                    query_id=query_id,
+                    query_id=trace.id,
                     errmsg=errmsg
                 )
             )
             return False, errmsg
 
+        trace.fetch()
+
         # Get Resultset Column Name, Type and size
         columns = cur.description and [
             desc.to_dict() for desc in cur.ordered_description()
@@ -1061,6 +1157,8 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
             for row in cur:
                 rows.append(dict(row))
 
+        trace.finish(rows=self.row_count, result=rows)
+
         return True, {'columns': columns, 'rows': rows}
 
     def async_fetchmany_2darray(self, records=2000, formatted_exception_msg=False):
@@ -1086,22 +1184,20 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
             )
 
         if self.row_count > 0:
-            result = []
             # For DDL operation, we may not have result.
             #
             # Because - there is not direct way to differentiate DML and
             # DDL operations, we need to rely on exception to figure
             # that out at the moment.
+            #
+            # The rows are returned as fetched (tuples having the values in
+            # the order of the columns), and serialised as arrays, i.e. no
+            # python objects are created per row, or per value.
             try:
                 if records == -1:
-                    res = cur.fetchall()
+                    result = cur.fetchall_2darray()
                 else:
-                    res = cur.fetchmany(records)
-                for row in res:
-                    new_row = []
-                    for col in self.column_info:
-                        new_row.append(row[col['name']])
-                    result.append(new_row)
+                    result = cur.fetchmany_2darray(records)
             except psycopg2.ProgrammingError as e:
                 result = None
         else:
@@ -1112,6 +1208,51 @@ Failed to execute query (execute_void) for the server #{server_id} - {conn_id}
 
         return True, result
 
+    def async_fetch_rows(self, start, records=2000,
+                         formatted_exception_msg=False):
+        """
+        Fetch the rows of the result of the async query from the given row
+        (0 based), without changing the position of the rows fetched using
+        async_fetchmany_2darray (i.e. jump to the row). The rows are read
+        directly from the temporary file, if the result has been written
+        into it.
+
+        Args:
+          start: first row to fetch
+          records: no of records to fetch. use -1 to fetch all the rest.
+          formatted_exception_msg:
+        """
+        cur = self.__async_cursor
+        if not cur:
+            return False, gettext(
+                "Cursor could not be found for the async connection."
+            )
+
+        if self.conn.isexecuting():
+            return False, gettext(
+                "Asynchronous query execution/operation underway."
+            )
+
+        if self.row_count <= 0 or cur.description is None:
+            return True, None
+
+        if isinstance(cur, ResultSpill):
+            return True, cur.read(start, records)
+
+        position = cur.rownumber
+        try:
+            cur.scroll(start, mode='absolute')
+            if records == -1:
+                result = cur.fetchall_2darray()
+            else:
+                result = cur.fetchmany_2darray(records)
+        except (IndexError, psycopg2.ProgrammingError):
+            result = []
+        finally:
+            cur.scroll(position, mode='absolute')
+
+        return True, result
+
     def connected(self):
         if self.conn:
             if not self.conn.closed:
@@ -1181,7 +1322,39 @@ Failed to reset the connection to the server due to following error:
     def ping(self):
         return self.execute_scalar('SELECT 1')
 
+    def __spill_result(self, cur):
+        """
+        Write the rows of the result of the async query into a temporary
+        file, which stands for the cursor afterwards, and release the cursor
+        (and the result held by it).
+
+        Returns:
+            The spill file, or the cursor (if the rows could not be written)
+        """
+        try:
+            spill = ResultSpill.from_cursor(
+                cur, config.ON_DEMAND_RECORD_COUNT, config.RESULT_SPILL_DIR
+            )
+        except Exception as e:
+            current_app.logger.warning(
+                u"Failed to write the result of the query (Query-id: "
+                u"{query_id}) into a temporary file:\n{error}".format(
+                    query_id=self.__async_query_id, error=e
+                )
+            )
+            cur.scroll(0, mode='absolute')
+            return cur
+
+        self.__async_cursor = spill
+        cur.close()
+        return spill
+
+    def __close_spill(self):
+        if isinstance(self.__async_cursor, ResultSpill):
+            self.__async_cursor.close()
+
     def _release(self):
+        self.__close_spill()
         if self.wasConnected:
             if self.conn:
                 self.conn.close()
@@ -1285,16 +1458,21 @@ Failed to reset the connection to the server due to following error:
                 "Cursor could not be found for the async connection."
             )
 
-        current_app.logger.log(
-            25,
-            "Polling result for (Query-id: {query_id})".format(
-                query_id=self.__async_query_id
+        if query_logging_enabled(current_app.logger):
+            current_app.logger.log(
+                QUERY_LOG_LEVEL,
+                "Polling result for (Query-id: {query_id})".format(
+                    query_id=self.__async_query_id
+                )
             )
-        )
+
+        trace = self.__async_trace
 
         try:
             status = self._wait_timeout(self.conn)
         except psycopg2.Error as pe:
+            if trace is not None:
+                trace.finish(error=True)
             if self.conn.closed:
                 raise ConnectionLost(
                     self.manager.sid,
@@ -1304,7 +1482,8 @@ Failed to reset the connection to the server due to following error:
             errmsg = self._formatted_exception_msg(pe, formatted_exception_msg)
             return False, errmsg
 
-        if self.conn.notices and self.__notices is not None:
+        if self.__notices is not None and \
+                self.conn.notices is not self.__notices:
             while self.conn.notices:
                 self.__notices.append(self.conn.notices.pop(0)[:])
 
@@ -1313,6 +1492,8 @@ Failed to reset the connection to the server due to following error:
         self.column_info = None
 
         if status == self.ASYNC_OK:
+            if trace is not None:
+                trace.fetch()
 
             # if user has cancelled the transaction then changed the status
             if self.execution_aborted:
@@ -1332,24 +1513,32 @@ Failed to reset the connection to the server due to following error:
                     pos += 1
 
             self.row_count = cur.rowcount
+
+            # Write the rows of a large result into a temporary file, instead
+            # of keeping it in the memory (they are fetched on demand).
+            threshold = config.RESULT_SPILL_THRESHOLD
+            if no_result and threshold and cur.rowcount > threshold and \
+                    cur.description is not None and \
+                    not isinstance(cur, ResultSpill):
+                cur = self.__spill_result(cur)
+
             if not no_result:
                 if cur.rowcount > 0:
-                    result = []
                     # For DDL operation, we may not have result.
                     #
                     # Because - there is not direct way to differentiate DML and
                     # DDL operations, we need to rely on exception to figure
                     # that out at the moment.
                     try:
-                        for row in cur:
-                            new_row = []
-                            for col in self.column_info:
-                                new_row.append(row[col['name']])
-                            result.append(new_row)
-
+                        result = [
+                            list(row) for row in cur.fetchall_2darray()
+                        ]
                     except psycopg2.ProgrammingError:
                         result = None
 
+            if trace is not None:
+                trace.finish(rows=self.row_count, result=result)
+
         return status, result
 
     def status_message(self):
@@ -1360,12 +1549,13 @@ Failed to reset the connection to the server due to following error:
         if not cur:
             return gettext("Cursor could not be found for the async connection.")
 
-        current_app.logger.log(
-            25,
-            "Status message for (Query-id: {query_id})".format(
-                query_id=self.__async_query_id
+        if query_logging_enabled(current_app.logger):
+            current_app.logger.log(
+                QUERY_LOG_LEVEL,
+                "Status message for (Query-id: {query_id})".format(
+                    query_id=self.__async_query_id
+                )
             )
-        )
 
         return cur.statusmessage
 
@@ -1388,14 +1578,31 @@ Failed to reset the connection to the server due to following error:
     def cancel_transaction(self, conn_id, did=None):
         """
         This function is used to cancel the running transaction
-        of the given connection id and database id using
-        PostgreSQL's pg_cancel_backend.
+        of the given connection id and database id using the libpq cancel
+        request, and PostgreSQL's pg_cancel_backend as a fallback.
 
         Args:
             conn_id: Connection id
             did: Database id (optional)
         """
         cancel_conn = self.manager.connection(did=did, conn_id=conn_id)
+
+        # Send the cancel request for the connection, which does not need a
+        # new session.
+        status, msg = cancel_conn.cancel_query()
+        if status:
+            if cancel_conn.__backend_pid != self.__backend_pid:
+                cancel_conn.execution_aborted = True
+            return status, msg
+
+        current_app.logger.warning(
+            u"Failed to send the cancel request for the connection "
+            u"{conn_id} of the server #{server_id}, falling back to "
+            u"pg_cancel_backend:\n{msg}".format(
+                conn_id=conn_id, server_id=self.manager.sid, msg=msg
+            )
+        )
+
         query = """SELECT pg_cancel_backend({0});""".format(cancel_conn.__backend_pid)
 
         status = True
@@ -1430,7 +1637,10 @@ Failed to reset the connection to the server due to following error:
                     ),
                     sslcrl=get_complete_file_path(self.manager.sslcrl),
                     sslcompression=True if self.manager.sslcompression
-                    else False
+                    else False,
+                    connect_timeout=max(
+                        int(math.ceil(config.CANCEL_QUERY_TIMEOUT)), 1
+                    )
                 )
 
                 # Get the cursor and run the query
@@ -1462,13 +1672,39 @@ Failed to reset the connection to the server due to following error:
 
         return status, msg
 
+    def cancel_query(self):
+        """
+        Cancel the query running on this connection using the libpq cancel
+        request (waiting for it at most CANCEL_QUERY_TIMEOUT seconds).
+
+        Returns:
+            (status, error message)
+        """
+        if not self.connected():
+            return False, gettext("Not connected to the database server.")
+
+        error = send_cancel_requests(
+            [self.conn], config.CANCEL_QUERY_TIMEOUT
+        )[0]
+        if error is not None:
+            return False, error
+
+        return True, ''
+
     def messages(self):
         """
-        Returns the list of the messages/notices send from the database server.
+        Returns the list of the messages/notices send from the database server
+        since the last call.
         """
-        resp = []
-        while self.__notices:
-            resp.append(self.__notices.pop(0))
+        if self.__notices is None:
+            return []
+
+        resp, dropped = self.__notices.pop_all()
+        if dropped:
+            resp.insert(0, gettext(
+                "{0} message(s) from the database server were discarded, "
+                "as the messages buffer was full.\n"
+            ).format(dropped))
         return resp
 
     def decode_to_utf8(self, value):
@@ -1602,6 +1838,9 @@ class ServerManager(object):
     """
 
     def __init__(self, server):
+        # Guards the connections, which may be looked up (and created) by
+        # the threads other than the request thread.
+        self.lock = threading.RLock()
         self.connections = dict()
 
         self.update(server)
@@ -1615,6 +1854,9 @@ class ServerManager(object):
         self.server_type = None
         self.server_cls = None
         self.password = None
+        # (fingerprint, fetched at) of the cached server information
+        self.fingerprint = None
+        self.user_info = None
 
         self.sid = server.id
         self.host = server.host
@@ -1629,6 +1871,8 @@ class ServerManager(object):
         self.pinged = datetime.datetime.now()
         self.db_info = dict()
         self.server_types = None
+        # (fetched at, in_recovery, wal_paused) - cached by the server node
+        self.recovery_state = None
         self.db_res = server.db_res
         self.passfile = server.passfile
         self.sslcert = server.sslcert
@@ -1637,12 +1881,13 @@ class ServerManager(object):
         self.sslcrl = server.sslcrl
         self.sslcompression = True if server.sslcompression else False
 
-        for con in self.connections:
-            self.connections[con]._release()
+        with self.lock:
+            for con in self.connections:
+                self.connections[con]._release()
 
-        self.update_session()
+            self.update_session()
 
-        self.connections = dict()
+            self.connections = dict()
 
     def as_dict(self):
         """
@@ -1664,8 +1909,11 @@ class ServerManager(object):
 
         connections = res['connections'] = dict()
 
-        for conn_id in self.connections:
-            conn = self.connections[conn_id].as_dict()
+        with self.lock:
+            conns = list(self.connections.items())
+
+        for conn_id, conn in conns:
+            conn = conn.as_dict()
 
             if conn is not None:
                 connections[conn_id] = conn
@@ -1675,6 +1923,33 @@ class ServerManager(object):
     def ServerVersion(self):
         return self.ver
 
+    def is_valid(self, fingerprint):
+        """
+        Tells whether the cached server information (version, server type,
+        role information etc.) is valid for a connection with the given
+        fingerprint (see Connection._fingerprint), i.e. it was fetched for
+        the same fingerprint within SERVER_INFO_CACHE_TTL seconds.
+        """
+        if self.ver is None or self.fingerprint is None or \
+                self.user_info is None:
+            return False
+
+        cached, fetched_at = self.fingerprint
+        return cached == fingerprint and (
+            datetime.datetime.now() - fetched_at
+        ).total_seconds() < config.SERVER_INFO_CACHE_TTL
+
+    def database_info(self, database):
+        """
+        Returns the cached information of the given database (by name), None
+        if not cached.
+        """
+        for info in self.db_info.values():
+            if isinstance(info, dict) and info.get('datname') == database \
+                    and 'datlastsysoid' in info:
+                return info
+        return None
+
     @property
     def version(self):
         return self.sversion
@@ -1742,20 +2017,21 @@ WHERE db.oid = {0}""".format(did))
 
         self.pinged = datetime.datetime.now()
 
-        if my_id in self.connections:
-            return self.connections[my_id]
-        else:
+        with self.lock:
+            if my_id in self.connections:
+                return self.connections[my_id]
+
             if async is None:
                 async = 1 if conn_id is not None else 0
             else:
                 async = 1 if async is True else 0
-            self.connections[my_id] = Connection(
+            conn = self.connections[my_id] = Connection(
                 self, my_id, database, auto_reconnect, async,
                 use_binary_placeholder=use_binary_placeholder,
                 array_to_string=array_to_string
             )
 
-            return self.connections[my_id]
+            return conn
 
     def _restore(self, data):
         """
@@ -1814,39 +2090,68 @@ WHERE db.oid = {0}""".format(did))
         my_id = (u'CONN:{0}'.format(conn_id)) if conn_id is not None else \
             (u'DB:{0}'.format(database)) if database is not None else None
 
-        if my_id is not None:
-            if my_id in self.connections:
-                self.connections[my_id]._release()
-                del self.connections[my_id]
-                if did is not None:
-                    del self.db_info[did]
+        with self.lock:
+            if my_id is not None:
+                if my_id in self.connections:
+                    self.connections.pop(my_id)._release()
+                    if did is not None:
+                        del self.db_info[did]
 
-                if len(self.connections) == 0:
-                    self.ver = None
-                    self.sversion = None
-                    self.server_type = None
-                    self.server_cls = None
-                    self.password = None
+                    if len(self.connections) == 0:
+                        self.ver = None
+                        self.sversion = None
+                        self.server_type = None
+                        self.server_cls = None
+                        self.password = None
+                        self.fingerprint = None
 
-                self.update_session()
+                    self.update_session()
 
-                return True
-            else:
-                return False
+                    return True
+                else:
+                    return False
 
-        for con in self.connections:
-            self.connections[con]._release()
+            for con in self.connections:
+                self.connections[con]._release()
 
-        self.connections = dict()
-        self.ver = None
-        self.sversion = None
-        self.server_type = None
-        self.server_cls = None
-        self.password = None
+            self.connections = dict()
+            self.ver = None
+            self.sversion = None
+            self.server_type = None
+            self.server_cls = None
+            self.password = None
+            self.recovery_state = None
+            self.fingerprint = None
 
-        self.update_session()
+            self.update_session()
 
-        return True
+            return True
+
+    def cancel_queries(self):
+        """
+        Cancel the queries running on all the connections to this server (in
+        parallel) using the libpq cancel requests.
+
+        Returns:
+            (Number of the connections, for which the cancel request was
+            sent, list of the error messages)
+        """
+        with self.lock:
+            conns = list(self.connections.values())
+        conns = [conn for conn in conns if conn.connected()]
+        errors = send_cancel_requests(
+            [conn.conn for conn in conns], config.CANCEL_QUERY_TIMEOUT
+        )
+
+        cancelled = 0
+        messages = []
+        for conn, error in zip(conns, errors):
+            if error is None:
+                cancelled += 1
+            else:
+                messages.append(u'{0}: {1}'.format(conn.conn_id, error))
+
+        return cancelled, messages
 
     def _update_password(self, passwd):
         self.password = passwd
@@ -115,6 +115,11 @@ class DictCursor(_cursor):
     * _ordered_description()
     - Generates the _WrapperColumn object from the description column, and
       identifies duplicate column name
+
+    * fetchmany_2darray(size)
+    * fetchall_2darray()
+    - Fetch the tuples as they are (i.e. the values in the order of the
+      ordered description), without generating the dictionaries.
     """
 
     def __init__(self, *args, **kwargs):
@@ -206,6 +211,22 @@ class DictCursor(_cursor):
         if tuples is not None:
             return [self._dict_tuple(t) for t in tuples]
 
+    def fetchmany_2darray(self, size=None):
+        """
+        Fetch many tuples as they are, i.e. without the dictionaries (the
+        values are in the order of the ordered description).
+        """
+        if size is None:
+            return _cursor.fetchmany(self)
+        return _cursor.fetchmany(self, size)
+
+    def fetchall_2darray(self):
+        """
+        Fetch all tuples as they are, i.e. without the dictionaries (the
+        values are in the order of the ordered description).
+        """
+        return _cursor.fetchall(self)
+
     def __iter__(self):
         it = _cursor.__iter__(self)
         yield self._dict_tuple(next(it))
@@ -0,0 +1,235 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Query instrumentation for the psycopg2 driver.
+
+It logs the queries executed (only when the query log level is enabled, and
+sampled as per QUERY_LOG_SAMPLE_RATE), times the phases of their execution,
+captures the slow queries (see SLOW_QUERY_THRESHOLD) as JSON records in a
+separate rotating log, and records the queries in the metrics.
+"""
+
+import datetime
+import itertools
+import logging
+import random
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+import simplejson as json
+from flask import current_app
+
+import config
+from pgadmin.utils import metrics
+
+# Logging level of the queries executed
+QUERY_LOG_LEVEL = 25
+
+# Maximum length of the query text in a slow query record
+MAX_QUERY_LENGTH = 1024
+
+_monotonic = getattr(time, 'monotonic', time.time)
+_query_ids = itertools.count(1)
+
+_slow_query_logger = None
+_slow_query_lock = threading.Lock()
+
+
+def query_logging_enabled(logger):
+    """
+    Tells whether a message at the query log level would be written by any
+    of the handlers of the logger (the logger itself is usually enabled for
+    all the levels, and the handlers filter the messages).
+    """
+    if not logger.isEnabledFor(QUERY_LOG_LEVEL):
+        return False
+
+    while logger is not None:
+        for handler in logger.handlers:
+            if handler.level <= QUERY_LOG_LEVEL:
+                return True
+        if not logger.propagate:
+            break
+        logger = logger.parent
+
+    return False
+
+
+def get_slow_query_logger():
+    """
+    Returns the logger for the slow query records (None, if the slow query
+    log is not configured).
+    """
+    global _slow_query_logger
+
+    if not config.SLOW_QUERY_LOG_FILE:
+        return None
+
+    if _slow_query_logger is None:
+        with _slow_query_lock:
+            if _slow_query_logger is None:
+                logger = logging.getLogger('pgadmin.slow_queries')
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+
+                handler = RotatingFileHandler(
+                    config.SLOW_QUERY_LOG_FILE,
+                    maxBytes=config.SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=config.SLOW_QUERY_LOG_BACKUP_COUNT,
+                    encoding='utf-8'
+                )
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                logger.addHandler(handler)
+
+                _slow_query_logger = logger
+
+    return _slow_query_logger
+
+
+def result_size(rows):
+    """
+    Estimate the size (in bytes) of the result (list of rows as lists,
+    tuples, or dicts).
+    """
+    size = 0
+    for row in rows or []:
+        for value in (row.values() if isinstance(row, dict) else row):
+            if value is None:
+                continue
+            if not isinstance(value, (bytes, type(u''))):
+                value = str(value)
+            size += len(value)
+    return size
+
+
+class QueryTrace(object):
+    """
+    class QueryTrace
+
+    Traces the execution of a query, which goes through the phases:
+    * queue   - from the request to the start of the execution (i.e. getting
+                the cursor, reconnecting etc.)
+    * execute - until the result is ready
+    * fetch   - fetching the result
+
+    The query id is unique (monotonically increasing) within the process.
+    """
+
+    def __init__(self, conn, kind, query):
+        self.id = next(_query_ids)
+        self.conn = conn
+        self.kind = kind
+        self.query = query
+        self.started_at = _monotonic()
+        self.executing_at = None
+        self.executed_at = None
+        self.finished = False
+
+    def _query_text(self):
+        query = self.query
+        if isinstance(query, bytes):
+            query = query.decode('utf-8', 'replace')
+        return query
+
+    def log(self):
+        """
+        Log the query (if the query log level is enabled, and the query is
+        sampled).
+        """
+        logger = current_app.logger
+        if not query_logging_enabled(logger):
+            return
+
+        rate = config.QUERY_LOG_SAMPLE_RATE
+        if rate < 1 and random.random() >= rate:
+            return
+
+        logger.log(
+            QUERY_LOG_LEVEL,
+            u"Execute ({kind}) for server #{server_id} - {conn_id} "
+            u"(Query-id: {query_id}):\n{query}".format(
+                kind=self.kind,
+                server_id=self.conn.manager.sid,
+                conn_id=self.conn.conn_id,
+                query=self._query_text(),
+                query_id=self.id
+            )
+        )
+
+    def execute(self):
+        """The execution of the query has started."""
+        self.executing_at = _monotonic()
+
+    def fetch(self):
+        """The result of the query is ready to be fetched."""
+        self.executed_at = _monotonic()
+
+    def timings(self, finished_at):
+        """
+        Returns the duration of the query, and its phases in milliseconds.
+        """
+        executing_at = self.executing_at or finished_at
+        executed_at = self.executed_at or finished_at
+
+        def ms(start, end):
+            return round((end - start) * 1000, 3)
+
+        return {
+            'duration': ms(self.started_at, finished_at),
+            'queue': ms(self.started_at, executing_at),
+            'execute': ms(executing_at, executed_at),
+            'fetch': ms(executed_at, finished_at)
+        }
+
+    def finish(self, rows=None, result=None, error=False):
+        """
+        The query has finished, capture it in the slow query log, if it took
+        longer than SLOW_QUERY_THRESHOLD milliseconds.
+
+        Args:
+            rows: Number of the rows returned/affected
+            result: Rows fetched (to estimate the size of the result)
+            error: The query failed
+        """
+        if self.finished:
+            return
+        self.finished = True
+
+        finished_at = _monotonic()
+        metrics.record_query(self.kind, finished_at - self.started_at)
+
+        threshold = config.SLOW_QUERY_THRESHOLD
+        if not threshold:
+            return
+
+        timings = self.timings(finished_at)
+        if timings['duration'] < threshold:
+            return
+
+        logger = get_slow_query_logger()
+        if logger is None:
+            return
+
+        record = {
+            'time': datetime.datetime.utcnow().isoformat() + 'Z',
+            'query_id': self.id,
+            'kind': self.kind,
+            'server': self.conn.manager.sid,
+            'db': self.conn.db,
+            'conn_id': self.conn.conn_id,
+            'rows': rows,
+            'bytes': result_size(result) if result is not None else None,
+            'error': error,
+            'query': self._query_text()[:MAX_QUERY_LENGTH]
+        }
+        record.update(timings)
+
+        logger.info(json.dumps(record, default=str))
@@ -0,0 +1,75 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Bounded buffer for the notices/messages sent by the database server.
+"""
+
+from collections import deque
+from threading import Lock
+
+
+class NoticeRing(object):
+    """
+    class NoticeRing
+
+    Keeps the latest notices, at most 'max_count' of them, and at most
+    'max_bytes' bytes in total (0 for no limit), discarding the oldest ones
+    (which are counted) when full.
+
+    It can be used as the 'notices' of a psycopg2 connection (it only needs
+    the append method), in which case the notices are stored as they are
+    received, instead of being truncated to the last 50 by psycopg2.
+    """
+
+    def __init__(self, max_count=0, max_bytes=0):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.notices = deque()
+        self.size = 0
+        self.dropped = 0
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.notices)
+
+    def __bool__(self):
+        return len(self.notices) > 0
+
+    __nonzero__ = __bool__
+
+    def append(self, notice):
+        if self.max_bytes and len(notice) > self.max_bytes:
+            notice = notice[:self.max_bytes]
+
+        with self.lock:
+            self.notices.append(notice)
+            self.size += len(notice)
+
+            while (
+                self.max_count and len(self.notices) > self.max_count
+            ) or (
+                self.max_bytes and self.size > self.max_bytes
+            ):
+                self.size -= len(self.notices.popleft())
+                self.dropped += 1
+
+    def pop_all(self):
+        """
+        Returns the notices buffered, and the number of the notices discarded
+        since the last call, and empties the buffer.
+        """
+        with self.lock:
+            notices = list(self.notices)
+            dropped = self.dropped
+            self.notices.clear()
+            self.size = 0
+            self.dropped = 0
+
+        return notices, dropped
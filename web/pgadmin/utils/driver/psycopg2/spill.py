@@ -0,0 +1,158 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Temporary file holding the rows of a (large) result of a query, read on
+demand, instead of keeping the whole result in the memory.
+"""
+
+import marshal
+import mmap
+import pickle
+import tempfile
+
+# Formats of the pages
+PAGE_MARSHAL = b'm'
+PAGE_PICKLE = b'p'
+
+
+class ResultSpill(object):
+    """
+    class ResultSpill
+
+    Keeps the rows of the result of a cursor in a temporary file, in the
+    pages of 'page_size' rows. A page is serialised using marshal (compact,
+    and fast), or pickle for the values not supported by marshal. The file is
+    memory-mapped for reading the pages, only the offsets of the pages (and
+    the last page read) are kept in the memory.
+
+    It stands for the cursor, once the rows are written, i.e. it provides
+    the description, the rowcount, the status message, and the fetch methods
+    of the cursor, so that the cursor (and the result held by it) can be
+    released.
+    """
+
+    def __init__(self, page_size=1000, directory=None):
+        self.page_size = page_size
+        self.file = tempfile.TemporaryFile(
+            prefix='pgadmin-result-', dir=directory
+        )
+        self.map = None
+        self.offsets = []
+        self.size = 0
+        self.rowcount = 0
+        self.rownumber = 0
+        self.description = None
+        self.statusmessage = None
+        self.columns = None
+        self.page = (None, None)
+
+    @classmethod
+    def from_cursor(cls, cur, page_size=1000, directory=None):
+        """
+        Write all the rows of the cursor into a new spill file.
+        """
+        spill = cls(page_size, directory)
+        try:
+            spill.description = cur.description
+            spill.statusmessage = cur.statusmessage
+            spill.columns = cur.ordered_description()
+
+            rows = cur.fetchmany_2darray(page_size)
+            while rows:
+                spill.write_page(rows)
+                rows = cur.fetchmany_2darray(page_size)
+
+            spill.finish()
+        except Exception:
+            spill.close()
+            raise
+        return spill
+
+    def write_page(self, rows):
+        try:
+            data = PAGE_MARSHAL + marshal.dumps(list(rows))
+        except ValueError:
+            data = PAGE_PICKLE + pickle.dumps(
+                list(rows), pickle.HIGHEST_PROTOCOL
+            )
+
+        self.file.write(data)
+        self.offsets.append(self.size)
+        self.size += len(data)
+        self.rowcount += len(rows)
+
+    def finish(self):
+        """All the rows are written, map the file for reading."""
+        self.file.flush()
+        if self.size:
+            self.map = mmap.mmap(
+                self.file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+    def read_page(self, index):
+        if self.page[0] == index:
+            return self.page[1]
+
+        start = self.offsets[index]
+        end = self.offsets[index + 1] \
+            if index + 1 < len(self.offsets) else self.size
+        data = self.map[start:end]
+
+        if data[:1] == PAGE_MARSHAL:
+            rows = marshal.loads(data[1:])
+        else:
+            rows = pickle.loads(data[1:])
+
+        self.page = (index, rows)
+        return rows
+
+    def read(self, start, count=-1):
+        """
+        Returns 'count' rows (all the rest, if -1) from the row 'start'
+        (0 based).
+        """
+        end = self.rowcount if count < 0 else min(start + count, self.rowcount)
+        res = []
+        pos = max(start, 0)
+
+        while pos < end:
+            index = pos // self.page_size
+            offset = pos - index * self.page_size
+            rows = self.read_page(index)
+            res.extend(rows[offset:offset + end - pos])
+            pos = (index + 1) * self.page_size
+
+        return res
+
+    def ordered_description(self):
+        return self.columns
+
+    def fetchmany_2darray(self, size=None):
+        rows = self.read(self.rownumber, size or self.page_size)
+        self.rownumber += len(rows)
+        return rows
+
+    def fetchall_2darray(self):
+        rows = self.read(self.rownumber)
+        self.rownumber += len(rows)
+        return rows
+
+    def scroll(self, value, mode='relative'):
+        self.rownumber = value if mode == 'absolute' \
+            else self.rownumber + value
+
+    def close(self):
+        self.page = (None, None)
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,276 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Collection of the metrics of the application - latency of the requests per
+endpoint and node type, database round trips and time per request, and the
+cache hit rates - exposed in the Prometheus text format.
+
+The metrics are kept in memory, per process.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request, has_request_context
+
+import config
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# Buckets (upper bounds) of the histograms
+REQUEST_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+QUERY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+ROUND_TRIP_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Name -> (type, help, label names, buckets)
+METRICS = {
+    'pgadmin_request_duration_seconds': (
+        'histogram', 'Latency of the requests per endpoint.',
+        ('endpoint', 'method'), REQUEST_BUCKETS
+    ),
+    'pgadmin_node_request_duration_seconds': (
+        'histogram', 'Latency of the requests per node type, and operation.',
+        ('node_type', 'operation'), REQUEST_BUCKETS
+    ),
+    'pgadmin_request_db_round_trips': (
+        'histogram', 'Number of the database queries executed per request.',
+        ('endpoint',), ROUND_TRIP_BUCKETS
+    ),
+    'pgadmin_request_db_duration_seconds': (
+        'histogram', 'Time spent in the database queries per request.',
+        ('endpoint',), REQUEST_BUCKETS
+    ),
+    'pgadmin_db_query_duration_seconds': (
+        'histogram', 'Latency of the database queries per kind of execution.',
+        ('kind',), QUERY_BUCKETS
+    ),
+    'pgadmin_cache_requests_total': (
+        'counter', 'Number of the lookups in the caches.',
+        ('cache', 'result'), None
+    ),
+    'pgadmin_cache_hit_ratio': (
+        'gauge', 'Ratio of the lookups in the caches, which were hits.',
+        ('cache',), None
+    )
+}
+
+_lock = threading.Lock()
+# (name, label values) -> Histogram, or count
+_values = dict()
+
+
+class Histogram(object):
+    """
+    class Histogram
+
+    Counts the observed values in the buckets (upper bounds), along with the
+    total count, and sum of the values.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One more for the values above the largest bucket (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Returns the list of (upper bound, cumulative count)."""
+        res = []
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            res.append((bound, total))
+        return res
+
+
+class RequestMetrics(object):
+    """The metrics collected during a request."""
+
+    def __init__(self):
+        self.started_at = _monotonic()
+        self.round_trips = 0
+        self.db_time = 0.0
+        self.node_type = None
+        self.operation = None
+        self.recorded = False
+
+
+def observe(name, labels, value):
+    """Observe the value in the histogram with the given label values."""
+    key = (name, labels)
+    with _lock:
+        histogram = _values.get(key)
+        if histogram is None:
+            histogram = _values[key] = Histogram(METRICS[name][3])
+        histogram.observe(value)
+
+
+def increment(name, labels, value=1):
+    """Increment the counter with the given label values."""
+    key = (name, labels)
+    with _lock:
+        _values[key] = _values.get(key, 0) + value
+
+
+def reset():
+    """Discard all the metrics collected."""
+    with _lock:
+        _values.clear()
+
+
+def _request_metrics():
+    if not config.METRICS_ENABLED or not has_request_context():
+        return None
+    return getattr(g, '_request_metrics', None)
+
+
+def start_request():
+    """Start collecting the metrics of the current request."""
+    if config.METRICS_ENABLED:
+        g._request_metrics = RequestMetrics()
+
+
+def set_node(node_type, operation):
+    """The current request is served by the node (NodeView) operation."""
+    metrics = _request_metrics()
+    if metrics is not None:
+        metrics.node_type = node_type
+        metrics.operation = operation
+
+
+def record_query(kind, duration):
+    """
+    A database query has been executed (taking the duration in seconds).
+    """
+    if not config.METRICS_ENABLED:
+        return
+
+    observe('pgadmin_db_query_duration_seconds', (kind,), duration)
+
+    metrics = _request_metrics()
+    if metrics is not None:
+        metrics.round_trips += 1
+        metrics.db_time += duration
+
+
+def record_cache(cache, hit):
+    """A lookup in the cache was a hit, or a miss."""
+    if config.METRICS_ENABLED:
+        increment(
+            'pgadmin_cache_requests_total',
+            (cache, 'hit' if hit else 'miss')
+        )
+
+
+def finish_request():
+    """Record the metrics of the current request."""
+    metrics = _request_metrics()
+    if metrics is None or metrics.recorded:
+        return
+    metrics.recorded = True
+
+    endpoint = request.endpoint
+    # Ignore the static files
+    if endpoint is not None and (
+        endpoint == 'static' or endpoint.endswith('.static')
+    ):
+        return
+    endpoint = endpoint or 'unknown'
+
+    duration = _monotonic() - metrics.started_at
+
+    observe(
+        'pgadmin_request_duration_seconds', (endpoint, request.method),
+        duration
+    )
+    if metrics.node_type is not None:
+        observe(
+            'pgadmin_node_request_duration_seconds',
+            (metrics.node_type, metrics.operation), duration
+        )
+    observe(
+        'pgadmin_request_db_round_trips', (endpoint,), metrics.round_trips
+    )
+    observe(
+        'pgadmin_request_db_duration_seconds', (endpoint,), metrics.db_time
+    )
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')\
+        .replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    return u'{' + u','.join(
+        u'{0}="{1}"'.format(name, _escape(value)) for name, value in pairs
+    ) + u'}'
+
+
+def render():
+    """Returns the metrics in the Prometheus text format."""
+    with _lock:
+        values = dict(
+            (key, (value if not isinstance(value, Histogram) else (
+                value.cumulative(), value.sum
+            ))) for key, value in _values.items()
+        )
+
+    # Cache hit ratio
+    lookups = dict()
+    for (name, labels), value in values.items():
+        if name == 'pgadmin_cache_requests_total':
+            hits, total = lookups.get(labels[0], (0, 0))
+            lookups[labels[0]] = (
+                hits + (value if labels[1] == 'hit' else 0), total + value
+            )
+    for cache, (hits, total) in lookups.items():
+        values[('pgadmin_cache_hit_ratio', (cache,))] = \
+            float(hits) / total if total else 0.0
+
+    lines = []
+    for name in sorted(METRICS):
+        kind, description, label_names, _ = METRICS[name]
+        lines.append(u'# HELP {0} {1}'.format(name, description))
+        lines.append(u'# TYPE {0} {1}'.format(name, kind))
+
+        for key in sorted(k for k in values if k[0] == name):
+            labels = key[1]
+            if kind != 'histogram':
+                lines.append(u'{0}{1} {2}'.format(
+                    name, _labels(label_names, labels), values[key]
+                ))
+                continue
+
+            buckets, total = values[key]
+            for bound, count in buckets:
+                lines.append(u'{0}_bucket{1} {2}'.format(
+                    name, _labels(label_names, labels, ('le', bound)), count
+                ))
+            lines.append(u'{0}_sum{1} {2}'.format(
+                name, _labels(label_names, labels), total
+            ))
+            lines.append(u'{0}_count{1} {2}'.format(
+                name, _labels(label_names, labels), buckets[-1][1]
+            ))
+
+    return u'\n'.join(lines) + u'\n'
@@ -283,6 +283,51 @@ def parse_partial_identifier(word):
         return None
 
 
+def strip_leading_comments(statement):
+    """Remove the whitespaces, and the comments preceding the statement
+
+    :param statement: the SQL statement
+    :return: the statement starting at its first keyword (or identifier, etc.)
+    """
+    offset = 0
+    for token in sqlparse.parse(statement)[0].flatten():
+        if token.ttype not in Token.Comment and \
+                token.ttype not in Token.Text.Whitespace:
+            break
+        offset += len(token.value)
+    return statement[offset:]
+
+
+def split_statements(sql):
+    """Split an SQL script into the statements, as sqlparse does
+
+    The empty statements (having only the whitespaces, comments or semicolons)
+    are skipped.
+
+    :param sql: the SQL script
+    :return: list of (line, statement) tuples, line is the (zero based) line
+             number of the script the statement starts at (i.e. its first
+             keyword, after the comments preceding it)
+    """
+    statements = []
+    pos = 0
+    for statement in sqlparse.split(sql):
+        start = sql.find(statement, pos)
+        if start < 0:
+            start = pos
+        pos = start + len(statement)
+
+        if not sqlparse.format(
+            statement, strip_comments=True
+        ).strip(' \t\r\n;'):
+            continue
+
+        start += len(statement) - len(strip_leading_comments(statement))
+        statements.append((sql.count('\n', 0, start), statement))
+
+    return statements
+
+
 if __name__ == '__main__':
     sql = 'select * from (select t. from tabl t'
     print (extract_tables(sql))
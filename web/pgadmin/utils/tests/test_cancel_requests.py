@@ -0,0 +1,63 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import time
+
+from pgadmin.utils.driver.psycopg2 import send_cancel_requests
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class FakeConnection(object):
+    """Stands for a psycopg2 connection receiving the cancel request"""
+    def __init__(self, delay=0, error=None):
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    def cancel(self):
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise Exception(self.error)
+        self.cancelled = True
+
+
+class CancelRequestsTestCase(BaseTestGenerator):
+    """Test sending the cancel requests for the connections in parallel"""
+    scenarios = [
+        ('Cancel requests are sent in parallel',
+         dict(
+             connections=[FakeConnection(0.5), FakeConnection(0.5),
+                          FakeConnection(0.5)],
+             timeout=2,
+             expected=[None, None, None],
+             max_duration=1.5
+         )),
+        ('Failed cancel request is reported',
+         dict(
+             connections=[FakeConnection(),
+                          FakeConnection(error='could not connect')],
+             timeout=2,
+             expected=[None, 'could not connect'],
+             max_duration=1.5
+         )),
+        ('Cancel request is not awaited after the timeout',
+         dict(
+             connections=[FakeConnection(), FakeConnection(5)],
+             timeout=0.5,
+             expected=[None, 'Timed out sending the cancel request.'],
+             max_duration=1.5
+         ))
+    ]
+
+    def runTest(self):
+        started = time.time()
+        errors = send_cancel_requests(self.connections, self.timeout)
+
+        self.assertEqual(errors, self.expected)
+        self.assertTrue(time.time() - started < self.max_duration)
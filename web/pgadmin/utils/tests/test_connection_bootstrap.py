@@ -0,0 +1,149 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import datetime
+import sys
+import threading
+
+from pgadmin.utils.driver.psycopg2 import ServerManager, get_startup_options
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import patch
+else:
+    from unittest.mock import patch
+
+FINGERPRINT = (100004, '10.4', 'UTF8', 'postgres', 'on')
+
+
+class ConnectionStartupOptionsTestCase(BaseTestGenerator):
+    """Test the libpq options applying the session settings at startup"""
+    scenarios = [
+        ('Session settings only',
+         dict(
+             role=None,
+             expected='-c DateStyle=ISO -c client_min_messages=notice '
+                      '-c bytea_output=escape -c client_encoding=UNICODE'
+         )),
+        ('Session settings, and the role with a space in the name',
+         dict(
+             role='read only',
+             expected='-c DateStyle=ISO -c client_min_messages=notice '
+                      '-c bytea_output=escape -c client_encoding=UNICODE '
+                      '-c role=read\\ only'
+         ))
+    ]
+
+    def runTest(self):
+        self.assertEqual(get_startup_options(self.role), self.expected)
+
+
+class ServerInfoCacheTestCase(BaseTestGenerator):
+    """Test the validity of the server information cached per server"""
+    scenarios = [
+        ('Cached information is valid for the same fingerprint',
+         dict(
+             fingerprint=FINGERPRINT,
+             age=10,
+             datname='postgres',
+             expected_valid=True,
+             expected_database=True
+         )),
+        ('Cached information is not valid after the server is upgraded',
+         dict(
+             fingerprint=(110000, '11.0', 'UTF8', 'postgres', 'on'),
+             age=10,
+             datname='postgres',
+             expected_valid=False,
+             expected_database=True
+         )),
+        ('Cached information is not valid after it expires',
+         dict(
+             fingerprint=FINGERPRINT,
+             age=600,
+             datname='postgres',
+             expected_valid=False,
+             expected_database=True
+         )),
+        ('Information of the other databases is not cached',
+         dict(
+             fingerprint=FINGERPRINT,
+             age=10,
+             datname='test',
+             expected_valid=True,
+             expected_database=False
+         ))
+    ]
+
+    @patch('pgadmin.utils.driver.psycopg2.config')
+    def runTest(self, config_mock):
+        config_mock.SERVER_INFO_CACHE_TTL = 300
+
+        manager = ServerManager.__new__(ServerManager)
+        manager.ver = 'PostgreSQL 10.4'
+        manager.user_info = {'id': 10, 'name': 'postgres'}
+        manager.fingerprint = (
+            FINGERPRINT,
+            datetime.datetime.now() - datetime.timedelta(seconds=self.age)
+        )
+        manager.db_info = {
+            13212: {'did': 13212, 'datname': 'postgres',
+                    'datlastsysoid': 13211},
+            'pgAgent': {'enabled': True}
+        }
+
+        self.assertEqual(
+            manager.is_valid(self.fingerprint), self.expected_valid
+        )
+        self.assertEqual(
+            manager.database_info(self.datname) is not None,
+            self.expected_database
+        )
+
+
+class ServerManagerConnectionsTestCase(BaseTestGenerator):
+    """Test the connections of a server are looked up from the threads"""
+    scenarios = [
+        ('Connection is created once for the concurrent lookups',
+         dict(threads=8))
+    ]
+
+    @patch('pgadmin.utils.driver.psycopg2.ServerManager.update_session')
+    def runTest(self, update_session_mock):
+        manager = ServerManager.__new__(ServerManager)
+        manager.lock = threading.RLock()
+        manager.connections = dict()
+        manager.db = 'postgres'
+        manager.db_info = dict()
+        manager.sid = 1
+
+        barrier = threading.Barrier(self.threads) \
+            if hasattr(threading, 'Barrier') else None
+        conns = []
+
+        def lookup():
+            if barrier is not None:
+                barrier.wait()
+            conns.append(manager.connection(conn_id='probe'))
+
+        workers = [
+            threading.Thread(target=lookup) for _ in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(len(conns), self.threads)
+        self.assertTrue(all(conn is conns[0] for conn in conns))
+        self.assertEqual(list(manager.connections), [u'CONN:probe'])
+
+        self.assertTrue(manager.release(conn_id='probe'))
+        self.assertEqual(manager.connections, dict())
+        self.assertFalse(manager.release(conn_id='probe'))
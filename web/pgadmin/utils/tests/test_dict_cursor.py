@@ -0,0 +1,83 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils.driver.psycopg2.cursor import DictCursor
+from pgadmin.utils.route import BaseTestGenerator
+from regression.python_test_utils import test_utils as utils
+
+
+class DictCursorTestCase(BaseTestGenerator):
+    """
+    Test the rows fetched as they are (for the data grid) are in the order of
+    the ordered description, as the rows fetched as the dictionaries.
+    """
+    scenarios = [
+        ('Distinct column names',
+         dict(
+             query='SELECT 1 AS a, 2 AS b, 3 AS c '
+                   'FROM generate_series(1, 3)',
+             names=['a', 'b', 'c']
+         )),
+        ('Duplicate column names are renamed',
+         dict(
+             query='SELECT 1 AS a, 2 AS b, 3 AS a, 4 AS b, 5 AS a '
+                   'FROM generate_series(1, 3)',
+             names=['a', 'b', 'a-2', 'b-2', 'a-3']
+         )),
+        ('Renamed column does not clash with an existing column',
+         dict(
+             query='SELECT 1 AS a, 2 AS "a-2", 3 AS a '
+                   'FROM generate_series(1, 3)',
+             names=['a', 'a-2', 'a-3']
+         ))
+    ]
+
+    def fetch(self, fetch):
+        cur = self.connection.cursor(cursor_factory=DictCursor)
+        try:
+            cur.execute(self.query)
+            return cur.ordered_description(), fetch(cur)
+        finally:
+            cur.close()
+
+    def runTest(self):
+        self.connection = utils.get_db_connection(
+            self.server['db'],
+            self.server['username'],
+            self.server['db_password'],
+            self.server['host'],
+            self.server['port'],
+            self.server['sslmode']
+        )
+        try:
+            desc, rows = self.fetch(lambda cur: cur.fetchall_2darray())
+            self.assertEqual([col.name for col in desc], self.names)
+            self.assertEqual(len(rows), 3)
+
+            # The values of the dictionaries (keyed by the renamed columns)
+            # are in the same order, as the values fetched as they are.
+            desc, dicts = self.fetch(lambda cur: cur.fetchall())
+            self.assertEqual(
+                [tuple(row[col.name] for col in desc) for row in dicts],
+                [tuple(row) for row in rows]
+            )
+
+            desc, pages = self.fetch(lambda cur: [
+                cur.fetchmany_2darray(2), cur.fetchmany_2darray(2)
+            ])
+            self.assertEqual(
+                [tuple(row) for row in pages[0] + pages[1]],
+                [tuple(row) for row in rows]
+            )
+            self.assertEqual(
+                [tuple(row) for row in rows],
+                [tuple(range(1, len(self.names) + 1))] * 3
+            )
+        finally:
+            self.connection.close()
@@ -0,0 +1,116 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import datetime
+import decimal
+
+import simplejson as json
+
+from pgadmin.utils.ajax import JSON_ENCODERS, convert_rows, encode_json, \
+    iter_json, _find_large_array
+from pgadmin.utils.route import BaseTestGenerator
+
+ROWS = [
+    [i, 'row %d' % i, datetime.date(2018, 1, 1) + datetime.timedelta(i),
+     None if i % 3 else datetime.timedelta(minutes=i), decimal.Decimal(i) / 4]
+    for i in range(25)
+]
+
+
+class JSONEncodingTestCase(BaseTestGenerator):
+    """Test the encoding of the responses, and their streaming"""
+    scenarios = [
+        ('Array of rows is streamed',
+         dict(
+             doc=ROWS,
+             threshold=20,
+             expected_path=[]
+         )),
+        ('Data of the response is streamed',
+         dict(
+             doc={'success': 1, 'data': [
+                 dict(oid=i, name='table_%d' % i, inode=False)
+                 for i in range(25)
+             ]},
+             threshold=20,
+             expected_path=['data']
+         )),
+        ('Result of the query is streamed',
+         dict(
+             doc={'success': 1, 'data': {
+                 'status': 'Success', 'result': ROWS, 'rows_fetched_to': 25
+             }},
+             threshold=20,
+             expected_path=['data', 'result']
+         )),
+        ('Small response is not streamed',
+         dict(
+             doc={'success': 1, 'data': {'result': ROWS}},
+             threshold=100,
+             expected_path=None
+         ))
+    ]
+
+    def runTest(self):
+        path = _find_large_array(self.doc, self.threshold)
+        self.assertEqual(path, self.expected_path)
+
+        expected = json.loads(encode_json(self.doc))
+        if path is not None:
+            streamed = u''.join(iter_json(self.doc, path, batch_size=7))
+            self.assertEqual(json.loads(streamed), expected)
+
+        # All the encoders produce the same document
+        for name, dumps in JSON_ENCODERS.items():
+            self.assertEqual(json.loads(dumps(self.doc)), expected, name)
+
+
+class DecimalEncodingTestCase(BaseTestGenerator):
+    """Test the decimals are kept exact by every encoder, and streaming"""
+    scenarios = [
+        ('Decimal beyond the double precision',
+         dict(value=decimal.Decimal('12345678901234567890.123456789'))),
+        ('Decimal with the trailing zeros',
+         dict(value=decimal.Decimal('0.10')))
+    ]
+
+    def runTest(self):
+        doc = {'data': [[i, self.value] for i in range(5)]}
+        expected = {'data': [[i, str(self.value)] for i in range(5)]}
+
+        for name, dumps in JSON_ENCODERS.items():
+            self.assertEqual(json.loads(dumps(doc)), expected, name)
+
+        streamed = u''.join(iter_json(doc, ['data'], batch_size=2))
+        self.assertEqual(json.loads(streamed), expected)
+
+
+class ConvertRowsTestCase(BaseTestGenerator):
+    """Test the conversion of the columns of the rows in bulk"""
+    scenarios = [
+        ('Columns of the arrays are converted',
+         dict(
+             rows=[[1, datetime.date(2018, 1, 2), None],
+                   [2, None, datetime.timedelta(hours=1)]],
+             expected=[[1, '2018-01-02', None], [2, None, '01:00:00']]
+         )),
+        ('Columns of the dicts are converted',
+         dict(
+             rows=[{'id': 1, 'amount': decimal.Decimal('1.50')}],
+             expected=[{'id': 1, 'amount': '1.50'}]
+         )),
+        ('Rows without such columns are kept as they are',
+         dict(
+             rows=[(1, 'a'), (2, 'b')],
+             expected=[(1, 'a'), (2, 'b')]
+         ))
+    ]
+
+    def runTest(self):
+        self.assertEqual(convert_rows(self.rows), self.expected)
@@ -0,0 +1,73 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils import metrics
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class MetricsRenderTestCase(BaseTestGenerator):
+    """Test the metrics exposed in the Prometheus text format"""
+    scenarios = [
+        ('Database query latency histogram',
+         dict(
+             queries=[('dict', 0.003), ('dict', 0.02), ('dict', 20)],
+             caches=[],
+             expected=[
+                 'pgadmin_db_query_duration_seconds_bucket'
+                 '{kind="dict",le="0.001"} 0',
+                 'pgadmin_db_query_duration_seconds_bucket'
+                 '{kind="dict",le="0.005"} 1',
+                 'pgadmin_db_query_duration_seconds_bucket'
+                 '{kind="dict",le="0.025"} 2',
+                 'pgadmin_db_query_duration_seconds_bucket'
+                 '{kind="dict",le="10"} 2',
+                 'pgadmin_db_query_duration_seconds_bucket'
+                 '{kind="dict",le="+Inf"} 3',
+                 'pgadmin_db_query_duration_seconds_sum{kind="dict"} 20.023',
+                 'pgadmin_db_query_duration_seconds_count{kind="dict"} 3'
+             ]
+         )),
+        ('Cache hit rates',
+         dict(
+             queries=[],
+             caches=[('server_info', True), ('server_info', True),
+                     ('server_info', False), ('recovery_state', False)],
+             expected=[
+                 'pgadmin_cache_requests_total'
+                 '{cache="server_info",result="hit"} 2',
+                 'pgadmin_cache_requests_total'
+                 '{cache="server_info",result="miss"} 1',
+                 'pgadmin_cache_hit_ratio{cache="recovery_state"} 0.0',
+                 'pgadmin_cache_hit_ratio{cache="server_info"} 0.6666'
+             ]
+         ))
+    ]
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def runTest(self):
+        for kind, duration in self.queries:
+            metrics.record_query(kind, duration)
+        for cache, hit in self.caches:
+            metrics.record_cache(cache, hit)
+
+        lines = metrics.render().splitlines()
+
+        self.assertIn(
+            '# TYPE pgadmin_request_duration_seconds histogram', lines
+        )
+        for expected in self.expected:
+            self.assertTrue(
+                any(line.startswith(expected) for line in lines),
+                '{0} not found in the metrics'.format(expected)
+            )
@@ -0,0 +1,58 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+from pgadmin.utils.driver.psycopg2.notices import NoticeRing
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class NoticeRingTestCase(BaseTestGenerator):
+    """Test the bounded buffer of the notices from the database server"""
+    scenarios = [
+        ('All the notices are kept within the limits',
+         dict(
+             max_count=10, max_bytes=0,
+             notices=['NOTICE:  %d\n' % i for i in range(5)],
+             expected=['NOTICE:  %d\n' % i for i in range(5)],
+             expected_dropped=0
+         )),
+        ('Oldest notices are discarded beyond the maximum count',
+         dict(
+             max_count=3, max_bytes=0,
+             notices=['NOTICE:  %d\n' % i for i in range(1000)],
+             expected=['NOTICE:  %d\n' % i for i in range(997, 1000)],
+             expected_dropped=997
+         )),
+        ('Oldest notices are discarded beyond the maximum size',
+         dict(
+             max_count=0, max_bytes=25,
+             notices=['NOTICE:  %d\n' % i for i in range(10)],
+             expected=['NOTICE:  8\n', 'NOTICE:  9\n'],
+             expected_dropped=8
+         )),
+        ('Oversized notice is truncated',
+         dict(
+             max_count=0, max_bytes=10,
+             notices=['NOTICE:  ' + 'x' * 100],
+             expected=['NOTICE:  x'],
+             expected_dropped=0
+         ))
+    ]
+
+    def runTest(self):
+        ring = NoticeRing(self.max_count, self.max_bytes)
+        for notice in self.notices:
+            ring.append(notice)
+
+        notices, dropped = ring.pop_all()
+        self.assertEqual(notices, self.expected)
+        self.assertEqual(dropped, self.expected_dropped)
+
+        # The buffer is empty after the notices are taken
+        self.assertFalse(ring)
+        self.assertEqual(ring.pop_all(), ([], 0))
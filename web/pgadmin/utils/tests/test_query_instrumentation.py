@@ -0,0 +1,98 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import logging
+import sys
+
+import simplejson as json
+
+from pgadmin.utils.driver.psycopg2 import instrumentation
+from pgadmin.utils.route import BaseTestGenerator
+
+if sys.version_info < (3, 3):
+    from mock import MagicMock, patch
+else:
+    from unittest.mock import MagicMock, patch
+
+
+class QueryLoggingEnabledTestCase(BaseTestGenerator):
+    """Test whether the queries would be written by the log handlers"""
+    scenarios = [
+        ('Handlers logging the warnings only',
+         dict(handler_levels=[logging.WARNING, logging.ERROR],
+              expected=False)),
+        ('A handler logging the queries',
+         dict(handler_levels=[logging.WARNING, 25], expected=True)),
+        ('A handler logging everything',
+         dict(handler_levels=[logging.DEBUG], expected=True))
+    ]
+
+    def runTest(self):
+        logger = logging.getLogger('pgadmin.test.query_logging')
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.handlers = []
+
+        for level in self.handler_levels:
+            handler = logging.NullHandler()
+            handler.setLevel(level)
+            logger.addHandler(handler)
+
+        self.assertEqual(
+            instrumentation.query_logging_enabled(logger), self.expected
+        )
+
+
+class SlowQueryLogTestCase(BaseTestGenerator):
+    """Test the capture of the slow queries"""
+    scenarios = [
+        ('Query faster than the threshold is not captured',
+         dict(threshold=100, clock=[0.0, 0.01, 0.03, 0.05],
+              expected=None)),
+        ('Slow query is captured with its timings',
+         dict(threshold=100, clock=[0.0, 0.01, 0.21, 0.25],
+              expected=dict(duration=250.0, queue=10.0, execute=200.0,
+                            fetch=40.0, rows=2, bytes=9))),
+        ('Slow query log is disabled',
+         dict(threshold=0, clock=[0.0, 0.01, 0.21, 0.25],
+              expected=None))
+    ]
+
+    def runTest(self):
+        conn = MagicMock(db='postgres', conn_id='DB:postgres')
+        conn.manager.sid = 1
+        slow_query_logger = MagicMock()
+        clock = iter(self.clock)
+
+        with patch.object(instrumentation, 'config') as config_mock, \
+                patch.object(instrumentation, '_monotonic',
+                             lambda: next(clock)), \
+                patch.object(instrumentation, 'get_slow_query_logger',
+                             return_value=slow_query_logger):
+            config_mock.SLOW_QUERY_THRESHOLD = self.threshold
+
+            trace = instrumentation.QueryTrace(
+                conn, 'dict', 'SELECT oid, relname FROM pg_class'
+            )
+            trace.execute()
+            trace.fetch()
+            trace.finish(rows=2, result=[{'oid': 1259, 'relname': 'ab'},
+                                         {'oid': 1, 'relname': 'cd'}])
+
+        if self.expected is None:
+            self.assertFalse(slow_query_logger.info.called)
+            return
+
+        record = json.loads(slow_query_logger.info.call_args[0][0])
+        self.assertEqual(record['query_id'], trace.id)
+        self.assertEqual(record['server'], 1)
+        self.assertEqual(record['db'], 'postgres')
+        self.assertEqual(record['conn_id'], 'DB:postgres')
+        for key, value in self.expected.items():
+            self.assertAlmostEqual(record[key], value)
@@ -0,0 +1,75 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+import decimal
+
+from pgadmin.utils.driver.psycopg2.spill import ResultSpill
+from pgadmin.utils.route import BaseTestGenerator
+
+
+class FakeCursor(object):
+    """Stands for a cursor having the rows of a result"""
+    def __init__(self, rows):
+        self.rows = rows
+        self.pos = 0
+        self.description = [('id', 23), ('value', 25)]
+        self.statusmessage = 'SELECT {0}'.format(len(rows))
+
+    def ordered_description(self):
+        return self.description
+
+    def fetchmany_2darray(self, size):
+        rows = self.rows[self.pos:self.pos + size]
+        self.pos += len(rows)
+        return rows
+
+
+class ResultSpillTestCase(BaseTestGenerator):
+    """Test writing the rows of a result into a file, and reading them"""
+    scenarios = [
+        ('Rows are read across the pages',
+         dict(
+             rows=[(i, 'value %d' % i) for i in range(1050)],
+             page_size=100,
+             reads=[(0, 10), (95, 10), (1000, 100), (1049, -1), (2000, 5)]
+         )),
+        ('Values not supported by marshal are kept',
+         dict(
+             rows=[(i, decimal.Decimal(i) / 4) for i in range(25)],
+             page_size=10,
+             reads=[(5, 10), (20, -1)]
+         )),
+        ('Empty result',
+         dict(
+             rows=[],
+             page_size=10,
+             reads=[(0, 10)]
+         ))
+    ]
+
+    def runTest(self):
+        spill = ResultSpill.from_cursor(FakeCursor(self.rows), self.page_size)
+        try:
+            self.assertEqual(spill.rowcount, len(self.rows))
+            self.assertEqual(spill.statusmessage,
+                             'SELECT {0}'.format(len(self.rows)))
+
+            # Random access
+            for start, count in self.reads:
+                end = None if count == -1 else start + count
+                self.assertEqual(spill.read(start, count),
+                                 [tuple(row) for row in self.rows[start:end]])
+
+            # Sequential access, as the cursor
+            fetched = spill.fetchmany_2darray(7)
+            fetched.extend(spill.fetchall_2darray())
+            self.assertEqual([tuple(row) for row in fetched], self.rows)
+            self.assertEqual(spill.fetchmany_2darray(7), [])
+        finally:
+            spill.close()
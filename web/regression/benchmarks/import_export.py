@@ -0,0 +1,133 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Benchmark comparing the engines of the import/export tool, i.e. the \\copy
+command run by the psql utility, and the COPY command run in-process by the
+python worker (with, and without compression).
+
+Each engine is run as a separate process (as the background process would
+be), against a scratch table having the given number of rows.
+
+The database server is connected as per the libpq environment variables
+(PGHOST, PGPORT, PGUSER, PGDATABASE, PGPASSWORD), e.g.
+
+    $ PGDATABASE=postgres python regression/benchmarks/import_export.py \\
+        --rows 1000000 --psql /usr/local/pgsql/bin/psql
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import psycopg2
+
+WORKER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+    'pgadmin', 'tools', 'import_export', 'copy_worker.py'
+)
+TABLE = 'pga_import_export_benchmark'
+
+
+def run(cmd):
+    start = time.time()
+    subprocess.check_call(cmd, stdout=open(os.devnull, 'w'))
+    return time.time() - start
+
+
+def psql(args, is_import, filename):
+    return run([
+        args.psql, '-X', '-q', '-c',
+        "\\copy {0} {1} '{2}' CSV".format(
+            TABLE, 'FROM' if is_import else 'TO', filename
+        )
+    ])
+
+
+def worker(args, is_import, filename, compression=None):
+    cmd = [
+        sys.executable, WORKER,
+        '--mode', 'import' if is_import else 'export',
+        '--file', filename, '--format', 'csv',
+        '--buffer-size', str(args.buffer_size),
+        '--command', 'COPY {0} {1} CSV'.format(
+            TABLE, 'FROM STDIN' if is_import else 'TO STDOUT'
+        )
+    ]
+    if compression:
+        cmd[-2:-2] = ['--compression', compression]
+    return run(cmd)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the engines of the import/export tool.'
+    )
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--buffer-size', type=int, default=1024 * 1024)
+    parser.add_argument('--psql', default='psql')
+    args = parser.parse_args()
+
+    conn = psycopg2.connect('')
+    conn.autocommit = True
+    cur = conn.cursor()
+    cur.execute(
+        'CREATE TABLE {0} AS SELECT i AS id, md5(i::text) AS val, '
+        'now() AS created FROM generate_series(1, %s) i'.format(TABLE),
+        (args.rows,)
+    )
+
+    engines = [
+        ('psql', '.csv', lambda i, f: psql(args, i, f)),
+        ('copy', '.csv', lambda i, f: worker(args, i, f)),
+        ('copy (gzip)', '.csv.gz', lambda i, f: worker(args, i, f, 'gzip'))
+    ]
+    try:
+        import zstandard  # noqa
+        engines.append(
+            ('copy (zstd)', '.csv.zst',
+             lambda i, f: worker(args, i, f, 'zstd'))
+        )
+    except ImportError:
+        pass
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        print('{0:<12} {1:>10} {2:>10} {3:>12}'.format(
+            'engine', 'export (s)', 'import (s)', 'size (MB)'
+        ))
+        for name, ext, copy in engines:
+            filename = os.path.join(tmpdir, 'data' + ext)
+            export_times = []
+            import_times = []
+            for _ in range(args.repeat):
+                if os.path.exists(filename):
+                    os.remove(filename)
+                export_times.append(copy(False, filename))
+                cur.execute('TRUNCATE {0}'.format(TABLE))
+                import_times.append(copy(True, filename))
+
+            print('{0:<12} {1:>10.2f} {2:>10.2f} {3:>12.1f}'.format(
+                name, min(export_times), min(import_times),
+                os.path.getsize(filename) / 1024.0 / 1024.0
+            ))
+    finally:
+        shutil.rmtree(tmpdir)
+        cur.execute('DROP TABLE {0}'.format(TABLE))
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Benchmark the encoding of the JSON responses on the realistic payloads (the
+nodes of a large schema, a page of the query result in the data grid, and a
+statistics result with the date/time and numeric values) - comparing the
+JSON encoders available, with and without converting the columns of the rows
+in bulk, and the streaming of the response.
+
+No database server is needed, e.g.
+
+    $ python regression/benchmarks/json_encoding.py --rows 100000
+"""
+from __future__ import print_function
+
+import argparse
+import datetime
+import decimal
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir
+))
+
+import config  # noqa
+from pgadmin.utils.ajax import JSON_ENCODERS, convert_rows, iter_json  # noqa
+
+
+def catalog_payload(rows):
+    """Nodes of the tables of a schema, as sent to the browser tree"""
+    return {'success': 1, 'errormsg': '', 'info': '', 'result': None,
+            'data': [{
+                'id': 16384 + i,
+                '_id': 16384 + i,
+                '_type': 'table',
+                '_pid': 2200,
+                'label': 'table_{0}'.format(i),
+                'icon': 'icon-table',
+                'inode': True,
+                'module': 'pgadmin.node.table',
+                'tigger_count': 0,
+                'has_enable_triggers': 0,
+                'is_partitioned': False
+            } for i in range(rows)]}
+
+
+def grid_payload(rows):
+    """A page of the query result (the values are typecasted as strings)"""
+    return {'success': 1, 'errormsg': '', 'info': '', 'result': None,
+            'data': {
+                'status': 'Success',
+                'result': [
+                    (i, 'customer {0}'.format(i), '2018-01-01 10:00:00+00',
+                     '{0}.99'.format(i), None, '{"id": 1}')
+                    for i in range(rows)
+                ],
+                'has_more_rows': True,
+                'rows_fetched_from': 1,
+                'rows_fetched_to': rows
+            }}
+
+
+def statistics_payload(rows):
+    """Statistics of the tables (the values are not typecasted)"""
+    now = datetime.datetime.now()
+    return {'success': 1, 'errormsg': '', 'info': '', 'result': None,
+            'data': {
+                'result': [
+                    ('table_{0}'.format(i), i * 10, decimal.Decimal(i) / 7,
+                     now - datetime.timedelta(seconds=i),
+                     datetime.timedelta(seconds=i))
+                    for i in range(rows)
+                ]
+            }}
+
+
+PAYLOADS = [
+    ('catalog', catalog_payload, ['data']),
+    ('grid', grid_payload, ['data', 'result']),
+    ('statistics', statistics_payload, ['data', 'result'])
+]
+
+
+def measure(func, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        durations.append(time.time() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the encoding of the JSON responses.'
+    )
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    print('{0:<12} {1:<12} {2:>14} {3:>14} {4:>14}'.format(
+        'payload', 'encoder', 'whole (rows/s)', 'bulk (rows/s)',
+        'stream (rows/s)'
+    ))
+    for payload_name, payload, path in PAYLOADS:
+        doc = payload(args.rows)
+
+        def encode_converted():
+            # Replace the rows with the converted ones in a copy of the
+            # document (as the streaming does)
+            converted = dict(doc)
+            container = converted
+            for key in path[:-1]:
+                container[key] = dict(container[key])
+                container = container[key]
+            container[path[-1]] = convert_rows(container[path[-1]])
+            return dumps(converted)
+
+        for name, dumps in sorted(JSON_ENCODERS.items()):
+            config.JSON_ENCODER = name
+            whole = measure(lambda: dumps(doc), args.repeat)
+            bulk = measure(encode_converted, args.repeat)
+            stream = measure(
+                lambda: [chunk for chunk in iter_json(
+                    doc, path, args.batch_size
+                )],
+                args.repeat
+            )
+            print('{0:<12} {1:<12} {2:>14.0f} {3:>14.0f} {4:>14.0f}'.format(
+                payload_name, name, args.rows / whole, args.rows / bulk,
+                args.rows / stream
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+##########################################################################
+#
+# pgAdmin 4 - PostgreSQL Tools
+#
+# Copyright (C) 2013 - 2018, The pgAdmin Development Team
+# This software is released under the PostgreSQL Licence
+#
+##########################################################################
+
+"""
+Benchmark the throughput (rows per second) of fetching the result of a query
+for the data grid, and serialising it as JSON, per data type - comparing the
+rows fetched as the dictionaries, and converted to the arrays (as the query
+tool used to), to the rows fetched as they are.
+
+The typecasters of pgAdmin are registered, as they are for the connections
+of the query tool.
+
+The database server is connected as per the libpq environment variables
+(PGHOST, PGPORT, PGUSER, PGDATABASE, PGPASSWORD), e.g.
+
+    $ PGDATABASE=postgres python regression/benchmarks/typecasters.py \\
+        --rows 1000000
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+import psycopg2
+import simplejson as json
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir
+))
+
+from pgadmin.utils.driver.psycopg2.cursor import DictCursor  # noqa
+from pgadmin.utils.driver.psycopg2.typecast import \
+    register_global_typecasters, register_string_typecasters, \
+    register_binary_typecasters, register_array_to_string_typecasters  # noqa
+
+# Data type -> expression (of i) generating the values
+DATA_TYPES = [
+    ('integer', 'i'),
+    ('bigint', 'i::bigint * 1000000'),
+    ('numeric', 'i::numeric / 7'),
+    ('double precision', 'i::float8 / 7'),
+    ('date', 'current_date + i'),
+    ('timestamptz', "now() + i * interval '1 second'"),
+    ('interval', "i * interval '1 minute'"),
+    ('text', 'md5(i::text)'),
+    ('bytea', "decode(md5(i::text), 'hex')"),
+    ('bigint[]', 'ARRAY[i, i + 1]::bigint[]'),
+    ('jsonb', "('{\"i\": ' || i || '}')::jsonb")
+]
+
+
+def fetch_dicts(cur):
+    """Fetch the rows as the dictionaries, and convert them to the arrays"""
+    columns = [col.name for col in cur.ordered_description()]
+    result = []
+    for row in cur.fetchall():
+        new_row = []
+        for col in columns:
+            new_row.append(row[col])
+        result.append(new_row)
+    return result
+
+
+def fetch_tuples(cur):
+    """Fetch the rows as they are"""
+    return cur.fetchall_2darray()
+
+
+def measure(conn, expr, rows, fetch):
+    cur = conn.cursor(cursor_factory=DictCursor)
+    cur.execute(
+        'SELECT {0} AS value FROM generate_series(1, %s) i'.format(expr),
+        (rows,)
+    )
+    start = time.time()
+    json.dumps(fetch(cur))
+    duration = time.time() - start
+    cur.close()
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the typecasting of the results per data type.'
+    )
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    register_global_typecasters()
+
+    conn = psycopg2.connect('')
+    conn.autocommit = True
+    register_string_typecasters(conn)
+    register_array_to_string_typecasters(conn)
+    register_binary_typecasters(conn)
+
+    print('{0:<18} {1:>14} {2:>14} {3:>8}'.format(
+        'data type', 'dicts (rows/s)', 'tuples (rows/s)', 'gain'
+    ))
+    try:
+        for name, expr in DATA_TYPES:
+            dicts = min(
+                measure(conn, expr, args.rows, fetch_dicts)
+                for _ in range(args.repeat)
+            )
+            tuples = min(
+                measure(conn, expr, args.rows, fetch_tuples)
+                for _ in range(args.repeat)
+            )
+            print('{0:<18} {1:>14.0f} {2:>14.0f} {3:>7.2f}x'.format(
+                name, args.rows / dicts, args.rows / tuples, dicts / tuples
+            ))
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()